@@ -0,0 +1,150 @@
+"""
+Reproduzierbare synthetische ZIP-Archive für Benchmarks.
+
+Jeder Generator erzeugt bei gleichem ``seed`` und ``scale`` byte-identische
+Archive (feste Zeitstempel, sortierte Einträge, Inhalte aus ``random.Random``).
+``scale`` skaliert Dateianzahl bzw. -größe linear.
+"""
+
+import os
+import random
+import zipfile
+
+# Fester Zeitstempel aller Einträge (frühestes im ZIP-Format darstellbares Datum)
+DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DEFAULT_SEED = 42
+
+_WORDS = (
+    "def class return import from self value data result config path file "
+    "project upload github archive index token name size list dict for in if else"
+).split()
+
+
+def _random_bytes(rng, size):
+    return rng.getrandbits(8 * size).to_bytes(size, "little") if size else b""
+
+
+def _source_file(rng, lines):
+    """Python-ähnlicher Quelltext mit Funktionen und Docstrings"""
+    out = [f'"""Modul {rng.randrange(10 ** 6)}"""', "", "import os", ""]
+    for i in range(lines // 4):
+        words = " ".join(rng.choice(_WORDS) for _ in range(6))
+        out.append(f"def funktion_{i}(wert, pfad=None):")
+        out.append(f'    """{words}"""')
+        out.append(f"    return wert * {rng.randrange(1000)}")
+        out.append("")
+    return ("\n".join(out) + "\n").encode()
+
+
+def _write(path, entries):
+    """Schreibt ``{Name: Bytes}`` sortiert mit festen Metadaten"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.part"
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in sorted(entries):
+            info = zipfile.ZipInfo(name, DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, entries[name])
+    os.replace(tmp_path, path)
+    return path
+
+
+def many_small_files(path, scale=1.0, seed=DEFAULT_SEED):
+    """Viele kleine Quelltextdateien in flachen Paketen"""
+    rng = random.Random(seed)
+    count = max(1, int(2000 * scale))
+    entries = {"projekt/requirements.txt": b"requests>=2.31\nflask==2.3.0\n"}
+    for i in range(count):
+        entries[f"projekt/paket_{i % 40}/modul_{i}.py"] = _source_file(rng, rng.randrange(8, 60))
+    return _write(path, entries)
+
+
+def few_huge_files(path, scale=1.0, seed=DEFAULT_SEED):
+    """Wenige große, schlecht komprimierbare Dateien"""
+    rng = random.Random(seed)
+    size = max(1024, int(8 * 1024 * 1024 * scale))
+    entries = {"projekt/main.py": _source_file(rng, 40)}
+    for i in range(3):
+        entries[f"projekt/daten/block_{i}.bin"] = _random_bytes(rng, size)
+    return _write(path, entries)
+
+
+def deep_tree(path, scale=1.0, seed=DEFAULT_SEED):
+    """Tief verschachtelte Verzeichnisse mit wenigen Dateien pro Ebene"""
+    rng = random.Random(seed)
+    entries = {"projekt/package.json": b'{"name": "tief", "dependencies": {"react": "^18.2.0"}}\n'}
+    branches = max(1, int(20 * scale))
+    for branch in range(branches):
+        parts = ["projekt", f"zweig_{branch}"]
+        for depth in range(30):
+            parts.append(f"ebene_{depth}")
+            entries["/".join(parts + [f"datei_{depth}.js"])] = (
+                f"export const wert{depth} = {rng.randrange(10 ** 6)};\n".encode()
+            )
+    return _write(path, entries)
+
+
+def highly_compressible(path, scale=1.0, seed=DEFAULT_SEED):
+    """Große, stark komprimierbare Textdateien (Logs, generierter Code)"""
+    rng = random.Random(seed)
+    lines = max(100, int(200000 * scale))
+    entries = {}
+    for i in range(4):
+        level = rng.choice(("INFO", "WARN", "DEBUG"))
+        text = "".join(f"2024-01-01 {level} upload {n % 500} verarbeitet\n" for n in range(lines))
+        entries[f"projekt/logs/lauf_{i}.log"] = text.encode()
+    entries["projekt/main.py"] = _source_file(rng, 40)
+    return _write(path, entries)
+
+
+def mixed_binaries(path, scale=1.0, seed=DEFAULT_SEED):
+    """Quelltext gemischt mit Bildern, Bibliotheken und Datendateien"""
+    rng = random.Random(seed)
+    count = max(1, int(300 * scale))
+    entries = {"projekt/pyproject.toml": b'[project]\nname = "gemischt"\ndependencies = ["numpy"]\n'}
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            entries[f"projekt/src/modul_{i}.py"] = _source_file(rng, 40)
+        elif kind == 1:
+            entries[f"projekt/bilder/bild_{i}.png"] = b"\x89PNG\r\n\x1a\n" + _random_bytes(
+                rng, rng.randrange(2000, 60000)
+            )
+        elif kind == 2:
+            entries[f"projekt/lib/modul_{i}.so"] = b"\x7fELF" + _random_bytes(
+                rng, rng.randrange(5000, 80000)
+            )
+        elif kind == 3:
+            entries[f"projekt/daten/tabelle_{i}.json"] = (
+                "[" + ",".join(str(rng.randrange(10 ** 6)) for _ in range(2000)) + "]"
+            ).encode()
+        else:
+            entries[f"projekt/docs/seite_{i}.md"] = (
+                " ".join(rng.choice(_WORDS) for _ in range(400)) + "\n"
+            ).encode()
+    return _write(path, entries)
+
+
+GENERATORS = {
+    "many_small": many_small_files,
+    "few_huge": few_huge_files,
+    "deep_tree": deep_tree,
+    "compressible": highly_compressible,
+    "mixed_binaries": mixed_binaries,
+}
+
+
+def generate_all(directory, scale=1.0, seed=DEFAULT_SEED, names=None):
+    """
+    Erzeugt die ausgewählten Archive in ``directory`` und gibt
+    ``{Name: Pfad}`` zurück. Vorhandene Archive mit gleichem Namen, ``scale``
+    und ``seed`` werden wiederverwendet.
+    """
+    archives = {}
+    for name in names or GENERATORS:
+        path = os.path.join(directory, f"{name}-s{scale:g}-r{seed}.zip")
+        if not os.path.exists(path):
+            GENERATORS[name](path, scale, seed)
+        archives[name] = path
+    return archives
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmarks der Upload-Pipeline.
+
+Misst ZIP-Validierung, Entpacken, Verzeichnisvalidierung, Analysen, README-Generator
+und lokalen Git-Commit mit Push in ein Bare-Repository auf synthetischen
+Archiven (siehe ``archive_generators``). Jede Kombination aus Benchmark und
+Archiv läuft in einem eigenen Prozess, damit der Spitzen-RSS-Wert nicht von
+vorherigen Läufen verfälscht wird.
+
+Beispiele::
+
+    python benchmarks/run_benchmarks.py --output ergebnis.json
+    python benchmarks/run_benchmarks.py --scale 0.2 --baseline baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline baseline.json
+
+Exit-Code 1, wenn gegenüber der Baseline eine Regression gefunden wurde.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(HERE)
+sys.path.append(os.path.join(os.path.dirname(HERE), "src"))
+
+from archive_generators import DEFAULT_SEED, GENERATORS, generate_all
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Upload-Typ mit den höchsten Limits, damit alle Archive vollständig geprüft werden
+UPLOAD_TYPE = "admin_upload"
+
+# Relative Verschlechterung, ab der ein Wert als Regression gilt
+DEFAULT_THRESHOLD = 0.25
+# Absolute Mindestabweichung gegen Messrauschen bei sehr kurzen Läufen
+MIN_TIME_DELTA = 0.005
+MIN_RSS_DELTA_MB = 5.0
+
+GIT_IDENTITY = ["-c", "user.name=benchmark", "-c", "user.email=benchmark@example.invalid"]
+
+
+def extract(archive, workspace):
+    from shared.zip_extract import extract_zip
+
+    target = os.path.join(workspace, "entpackt")
+    extract_zip(archive, target)
+    return os.path.join(target, "projekt")
+
+
+def bench_extract(archive, workspace):
+    from shared.zip_extract import extract_zip
+
+    target = os.path.join(workspace, "entpackt")
+    return lambda: extract_zip(archive, target), lambda: shutil.rmtree(target, ignore_errors=True)
+
+
+def bench_validate_zip(archive, workspace):
+    from security_validation import validate_zip_file
+
+    return lambda: validate_zip_file(archive, UPLOAD_TYPE), None
+
+
+def bench_validate_directory(archive, workspace):
+    from security_validation import validate_upload_directory
+
+    project = extract(archive, workspace)
+    return lambda: validate_upload_directory(project, UPLOAD_TYPE), None
+
+
+def bench_analyzers(archive, workspace):
+    from shared.analysis_cache import default_cache
+    from shared.dependency_files import collect_dependencies
+    from shared.doc_extractor import build_symbol_table
+    from shared.file_index import build_file_index
+    from shared.project_detection import detect_project_profile
+    from shared.secret_scanner import scan_directory
+
+    project = extract(archive, workspace)
+
+    def run():
+        index = build_file_index(project)
+        detect_project_profile(project, index=index)
+        collect_dependencies(project, index=index)
+        build_symbol_table(project, index=index)
+        scan_directory(project, index=index)
+
+    # Ohne Cache-Treffer messen (jeder Lauf wie ein neuer Upload)
+    return run, default_cache.clear
+
+
+def bench_readme(archive, workspace):
+    from shared.file_index import build_file_index
+    from shared.generate_readme import generate_readme
+
+    project = extract(archive, workspace)
+    return lambda: generate_readme(build_file_index(project)), None
+
+
+def bench_git_commit(archive, workspace):
+    project = extract(archive, workspace)
+    remote = os.path.join(workspace, "remote.git")
+
+    def git(*args, cwd=project):
+        subprocess.run(["git", *GIT_IDENTITY, *args], cwd=cwd, check=True, capture_output=True)
+
+    def reset():
+        shutil.rmtree(os.path.join(project, ".git"), ignore_errors=True)
+        shutil.rmtree(remote, ignore_errors=True)
+        git("init", "--bare", "-q", remote, cwd=workspace)
+
+    def run():
+        git("init", "-q", "-b", "main")
+        git("add", "-A")
+        git("commit", "-q", "-m", "Benchmark")
+        git("push", "-q", remote, "main")
+
+    return run, reset
+
+
+BENCHMARKS = {
+    "validate_zip": bench_validate_zip,
+    "extract": bench_extract,
+    "validate_directory": bench_validate_directory,
+    "analyzers": bench_analyzers,
+    "readme": bench_readme,
+    "git_commit": bench_git_commit,
+}
+
+
+def percentile(values, fraction):
+    """Perzentil mit linearer Interpolation"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb():
+    """Spitzen-RSS dieses Prozesses und seiner Kindprozesse (z. B. git) in MB"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux meldet KB, macOS Bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(benchmark, archive, repeat):
+    """Führt einen Benchmark im aktuellen Prozess aus (Worker-Modus)"""
+    with zipfile.ZipFile(archive) as zf:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+    workspace = tempfile.mkdtemp(prefix="bench-")
+    try:
+        run, reset = BENCHMARKS[benchmark](archive, workspace)
+        timings = []
+        for _ in range(repeat):
+            if reset is not None:
+                reset()
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    return {
+        "timings": timings,
+        "bytes": sum(info.file_size for info in infos),
+        "files": len(infos),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def summarize(raw):
+    timings = raw["timings"]
+    p50 = percentile(timings, 0.5)
+    return {
+        "runs": len(timings),
+        "p50_s": round(p50, 6),
+        "p95_s": round(percentile(timings, 0.95), 6),
+        "mean_s": round(sum(timings) / len(timings), 6),
+        "throughput_mb_s": round(raw["bytes"] / 1024 / 1024 / p50, 2) if p50 else None,
+        "files_per_s": round(raw["files"] / p50, 1) if p50 else None,
+        "bytes": raw["bytes"],
+        "files": raw["files"],
+        "peak_rss_mb": round(raw["peak_rss_mb"], 1) if raw["peak_rss_mb"] is not None else None,
+    }
+
+
+def run_isolated(benchmark, archive, repeat):
+    """Startet einen Worker-Prozess und liefert dessen Rohmesswerte"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", benchmark, archive,
+         "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_suite(archives, benchmarks, repeat, isolated=True, progress=None):
+    """``{"Benchmark/Archiv": Kennzahlen}`` für alle Kombinationen"""
+    results = {}
+    for name, archive in archives.items():
+        for benchmark in benchmarks:
+            key = f"{benchmark}/{name}"
+            raw = run_isolated(benchmark, archive, repeat) if isolated else measure(
+                benchmark, archive, repeat
+            )
+            results[key] = summarize(raw)
+            if progress is not None:
+                progress(key, results[key])
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Vergleicht Median-Laufzeit, p95 und Spitzen-RSS mit einer Baseline. Gibt
+    eine Liste der Regressionen ``{"case", "metric", "baseline", "current", "change"}`` zurück.
+    """
+    regressions = []
+    for key, current in results.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        for metric, min_delta in (
+            ("p50_s", MIN_TIME_DELTA),
+            ("p95_s", MIN_TIME_DELTA),
+            ("peak_rss_mb", MIN_RSS_DELTA_MB),
+        ):
+            before, now = old.get(metric), current.get(metric)
+            if before is None or now is None:
+                continue
+            if now > before * (1 + threshold) and now - before > min_delta:
+                regressions.append(
+                    {
+                        "case": key,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": now,
+                        "change": round(now / before - 1, 3) if before else None,
+                    }
+                )
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks der Upload-Pipeline")
+    parser.add_argument("--scale", type=float, default=1.0, help="Größe der Testarchive")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=5, help="Läufe pro Messung")
+    parser.add_argument("--archives", help=f"Auswahl aus {', '.join(GENERATORS)}")
+    parser.add_argument("--benchmarks", help=f"Auswahl aus {', '.join(BENCHMARKS)}")
+    parser.add_argument("--data-dir", help="Verzeichnis für (wiederverwendete) Testarchive")
+    parser.add_argument("--output", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="Mit gespeicherten Ergebnissen vergleichen")
+    parser.add_argument("--save-baseline", help="Ergebnisse als neue Baseline speichern")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--worker", nargs=2, metavar=("BENCHMARK", "ARCHIV"), help=argparse.SUPPRESS)
+    return parser
+
+
+def _selection(value, choices):
+    if not value:
+        return list(choices)
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in choices]
+    if unknown:
+        raise SystemExit(f"Unbekannt: {', '.join(unknown)}")
+    return names
+
+
+def _print_progress(key, summary):
+    print(
+        f"{key:40s} p50 {summary['p50_s'] * 1000:9.1f} ms  "
+        f"p95 {summary['p95_s'] * 1000:9.1f} ms  "
+        f"{summary['throughput_mb_s'] or 0:8.1f} MB/s  RSS {summary['peak_rss_mb']} MB",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.worker:
+        print(json.dumps(measure(args.worker[0], args.worker[1], args.repeat)))
+        return 0
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="bench-data-")
+    try:
+        archives = generate_all(
+            data_dir, args.scale, args.seed, _selection(args.archives, GENERATORS)
+        )
+        results = run_suite(
+            archives, _selection(args.benchmarks, BENCHMARKS), args.repeat, progress=_print_progress
+        )
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['case']} {regression['metric']}: "
+                f"{regression['baseline']} → {regression['current']}",
+                file=sys.stderr,
+            )
+        exit_code = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+    if not args.output:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
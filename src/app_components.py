@@ -0,0 +1,537 @@
+"""
+Streamlit-Bausteine der Upload-Oberfläche.
+
+Hilfsfunktionen für Uploads, Upload-Aufträge, Analyse-Panels,
+Repository-Liste, Git-Fehler und die Lernseite. Sie liegen in einem eigenen
+Modul, damit Streamlit sie nur einmal importiert und bei jedem Rerun
+lediglich das Seitenskript ausführt.
+"""
+
+import os
+import time
+from contextlib import closing
+from datetime import datetime
+
+import requests
+import streamlit as st
+
+from shared.analysis_scheduler import hash_file_obj
+from shared.archive_reader import FILE, list_members
+from shared.github_cache import invalidate_token
+from shared.job_queue import CANCELLED, FAILED, QUEUED, RUNNING
+from shared.project_checks import ANALYSIS_PANELS, analyze_git_error
+from shared.repo_inventory import RepoInventory
+from shared.workspace_manager import archive_workspace_size, get_workspace_manager
+from upload_jobs import extract_uploaded_archive
+from uploader_utils import create_repo_and_push
+
+# Abfrageintervall laufender Upload-Aufträge (Sekunden)
+JOB_POLL_INTERVAL = 1.0
+
+
+def archive_file_list(uploaded_file):
+    """
+    Dateiliste eines hochgeladenen Archivs ohne Entpacken (tar: ein Durchgang
+    über den Datenstrom); ein gemeinsames Wurzelverzeichnis wird wie beim
+    Entpacken entfernt.
+    """
+    names = [
+        member.name
+        for member in list_members(uploaded_file)
+        if member.kind == FILE and not member.name.startswith("__MACOSX/")
+    ]
+
+    tops = {name.split("/", 1)[0] for name in names}
+    if len(tops) == 1 and all("/" in name for name in names):
+        names = [name.split("/", 1)[1] for name in names]
+    return names
+
+
+def render_stream(chunks, placeholder, min_interval=0.05):
+    """
+    Zeigt eine gestreamte Antwort fortlaufend im Platzhalter an und gibt den
+    vollständigen Text zurück. Bricht Streamlit den Lauf ab (Stop oder neue
+    Eingabe), wird der Generator geschlossen und damit die Verbindung beendet.
+    """
+    text, last_update = "", 0.0
+    with closing(chunks):
+        for chunk in chunks:
+            text += chunk
+            now = time.monotonic()
+            if now - last_update >= min_interval:
+                placeholder.markdown(text + "▌")
+                last_update = now
+    placeholder.markdown(text)
+    return text
+
+
+def get_upload_hash(uploaded_file):
+    """SHA-256 einer hochgeladenen Datei, einmal pro Upload berechnet"""
+    hashes = st.session_state.setdefault("upload_hashes", {})
+    upload_key = (
+        uploaded_file.name,
+        uploaded_file.size,
+        getattr(uploaded_file, "file_id", None),
+    )
+    if upload_key not in hashes:
+        hashes[upload_key] = hash_file_obj(uploaded_file)
+    return hashes[upload_key]
+
+
+def render_analysis_result(name, result):
+    """Stellt das Ergebnis einer KI-Analyse dar"""
+    if isinstance(result, dict) and result.get("error"):
+        st.error(f"❌ Analyse fehlgeschlagen: {result['error']}")
+        return
+
+    if name == "code_patterns":
+        if not result:
+            st.success("✅ Keine auffälligen Code-Muster gefunden")
+        for item in result[:50]:
+            st.write(
+                f"- `{item['file']}:{item['line']}` **{item['pattern']}** – {item['suggestion']}"
+            )
+        if len(result) > 50:
+            st.write(f"... und {len(result) - 50} weitere Funde")
+
+    elif name == "dependencies":
+        if result.get("database") is None:
+            st.caption(
+                "ℹ️ Keine lokale OSV-Datenbank gefunden (OSV_DB_PATH) – "
+                "Sicherheitsprüfung übersprungen."
+            )
+        for vuln in result["vulnerabilities"]:
+            hint = " (im erlaubten Versionsbereich)" if vuln.get("possible") else ""
+            st.error(
+                f"🚨 {vuln['package']}{hint}: {vuln['description']} "
+                f"[{vuln.get('id', '')}, {vuln['severity']}] – `{vuln.get('file', '')}`"
+            )
+        for rec in result["recommendations"]:
+            st.info(f"💡 {rec.get('package', rec.get('current'))}: {rec['suggestion']}")
+        if not result["vulnerabilities"] and not result["recommendations"]:
+            st.success("✅ Keine Auffälligkeiten bei den Abhängigkeiten")
+
+    elif name == "documentation":
+        if result["setup"]:
+            st.markdown("**Setup**")
+            st.markdown(result["setup"])
+        if result["api"]:
+            st.markdown("**API**")
+            for item in result["api"][:50]:
+                st.markdown(f"- `{item.get('signature', item['function'])}` – {item['description']}")
+        for example in result["examples"][:10]:
+            st.markdown(f"**Beispiel:** {example['name']}")
+            st.code(example["code"], language="python")
+
+    elif name == "structure":
+        for rec in result["recommendations"]:
+            st.write(f"- {rec}")
+        for practice in result["best_practices"]:
+            st.write(f"- {practice}")
+
+
+def render_analysis_panels(scheduler, zip_hash, uploaded_zip):
+    """
+    Zeigt ein Panel pro KI-Analyse. Vorhandene Ergebnisse stammen aus dem
+    Session-Cache; fehlende werden erst auf Anforderung berechnet.
+    """
+    st.subheader("🧠 KI-Analyse-Ergebnisse")
+    for name, (label, _) in ANALYSIS_PANELS.items():
+        with st.expander(label, expanded=scheduler.has_result(zip_hash, name)):
+            if not scheduler.has_result(zip_hash, name):
+                st.caption("Analyse wurde noch nicht ausgeführt.")
+                if not st.button("▶️ Analyse starten", key=f"run_analysis_{name}"):
+                    continue
+                with st.spinner(f"{label} wird analysiert..."):
+                    with get_workspace_manager().acquire(
+                        archive_workspace_size(uploaded_zip)
+                    ) as workspace:
+                        project_dir = extract_uploaded_archive(uploaded_zip, workspace.path)
+                        scheduler.run(zip_hash, name, project_dir)
+            render_analysis_result(name, scheduler.results(zip_hash)[name])
+
+
+def render_upload_result(result):
+    """Stellt das Ergebnis eines abgeschlossenen Upload-Auftrags dar"""
+    project_type = result["project_type"]
+    if project_type:
+        if len(project_type["languages"]) > 1:
+            st.info(
+                "🧩 Mehrsprachiges Projekt: "
+                + ", ".join(
+                    f"{lang['type']} ({lang['share']:.0%})" for lang in project_type["languages"]
+                )
+            )
+        if len(project_type["workspaces"]) > 1:
+            st.info(
+                f"📂 {len(project_type['workspaces'])} Teilprojekte: "
+                + ", ".join(f"`{ws['path']}` ({ws['type']})" for ws in project_type["workspaces"])
+            )
+
+    description = result["description"]
+    if isinstance(description, dict):
+        st.warning(f"⚠️ KI-Analyse fehlgeschlagen: {description['error']}")
+    elif description:
+        with st.expander("🧠 Projektbeschreibung", expanded=True):
+            st.markdown(description)
+
+    security_issues = result["security_issues"]
+    if security_issues:
+        with st.expander(f"🔐 {len(security_issues)} mögliche Geheimnisse gefunden", expanded=True):
+            for issue in security_issues[:100]:
+                st.write(
+                    f"- `{issue['file']}:{issue['line']}:{issue['column']}` "
+                    f"{issue['message']} ({issue['severity']}): `{issue['secret']}`"
+                )
+            if len(security_issues) > 100:
+                st.write(f"... und {len(security_issues) - 100} weitere Funde")
+
+    validation = result["validation"]
+    if validation:
+        with st.expander("🔍 Analyse", expanded=not validation["valid"]):
+            for msg in validation["messages"]:
+                st.write(msg)
+            if validation["test_results"]:
+                st.code(validation["test_results"])
+
+    appimage = result["appimage"]
+    if appimage and appimage["success"]:
+        st.success("✅ AppImage erfolgreich hochgeladen!")
+        st.markdown(f"### [AppImage herunterladen]({appimage['download_url']})")
+    elif appimage:
+        st.error(f"❌ {appimage['message']}")
+
+    if result["uploaded"]:
+        st.success("✅ Projekt erfolgreich hochgeladen!")
+        st.markdown(f"### [Repository auf GitHub öffnen]({result['repo_url']})")
+
+
+def render_upload_failure(error_message, entry, retry):
+    """Fehlermeldung eines Upload-Auftrags mit Lösungsvorschlägen"""
+    st.error(f"❌ Fehler: {error_message}")
+
+    # Git-Fehleranalyse - prüfe spezifisch auf Git-Probleme
+    if not any(
+        keyword in error_message.lower() for keyword in ["git", "push", "repository", "remote"]
+    ):
+        st.warning(
+            "❓ Allgemeiner Fehler - Bitte überprüfen Sie Ihre Eingaben und versuchen Sie es erneut."
+        )
+        return
+
+    solutions = analyze_git_error(error_message)
+    if not solutions:
+        st.warning("❓ Keine automatische Lösung verfügbar. Mögliche Ursachen:")
+        st.markdown(
+            """
+        - **GitHub Token:** Überprüfen Sie die Berechtigung ('repo' Scope erforderlich)
+        - **Repository-Name:** Möglicherweise bereits verwendet oder ungültig
+        - **Netzwerk:** Verbindungsprobleme zu GitHub
+        - **Git-Konfiguration:** Lokale Git-Einstellungen
+        """
+        )
+        return
+
+    st.warning("🔧 Mögliche Lösungen gefunden:")
+    for i, solution in enumerate(solutions):
+        st.info(f"**Problem:** {solution['problem']}")
+        st.info(f"**Lösung:** {solution['solution']}")
+        if retry is None:
+            continue
+        # Neuversuch unter neuem Namen ohne auto_init, um Konflikte zu vermeiden
+        if solution["action"] == "git_reset":
+            if st.button(f"🔄 Repository zurücksetzen #{i+1}", key=f"reset_{entry['id']}_{i}"):
+                retry(entry, repo_name=entry["repo_name"] + "-fixed", auto_init=False)
+        elif solution["action"] == "force_push":
+            if st.button(
+                f"🔄 Mit verbesserter Methode versuchen #{i+1}",
+                key=f"improved_{entry['id']}_{i}",
+            ):
+                retry(entry, repo_name=entry["repo_name"] + "-v2", auto_init=False)
+
+
+def render_upload_jobs(jobs, entries, store, retry=None):
+    """
+    Zeigt die Upload-Aufträge dieser Sitzung. ``entries`` ist die Liste in
+    ``st.session_state``; nur dort gemerkte Aufträge sind sichtbar, andere
+    Sitzungen sehen sie nicht. Analyseergebnisse fertiger Aufträge werden
+    einmalig in ``store`` übernommen. Gibt True zurück, solange ein Auftrag
+    wartet oder läuft.
+    """
+    active = False
+    for entry in reversed(list(entries)):
+        job = jobs.get(entry["id"])
+        if job is None:
+            # Aus der Registry verdrängt
+            entries.remove(entry)
+            continue
+
+        st.markdown(f"#### 🚀 `{entry['repo_name']}`")
+        if job["status"] in (QUEUED, RUNNING):
+            active = True
+            st.progress(job["progress"])
+            st.caption(job["log"][-1] if job["log"] else "⏳ Wartet auf einen freien Platz...")
+            if job["cancel_requested"]:
+                st.caption("⏹️ Abbruch angefordert – der aktuelle Schritt wird noch beendet.")
+            elif st.button("⏹️ Abbrechen", key=f"cancel_{entry['id']}"):
+                jobs.cancel(entry["id"])
+        elif job["status"] == CANCELLED:
+            st.warning("⏹️ Upload abgebrochen")
+        elif job["status"] == FAILED:
+            render_upload_failure(job["error"], entry, retry)
+        else:
+            result = job["result"]
+            if not entry.get("merged"):
+                store[entry["zip_hash"]] = dict(
+                    store.get(entry["zip_hash"], {}), **result["analyses"]
+                )
+                entry["merged"] = True
+            render_upload_result(result)
+            if not result["uploaded"]:
+                st.error("❌ Bitte Probleme beheben")
+                if retry is not None and st.button(
+                    "⚠️ Trotz Fehler fortfahren", key=f"proceed_{entry['id']}"
+                ):
+                    retry(entry, ignore_validation=True)
+
+        if job["log"]:
+            with st.expander("📜 Protokoll"):
+                st.code("\n".join(job["log"]))
+        if job["status"] not in (QUEUED, RUNNING) and st.button(
+            "🗑️ Ausblenden", key=f"hide_{entry['id']}"
+        ):
+            entries.remove(entry)
+            st.experimental_rerun()
+    return active
+
+
+def load_repositories(github_token, github_user, refresh=False, full=False):
+    """
+    Lädt Repositories aus dem lokalen Inventar-Cache; bei ``refresh`` (oder
+    leerem Cache) inkrementell bzw. bei ``full`` vollständig über die GitHub API
+    """
+    if not github_token or not github_user:
+        st.warning("⚠️ Bitte gib GitHub-Token und Benutzername ein.")
+        return None
+
+    inventory = RepoInventory(github_token)
+    repos = None if refresh or full else inventory.cached()
+
+    if repos is None:
+        try:
+            with st.spinner("Lade Repositories..."):
+                repos, changed = inventory.refresh(full=full)
+        except RuntimeError as e:
+            if "(401)" in str(e):
+                invalidate_token(github_token)
+            st.error(f"❌ Fehler beim Laden: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            st.error(f"❌ Netzwerkfehler: {e}")
+            return None
+        st.success(
+            f"✅ {len(repos)} Repositories, {changed} neu oder geändert "
+            f"({inventory.requests_made} API-Anfragen)"
+        )
+
+    fetched_at = datetime.fromtimestamp(inventory.fetched_at).strftime("%d.%m.%Y %H:%M")
+    st.caption(f"Stand: {fetched_at}")
+
+    # Filter nur die Repos des gewünschten Users
+    user_repos = [repo for repo in repos if repo["owner"]["login"] == github_user]
+    st.info(f"📊 Davon {len(user_repos)} Repositories von {github_user}")
+    return user_repos
+
+
+def handle_git_error(
+    error_message,
+    project_dir,
+    github_token,
+    github_user,
+    repo_name,
+    repo_private,
+    add_license,
+    add_gitignore,
+    auto_init,
+):
+    """Behandelt Git-Fehler und bietet Lösungsmöglichkeiten an"""
+    solutions = analyze_git_error(error_message)
+
+    if solutions:
+        st.warning("🔧 Mögliche Lösungen gefunden:")
+        for solution in solutions:
+            st.info(f"Problem: {solution['problem']}")
+            st.info(f"Lösung: {solution['solution']}")
+
+            if solution["action"] == "git_reset":
+                btn_text = "🔄 Repository zurücksetzen"
+                if st.button(btn_text):
+                    with st.spinner("Reset läuft..."):
+                        try:
+                            # Git-Repository neu initialisieren
+                            cmd = f"cd {project_dir} && rm -rf .git"
+                            cmd += " && git init"
+                            os.system(cmd)
+
+                            # Repository neu erstellen
+                            repo_url = create_repo_and_push(
+                                github_token,
+                                github_user,
+                                repo_name,
+                                project_dir,
+                                private=repo_private,
+                                license_template=(
+                                    None if add_license == "Keine" else add_license
+                                ),
+                                gitignore_template=(
+                                    None if add_gitignore == "Keine" else add_gitignore
+                                ),
+                                auto_init=auto_init,
+                            )
+                            msg = "✅ Repository erfolgreich zurückgesetzt!"
+                            st.success(msg)
+
+                            link = "### [Repository auf GitHub öffnen]"
+                            link += f"({repo_url})"
+                            st.markdown(link)
+                        except Exception as reset_error:
+                            err = "❌ Fehler beim Reset: "
+                            err += str(reset_error)
+                            st.error(err)
+
+            elif solution["action"] == "force_push":
+                if st.button("⚠️ Force-Push"):
+                    with st.spinner("Force-Push läuft..."):
+                        try:
+                            cmd = f"cd {project_dir}"
+                            cmd += " && git push -f origin main"
+                            os.system(cmd)
+                            st.success("✅ Force-Push erfolgt!")
+                        except Exception as force_error:
+                            err = "❌ Force-Push Fehler: "
+                            err += str(force_error)
+                            st.error(err)
+    else:
+        msg = "❓ Keine automatische Lösung. Bitte überprüfen:"
+        st.warning(msg)
+        st.markdown(
+            """
+        - GitHub Token Berechtigungen
+        - Repository-Name (Verfügbarkeit)
+        - Netzwerkverbindung
+        - GitHub API Status
+        """
+        )
+
+
+def show_learning_content():
+    """Zeigt Lerninhalte und Hilfe an"""
+    st.title("📚 Lern & Hilfe")
+
+    # Git & GitHub Grundlagen
+    with st.expander("🌱 Git & GitHub Grundlagen", expanded=True):
+        st.markdown(
+            """
+        ### Was ist Git?
+        Git ist ein **Versionskontrollsystem**, das dir hilft:
+        - Änderungen an deinem Code zu verfolgen
+        - Mit anderen zusammenzuarbeiten
+        - Frühere Versionen wiederherzustellen
+
+        ### Was ist GitHub?
+        GitHub ist eine **Online-Plattform**, die:
+        - Deine Git-Repositories hostet
+        - Zusammenarbeit ermöglicht
+        - Issues, Pull Requests und mehr bietet
+        """
+        )
+
+    # Repository-Einstellungen erklärt
+    with st.expander("🔧 Repository-Einstellungen erklärt"):
+        st.markdown(
+            """
+        ### Repository-Einstellungen
+        1. **Privates Repository**:
+           - Nur du und eingeladene Personen können es sehen
+           - Gut für persönliche oder sensible Projekte
+
+        2. **README automatisch erstellen**:
+           - README.md ist die "Visitenkarte" deines Projekts
+           - Beschreibt, was dein Projekt macht
+           - Erklärt, wie man es nutzt
+
+        3. **Lizenz**:
+           - MIT: Sehr permissiv, erlaubt fast alles
+           - Apache: Gut für größere Projekte
+           - GPL: Erzwingt Open-Source
+
+        4. **.gitignore**:
+           - Verhindert, dass bestimmte Dateien hochgeladen werden
+           - Wichtig für temporäre Dateien und Geheimnisse
+        """
+        )
+
+    # Best Practices
+    with st.expander("✨ Best Practices"):
+        st.markdown(
+            """
+        ### Repository Best Practices
+
+        1. **Gute README schreiben**
+           - Projektbeschreibung
+           - Installation & Nutzung
+           - Beispiele
+
+        2. **Saubere Struktur**
+           - Logische Ordnerstruktur
+           - Wichtige Dateien im Wurzelverzeichnis
+           - Dokumentation in `docs/`
+
+        3. **Sicherheit**
+           - Keine Passwörter committen
+           - .env Dateien in .gitignore
+           - Sichere Abhängigkeiten
+        """
+        )
+
+    # Häufige Probleme
+    with st.expander("❓ Häufige Probleme & Lösungen"):
+        st.markdown(
+            """
+        ### Typische Probleme
+
+        1. **Push wird abgelehnt**
+           - Repository existiert bereits
+           - Keine Schreibrechte
+           - Konflikte mit Remote
+
+        2. **Authentifizierung schlägt fehl**
+           - Token abgelaufen
+           - Falsche Berechtigungen
+           - Token nicht korrekt kopiert
+
+        3. **Tests schlagen fehl**
+           - Abhängigkeiten fehlen
+           - Falsches Python/Node.js Version
+           - Fehler im Code
+        """
+        )
+
+    # Interaktive Tipps
+    with st.expander("💡 Hilfreiche Tipps"):
+        tip_index = st.session_state.get("tip_index", 0)
+        tips = [
+            "Committe regelmäßig kleine Änderungen statt selten große",
+            "Nutze aussagekräftige Commit-Nachrichten",
+            "Teste dein Projekt lokal bevor du pushst",
+            "Halte deine Abhängigkeiten aktuell",
+            "Dokumentiere während der Entwicklung",
+            "Nutze Branches für neue Features",
+            "Mache Backups wichtiger Daten",
+            "Überprüfe die GitHub Actions Status",
+        ]
+
+        st.info(f"**Tipp des Tages:** {tips[tip_index]}")
+        if st.button("🎲 Neuer Tipp"):
+            st.session_state.tip_index = (tip_index + 1) % len(tips)
+            st.experimental_rerun()
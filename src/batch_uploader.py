@@ -1,6 +1,4 @@
 import streamlit as st
-import zipfile
-import tempfile
 import os
 import sys
 import time
@@ -12,7 +10,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from uploader_utils import create_repo_and_push
 from dotenv import load_dotenv
-from shared.generate_readme import generate_readme
+from shared.offline_summary import generate_offline_readme
+from shared.archive_reader import UPLOAD_TYPES, strip_archive_suffix
+from shared.workspace_manager import archive_workspace_size, get_workspace_manager
+from upload_jobs import extract_uploaded_archive
 from shared.gpt_analysis_github_copilot import analyze_project_with_github_copilot
 
 # .env laden
@@ -45,7 +46,7 @@ with col2:
 
 # Batch-Upload
 uploaded_files = st.file_uploader("Mehrere ZIP-Dateien auswählen", 
-                                 type="zip", accept_multiple_files=True)
+                                 type=UPLOAD_TYPES, accept_multiple_files=True)
 
 if uploaded_files and github_token and github_user:
     # Vorschau der zu erstellenden Repositories
@@ -53,7 +54,7 @@ if uploaded_files and github_token and github_user:
     
     preview_data = []
     for i, file in enumerate(uploaded_files):
-        repo_name = file.name.replace(".zip", "").replace(" ", "-")
+        repo_name = strip_archive_suffix(file.name).replace(" ", "-")
         preview_data.append({
             "Nr.": i+1,
             "ZIP-Datei": file.name,
@@ -70,27 +71,18 @@ if uploaded_files and github_token and github_user:
         results = []
         
         for i, file in enumerate(uploaded_files):
-            repo_name = file.name.replace(".zip", "").replace(" ", "-")
+            repo_name = strip_archive_suffix(file.name).replace(" ", "-")
             status_text.text(f"Verarbeite {file.name} ({i+1}/{len(uploaded_files)})...")
             
             try:
-                with tempfile.TemporaryDirectory() as tmpdir:
+                # Platz für Archiv und entpackten Inhalt vorab reservieren
+                with get_workspace_manager().acquire(archive_workspace_size(file)) as workspace:
                     # ZIP speichern und entpacken
-                    zip_path = os.path.join(tmpdir, file.name)
-                    with open(zip_path, "wb") as f:
-                        f.write(file.read())
-                    
-                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                        zip_ref.extractall(tmpdir)
-                    
-                    # Projektverzeichnis ermitteln
-                    entries = os.listdir(tmpdir)
-                    dirs = [d for d in entries if os.path.isdir(os.path.join(tmpdir, d)) and d != "__MACOSX"]
-                    project_dir = os.path.join(tmpdir, dirs[0]) if dirs else tmpdir
+                    project_dir = extract_uploaded_archive(file, workspace.path)
                     
                     # README generieren
                     if auto_init:
-                        generated = generate_readme(os.listdir(project_dir))
+                        generated = generate_offline_readme(project_dir)
                         with open(os.path.join(project_dir, "README.md"), "w") as f:
                             f.write(generated)
                     
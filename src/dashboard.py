@@ -1,11 +1,8 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
 import requests
-import matplotlib.pyplot as plt
-import altair as alt
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Streamlit Konfiguration
 st.set_page_config(page_title="GitHub Uploader Dashboard", layout="wide")
@@ -15,6 +12,9 @@ st.title("📊 GitHub Uploader Dashboard")
 from dotenv import load_dotenv
 load_dotenv()
 
+from shared.repo_inventory import RepoInventory
+from shared.upload_stats import HISTORY_FILE, count_since, load_stats, rollup, success_rate
+
 # Voreinstellungen
 default_token = os.getenv("GITHUB_TOKEN")
 default_user = os.getenv("GITHUB_USERNAME")
@@ -32,43 +32,43 @@ with st.sidebar:
 
 # Hauptbereich
 if github_token and github_user:
+    # Diagrammbibliotheken erst laden, wenn das Dashboard Daten anzeigt
+    import pandas as pd
+    import altair as alt
+
     # Tabs für verschiedene Ansichten
     tab1, tab2, tab3, tab4 = st.tabs(["📈 Übersicht", "🔍 Repository-Liste", "📜 Upload-Historie", "⚙️ Verwaltung"])
     
     with tab1:
         st.header("📈 Dashboard-Übersicht")
         
-        # Upload-Historie laden
-        history_file = "upload_history.json"
-        if os.path.exists(history_file):
+        # Vorberechnete Statistik laden (liest die Historie nur bei Bedarf)
+        if os.path.exists(HISTORY_FILE):
             try:
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
-                
-                # Statistiken berechnen
-                total_repos = len(history)
-                recent_repos = sum(1 for item in history if datetime.fromisoformat(item['timestamp']) > datetime.now() - timedelta(days=7))
-                success_rate = sum(1 for item in history if item['status'] == 'success') / total_repos if total_repos > 0 else 0
+                stats = load_stats()
                 
                 # Statistik-Karten
                 col1, col2, col3 = st.columns(3)
-                col1.metric("Gesamt-Repositories", total_repos)
-                col2.metric("Letzte 7 Tage", recent_repos)
-                col3.metric("Erfolgsrate", f"{success_rate:.1%}")
+                col1.metric("Gesamt-Repositories", stats["success"])
+                col2.metric("Letzte 7 Tage", count_since(stats, 7))
+                col3.metric("Erfolgsrate", f"{success_rate(stats):.1%}")
                 
                 # Zeitverlauf-Diagramm
                 st.subheader("Repository-Erstellungen im Zeitverlauf")
+                period_labels = {"Tag": "day", "Woche": "week", "Monat": "month"}
+                period = st.radio("Zeitraum", list(period_labels), horizontal=True)
                 
-                # Daten für Chart vorbereiten
-                df = pd.DataFrame(history)
-                df['date'] = pd.to_datetime(df['timestamp']).dt.date
-                daily_counts = df.groupby('date').size().reset_index(name='count')
+                # Daten für Chart aus den vorberechneten Buckets
+                buckets = pd.DataFrame(
+                    rollup(stats, period_labels[period]),
+                    columns=['bucket', 'success', 'failure']
+                )
                 
                 # Altair Chart
-                chart = alt.Chart(daily_counts).mark_line(point=True).encode(
-                    x='date:T',
-                    y='count:Q',
-                    tooltip=['date:T', 'count:Q']
+                chart = alt.Chart(buckets).mark_line(point=True).encode(
+                    x=alt.X('bucket:O', title=period),
+                    y=alt.Y('success:Q', title='Erfolgreiche Uploads'),
+                    tooltip=['bucket:O', 'success:Q', 'failure:Q']
                 ).properties(height=300)
                 
                 st.altair_chart(chart, use_container_width=True)
@@ -81,37 +81,45 @@ if github_token and github_user:
     with tab2:
         st.header("🔍 Repository-Liste")
         
-        if st.button("🔄 Repositories laden"):
-            with st.spinner("Lade Repositories..."):
-                headers = {"Authorization": f"token {github_token}"}
-                response = requests.get(f"https://api.github.com/users/{github_user}/repos?per_page=100", headers=headers)
-                
-                if response.status_code == 200:
-                    repos = response.json()
-                    
-                    # Daten für Tabelle vorbereiten
-                    repo_data = []
-                    for repo in repos:
-                        repo_data.append({
-                            "Name": repo['name'],
-                            "Beschreibung": repo['description'] or "",
-                            "Erstellt am": repo['created_at'],
-                            "Sprache": repo['language'] or "Unbekannt",
-                            "Sichtbarkeit": "Privat" if repo['private'] else "Öffentlich",
-                            "URL": repo['html_url']
-                        })
-                    
-                    # Tabelle anzeigen
-                    df = pd.DataFrame(repo_data)
-                    st.dataframe(df)
-                    
-                    # Sprachverteilung
-                    st.subheader("Sprachverteilung")
-                    lang_counts = df['Sprache'].value_counts()
-                    st.bar_chart(lang_counts)
-                    
-                else:
-                    st.error(f"Fehler beim Laden der Repositories: {response.status_code}")
+        col1, col2 = st.columns(2)
+        refresh = col1.button("🔄 Aktualisieren")
+        full_refresh = col2.button("♻️ Vollständig neu laden")
+
+        # Inventar aus dem lokalen Cache; API nur bei Aktualisierung oder leerem Cache
+        inventory = RepoInventory(github_token)
+        repos = None if refresh or full_refresh else inventory.cached()
+        if repos is None:
+            try:
+                with st.spinner("Lade Repositories..."):
+                    repos, changed = inventory.refresh(full=full_refresh)
+                st.success(f"✅ {len(repos)} Repositories, {changed} neu oder geändert")
+            except (RuntimeError, requests.exceptions.RequestException) as e:
+                st.error(f"Fehler beim Laden der Repositories: {e}")
+
+        if repos is not None:
+            st.caption(f"Stand: {datetime.fromtimestamp(inventory.fetched_at):%d.%m.%Y %H:%M}")
+            repos = [repo for repo in repos if repo['owner']['login'] == github_user]
+
+            # Daten für Tabelle vorbereiten
+            repo_data = []
+            for repo in repos:
+                repo_data.append({
+                    "Name": repo['name'],
+                    "Beschreibung": repo['description'] or "",
+                    "Erstellt am": repo['created_at'],
+                    "Sprache": repo['language'] or "Unbekannt",
+                    "Sichtbarkeit": "Privat" if repo['private'] else "Öffentlich",
+                    "URL": repo['html_url']
+                })
+            
+            # Tabelle anzeigen
+            df = pd.DataFrame(repo_data)
+            st.dataframe(df)
+            
+            # Sprachverteilung
+            st.subheader("Sprachverteilung")
+            lang_counts = df['Sprache'].value_counts()
+            st.bar_chart(lang_counts)
     
     with tab3:
         st.header("📜 Upload-Historie")
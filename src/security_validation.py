@@ -6,6 +6,9 @@ import re
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from shared.archive_reader import FORMAT_LABELS, archive_format, require_format
+from shared.zip_extract import ExtractionError
+
 # Konfigurierbare Limits je nach Anwendungsfall
 UPLOAD_LIMITS = {
     "web_upload": {
@@ -309,6 +312,41 @@ def validate_zip_file(zip_path, upload_type="web_upload", user_id=None):
         return False, f"Fehler bei der Validierung: {str(e)}"
 
 
+def validate_archive_file(archive_path, upload_type="web_upload", user_id=None):
+    """
+    Validiert ein Upload-Archiv beliebigen Formats. ZIP-Archive werden über
+    das Zentralverzeichnis vollständig geprüft (``validate_zip_file``).
+    tar- und 7z-Archive werden hier nur auf Größe, Format und Rate Limit
+    geprüft; Dateinamen und Limits prüft ``extract_archive`` beim Entpacken.
+    Gibt (is_valid, message) zurück.
+    """
+    archive_type = archive_format(archive_path)
+    if archive_type in (None, "zip"):
+        return validate_zip_file(archive_path, upload_type, user_id)
+
+    limits = UPLOAD_LIMITS.get(upload_type, UPLOAD_LIMITS["web_upload"])
+    label = FORMAT_LABELS[archive_type]
+
+    if user_id:
+        rate_ok, rate_msg = check_rate_limit(user_id, upload_type)
+        if not rate_ok:
+            return False, rate_msg
+
+    archive_size = os.path.getsize(archive_path)
+    if archive_size > limits["max_zip_size"]:
+        return (
+            False,
+            f"{label}-Archiv ist zu groß (max. {limits['max_zip_size']/1024/1024:.1f} MB)",
+        )
+
+    try:
+        require_format(archive_type)
+    except ExtractionError as e:
+        return False, str(e)
+
+    return True, f"{label}-Archiv angenommen (Inhalt wird beim Entpacken geprüft)"
+
+
 def scan_file_content(file_path, upload_type="web_upload"):
     """
     Scannt den Inhalt einer Datei auf verdächtige Muster.
@@ -0,0 +1,312 @@
+"""
+Lokale Schwachstellen-Datenbank im OSV-Format.
+
+Advisories werden aus einem OSV-Dump auf der Festplatte geladen (Verzeichnis
+mit JSON-Dateien, einzelne JSON-Datei oder ZIP-Archiv wie ``all.zip`` von
+osv.dev) und pro Ökosystem und Paket indiziert. Betroffene Versionsbereiche
+werden je Paket in sortierte, disjunkte Segmente zerlegt; eine Abfrage ist
+damit eine binäre Suche und kommt ohne Netzwerkzugriff aus.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Standardpfad des OSV-Dumps (überschreibbar per Umgebungsvariable)
+DEFAULT_DB_PATH = os.getenv("OSV_DB_PATH", "osv-db")
+
+# OSV-Ökosystemnamen
+PYPI = "PyPI"
+NPM = "npm"
+
+# Phasen nur als vollständiger Bezeichner ("c" in "canary" ist kein rc)
+_VERSION_RE = re.compile(
+    r"^\s*v?(?:(\d+)!)?(\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(dev|alpha|a|beta|b|c|rc|preview|pre)(?=[._\d-]|$)[-_.]?(\d*))?"
+    r"(?:[-_.]?(post|rev|r)(?=[._\d-]|$)[-_.]?(\d*))?"
+    r"(?:[-_.]?(dev)(?=[._\d-]|$)[-_.]?(\d*))?"
+)
+
+# SemVer-Vorabversionen: alphanumerisch (1.0.0-next.5) oder numerisch (1.0.0-0.3.7)
+_PRERELEASE_RE = re.compile(r"-([0-9A-Za-z]*[A-Za-z][0-9A-Za-z]*)(?:[-.]?(\d+))?")
+_NUMERIC_PRERELEASE_RE = re.compile(r"-(\d+)(?:\.[0-9A-Za-z-]+)*$")
+
+_PHASES = {
+    "dev": -4,
+    "a": -3,
+    "alpha": -3,
+    "b": -2,
+    "beta": -2,
+    "c": -1,
+    "rc": -1,
+    "pre": -1,
+    "preview": -1,
+}
+# Numerische Bezeichner liegen nach SemVer unter allen alphanumerischen
+_NUMERIC_PHASE = -5
+
+# Kleinster und größter möglicher Versionsschlüssel
+MIN_VERSION = (-1, (-1,), -9, 0, 0, 0)
+MAX_VERSION = (float("inf"),)
+
+_SEVERITY_NAMES = {
+    "critical": "critical",
+    "high": "high",
+    "moderate": "medium",
+    "medium": "medium",
+    "low": "low",
+}
+
+
+def version_key(version):
+    """
+    Wandelt eine Version (PEP 440 oder SemVer) in einen vergleichbaren Schlüssel um.
+    Nicht interpretierbare Versionen ergeben None.
+    """
+    match = _VERSION_RE.match(version or "")
+    if not match:
+        return None
+    epoch, release, phase, phase_num, post, post_num, dev, dev_num = match.groups()
+
+    parts = [int(p) for p in release.split(".")]
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+
+    # Reihenfolge: dev < Vorabversion < Final < post
+    phase_rank = _PHASES[phase] if phase else 0
+    if dev and not phase and not post:
+        phase_rank = _PHASES["dev"]
+    # Andere SemVer-Vorabversionen (1.0.0-next.5, 2.0.0-canary.1) liegen unter dem Release
+    rest = version[match.end() :].strip()
+    tag = _PRERELEASE_RE.match(rest)
+    numeric = _NUMERIC_PRERELEASE_RE.match(rest) if release.count(".") == 2 else None
+    if not (phase or post or dev):
+        if tag:
+            phase, phase_rank, phase_num = tag.group(1), _PHASES["pre"], tag.group(2)
+        elif numeric:
+            phase, phase_rank, phase_num = numeric.group(1), _NUMERIC_PHASE, numeric.group(1)
+    return (
+        int(epoch or 0),
+        tuple(parts),
+        phase_rank,
+        int(phase_num or 0),
+        int(post_num or 0) + 1 if post else 0,
+        -1 if dev and (phase or post) else 0,
+    )
+
+
+def normalize_name(ecosystem, name):
+    """Normalisiert Paketnamen (PyPI nach PEP 503)"""
+    name = name.strip()
+    if ecosystem == PYPI:
+        return re.sub(r"[-_.]+", "-", name).lower()
+    if ecosystem == NPM:
+        return name.lower()
+    return name
+
+
+def _severity(advisory):
+    specific = advisory.get("database_specific") or {}
+    severity = str(specific.get("severity", "")).lower()
+    if severity in _SEVERITY_NAMES:
+        return _SEVERITY_NAMES[severity]
+    for affected in advisory.get("affected", []):
+        severity = str((affected.get("ecosystem_specific") or {}).get("severity", "")).lower()
+        if severity in _SEVERITY_NAMES:
+            return _SEVERITY_NAMES[severity]
+    return "unknown"
+
+
+def _intervals(ranges):
+    """Erzeugt halboffene Intervalle [Start, Ende) aus OSV-Range-Events"""
+    for version_range in ranges:
+        if version_range.get("type") not in ("ECOSYSTEM", "SEMVER"):
+            continue
+        start = None
+        for event in version_range.get("events", []):
+            if "introduced" in event:
+                introduced = event["introduced"]
+                start = MIN_VERSION if introduced == "0" else version_key(introduced)
+            elif start is not None and ("fixed" in event or "last_affected" in event):
+                if "fixed" in event:
+                    end = version_key(event["fixed"])
+                else:
+                    last = version_key(event["last_affected"])
+                    # Direkter Nachfolger: schließt last_affected selbst mit ein
+                    end = last + (1,) if last else None
+                if end is not None:
+                    yield start, end
+                start = None
+        if start is not None:
+            yield start, MAX_VERSION
+
+
+class _PackageIndex:
+    """Disjunkte Versionssegmente eines Pakets mit den jeweils betroffenen Advisories"""
+
+    def __init__(self):
+        self.intervals = []
+        self.exact = {}
+        self.points = []
+        self.covers = []
+
+    def add(self, advisory_id, ranges, versions):
+        for start, end in _intervals(ranges):
+            if start is not None and start < end:
+                self.intervals.append((start, end, advisory_id))
+        for version in versions:
+            self.exact.setdefault(version, set()).add(advisory_id)
+
+    def build(self):
+        """Zerlegt alle Intervalle in sortierte Segmente [points[i], points[i+1])"""
+        self.points = sorted({p for start, end, _ in self.intervals for p in (start, end)})
+        covers = [set() for _ in self.points]
+        for start, end, advisory_id in self.intervals:
+            first = bisect.bisect_left(self.points, start)
+            last = bisect.bisect_left(self.points, end)
+            for i in range(first, last):
+                covers[i].add(advisory_id)
+        self.covers = [frozenset(c) for c in covers]
+        self.intervals = []
+
+    def lookup(self, version):
+        """Advisory-IDs, die eine konkrete Version betreffen"""
+        found = set(self.exact.get(version, ()))
+        key = version_key(version)
+        if key is not None:
+            i = bisect.bisect_right(self.points, key) - 1
+            if i >= 0:
+                found |= self.covers[i]
+        return found
+
+    def lookup_range(self, low, high):
+        """Advisory-IDs, die irgendeine Version im Bereich [low, high) betreffen"""
+        found = set()
+        first = max(bisect.bisect_right(self.points, low) - 1, 0)
+        last = bisect.bisect_left(self.points, high)
+        for i in range(first, min(last, len(self.covers))):
+            found |= self.covers[i]
+        return found
+
+
+class AdvisoryDatabase:
+    """In-Memory-Index über OSV-Advisories, gruppiert nach Ökosystem und Paket"""
+
+    def __init__(self):
+        self.advisories = {}
+        self._packages = {}
+        self._built = False
+
+    def add(self, advisory):
+        """Fügt ein OSV-Advisory (dict) hinzu"""
+        advisory_id = advisory.get("id")
+        if not advisory_id or advisory.get("withdrawn"):
+            return
+        self.advisories[advisory_id] = {
+            "id": advisory_id,
+            "aliases": advisory.get("aliases", []),
+            "summary": advisory.get("summary") or advisory.get("details", "")[:200],
+            "severity": _severity(advisory),
+        }
+        for affected in advisory.get("affected", []):
+            package = affected.get("package") or {}
+            ecosystem = package.get("ecosystem", "").split(":")[0]
+            if not ecosystem or not package.get("name"):
+                continue
+            key = (ecosystem, normalize_name(ecosystem, package["name"]))
+            self._packages.setdefault(key, _PackageIndex()).add(
+                advisory_id, affected.get("ranges", []), affected.get("versions", [])
+            )
+        self._built = False
+
+    def build(self):
+        for package_index in self._packages.values():
+            package_index.build()
+        self._built = True
+
+    def _index(self, ecosystem, name):
+        if not self._built:
+            self.build()
+        return self._packages.get((ecosystem, normalize_name(ecosystem, name)))
+
+    def lookup(self, ecosystem, name, version):
+        """Advisories, die ``name==version`` betreffen, sortiert nach ID"""
+        package_index = self._index(ecosystem, name)
+        if package_index is None:
+            return []
+        return [self.advisories[i] for i in sorted(package_index.lookup(version))]
+
+    def lookup_range(self, ecosystem, name, low=None, high=None):
+        """Advisories, die mindestens eine Version im Bereich [low, high) betreffen"""
+        package_index = self._index(ecosystem, name)
+        if package_index is None:
+            return []
+        found = package_index.lookup_range(low or MIN_VERSION, high or MAX_VERSION)
+        return [self.advisories[i] for i in sorted(found)]
+
+    def __len__(self):
+        return len(self.advisories)
+
+
+def _iter_documents(path):
+    """Liefert alle JSON-Dokumente eines OSV-Dumps"""
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(".zip"):
+                    yield from _iter_documents(os.path.join(root, name))
+                elif name.endswith(".json"):
+                    with open(os.path.join(root, name), "rb") as f:
+                        yield f.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield archive.read(name)
+    else:
+        with open(path, "rb") as f:
+            yield f.read()
+
+
+def load_database(path):
+    """Lädt einen OSV-Dump und baut den Index auf"""
+    database = AdvisoryDatabase()
+    for document in _iter_documents(path):
+        try:
+            data = json.loads(document)
+        except ValueError as e:
+            logger.warning(f"Ungültiges Advisory in {path}: {e}")
+            continue
+        for advisory in data if isinstance(data, list) else [data]:
+            database.add(advisory)
+    database.build()
+    logger.info(f"{len(database)} Advisories aus {path} geladen")
+    return database
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def get_database(path=None):
+    """
+    Gibt die (gecachte) Datenbank für ``path`` zurück; None, wenn kein Dump
+    vorhanden ist. Der Cache wird bei Änderung des Dumps neu geladen.
+    """
+    path = path or DEFAULT_DB_PATH
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _loaded_lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load_database(path))
+            _loaded[path] = cached
+        return cached[1]
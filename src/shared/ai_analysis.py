@@ -0,0 +1,387 @@
+"""
+KI-Projektanalyse mit austauschbaren Anbietern, Prompt-Budget und Cache.
+
+Alle unterstützten Anbieter (GitHub Copilot, OpenRouter, OpenAI) sprechen das
+OpenAI-kompatible ``chat/completions``-Format und werden über eine gemeinsame
+Schnittstelle angesprochen. Dateilisten werden vor dem Senden deterministisch
+auf ein Token-Budget gekürzt (Manifeste zuerst, dann Verzeichnisübersicht,
+dann flache Dateien). Antworten werden pro Projekt-Fingerprint, Anbieter und
+Modell zwischengespeichert; parallele Anfragen sind prozessweit begrenzt.
+Antworten lassen sich auch gestreamt (Server-Sent Events) abrufen.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from shared.project_detection import ECOSYSTEMS
+
+logger = logging.getLogger(__name__)
+
+# Grobe Schätzung: ein Token entspricht etwa vier Zeichen
+CHARS_PER_TOKEN = 4
+
+# Token-Budget für die Dateiliste im Prompt
+DEFAULT_FILE_BUDGET = int(os.getenv("AI_FILE_BUDGET", "1500"))
+
+# Maximale Anzahl gleichzeitiger Anfragen an KI-Anbieter
+MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4"))
+
+DEFAULT_TIMEOUT = 60
+
+# Persistenter Antwort-Cache
+DEFAULT_CACHE_PATH = os.getenv("AI_CACHE_PATH", "ai_response_cache.json")
+CACHE_MAX_ENTRIES = 1000
+
+# Dateien, die das Projekt besonders gut beschreiben und immer im Prompt landen
+KEY_FILES = {
+    manifest for spec in ECOSYSTEMS.values() for manifest in spec["manifests"]
+} | {
+    "README.md",
+    "README.rst",
+    "Dockerfile",
+    "docker-compose.yml",
+    "Makefile",
+    "manage.py",
+    "app.py",
+    "main.py",
+    "index.html",
+}
+
+SYSTEM_PROMPT = "Du bist ein hilfsbereiter Projektanalyst."
+
+PROJECT_PROMPT = """Bitte beschreibe dieses Projekt basierend auf diesen Dateien:
+{files}
+
+Antworte mit:
+1. Kurzbeschreibung in 1–2 Sätzen
+2. Eine Liste mit max. 6 passenden Tags
+"""
+
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ChatCompletionProvider:
+    """Anbieter mit OpenAI-kompatiblem ``chat/completions``-Endpunkt"""
+
+    def __init__(self, name, url, api_key, model, headers=None, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.url = url
+        self.api_key = api_key
+        self.model = model
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _request(self, messages, max_tokens, temperature, stream=False):
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream" if stream else "application/json",
+        }
+        headers.update(self.headers)
+        payload = {"model": self.model, "messages": messages}
+        # None: Standardwert des Anbieters verwenden (Parameter nicht senden)
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if stream:
+            payload["stream"] = True
+        response = self.session.post(
+            self.url, headers=headers, json=payload, timeout=self.timeout, stream=stream
+        )
+        if response.status_code != 200:
+            try:
+                error = response.json()
+                message = error.get("message") or error.get("error", {}).get("message")
+            except (ValueError, AttributeError):
+                message = None
+            response.close()
+            raise RuntimeError(
+                f"{self.name} API-Fehler ({response.status_code}): "
+                f"{message or 'Unbekannter Fehler'}"
+            )
+        return response
+
+    def complete(self, messages, max_tokens=500, temperature=0.4):
+        """Sendet eine Anfrage und gibt den Antworttext zurück"""
+        with _request_slots:
+            response = self._request(messages, max_tokens, temperature)
+        return response.json()["choices"][0]["message"]["content"]
+
+    def stream(self, messages, max_tokens=500, temperature=0.4):
+        """
+        Liefert den Antworttext stückweise, sobald er eintrifft (Server-Sent Events).
+        Wird der Generator vorzeitig geschlossen, wird die Verbindung sofort beendet.
+        """
+        with _request_slots:
+            response = self._request(messages, max_tokens, temperature, stream=True)
+            try:
+                # Anbieter ohne Streaming-Unterstützung antworten mit vollständigem JSON
+                if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                    yield response.json()["choices"][0]["message"]["content"]
+                    return
+                for raw_line in response.iter_lines(chunk_size=None):
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        return
+                    choices = json.loads(data).get("choices") or []
+                    content = choices[0].get("delta", {}).get("content") if choices else None
+                    if content:
+                        yield content
+            finally:
+                response.close()
+
+
+def copilot_provider(api_key=None):
+    api_key = api_key or os.getenv("GITHUB_COPILOT_TOKEN")
+    if not api_key:
+        raise EnvironmentError(
+            "GITHUB_COPILOT_TOKEN nicht gesetzt in .env. "
+            "Registriere unter: https://github.com/copilot/chat"
+        )
+    return ChatCompletionProvider(
+        "GitHub Copilot",
+        "https://api.github.com/copilot_internal/v2/chat/completions",
+        api_key,
+        "gpt-4",
+    )
+
+
+def openrouter_provider(api_key=None, model=None):
+    api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        raise EnvironmentError("OPENROUTER_API_KEY nicht gesetzt in .env")
+    return ChatCompletionProvider(
+        "OpenRouter",
+        "https://openrouter.ai/api/v1/chat/completions",
+        api_key,
+        model or os.getenv("OPENROUTER_MODEL", "mistral/mistral-7b-instruct:free"),
+    )
+
+
+def openai_provider(api_key=None, model="gpt-4"):
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise EnvironmentError("OPENAI_API_KEY nicht gesetzt in .env")
+    return ChatCompletionProvider(
+        "OpenAI", "https://api.openai.com/v1/chat/completions", api_key, model
+    )
+
+
+PROVIDERS = {
+    "copilot": copilot_provider,
+    "openrouter": openrouter_provider,
+    "openai": openai_provider,
+}
+
+
+def get_provider(name=None):
+    """
+    Anbieter nach Name oder ``AI_PROVIDER``; ohne Angabe der erste konfigurierte.
+    """
+    name = name or os.getenv("AI_PROVIDER")
+    if name:
+        return PROVIDERS[name]()
+    for factory in PROVIDERS.values():
+        try:
+            return factory()
+        except EnvironmentError:
+            continue
+    raise EnvironmentError(
+        "Kein KI-Anbieter konfiguriert "
+        "(GITHUB_COPILOT_TOKEN, OPENROUTER_API_KEY oder OPENAI_API_KEY)"
+    )
+
+
+def summarize_file_list(paths, budget_tokens=DEFAULT_FILE_BUDGET):
+    """
+    Kürzt eine Dateiliste deterministisch auf ``budget_tokens``:
+    zuerst Schlüsseldateien (Manifeste, README, Einstiegspunkte), dann eine
+    Übersicht der obersten Verzeichnisse, dann Dateien nach Tiefe und Name.
+    """
+    paths = sorted(set(paths), key=lambda p: (p.count("/"), p))
+    full = "\n".join(paths)
+    if estimate_tokens(full) <= budget_tokens:
+        return full
+
+    lines, used, included = [], 0, set()
+
+    def add(line):
+        nonlocal used
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens:
+            return False
+        lines.append(line)
+        used += cost
+        return True
+
+    for path in paths:
+        if os.path.basename(path) in KEY_FILES and add(path):
+            included.add(path)
+
+    # Verzeichnisübersicht: Dateianzahl und häufigste Endungen
+    directories = OrderedDict()
+    for path in paths:
+        if "/" in path:
+            top = path.split("/", 1)[0]
+            directories.setdefault(top, Counter())[os.path.splitext(path)[1] or "(ohne)"] += 1
+    for top, extensions in sorted(directories.items(), key=lambda item: -sum(item[1].values())):
+        common = ", ".join(f"{ext}×{count}" for ext, count in extensions.most_common(3))
+        if not add(f"{top}/ ({sum(extensions.values())} Dateien: {common})"):
+            break
+
+    for path in paths:
+        if path not in included:
+            if not add(path):
+                break
+            included.add(path)
+
+    remaining = len(paths) - len(included)
+    if remaining:
+        lines.append(f"... und {remaining} weitere Dateien")
+    return "\n".join(lines)
+
+
+def project_fingerprint(paths, sizes=None):
+    """Stabiler Fingerprint einer Dateiliste (optional inklusive Dateigrößen)"""
+    sha256 = hashlib.sha256()
+    for path in sorted(paths):
+        sha256.update(path.encode("utf-8", "replace"))
+        if sizes is not None:
+            sha256.update(str(sizes.get(path, "")).encode())
+        sha256.update(b"\0")
+    return sha256.hexdigest()
+
+
+class ResponseCache:
+    """Persistenter LRU-Cache für KI-Antworten (JSON-Datei)"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._entries.update(json.load(f))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"KI-Cache {self.path} nicht lesbar: {e}")
+        return self._entries
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            entries = self._load()
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            if self.path:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+
+
+default_response_cache = ResponseCache()
+
+
+def _project_request(paths, provider, budget_tokens, sizes):
+    """Cache-Schlüssel und Nachrichten für die Analyse einer Dateiliste"""
+    files = summarize_file_list(paths, budget_tokens)
+    prompt = PROJECT_PROMPT.format(files=files)
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+    key = f"{provider.name}:{provider.model}:{project_fingerprint(paths, sizes)}:{prompt_hash}"
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    return key, messages
+
+
+def analyze_project(paths, provider=None, cache=None, budget_tokens=DEFAULT_FILE_BUDGET, sizes=None):
+    """
+    Kurzbeschreibung und Tags eines Projekts anhand seiner Dateiliste.
+    Identische Projekte (gleicher Fingerprint) werden nicht erneut angefragt.
+    """
+    provider = provider or get_provider()
+    cache = default_response_cache if cache is None else cache
+    key, messages = _project_request(paths, provider, budget_tokens, sizes)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    answer = provider.complete(messages, max_tokens=300)
+    cache.set(key, answer)
+    return answer
+
+
+def stream_project_analysis(
+    paths, provider=None, cache=None, budget_tokens=DEFAULT_FILE_BUDGET, sizes=None
+):
+    """
+    Wie ``analyze_project``, liefert die Antwort aber stückweise. Eine gecachte
+    Antwort kommt in einem Stück; nur vollständig empfangene Antworten werden
+    gecacht, ein Abbruch hinterlässt keinen Teil-Eintrag.
+    """
+    provider = provider or get_provider()
+    cache = default_response_cache if cache is None else cache
+    key, messages = _project_request(paths, provider, budget_tokens, sizes)
+
+    cached = cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for chunk in provider.stream(messages, max_tokens=300):
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, "".join(parts))
+
+
+def analyze_projects(projects, provider=None, cache=None, max_concurrency=MAX_CONCURRENCY):
+    """
+    Analysiert mehrere Projekte parallel (höchstens ``max_concurrency`` Anfragen).
+    ``projects`` bildet Namen auf Dateilisten ab; Fehler werden als
+    ``{"error": ...}`` zurückgegeben, statt den ganzen Batch abzubrechen.
+    """
+    provider = provider or get_provider()
+
+    def run(paths):
+        try:
+            return analyze_project(paths, provider=provider, cache=cache)
+        except Exception as e:
+            logger.warning(f"KI-Analyse fehlgeschlagen: {e}")
+            return {"error": str(e)}
+
+    if not projects:
+        return {}
+    names = list(projects)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(names)))) as executor:
+        results = executor.map(run, (projects[name] for name in names))
+        return dict(zip(names, results))
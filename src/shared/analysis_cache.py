@@ -0,0 +1,79 @@
+"""
+Gemeinsamer Ergebnis-Cache für dateibasierte Analysen.
+
+Einträge werden pro Analyse und Datei gespeichert und sind an Größe und
+Änderungszeit der Datei gebunden. Ändert sich die Datei, wird der Eintrag
+automatisch neu berechnet. Der Cache lebt auf Modulebene und übersteht damit
+auch Streamlit-Reruns.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# Maximale Anzahl Einträge, bevor die ältesten verdrängt werden
+DEFAULT_MAX_ENTRIES = 50000
+
+
+class AnalysisCache:
+    """Thread-sicherer LRU-Cache für Analyseergebnisse pro Datei"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def file_key(analyzer, file_path):
+        """Schlüssel aus Analyse, Pfad, Größe und Änderungszeit; None falls Datei fehlt"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (analyzer, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, key):
+        """Gibt ``(True, Wert)`` bei Treffer, sonst ``(False, None)`` zurück"""
+        if key is None:
+            return False, None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, analyzer, file_path, compute):
+        """Liefert das gecachte Ergebnis oder berechnet es mit ``compute(file_path)``"""
+        key = self.file_key(analyzer, file_path)
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute(file_path)
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Von allen Analysen gemeinsam genutzte Instanz
+default_cache = AnalysisCache()
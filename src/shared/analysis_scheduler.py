@@ -0,0 +1,122 @@
+"""
+Bedarfsgesteuerte Ausführung der Projektanalysen.
+
+Analysen werden nur gestartet, wenn sie angefordert werden (Checkbox aktiv
+oder Panel geöffnet), laufen im Hintergrund parallel zu anderen Schritten
+(z. B. Repository-Erstellung) und werden pro ZIP-Hash in einem beliebigen
+Mapping (typischerweise ``st.session_state``) zwischengespeichert.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Anzahl paralleler Analysen im gemeinsamen Pool
+ANALYSIS_WORKERS = 4
+
+# Blockgröße beim Hashen hochgeladener Dateien
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Gemeinsamer Thread-Pool, der Streamlit-Reruns überdauert"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis"
+            )
+        return _executor
+
+
+def hash_file_obj(file_obj, chunk_size=HASH_CHUNK_SIZE):
+    """SHA-256 eines Datei-Objekts (z. B. Streamlit-Upload); Position bleibt erhalten"""
+    position = file_obj.tell()
+    file_obj.seek(0)
+    sha256 = hashlib.sha256()
+    for block in iter(lambda: file_obj.read(chunk_size), b""):
+        sha256.update(block)
+    file_obj.seek(position)
+    return sha256.hexdigest()
+
+
+class AnalysisScheduler:
+    """
+    Plant Analysen für ein Projekt und speichert ihre Ergebnisse.
+
+    ``analyzers`` bildet Analysenamen auf Funktionen ``func(project_dir)`` ab.
+    ``store`` ist ein Mapping ZIP-Hash → {Analysename: Ergebnis}; es wird nur
+    aus dem aufrufenden Thread beschrieben (``collect``/``run``).
+    """
+
+    def __init__(self, analyzers, store, executor=None):
+        self.analyzers = analyzers
+        self.store = store
+        self.executor = executor or get_executor()
+        self._futures = {}
+
+    def results(self, key):
+        """Bereits vorliegende Ergebnisse für einen ZIP-Hash"""
+        return self.store.get(key, {})
+
+    def has_result(self, key, name):
+        return name in self.results(key)
+
+    def schedule(self, key, names, project_dir):
+        """Startet die angegebenen Analysen im Hintergrund, sofern nicht gecacht"""
+        for name in names:
+            if self.has_result(key, name) or (key, name) in self._futures:
+                continue
+            self._futures[(key, name)] = self.executor.submit(
+                self.analyzers[name], project_dir
+            )
+        return [name for (k, name) in self._futures if k == key]
+
+    def collect(self, key, names=None, timeout=None):
+        """
+        Wartet auf laufende Analysen und übernimmt ihre Ergebnisse in den Store.
+        Fehler werden als ``{"error": ...}`` gespeichert statt geworfen.
+        """
+        pending = [
+            (k, name)
+            for (k, name) in self._futures
+            if k == key and (names is None or name in names)
+        ]
+        for future_key in pending:
+            future = self._futures.pop(future_key)
+            try:
+                value = future.result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Analyse {future_key[1]} fehlgeschlagen: {e}")
+                value = {"error": str(e)}
+            self._store(key, future_key[1], value)
+        return self.results(key)
+
+    def run(self, key, name, project_dir, func=None):
+        """
+        Führt eine Analyse sofort aus (oder liefert das gecachte Ergebnis).
+        ``func`` ersetzt die registrierte Analysefunktion, z. B. für Validierungen
+        mit zusätzlichen Parametern.
+        """
+        if not self.has_result(key, name):
+            if (key, name) in self._futures:
+                self.collect(key, [name])
+            else:
+                try:
+                    value = (func or self.analyzers[name])(project_dir)
+                except Exception as e:
+                    logger.warning(f"Analyse {name} fehlgeschlagen: {e}")
+                    value = {"error": str(e)}
+                self._store(key, name, value)
+        return self.results(key)[name]
+
+    def _store(self, key, name, value):
+        results = dict(self.store.get(key, {}))
+        results[name] = value
+        self.store[key] = results
@@ -0,0 +1,356 @@
+"""
+Inkrementeller AppImage-Build für hochgeladene Python-Projekte.
+
+Das AppDir wird außerhalb des Projekts in einem Build-Cache aufgebaut
+(Hardlinks, bei Bedarf Kopien), Ausgabe- und VCS-Verzeichnisse werden
+übersprungen. ``appimagetool`` und die AppImage-Runtime werden einmalig im
+Cache abgelegt oder lokal vorgegeben (``APPIMAGETOOL``, ``APPIMAGE_RUNTIME``),
+sodass Builds ohne Netzwerk funktionieren. Der Build-Schlüssel ist ein Hash
+über Dateiinhalte, Vorlagen, Werkzeug und Runtime; existiert für ihn bereits
+ein AppImage, entfallen AppDir und squashfs-Schritt vollständig.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+
+import requests
+
+from shared.file_index import SKIP_DIRS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "APPIMAGE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "zip2gh-appimage")
+)
+
+TOOL_NAME = "appimagetool-x86_64.AppImage"
+TOOL_URL = (
+    "https://github.com/AppImage/AppImageKit/releases/download/continuous/" + TOOL_NAME
+)
+RUNTIME_NAME = "runtime-x86_64"
+RUNTIME_URL = "https://github.com/AppImage/type2-runtime/releases/download/continuous/" + RUNTIME_NAME
+
+# Nie ins AppDir übernommen: VCS/Caches und frühere Build-Ausgaben
+EXCLUDE_DIRS = SKIP_DIRS | {"AppDir"}
+EXCLUDE_SUFFIXES = (".AppImage", ".pyc")
+
+# Startskripte in Suchreihenfolge
+ENTRY_POINTS = ("main.py", "app.py", "__main__.py")
+
+# Feste Zeitstempel im squashfs, damit gleiche Eingaben gleiche AppImages ergeben
+SOURCE_DATE_EPOCH = "315532800"
+
+BUILD_TIMEOUT = 600
+DOWNLOAD_TIMEOUT = 60
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Wird bei Änderungen an Vorlagen oder AppDir-Aufbau erhöht
+BUILD_FORMAT = "1"
+
+DESKTOP_TEMPLATE = """[Desktop Entry]
+Type=Application
+Name={app_name}
+Exec=AppRun
+Icon={app_name}
+Categories=Development;
+Terminal=true
+"""
+
+APPRUN_TEMPLATE = """#!/bin/bash
+SELF=$(readlink -f "$0")
+HERE=${{SELF%/*}}
+export PYTHONPATH="${{HERE}}/usr/bin/${{PYTHONPATH:+:$PYTHONPATH}}"
+export XDG_DATA_DIRS="${{HERE}}/usr/share/${{XDG_DATA_DIRS:+:$XDG_DATA_DIRS}}"
+cd "${{HERE}}/usr/bin"
+exec python3 "${{HERE}}/usr/bin/{entry}" "$@"
+"""
+
+ICON_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<svg width="256" height="256" viewBox="0 0 256 256" xmlns="http://www.w3.org/2000/svg">
+  <rect width="256" height="256" rx="32" fill="#24292e"/>
+  <text x="128" y="150" text-anchor="middle" fill="white" font-family="sans-serif" font-size="40">{label}</text>
+</svg>
+"""
+
+# Builds derselben Anwendung laufen nacheinander, verschiedene Anwendungen
+# parallel; das gemeinsame Manifest wird nur kurz für das Aktualisieren gesperrt
+_app_locks = {}
+_app_locks_guard = threading.Lock()
+_manifest_lock = threading.Lock()
+
+
+def _app_lock(app_name):
+    with _app_locks_guard:
+        return _app_locks.setdefault(app_name, threading.Lock())
+
+
+def _download(url, target):
+    """Lädt eine Datei atomar herunter und macht sie ausführbar"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f, requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=HASH_CHUNK_SIZE):
+                f.write(chunk)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return target
+
+
+def _locate(env_var, name, url, cache_dir, allow_download, path_names=()):
+    """Umgebungsvariable → Cache → PATH → Download (falls erlaubt)"""
+    configured = os.getenv(env_var)
+    if configured:
+        return configured if os.path.isfile(configured) else None
+    cached = os.path.join(cache_dir, "tools", name)
+    if os.path.isfile(cached):
+        return cached
+    for path_name in path_names:
+        found = shutil.which(path_name)
+        if found:
+            return found
+    if not allow_download:
+        return None
+    logger.info(f"Lade {name} herunter")
+    return _download(url, cached)
+
+
+def find_appimagetool(cache_dir=DEFAULT_CACHE_DIR, allow_download=True):
+    """Pfad zu ``appimagetool`` oder None, wenn keins verfügbar ist"""
+    return _locate(
+        "APPIMAGETOOL", TOOL_NAME, TOOL_URL, cache_dir, allow_download, ("appimagetool", TOOL_NAME)
+    )
+
+
+def find_runtime(cache_dir=DEFAULT_CACHE_DIR, allow_download=True):
+    """
+    Pfad zur AppImage-Runtime oder None. Ohne Runtime lädt ``appimagetool``
+    sie bei jedem Build selbst herunter.
+    """
+    return _locate("APPIMAGE_RUNTIME", RUNTIME_NAME, RUNTIME_URL, cache_dir, allow_download)
+
+
+def project_files(project_dir):
+    """Sortierte relative Pfade aller Dateien, die ins AppDir gehören"""
+    files = []
+    for root, dirs, names in os.walk(project_dir):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDE_DIRS)
+        rel_root = os.path.relpath(root, project_dir)
+        for name in names:
+            if name.endswith(EXCLUDE_SUFFIXES):
+                continue
+            path = name if rel_root == "." else os.path.join(rel_root, name)
+            if os.path.isfile(os.path.join(project_dir, path)):
+                files.append(path.replace(os.sep, "/"))
+    files.sort()
+    return files
+
+
+def _file_digest(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _identity(path):
+    """Kennung eines Werkzeugs ohne es vollständig zu lesen"""
+    if not path:
+        return None
+    info = os.stat(path)
+    return [os.path.abspath(path), info.st_size, info.st_mtime_ns]
+
+
+def tree_digests(project_dir, files, previous=None):
+    """
+    Inhaltshashes pro Datei ``{Pfad: [Größe, mtime_ns, Ausführbar, sha256]}``.
+    Stimmen Größe und Änderungszeit mit ``previous`` überein, wird der alte
+    Hash übernommen statt die Datei erneut zu lesen.
+    """
+    previous = previous or {}
+    digests = {}
+    for path in files:
+        full_path = os.path.join(project_dir, *path.split("/"))
+        info = os.stat(full_path)
+        executable = bool(info.st_mode & stat.S_IXUSR)
+        old = previous.get(path)
+        if old and old[:3] == [info.st_size, info.st_mtime_ns, executable]:
+            digests[path] = old
+        else:
+            digests[path] = [info.st_size, info.st_mtime_ns, executable, _file_digest(full_path)]
+    return digests
+
+
+def find_entry_point(files):
+    return next((name for name in ENTRY_POINTS if name in files), ENTRY_POINTS[0])
+
+
+def build_key(app_name, entry, digests, tool, runtime):
+    """Inhaltsadresse eines Builds (unabhängig von Änderungszeiten)"""
+    sha256 = hashlib.sha256()
+    header = [BUILD_FORMAT, app_name, entry, _identity(tool), _identity(runtime)]
+    sha256.update(json.dumps(header).encode())
+    for template in (DESKTOP_TEMPLATE, APPRUN_TEMPLATE, ICON_TEMPLATE):
+        sha256.update(template.encode())
+    for path, (_, _, executable, digest) in sorted(digests.items()):
+        sha256.update(f"{path}\0{int(executable)}\0{digest}\n".encode())
+    return sha256.hexdigest()
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def assemble_appdir(project_dir, files, app_dir, app_name, entry):
+    """Baut das AppDir aus Hardlinks auf die Projektdateien und den Vorlagen"""
+    bin_dir = os.path.join(app_dir, "usr", "bin")
+    for path in files:
+        target = os.path.join(bin_dir, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _link_or_copy(os.path.join(project_dir, *path.split("/")), target)
+
+    desktop = DESKTOP_TEMPLATE.format(app_name=app_name)
+    applications = os.path.join(app_dir, "usr", "share", "applications")
+    os.makedirs(applications)
+    for directory in (app_dir, applications):
+        with open(os.path.join(directory, f"{app_name}.desktop"), "w") as f:
+            f.write(desktop)
+
+    icon = ICON_TEMPLATE.format(label=app_name[:2].upper())
+    icons = os.path.join(app_dir, "usr", "share", "icons", "hicolor", "scalable", "apps")
+    os.makedirs(icons)
+    for directory in (app_dir, icons):
+        with open(os.path.join(directory, f"{app_name}.svg"), "w") as f:
+            f.write(icon)
+
+    apprun = os.path.join(app_dir, "AppRun")
+    with open(apprun, "w") as f:
+        f.write(APPRUN_TEMPLATE.format(entry=entry))
+    os.chmod(apprun, 0o755)
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path, manifest):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def _update_manifest(path, app_name, entry):
+    """Setzt den Eintrag einer Anwendung, ohne Einträge paralleler Builds zu verlieren"""
+    with _manifest_lock:
+        manifest = _load_manifest(path)
+        manifest[app_name] = entry
+        _save_manifest(path, manifest)
+
+
+def build_appimage(project_dir, app_name, cache_dir=DEFAULT_CACHE_DIR, allow_download=True,
+                   tool=None, runtime=None):
+    """
+    Erstellt ein AppImage aus dem Projekt. Unveränderte Projekte liefern das
+    vorhandene AppImage aus dem Cache (``cached``), ohne ``appimagetool``
+    aufzurufen. Gibt ``{"success", "message", "appimage_path", "cached"}`` zurück.
+    """
+    results = {"success": False, "message": "", "appimage_path": None, "cached": False}
+    os.makedirs(cache_dir, exist_ok=True)
+
+    try:
+        tool = tool or find_appimagetool(cache_dir, allow_download)
+        if tool is None:
+            results["message"] = (
+                "appimagetool nicht gefunden (APPIMAGETOOL setzen oder Download erlauben)"
+            )
+            return results
+        if runtime is None:
+            runtime = find_runtime(cache_dir, allow_download)
+    except (OSError, requests.exceptions.RequestException) as e:
+        results["message"] = f"Build-Werkzeug nicht verfügbar: {e}"
+        return results
+
+    with _app_lock(app_name):
+        manifest_path = os.path.join(cache_dir, "manifest.json")
+        with _manifest_lock:
+            previous = _load_manifest(manifest_path).get(app_name, {})
+
+        files = project_files(project_dir)
+        entry = find_entry_point(files)
+        digests = tree_digests(project_dir, files, previous.get("files"))
+        key = build_key(app_name, entry, digests, tool, runtime)
+
+        build_dir = os.path.join(cache_dir, "builds", key[:24])
+        output = os.path.join(build_dir, f"{app_name}-x86_64.AppImage")
+        record = {"key": key, "output": output, "files": digests}
+        if os.path.isfile(output):
+            _update_manifest(manifest_path, app_name, record)
+            results.update(
+                success=True,
+                message="AppImage unverändert, vorhandener Build wird verwendet",
+                appimage_path=output,
+                cached=True,
+            )
+            return results
+
+        staging = tempfile.mkdtemp(prefix="appdir-", dir=cache_dir)
+        try:
+            app_dir = os.path.join(staging, "AppDir")
+            assemble_appdir(project_dir, files, app_dir, app_name, entry)
+
+            command = [tool, "--no-appstream"]
+            if runtime:
+                command += ["--runtime-file", runtime]
+            partial = os.path.join(staging, os.path.basename(output))
+            command += [app_dir, partial]
+            env = dict(
+                os.environ,
+                ARCH="x86_64",
+                APPIMAGE_EXTRACT_AND_RUN="1",
+                SOURCE_DATE_EPOCH=SOURCE_DATE_EPOCH,
+            )
+            completed = subprocess.run(
+                command, capture_output=True, text=True, env=env, timeout=BUILD_TIMEOUT
+            )
+            if completed.returncode != 0 or not os.path.isfile(partial):
+                output_text = (completed.stderr or completed.stdout).strip()
+                results["message"] = f"Fehler beim Erstellen des AppImage: {output_text[-500:]}"
+                return results
+
+            os.makedirs(build_dir, exist_ok=True)
+            os.replace(partial, output)
+        except (OSError, subprocess.SubprocessError) as e:
+            results["message"] = f"Fehler: {e}"
+            return results
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        # Nur den aktuellen Build pro Anwendung behalten
+        old_output = previous.get("output")
+        if old_output and old_output != output:
+            shutil.rmtree(os.path.dirname(old_output), ignore_errors=True)
+        _update_manifest(manifest_path, app_name, record)
+
+    results.update(success=True, message="AppImage erfolgreich erstellt!", appimage_path=output)
+    return results
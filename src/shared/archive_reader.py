@@ -0,0 +1,449 @@
+"""
+Einheitlicher Zugriff auf Upload-Archive: ZIP, tar (auch gzip, bzip2, xz
+und zstd komprimiert) sowie 7z.
+
+Das Format wird an der Signatur am Dateianfang erkannt, nicht am
+Dateinamen (die HTTP-API speichert Uploads ohne Endung). tar-Archive haben
+kein Inhaltsverzeichnis; sie werden in einem einzigen Durchgang aus dem
+dekomprimierten Datenstrom gelesen, ohne wahlfreien Zugriff. Deshalb werden
+Pfade, Dateinamen und Limits bei ihnen erst beim Entpacken Eintrag für
+Eintrag geprüft. ZIP-Archive werden über ``extract_zip`` parallel entpackt.
+
+tar.zst benötigt das Paket ``zstandard``, 7z das Paket ``py7zr`` (beide
+optional). py7zr bietet kein sequenzielles Lesen einzelner Einträge; 7z-
+Archive werden in einem Durchgang entpackt, py7zr schreibt dabei jeden
+Eintrag über ``_BoundedWriter`` mit denselben Limits wie bei tar.
+"""
+
+import os
+import tarfile
+import zipfile
+from collections import namedtuple
+from contextlib import contextmanager
+
+from shared.zip_extract import (
+    BUFFER_SIZE,
+    EXTRACT_WORKERS,
+    ByteBudget,
+    ExtractionError,
+    extract_zip,
+    member_error,
+    resolve_member_path,
+    write_member,
+)
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+# Lesefehler aus dem dekomprimierten tar-Datenstrom
+_STREAM_ERRORS = (OSError, EOFError, tarfile.TarError)
+if zstandard is not None:
+    _STREAM_ERRORS += (zstandard.ZstdError,)
+
+try:
+    import py7zr
+    from py7zr.io import Py7zIO, WriterFactory
+except ImportError:  # optional: pip install py7zr
+    py7zr = None
+    Py7zIO = WriterFactory = object
+
+# Signaturen am Dateianfang; tar selbst wird über "ustar" bei Offset 257 erkannt
+SIGNATURES = [
+    (b"PK\x03\x04", "zip"),
+    (b"PK\x05\x06", "zip"),  # leeres ZIP
+    (b"\x1f\x8b", "gz"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zst"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+]
+FORMAT_LABELS = {
+    "zip": "ZIP",
+    "tar": "tar",
+    "gz": "tar.gz",
+    "bz2": "tar.bz2",
+    "xz": "tar.xz",
+    "zst": "tar.zst",
+    "7z": "7z",
+}
+# Dateiendungen, längste zuerst (Repository-Namen, Verzeichnissuche)
+ARCHIVE_SUFFIXES = (
+    ".tar.gz", ".tar.bz2", ".tar.xz", ".tar.zst",
+    ".tgz", ".tbz2", ".txz", ".tzst", ".tar", ".zip", ".7z",
+)
+# Für st.file_uploader (vergleicht nur die letzte Endung)
+UPLOAD_TYPES = ["zip", "tar", "gz", "tgz", "bz2", "tbz2", "xz", "txz", "zst", "tzst", "7z"]
+
+# Angenommenes Kompressionsverhältnis, wenn die entpackte Größe unbekannt ist
+ESTIMATE_RATIO = 5
+
+FILE, DIRECTORY, LINK, OTHER = "file", "directory", "link", "other"
+ArchiveMember = namedtuple("ArchiveMember", ["name", "size", "kind"])
+
+
+@contextmanager
+def _binary(source):
+    """Pfad öffnen oder Datei-Objekt ab Anfang lesen (Position wird wiederhergestellt)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield f
+        return
+    position = source.tell()
+    source.seek(0)
+    try:
+        yield source
+    finally:
+        source.seek(position)
+
+
+def archive_format(source):
+    """Format eines Archivs (Schlüssel aus ``FORMAT_LABELS``) oder None"""
+    with _binary(source) as f:
+        head = f.read(512)
+        for signature, fmt in SIGNATURES:
+            if head.startswith(signature):
+                return fmt
+        if head[257:262] == b"ustar":
+            return "tar"
+        # ZIP mit vorangestellten Daten (z. B. selbstentpackend)
+        f.seek(0)
+        return "zip" if zipfile.is_zipfile(f) else None
+
+
+def require_format(fmt):
+    """Wirft ``ExtractionError`` für unbekannte Formate oder fehlende optionale Pakete"""
+    if fmt is None:
+        raise ExtractionError(
+            f"Kein unterstütztes Archivformat ({', '.join(FORMAT_LABELS.values())})"
+        )
+    if fmt == "zst" and zstandard is None:
+        raise ExtractionError("tar.zst-Archive benötigen das Paket 'zstandard'")
+    if fmt == "7z" and py7zr is None:
+        raise ExtractionError("7z-Archive benötigen das Paket 'py7zr'")
+
+
+def strip_archive_suffix(filename):
+    """Dateiname ohne Archivendung (``projekt.tar.gz`` → ``projekt``)"""
+    lower = filename.lower()
+    for suffix in ARCHIVE_SUFFIXES:
+        if lower.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename
+
+
+@contextmanager
+def _open_tar(f, fmt):
+    """tar-Archiv im Stream-Modus (nur vorwärts lesen)"""
+    if fmt == "zst":
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            f, read_across_frames=True, closefd=False
+        )
+        with reader, tarfile.open(fileobj=reader, mode="r|") as tf:
+            yield tf
+    else:
+        mode = "r|" if fmt == "tar" else f"r|{fmt}"
+        with tarfile.open(fileobj=f, mode=mode) as tf:
+            yield tf
+
+
+def _tar_name(info):
+    name = info.name
+    while name.startswith("./"):
+        name = name[2:]
+    return name
+
+
+def _tar_kind(info):
+    if info.isfile():
+        return FILE
+    if info.isdir():
+        return DIRECTORY
+    if info.issym() or info.islnk():
+        return LINK
+    return OTHER
+
+
+def iter_members(source, fmt=None):
+    """
+    Liefert ``(ArchiveMember, stream)`` für jeden Eintrag in Archivreihenfolge.
+    ``stream`` ist nur bei Dateien gesetzt und nur bis zum nächsten Eintrag
+    lesbar. Für 7z nicht verfügbar (siehe Moduldokumentation).
+    """
+    fmt = fmt or archive_format(source)
+    require_format(fmt)
+    if fmt == "7z":
+        raise ExtractionError("7z-Archive können nicht sequenziell gelesen werden")
+
+    with _binary(source) as f:
+        if fmt == "zip":
+            with zipfile.ZipFile(f) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        yield ArchiveMember(info.filename, 0, DIRECTORY), None
+                        continue
+                    with zf.open(info) as stream:
+                        yield ArchiveMember(info.filename, info.file_size, FILE), stream
+            return
+
+        try:
+            with _open_tar(f, fmt) as tf:
+                for info in tf:
+                    kind = _tar_kind(info)
+                    member = ArchiveMember(_tar_name(info), info.size if kind == FILE else 0, kind)
+                    yield member, tf.extractfile(info) if kind == FILE else None
+        except _STREAM_ERRORS as e:
+            raise ExtractionError(f"Ungültiges {FORMAT_LABELS[fmt]}-Archiv: {e}")
+
+
+def list_members(source, fmt=None):
+    """Einträge ohne Inhalt (tar: ein Durchgang über den Datenstrom)"""
+    fmt = fmt or archive_format(source)
+    require_format(fmt)
+    if fmt == "7z":
+        with _binary(source) as f, py7zr.SevenZipFile(f, "r") as archive:
+            return [
+                ArchiveMember(
+                    info.filename,
+                    0 if info.is_directory else info.uncompressed,
+                    DIRECTORY if info.is_directory else FILE,
+                )
+                for info in archive.list()
+            ]
+    return [member for member, _ in iter_members(source, fmt)]
+
+
+def unpacked_size(source, fmt=None):
+    """
+    Entpackte Größe aus den Metadaten, ohne zu dekomprimieren. Ohne Angabe
+    (tar.bz2, tar.xz, zstd ohne Größe im Frame) wird mit ``ESTIMATE_RATIO``
+    geschätzt; die Limits beim Entpacken gelten unabhängig davon.
+    """
+    fmt = fmt or archive_format(source)
+    with _binary(source) as f:
+        size = f.seek(0, os.SEEK_END)
+        if fmt == "zip":
+            f.seek(0)
+            with zipfile.ZipFile(f) as zf:
+                return sum(info.file_size for info in zf.infolist())
+        if fmt == "tar":
+            return size
+        if fmt == "gz" and size >= 18:
+            # ISIZE im gzip-Trailer (modulo 4 GiB, bei mehreren Membern nur der letzte)
+            f.seek(-4, os.SEEK_END)
+            isize = int.from_bytes(f.read(4), "little")
+            if isize >= size:
+                return isize
+        if fmt == "zst" and zstandard is not None:
+            f.seek(0)
+            try:
+                content_size = zstandard.frame_content_size(f.read(18))
+            except zstandard.ZstdError:
+                content_size = -1
+            if content_size >= size:
+                return content_size
+    if fmt == "7z" and py7zr is not None:
+        return sum(member.size for member in list_members(source, fmt))
+    return size * ESTIMATE_RATIO
+
+
+def _check_name(check, name):
+    if check is not None:
+        ok, message = check(name)
+        if not ok:
+            raise ExtractionError(f"Unsichere Datei gefunden: {name} - {message}")
+
+
+def extract_archive(archive_path, target, max_total_size=None, max_file_size=None,
+                    max_files=None, check=None, workers=EXTRACT_WORKERS,
+                    buffer_size=BUFFER_SIZE):
+    """
+    Entpackt ein Archiv beliebigen Formats nach ``target`` und gibt
+    ``{"format", "files", "directories", "bytes", "skipped"}`` zurück.
+    ``check(name)`` prüft jeden Dateinamen und gibt ``(ok, meldung)`` zurück
+    (z. B. ``is_safe_filename``). Symbolische Links, harte Links und
+    Gerätedateien aus tar-Archiven werden übersprungen (``skipped``).
+    Bei einem Fehler bleiben bereits geschriebene Dateien liegen.
+    """
+    fmt = archive_format(archive_path)
+    require_format(fmt)
+    limits = {
+        "max_total_size": max_total_size,
+        "max_file_size": max_file_size,
+        "max_files": max_files,
+    }
+
+    if fmt == "zip":
+        if check is not None:
+            with zipfile.ZipFile(archive_path) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir():
+                        _check_name(check, info.filename)
+        stats = extract_zip(
+            archive_path, target, workers=workers, buffer_size=buffer_size, **limits
+        )
+        return dict(stats, format=fmt, skipped=0)
+    if fmt == "7z":
+        return _extract_7z(archive_path, target, check, **limits)
+    return _extract_stream(archive_path, fmt, target, check, buffer_size, **limits)
+
+
+def _extract_stream(archive_path, fmt, target, check, buffer_size,
+                    max_total_size, max_file_size, max_files):
+    """Entpackt ein tar-Archiv in einem Durchgang; Prüfungen pro Eintrag"""
+    os.makedirs(target, exist_ok=True)
+    budget = ByteBudget(max_total_size)
+    stats = {"format": fmt, "files": 0, "directories": 0, "bytes": 0, "skipped": 0}
+    count = 0
+    for member, stream in iter_members(archive_path, fmt):
+        count += 1
+        if max_files is not None and count > max_files:
+            raise ExtractionError(f"Archiv enthält zu viele Dateien (max. {max_files})")
+        path = resolve_member_path(target, member.name)
+
+        try:
+            if member.kind == DIRECTORY:
+                os.makedirs(path, exist_ok=True)
+                stats["directories"] += 1
+            elif member.kind == FILE:
+                _check_name(check, member.name)
+                if max_file_size is not None and member.size > max_file_size:
+                    raise ExtractionError(
+                        f"Einzelne Datei zu groß: {member.name} "
+                        f"({member.size / 1024 / 1024:.1f} MB)"
+                    )
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Vorhandene Symlinks im Ziel dürfen nicht umleiten
+                if os.path.realpath(path) != path:
+                    raise ExtractionError(
+                        f"Pfad außerhalb des Zielverzeichnisses: {member.name}"
+                    )
+                write_member(
+                    stream, path, member.name, member.size, budget, max_file_size, buffer_size
+                )
+                stats["files"] += 1
+            else:
+                stats["skipped"] += 1
+        except _STREAM_ERRORS as e:
+            # z. B. Datei "a" und Verzeichnis "a/" im selben Archiv, abgeschnittener Strom
+            raise member_error(member.name, e) from e
+
+    stats["bytes"] = budget.used
+    return stats
+
+
+class _BoundedWriter(Py7zIO):
+    """Schreibt einen 7z-Eintrag direkt in die Zieldatei und zählt die Bytes mit"""
+
+    def __init__(self, path, name, budget, max_file_size):
+        self.name = name
+        self.budget = budget
+        self.max_file_size = max_file_size
+        self.written = 0
+        try:
+            self.out = open(path, "wb")
+        except OSError as e:
+            raise member_error(name, e) from e
+
+    def write(self, s):
+        self.written += len(s)
+        if self.max_file_size is not None and self.written > self.max_file_size:
+            raise ExtractionError(
+                f"Einzelne Datei zu groß: {self.name} "
+                f"(max. {self.max_file_size / 1024 / 1024:.1f} MB)"
+            )
+        self.budget.take(len(s))
+        try:
+            return self.out.write(s)
+        except OSError as e:
+            raise member_error(self.name, e) from e
+
+    def read(self, size=None):
+        return b""
+
+    def seek(self, offset, whence=0):
+        return self.written
+
+    def flush(self):
+        self.out.flush()
+
+    def size(self):
+        return self.written
+
+    def close(self):
+        self.out.close()
+
+
+class _BoundedWriterFactory(WriterFactory):
+    """Liefert py7zr für jeden Eintrag einen ``_BoundedWriter`` innerhalb von ``target``"""
+
+    def __init__(self, target, check, budget, max_file_size):
+        self.root = os.path.realpath(target)
+        self.check = check
+        self.budget = budget
+        self.max_file_size = max_file_size
+        self.writers = []
+
+    def create(self, filename):
+        # py7zr übergibt den Ausgabepfad unterhalb von ``target``
+        name = os.path.relpath(filename, self.root).replace(os.sep, "/")
+        _check_name(self.check, name)
+        path = resolve_member_path(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.realpath(path) != path:
+            raise ExtractionError(f"Pfad außerhalb des Zielverzeichnisses: {name}")
+        writer = _BoundedWriter(path, name, self.budget, self.max_file_size)
+        self.writers.append(writer)
+        return writer
+
+
+def _extract_7z(archive_path, target, check, max_total_size, max_file_size, max_files):
+    """
+    Prüft das Inhaltsverzeichnis eines 7z-Archivs und entpackt es; Größen-
+    limits gelten zusätzlich für die tatsächlich geschriebenen Bytes.
+    """
+    os.makedirs(target, exist_ok=True)
+    budget = ByteBudget(max_total_size)
+    factory = _BoundedWriterFactory(target, check, budget, max_file_size)
+    with py7zr.SevenZipFile(archive_path, "r") as archive:
+        infos = archive.list()
+        if max_files is not None and len(infos) > max_files:
+            raise ExtractionError(f"Archiv enthält zu viele Dateien (max. {max_files})")
+        for entry in archive.files:
+            if entry.is_symlink:
+                raise ExtractionError(f"Symbolischer Link im Archiv: {entry.filename}")
+
+        files, total = 0, 0
+        for info in infos:
+            path = resolve_member_path(target, info.filename)
+            if info.is_directory:
+                os.makedirs(path, exist_ok=True)
+                continue
+            _check_name(check, info.filename)
+            if max_file_size is not None and info.uncompressed > max_file_size:
+                raise ExtractionError(
+                    f"Einzelne Datei zu groß: {info.filename} "
+                    f"({info.uncompressed / 1024 / 1024:.1f} MB)"
+                )
+            files += 1
+            total += info.uncompressed
+        if max_total_size is not None and total > max_total_size:
+            raise ExtractionError(
+                f"Entpackte Größe überschreitet Limit ({total / 1024 / 1024:.1f} MB > "
+                f"{max_total_size / 1024 / 1024:.1f} MB)"
+            )
+        try:
+            archive.extract(path=factory.root, factory=factory)
+        finally:
+            # Bei einem Fehler ruft py7zr ``close`` nicht auf
+            for writer in factory.writers:
+                writer.out.close()
+
+    return {
+        "format": "7z",
+        "files": files,
+        "directories": len(infos) - files,
+        "bytes": budget.used,
+        "skipped": 0,
+    }
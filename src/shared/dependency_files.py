@@ -0,0 +1,362 @@
+"""
+Parser für Manifest- und Lockfiles von Python- und Node.js-Projekten.
+
+Unterstützt requirements*.txt, pyproject.toml (PEP 621 und Poetry),
+Pipfile.lock, poetry.lock, package.json, package-lock.json (v1–v3) und
+yarn.lock (Classic und Berry). Jede Abhängigkeit wird als dict
+``{ecosystem, name, version, spec, file}`` geliefert; ``version`` ist nur bei
+exakt aufgelösten Versionen gesetzt, sonst enthält ``spec`` den Bereich.
+"""
+
+import json
+import logging
+import os
+import re
+
+from shared.advisory_db import MAX_VERSION, MIN_VERSION, NPM, PYPI, version_key
+from shared.file_index import build_file_index
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+logger = logging.getLogger(__name__)
+
+# Lockfiles haben Vorrang vor den Manifesten im selben Verzeichnis
+PYTHON_LOCKFILES = ("Pipfile.lock", "poetry.lock")
+NODE_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock")
+
+_REQUIREMENT_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*)$")
+_SPECIFIER_RE = re.compile(r"(===|==|!=|~=|>=|<=|>|<)\s*([^\s,;]+)")
+# npm-x-Ranges (4.x, 1.2.*) sind keine exakten Versionen
+_EXACT_VERSION_RE = re.compile(
+    r"^(?!.*(?:^|\.)[xX*](?:\.|$))v?\d+(?:\.\d+)*(?:[-.+]?[0-9A-Za-z.]+)?$"
+)
+
+
+def _dependency(ecosystem, name, version=None, spec=""):
+    return {"ecosystem": ecosystem, "name": name, "version": version, "spec": spec}
+
+
+def parse_requirement(line):
+    """Parst eine PEP-508-Anforderung wie ``django[argon2]>=3.2,<4 ; python_version>'3'``"""
+    line = line.split("#", 1)[0].split(";", 1)[0].strip()
+    if not line or line.startswith(("-", "git+", "http:", "https:", "file:")):
+        return None
+    match = _REQUIREMENT_RE.match(line)
+    if not match:
+        return None
+    name, spec = match.group(1), match.group(2).strip().strip("()").strip()
+    pinned = re.fullmatch(r"={2,3}\s*([^\s,*]+)", spec)
+    return _dependency(PYPI, name, pinned.group(1) if pinned else None, spec)
+
+
+def parse_requirements(text):
+    return [dep for dep in map(parse_requirement, text.splitlines()) if dep]
+
+
+def _toml_dependency_strings(text):
+    """Ersatz ohne TOML-Parser: Strings aus ``dependencies = [...]``-Listen"""
+    strings = []
+    for block in re.findall(r"dependencies\s*=\s*\[(.*?)\]", text, re.DOTALL):
+        strings.extend(re.findall(r"[\"']([^\"']+)[\"']", block))
+    return strings
+
+
+def _poetry_dependency(name, constraint):
+    if isinstance(constraint, dict):
+        constraint = constraint.get("version", "")
+    if not isinstance(constraint, str):
+        return None
+    constraint = constraint.strip()
+    version = constraint.lstrip("=") if _EXACT_VERSION_RE.match(constraint.lstrip("=")) else None
+    return _dependency(PYPI, name, version, constraint)
+
+
+def parse_pyproject(text):
+    if tomllib is None:
+        return [dep for dep in map(parse_requirement, _toml_dependency_strings(text)) if dep]
+
+    data = tomllib.loads(text)
+    project = data.get("project", {})
+    requirements = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        requirements.extend(extra)
+    dependencies = [dep for dep in map(parse_requirement, requirements) if dep]
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    sections = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    sections.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+    for section in sections:
+        for name, constraint in section.items():
+            if name.lower() == "python":
+                continue
+            dep = _poetry_dependency(name, constraint)
+            if dep:
+                dependencies.append(dep)
+    return dependencies
+
+
+def parse_pipfile_lock(text):
+    data = json.loads(text)
+    dependencies = []
+    for section in ("default", "develop"):
+        for name, info in data.get(section, {}).items():
+            spec = info.get("version", "")
+            dependencies.append(_dependency(PYPI, name, spec.lstrip("=") or None, spec))
+    return dependencies
+
+
+def parse_poetry_lock(text):
+    if tomllib is None:
+        packages = re.findall(
+            r'\[\[package\]\]\s*name\s*=\s*"([^"]+)"\s*version\s*=\s*"([^"]+)"', text
+        )
+    else:
+        packages = [(p["name"], p["version"]) for p in tomllib.loads(text).get("package", [])]
+    return [_dependency(PYPI, name, version, f"=={version}") for name, version in packages]
+
+
+def parse_package_json(text):
+    data = json.loads(text)
+    dependencies = []
+    for section in ("dependencies", "devDependencies", "optionalDependencies"):
+        for name, spec in data.get(section, {}).items():
+            if not isinstance(spec, str):
+                continue
+            version = spec if _EXACT_VERSION_RE.match(spec) and not spec.startswith("v") else None
+            dependencies.append(_dependency(NPM, name, version, spec))
+    return dependencies
+
+
+def parse_package_lock(text):
+    data = json.loads(text)
+    dependencies = []
+
+    # lockfileVersion 2/3: flache "packages"-Map mit node_modules-Pfaden
+    packages = data.get("packages")
+    if packages:
+        for path, info in packages.items():
+            if not path or info.get("link") or "node_modules/" not in path:
+                continue
+            name = info.get("name") or path.rsplit("node_modules/", 1)[1]
+            if info.get("version"):
+                dependencies.append(_dependency(NPM, name, info["version"]))
+        return dependencies
+
+    # lockfileVersion 1: verschachtelte "dependencies"
+    stack = [data.get("dependencies", {})]
+    while stack:
+        for name, info in stack.pop().items():
+            if info.get("version"):
+                dependencies.append(_dependency(NPM, name, info["version"]))
+            if info.get("dependencies"):
+                stack.append(info["dependencies"])
+    return dependencies
+
+
+def _yarn_package_name(descriptor):
+    descriptor = descriptor.strip().strip('"')
+    at = descriptor.find("@", 1)
+    return descriptor[:at] if at > 0 else descriptor
+
+
+def parse_yarn_lock(text):
+    dependencies = []
+    name = None
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            # Kopfzeile: "pkg@^1.0.0", "pkg@~1.1.0":  bzw.  "pkg@npm:^1.0.0":
+            name = _yarn_package_name(line.rstrip(":").split(",")[0])
+            if name == "__metadata":
+                name = None
+        elif name and line.startswith("  ") and not line.startswith("   "):
+            match = re.match(r'\s+version:?\s+"?([^"\s]+)"?', line)
+            if match:
+                dependencies.append(_dependency(NPM, name, match.group(1)))
+                name = None
+    return dependencies
+
+
+PARSERS = {
+    "requirements.txt": parse_requirements,
+    "pyproject.toml": parse_pyproject,
+    "Pipfile.lock": parse_pipfile_lock,
+    "poetry.lock": parse_poetry_lock,
+    "package.json": parse_package_json,
+    "package-lock.json": parse_package_lock,
+    "npm-shrinkwrap.json": parse_package_lock,
+    "yarn.lock": parse_yarn_lock,
+}
+
+
+def parser_for(file_name):
+    if file_name in PARSERS:
+        return PARSERS[file_name]
+    if file_name.startswith("requirements") and file_name.endswith(".txt"):
+        return parse_requirements
+    return None
+
+
+def _bump(key):
+    """Kleinster Schlüssel, der größer als ``key`` ist"""
+    return key + (1,)
+
+
+def _next_release(version, position):
+    parts = [int(p) for p in re.findall(r"\d+", version)[: position + 1]]
+    parts += [0] * (position + 1 - len(parts))
+    parts[position] += 1
+    return version_key(".".join(map(str, parts)))
+
+
+def spec_range(ecosystem, spec):
+    """
+    Wandelt eine Bereichsangabe in ein Intervall ``(low, high)`` für
+    ``AdvisoryDatabase.lookup_range`` um. None, wenn der Bereich unklar ist.
+    """
+    spec = spec.strip()
+    low, high = MIN_VERSION, MAX_VERSION
+
+    if ecosystem == NPM or spec[:1] in ("^", "~") and not spec.startswith("~="):
+        # npm-Bereiche: ^1.2.3, ~1.2.3, 1.x, 1.2.3 - 2.0.0, >=1 <2
+        # (Alternativen mit ||, Tags, Git- und Dateiverweise ergeben None)
+        if "||" in spec or spec in ("*", "latest", ""):
+            return None
+        if spec[:1] in ("^", "~"):
+            version = spec[1:].lstrip("=v")
+            key = version_key(version)
+            if key is None:
+                return None
+            parts = re.findall(r"\d+", version)
+            if spec[0] == "~":
+                position = 1 if len(parts) > 1 else 0
+            else:
+                position = next((i for i, p in enumerate(parts) if p != "0"), len(parts) - 1)
+            return key, _next_release(version, min(position, 2))
+        match = re.fullmatch(r"=?v?(\d+)(?:\.(\d+))?(?:\.[xX*]){1,2}", spec)
+        if match:
+            version = ".".join(p for p in match.groups() if p is not None)
+            position = len([p for p in match.groups() if p is not None]) - 1
+            return version_key(version), _next_release(version, position)
+        match = re.fullmatch(r"v?(\S+)\s+-\s+v?(\S+)", spec)
+        if match:
+            start, end = version_key(match.group(1)), version_key(match.group(2))
+            if start is None or end is None:
+                return None
+            # Unvollständige Obergrenze (1.2.3 - 2.3) schließt alle 2.3.x ein
+            end_parts = match.group(2).split(".")
+            if len(end_parts) < 3 and all(p.isdigit() for p in end_parts):
+                return start, _next_release(match.group(2), len(end_parts) - 1)
+            return start, _bump(end)
+
+    specifiers = _SPECIFIER_RE.findall(spec)
+    if not specifiers:
+        return None
+    for operator, version in specifiers:
+        if version.endswith(".*"):
+            prefix = version[:-2]
+            low = max(low, version_key(prefix) or low)
+            high = min(high, _next_release(prefix, prefix.count(".")))
+            continue
+        key = version_key(version)
+        if key is None:
+            return None
+        if operator in ("==", "==="):
+            low, high = max(low, key), min(high, _bump(key))
+        elif operator == ">=":
+            low = max(low, key)
+        elif operator == ">":
+            low = max(low, _bump(key))
+        elif operator == "<":
+            high = min(high, key)
+        elif operator == "<=":
+            high = min(high, _bump(key))
+        elif operator == "~=":
+            low = max(low, key)
+            high = min(high, _next_release(version, max(version.count(".") - 1, 0)))
+    return low, high
+
+
+def find_dependency_files(project_dir, index=None):
+    """Relevante Manifest- und Lockfiles im gesamten Projekt (relative Pfade)"""
+    if index is None:
+        index = build_file_index(project_dir)
+
+    files = []
+    for directory, entries in sorted(index.by_dir.items()):
+        names = {entry.name for entry in entries}
+        for entry in entries:
+            if parser_for(entry.name) is None:
+                continue
+            if entry.name == "package.json" and names.intersection(NODE_LOCKFILES):
+                continue
+            if entry.name == "pyproject.toml" and names.intersection(PYTHON_LOCKFILES):
+                continue
+            files.append(entry.path)
+    return files
+
+
+def collect_dependencies(project_dir, index=None):
+    """Alle Abhängigkeiten eines Projekts, inklusive Teilprojekte und Lockfiles"""
+    if index is None:
+        index = build_file_index(project_dir)
+
+    dependencies = []
+    seen = set()
+    for rel_path in find_dependency_files(project_dir, index):
+        parser = parser_for(os.path.basename(rel_path))
+        try:
+            with open(index.abspath(rel_path), "r", encoding="utf-8") as f:
+                parsed = parser(f.read())
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Abhängigkeiten aus {rel_path} nicht lesbar: {e}")
+            continue
+        for dep in parsed:
+            key = (dep["ecosystem"], dep["name"].lower(), dep["version"], dep["spec"], rel_path)
+            if key not in seen:
+                seen.add(key)
+                dependencies.append(dict(dep, file=rel_path))
+    return dependencies
+
+
+def audit_dependencies(dependencies, database):
+    """
+    Gleicht Abhängigkeiten mit der Advisory-Datenbank ab. Exakte Versionen
+    werden direkt geprüft; Bereiche melden Advisories, von denen mindestens
+    eine erlaubte Version betroffen ist (``possible`` = True).
+    """
+    findings = []
+    for dep in dependencies:
+        if dep["version"]:
+            advisories = database.lookup(dep["ecosystem"], dep["name"], dep["version"])
+            possible = False
+        else:
+            bounds = spec_range(dep["ecosystem"], dep["spec"]) if dep["spec"] else None
+            if bounds is None:
+                continue
+            advisories = database.lookup_range(dep["ecosystem"], dep["name"], *bounds)
+            possible = True
+
+        label = f"{dep['name']}=={dep['version']}" if dep["version"] else f"{dep['name']}{dep['spec']}"
+        for advisory in advisories:
+            findings.append(
+                {
+                    "package": label,
+                    "name": dep["name"],
+                    "version": dep["version"],
+                    "file": dep.get("file"),
+                    "id": advisory["id"],
+                    "aliases": advisory["aliases"],
+                    "severity": advisory["severity"],
+                    "description": advisory["summary"] or "Bekannte Sicherheitslücke",
+                    "possible": possible,
+                }
+            )
+    return findings
@@ -0,0 +1,203 @@
+"""
+AST-basierte Extraktion von Dokumentation aus Python-Quellcode.
+
+Jede Datei wird genau einmal gelesen und geparst. Das Ergebnis ist eine
+strukturierte Symboltabelle mit Modulen, Klassen, Funktionen, Signaturen,
+Docstrings und Testbeispielen. Ergebnisse landen im gemeinsamen
+Analyse-Cache, damit wiederholte Aufrufe die Dateien nicht erneut parsen.
+"""
+
+import ast
+import os
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.analysis_cache import default_cache
+from shared.file_index import build_file_index
+
+# Name der Analyse im gemeinsamen Cache
+CACHE_NAME = "doc_symbols"
+
+# Maximale Anzahl paralleler Dateien
+MAX_WORKERS = 8
+
+
+def is_test_file(name):
+    """Erkennt Testdateien nach pytest-Konvention"""
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def module_name(rel_path):
+    """Wandelt einen relativen Dateipfad in einen Modulnamen um"""
+    parts = rel_path[: -len(".py")].split("/") if rel_path.endswith(".py") else rel_path.split("/")
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+class _Source:
+    """Quelltext mit einmalig gesplitteten Zeilen für schnelle Ausschnitte"""
+
+    def __init__(self, data):
+        self.lines = data.splitlines(keepends=True)
+
+    def segment(self, node):
+        """Quelltext eines Knotens (Spaltenangaben sind UTF-8-Byte-Offsets)"""
+        if node is None or getattr(node, "end_lineno", None) is None:
+            return ""
+        first, last = node.lineno - 1, node.end_lineno - 1
+        if first == last:
+            text = self.lines[first][node.col_offset : node.end_col_offset]
+        else:
+            text = (
+                self.lines[first][node.col_offset :]
+                + b"".join(self.lines[first + 1 : last])
+                + self.lines[last][: node.end_col_offset]
+            )
+        return text.decode("utf-8", errors="replace")
+
+    def block(self, node):
+        """Vollständige Zeilen eines Knotens, ohne gemeinsame Einrückung"""
+        text = b"".join(self.lines[node.lineno - 1 : node.end_lineno])
+        return textwrap.dedent(text.decode("utf-8", errors="replace")).rstrip()
+
+
+def _format_arg(source, arg, default=None):
+    text = arg.arg
+    if arg.annotation is not None:
+        text += f": {source.segment(arg.annotation)}"
+    if default is not None:
+        text += " = " if arg.annotation is not None else "="
+        text += source.segment(default)
+    return text
+
+
+def format_signature(source, node):
+    """Erzeugt die Signatur einer Funktion inklusive Typannotationen"""
+    args = node.args
+    positional = list(getattr(args, "posonlyargs", [])) + list(args.args)
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+
+    params = []
+    posonly_count = len(getattr(args, "posonlyargs", []))
+    for i, (arg, default) in enumerate(zip(positional, defaults)):
+        params.append(_format_arg(source, arg, default))
+        if posonly_count and i == posonly_count - 1:
+            params.append("/")
+
+    if args.vararg is not None:
+        params.append("*" + _format_arg(source, args.vararg))
+    elif args.kwonlyargs:
+        params.append("*")
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        params.append(_format_arg(source, arg, default))
+    if args.kwarg is not None:
+        params.append("**" + _format_arg(source, args.kwarg))
+
+    signature = f"{node.name}({', '.join(params)})"
+    if node.returns is not None:
+        signature += f" -> {source.segment(node.returns)}"
+    return signature
+
+
+def _function_info(source, node):
+    return {
+        "name": node.name,
+        "lineno": node.lineno,
+        "signature": format_signature(source, node),
+        "docstring": ast.get_docstring(node) or "",
+        "async": isinstance(node, ast.AsyncFunctionDef),
+    }
+
+
+def _test_example(source, node):
+    name = node.name[len("test_") :] if node.name.startswith("test_") else node.name
+    return {
+        "name": name.replace("_", " ").strip() or node.name,
+        "lineno": node.lineno,
+        "code": source.block(node),
+    }
+
+
+def parse_symbols(data, collect_tests=False):
+    """
+    Parst Python-Quelltext (Bytes) und gibt die Symbole eines Moduls zurück.
+    Bei Syntaxfehlern enthält das Ergebnis den Schlüssel ``error``.
+    """
+    symbols = {"docstring": "", "classes": [], "functions": [], "tests": []}
+    try:
+        tree = ast.parse(data)
+    except (SyntaxError, ValueError) as e:
+        symbols["error"] = f"{type(e).__name__}: {e}"
+        return symbols
+
+    source = _Source(data)
+    symbols["docstring"] = ast.get_docstring(tree) or ""
+    function_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    for node in tree.body:
+        if isinstance(node, function_types):
+            symbols["functions"].append(_function_info(source, node))
+            if collect_tests and node.name.startswith("test"):
+                symbols["tests"].append(_test_example(source, node))
+        elif isinstance(node, ast.ClassDef):
+            methods = [
+                _function_info(source, child)
+                for child in node.body
+                if isinstance(child, function_types)
+            ]
+            symbols["classes"].append(
+                {
+                    "name": node.name,
+                    "lineno": node.lineno,
+                    "bases": [source.segment(base) for base in node.bases],
+                    "docstring": ast.get_docstring(node) or "",
+                    "methods": methods,
+                }
+            )
+            if collect_tests:
+                symbols["tests"].extend(
+                    _test_example(source, child)
+                    for child in node.body
+                    if isinstance(child, function_types) and child.name.startswith("test")
+                )
+
+    return symbols
+
+
+def _extract(file_path):
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return parse_symbols(data, collect_tests=is_test_file(os.path.basename(file_path)))
+
+
+def extract_file_symbols(file_path, rel_path=None, cache=default_cache):
+    """Symbole einer einzelnen Python-Datei (über den gemeinsamen Cache)"""
+    rel_path = rel_path or os.path.basename(file_path)
+    try:
+        symbols = cache.get_or_compute(CACHE_NAME, file_path, _extract)
+    except OSError as e:
+        symbols = {"docstring": "", "classes": [], "functions": [], "tests": [], "error": str(e)}
+    return dict(symbols, path=rel_path, module=module_name(rel_path))
+
+
+def build_symbol_table(project_dir, index=None, max_workers=MAX_WORKERS, cache=default_cache):
+    """
+    Erstellt die Symboltabelle aller Python-Dateien eines Projekts.
+    Die Dateien werden parallel verarbeitet; Ergebnisse sind nach Pfad sortiert.
+    """
+    if index is None:
+        index = build_file_index(project_dir)
+
+    entries = index.by_ext.get(".py", [])
+    if not entries:
+        return {"modules": []}
+
+    def run(entry):
+        return extract_file_symbols(index.abspath(entry), entry.path, cache=cache)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
+        modules = list(executor.map(run, entries))
+
+    modules.sort(key=lambda module: module["path"])
+    return {"modules": modules}
@@ -0,0 +1,130 @@
+"""
+Rekursiver Datei-Index für Projektverzeichnisse.
+
+Der Index wird einmal pro Projekt aufgebaut (ein einziger Verzeichnisdurchlauf
+mit Tiefenbegrenzung) und von allen Analysen gemeinsam genutzt, statt dass
+jede Analyse das Verzeichnis erneut mit ``os.walk``/``os.listdir`` durchläuft.
+"""
+
+import os
+from collections import defaultdict, namedtuple
+
+# Verzeichnisse, die nie zum Projektinhalt zählen
+SKIP_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "__MACOSX",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".idea",
+    ".vscode",
+}
+
+# Maximale Verzeichnistiefe (0 = nur das Wurzelverzeichnis)
+DEFAULT_MAX_DEPTH = 8
+
+FileEntry = namedtuple("FileEntry", ["path", "dir", "name", "ext", "size", "depth"])
+
+
+class FileIndex:
+    """Indizierte, rekursive Dateiliste eines Projektverzeichnisses"""
+
+    def __init__(self, root, entries, truncated=False):
+        self.root = root
+        self.entries = entries
+        self.truncated = truncated
+        self.by_dir = defaultdict(list)
+        self.by_ext = defaultdict(list)
+        self.by_name = defaultdict(list)
+        for entry in entries:
+            self.by_dir[entry.dir].append(entry)
+            self.by_ext[entry.ext].append(entry)
+            self.by_name[entry.name].append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @property
+    def paths(self):
+        """Relative Pfade aller Dateien (POSIX-Schreibweise)"""
+        return [entry.path for entry in self.entries]
+
+    @property
+    def total_size(self):
+        return sum(entry.size for entry in self.entries)
+
+    def abspath(self, entry_or_path):
+        """Absoluter Pfad zu einem Index-Eintrag oder relativen Pfad"""
+        path = entry_or_path.path if isinstance(entry_or_path, FileEntry) else entry_or_path
+        return os.path.join(self.root, *path.split("/"))
+
+    def files_in(self, directory):
+        """Dateien direkt im angegebenen (relativen) Verzeichnis"""
+        return self.by_dir.get(directory, [])
+
+    def subtree(self, directory):
+        """Dateien im angegebenen Verzeichnis und allen Unterverzeichnissen"""
+        if directory in ("", "."):
+            return list(self.entries)
+        prefix = directory.rstrip("/") + "/"
+        return [entry for entry in self.entries if entry.path.startswith(prefix)]
+
+
+def build_file_index(root, max_depth=DEFAULT_MAX_DEPTH, skip_dirs=SKIP_DIRS):
+    """
+    Baut den Datei-Index für ``root`` mit einem einzigen Verzeichnisdurchlauf auf.
+
+    Verzeichnisse aus ``skip_dirs`` und symbolische Links auf Verzeichnisse
+    werden übersprungen. Wird ``max_depth`` überschritten, ist ``truncated`` gesetzt.
+    """
+    entries = []
+    truncated = False
+    stack = [("", 0)]
+
+    while stack:
+        rel_dir, depth = stack.pop()
+        abs_dir = os.path.join(root, *rel_dir.split("/")) if rel_dir else root
+        try:
+            with os.scandir(abs_dir) as it:
+                dir_entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for dir_entry in dir_entries:
+            rel_path = f"{rel_dir}/{dir_entry.name}" if rel_dir else dir_entry.name
+            try:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    if dir_entry.name in skip_dirs:
+                        continue
+                    if depth >= max_depth:
+                        truncated = True
+                        continue
+                    subdirs.append((rel_path, depth + 1))
+                elif dir_entry.is_file(follow_symlinks=False):
+                    entries.append(
+                        FileEntry(
+                            path=rel_path,
+                            dir=rel_dir,
+                            name=dir_entry.name,
+                            ext=os.path.splitext(dir_entry.name)[1].lower(),
+                            size=dir_entry.stat(follow_symlinks=False).st_size,
+                            depth=depth,
+                        )
+                    )
+            except OSError:
+                continue
+
+        # Umgekehrt auf den Stack, damit Unterverzeichnisse alphabetisch folgen
+        stack.extend(reversed(subdirs))
+
+    return FileIndex(root, entries, truncated=truncated)
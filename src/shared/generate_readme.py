@@ -1,107 +1,273 @@
-def generate_readme(file_list):
+"""
+README-Generator auf Basis des rekursiven Datei-Index.
+
+Alle Merkmale (Sprachen, Manifeste im Wurzelverzeichnis, Framework-Stichwörter)
+werden in einem Durchlauf gesammelt; mit einem ``FileIndex`` genügen dessen
+vorberechnete Tabellen. Die Dateivorschau nutzt ``heapq.nsmallest`` statt die
+ganze Liste zu sortieren, Stichwörter werden nur bei passenden Manifesten
+gesucht. Gerendert wird über vorkompilierte Abschnittsvorlagen, die sich pro
+Projekttyp anpassen lassen (``register_template``).
+"""
+
+import heapq
+from itertools import chain
+from string import Template
+
+from shared.file_index import FileIndex
+
+# Anzahl Dateien in der Strukturvorschau
+PREVIEW_LIMIT = 20
+
+# Sprachen in Anzeigereihenfolge mit ihren Dateiendungen
+LANGUAGES = (
+    ("Python", (".py",)),
+    ("JavaScript", (".js", ".jsx")),
+    ("HTML", (".html",)),
+    ("CSS", (".css",)),
+    ("Java", (".java",)),
+    ("PHP", (".php",)),
+)
+
+# Frameworks: (Name, Datei im Wurzelverzeichnis, zusätzlich nötiges Stichwort)
+FRAMEWORKS = (
+    ("Node.js", "package.json", None),
+    ("Python-Paket", "requirements.txt", None),
+    ("Django", "manage.py", "django"),
+    ("Flask", "app.py", "flask"),
+    ("Maven", "pom.xml", None),
+    ("Gradle", "build.gradle", None),
+    ("PHP/Composer", "composer.json", None),
+)
+
+# Stichwörter, die irgendwo in Datei- oder Verzeichnisnamen vorkommen
+KEYWORDS = ("react", "vue", "angular", "flask", "django")
+
+DESCRIPTION = "Dieses Projekt wurde automatisch mit dem ZIP-to-GitHub Uploader erstellt."
+
+# Abschnitte: (Name, Vorlage, Kontextfelder, die nicht leer sein dürfen)
+DEFAULT_SECTIONS = (
+    ("title", "# ${title}", ()),
+    ("description", "\n## Beschreibung\n${description}", ()),
+    ("frameworks", "\nDieses Projekt verwendet: ${frameworks}", ("frameworks",)),
+    ("structure", "\n## Projektstruktur\n```${structure}\n```", ()),
+    ("install", "\n## Installation\n```bash\n${install}\n```", ("install",)),
+    ("run", "\n## Ausführung\n```bash\n${run}\n```", ("run",)),
+)
+
+
+def compile_template(sections):
+    """Kompiliert Abschnitte einmalig zu ``[(Template, Pflichtfelder)]``"""
+    return [(Template(text), requires) for _, text, requires in sections]
+
+
+_templates = {None: compile_template(DEFAULT_SECTIONS)}
+# Abschnitte der registrierten Vorlagen, damit andere Generatoren sie erweitern können
+_sections = {}
+
+
+def register_template(project_type, **overrides):
     """
-    Generiert eine README.md basierend auf den Dateien im Projekt.
-    Erkennt automatisch Projekttypen und erstellt eine passende Struktur.
+    Passt die Vorlage für einen Projekttyp an. Jeder Schlüssel ersetzt den
+    gleichnamigen Abschnitt durch ``(Vorlage, Pflichtfelder)`` oder entfernt
+    ihn mit ``None``.
+    """
+    sections = []
+    for name, text, requires in DEFAULT_SECTIONS:
+        if name in overrides:
+            if overrides[name] is None:
+                continue
+            text, requires = overrides[name]
+        sections.append((name, text, requires))
+    _sections[project_type] = tuple(sections)
+    _templates[project_type] = compile_template(sections)
+
+
+def template_sections(project_type):
+    """Abschnitte der für ``project_type`` registrierten Vorlage, sonst None"""
+    return _sections.get(project_type)
+
+
+register_template(
+    "Docker-Projekt",
+    run=("\n## Ausführung\n```bash\n${docker}\n```", ("docker",)),
+)
+
+
+def _needed_keywords(root_names):
+    """Stichwörter, die bei den vorhandenen Manifesten den Projekttyp ändern können"""
+    needed = set()
+    if "package.json" in root_names:
+        needed.update(("react", "vue", "angular"))
+    if root_names & {"requirements.txt", "app.py"}:
+        needed.add("flask")
+    if root_names & {"requirements.txt", "manage.py"}:
+        needed.add("django")
+    return needed
+
+
+def _find_keywords(keywords, texts):
+    """Sucht Stichwörter nacheinander in den (erst bei Bedarf gebildeten) Texten"""
+    found = set()
+    for make_text in texts:
+        remaining = keywords - found
+        if not remaining:
+            break
+        text = make_text()
+        found.update(keyword for keyword in remaining if keyword in text)
+    return found
+
+
+def _index_preview(index, limit):
+    """
+    Die ``limit`` kleinsten Pfade eines Index. Verzeichnisse werden in der
+    Reihenfolge ihres Präfixes besucht; sobald ein Präfix größer als der
+    bisher ``limit``-kleinste Pfad ist, kann kein weiterer Pfad mehr folgen.
+    """
+    prefixes = [(f"{directory}/" if directory else "", directory) for directory in index.by_dir]
+    heapq.heapify(prefixes)
+    best = []
+    while prefixes:
+        prefix, directory = heapq.heappop(prefixes)
+        if len(best) >= limit and prefix > best[-1]:
+            break
+        best = heapq.nsmallest(
+            limit, chain(best, (entry.path for entry in index.by_dir[directory]))
+        )
+    return best
+
+
+def collect_facts(files):
     """
-    # Projekttyp erkennen
-    project_type = "Unbekannt"
-    languages = []
-    
-    if any(f.endswith(".py") for f in file_list):
-        languages.append("Python")
-    if any(f.endswith(".js") or f.endswith(".jsx") for f in file_list):
-        languages.append("JavaScript")
-    if any(f.endswith(".html") for f in file_list):
-        languages.append("HTML")
-    if any(f.endswith(".css") for f in file_list):
-        languages.append("CSS")
-    if any(f.endswith(".java") for f in file_list):
-        languages.append("Java")
-    if any(f.endswith(".php") for f in file_list):
-        languages.append("PHP")
-    
-    # Frameworks erkennen
-    frameworks = []
-    if "package.json" in file_list:
-        frameworks.append("Node.js")
-    if "requirements.txt" in file_list:
-        frameworks.append("Python-Paket")
-    if "manage.py" in file_list and any("django" in f.lower() for f in file_list):
-        frameworks.append("Django")
-    if "app.py" in file_list and any("flask" in f.lower() for f in file_list):
-        frameworks.append("Flask")
-    if "pom.xml" in file_list:
-        frameworks.append("Maven")
-    if "build.gradle" in file_list:
-        frameworks.append("Gradle")
-    if "composer.json" in file_list:
-        frameworks.append("PHP/Composer")
-    
-    # Projekttyp bestimmen
-    if "index.html" in file_list and "style.css" in file_list:
+    Sammelt Endungen, Dateinamen im Wurzelverzeichnis, Stichwörter und die
+    Strukturvorschau. ``files`` ist ein ``FileIndex`` oder eine Liste relativer
+    Pfade. Stichwörter werden nur gesucht, wenn sie den Projekttyp beeinflussen.
+    """
+    if isinstance(files, FileIndex):
+        extensions = set(files.by_ext)
+        root_names = {entry.name for entry in files.files_in("")}
+        texts = (
+            lambda: "\n".join(files.by_dir).lower(),
+            lambda: "\n".join(files.by_name).lower(),
+        )
+        preview = _index_preview(files, PREVIEW_LIMIT)
+    else:
+        files = list(files)
+        extensions, root_names = set(), set()
+        for path in files:
+            name = path.rsplit("/", 1)[-1]
+            if name == path:
+                root_names.add(name)
+            dot = name.rfind(".")
+            if dot > 0:
+                extensions.add(name[dot:].lower())
+        texts = (lambda: "\n".join(files).lower(),)
+        preview = heapq.nsmallest(PREVIEW_LIMIT, files)
+
+    return {
+        "extensions": extensions,
+        "root_names": root_names,
+        "keywords": _find_keywords(_needed_keywords(root_names), texts),
+        "preview": preview,
+        "count": len(files),
+    }
+
+
+def detect_readme_type(facts):
+    """Projekttyp, Sprachen und Frameworks aus den gesammelten Merkmalen"""
+    root, keywords = facts["root_names"], facts["keywords"]
+    languages = [
+        language
+        for language, extensions in LANGUAGES
+        if not facts["extensions"].isdisjoint(extensions)
+    ]
+
+    frameworks = [
+        framework
+        for framework, name, keyword in FRAMEWORKS
+        if name in root and (keyword is None or keyword in keywords)
+    ]
+
+    if "index.html" in root and "style.css" in root:
         project_type = "Webseite"
-    elif "package.json" in file_list and "react" in str(file_list).lower():
+    elif "package.json" in root and "react" in keywords:
         project_type = "React-Anwendung"
-    elif "package.json" in file_list and "vue" in str(file_list).lower():
+    elif "package.json" in root and "vue" in keywords:
         project_type = "Vue.js-Anwendung"
-    elif "package.json" in file_list and "angular" in str(file_list).lower():
+    elif "package.json" in root and "angular" in keywords:
         project_type = "Angular-Anwendung"
-    elif "requirements.txt" in file_list and "flask" in str(file_list).lower():
+    elif "requirements.txt" in root and "flask" in keywords:
         project_type = "Flask-Anwendung"
-    elif "requirements.txt" in file_list and "django" in str(file_list).lower():
+    elif "requirements.txt" in root and "django" in keywords:
         project_type = "Django-Anwendung"
-    elif "docker-compose.yml" in file_list or "Dockerfile" in file_list:
+    elif "docker-compose.yml" in root or "Dockerfile" in root:
         project_type = "Docker-Projekt"
-    elif len(languages) > 0:
+    elif languages:
         project_type = f"{', '.join(languages)}-Projekt"
-    
-    # README erstellen
-    lines = [f"# {project_type}"]
-    
-    # Beschreibung
-    lines.append("\n## Beschreibung")
-    lines.append("Dieses Projekt wurde automatisch mit dem ZIP-to-GitHub Uploader erstellt.")
-    
-    if frameworks:
-        lines.append(f"\nDieses Projekt verwendet: {', '.join(frameworks)}")
-    
-    # Dateien auflisten
-    lines.append("\n## Projektstruktur")
-    lines.append("```")
-    
-    # Zeige maximal 20 Dateien
-    for f in sorted(file_list)[:20]:
-        lines.append(f"- {f}")
-    
-    if len(file_list) > 20:
-        lines.append(f"... und {len(file_list) - 20} weitere Dateien")
-    
-    lines.append("```")
-    
-    # Installation
-    if "requirements.txt" in file_list:
-        lines.append("\n## Installation")
-        lines.append("```bash")
-        lines.append("pip install -r requirements.txt")
-        lines.append("```")
-    elif "package.json" in file_list:
-        lines.append("\n## Installation")
-        lines.append("```bash")
-        lines.append("npm install")
-        lines.append("```")
-    
-    # Ausführung
-    if "package.json" in file_list:
-        lines.append("\n## Ausführung")
-        lines.append("```bash")
-        lines.append("npm start")
-        lines.append("```")
-    elif any(f.endswith(".py") for f in file_list):
-        main_file = next((f for f in file_list if f == "app.py" or f == "main.py"), None)
-        if main_file:
-            lines.append("\n## Ausführung")
-            lines.append("```bash")
-            lines.append(f"python {main_file}")
-            lines.append("```")
-    
-    return "\n".join(lines)
+    else:
+        project_type = "Unbekannt"
+
+    return project_type, languages, frameworks
+
+
+def build_context(facts):
+    """Werte für die Vorlagen aus den gesammelten Merkmalen"""
+    root = facts["root_names"]
+    project_type, languages, frameworks = detect_readme_type(facts)
+
+    structure = [f"- {path}" for path in facts["preview"]]
+    if facts["count"] > PREVIEW_LIMIT:
+        structure.append(f"... und {facts['count'] - PREVIEW_LIMIT} weitere Dateien")
+
+    if "requirements.txt" in root:
+        install = "pip install -r requirements.txt"
+    elif "package.json" in root:
+        install = "npm install"
+    else:
+        install = ""
+
+    if "package.json" in root:
+        run = "npm start"
+    elif "Python" in languages:
+        main_file = next((name for name in ("app.py", "main.py") if name in root), None)
+        run = f"python {main_file}" if main_file else ""
+    else:
+        run = ""
+
+    if "docker-compose.yml" in root:
+        docker = "docker compose up"
+    elif "Dockerfile" in root:
+        docker = "docker build -t projekt .\ndocker run projekt"
+    else:
+        docker = ""
+
+    return {
+        "project_type": project_type,
+        "title": project_type,
+        "description": DESCRIPTION,
+        "languages": ", ".join(languages),
+        "frameworks": ", ".join(frameworks),
+        "structure": "".join(f"\n{line}" for line in structure),
+        "install": install,
+        "run": run,
+        "docker": docker,
+    }
+
+
+def render_readme(context, template=None):
+    """Rendert eine README aus Kontext und (vorkompilierter) Vorlage"""
+    if template is None:
+        template = _templates.get(context["project_type"], _templates[None])
+    return "\n".join(
+        section.substitute(context)
+        for section, requires in template
+        if all(context[field] for field in requires)
+    )
+
+
+def generate_readme(files):
+    """
+    Generiert eine README.md basierend auf den Dateien im Projekt.
+    ``files`` ist ein rekursiver ``FileIndex`` oder eine Liste relativer Pfade;
+    Projekttyp, Sprachen und Frameworks werden automatisch erkannt.
+    """
+    return render_readme(build_context(collect_facts(files)))
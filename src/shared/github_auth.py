@@ -0,0 +1,82 @@
+"""
+Prüfung von GitHub-Token und Rate-Limit für die Upload-Oberfläche.
+
+Beide Abfragen werden pro Token über ``shared.github_cache`` zwischengespeichert,
+damit Streamlit-Reruns keine neuen HTTP-Anfragen auslösen.
+"""
+
+from datetime import datetime
+
+import requests
+
+from shared.github_cache import cached_per_token, invalidate_token
+
+# Cache-Dauer (Sekunden) für Token-Prüfung und Rate-Limit-Abfrage
+TOKEN_CHECK_TTL = 600
+RATE_LIMIT_TTL = 60
+
+
+@cached_per_token(ttl=TOKEN_CHECK_TTL, cache_if=lambda result: result[2] != "connection")
+def _check_token(token):
+    """Prüft ein Token mit einer einzigen Anfrage; gibt (Status, Scopes, Fehlerart) zurück"""
+    try:
+        response = requests.get(
+            "https://api.github.com/user",
+            headers={"Authorization": f"token {token}"},
+            timeout=10,
+        )
+    except requests.exceptions.RequestException as e:
+        return None, str(e), "connection"
+
+    if response.status_code == 401:
+        # Alle gecachten Ergebnisse dieses Tokens sind hinfällig
+        invalidate_token(token)
+    return response.status_code, response.headers.get("X-OAuth-Scopes", ""), None
+
+
+def validate_github_token(token):
+    """Überprüft die Gültigkeit und Berechtigungen eines GitHub-Tokens (gecacht)"""
+    if not token:
+        return False, "Kein Token angegeben"
+
+    status_code, scopes, error = _check_token(token)
+    if error == "connection":
+        return False, f"Verbindungsfehler: {scopes}"
+
+    if status_code != 200:
+        return False, f"Token ungültig (Status: {status_code})"
+
+    # Die Scopes liefert bereits die /user-Antwort
+    if "repo" not in scopes:
+        return False, "Token benötigt 'repo' Berechtigung"
+
+    return True, "Token gültig"
+
+
+@cached_per_token(ttl=RATE_LIMIT_TTL, cache_if=lambda result: result[0])
+def check_rate_limits(token):
+    """Überprüft GitHub API Rate Limits (gecacht; Warnungen werden neu geprüft)"""
+    headers = {"Authorization": f"token {token}"}
+    try:
+        response = requests.get(
+            "https://api.github.com/rate_limit",
+            headers=headers,
+            timeout=10,
+        )
+
+        if response.status_code == 200:
+            limits = response.json()
+            core = limits["resources"]["core"]
+            remaining = core["remaining"]
+            reset_time = datetime.fromtimestamp(core["reset"])
+
+            if remaining < 10:
+                return (
+                    False,
+                    f"Rate Limit fast erreicht. Reset um {reset_time.strftime('%H:%M')}",
+                )
+
+        return True, f"Rate Limit OK ({remaining} verbleibend)"
+
+    except Exception as e:
+        return False, f"Fehler beim Prüfen der Rate Limits: {str(e)}"
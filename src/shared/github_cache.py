@@ -0,0 +1,98 @@
+"""
+Prozessweiter TTL-Cache für token-bezogene GitHub-Abfragen.
+
+Streamlit führt die Seite bei jeder Eingabe neu aus; Token-Prüfung und
+Rate-Limit-Abfrage würden sonst bei jedem Rerun erneut HTTP-Anfragen senden.
+Einträge werden über einen Hash des Tokens adressiert (das Token selbst wird
+nicht als Schlüssel gehalten) und lassen sich pro Token gezielt verwerfen,
+etwa bei manueller Aktualisierung oder nach einer 401-Antwort.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+
+# Standard-Lebensdauer eines Eintrags in Sekunden
+DEFAULT_TTL = 300
+
+
+def token_key(github_token):
+    """Kurzer Hash des Tokens als Cache-Schlüssel (Token wird nie gespeichert)"""
+    return hashlib.sha256(github_token.encode("utf-8")).hexdigest()[:16]
+
+
+class TokenCache:
+    """Thread-sicherer TTL-Cache mit Schlüsseln ``(Token-Hash, Name, Argumente)``"""
+
+    def __init__(self, clock=time.monotonic):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def get(self, key):
+        """Gibt ``(True, Wert)`` bei gültigem Eintrag, sonst ``(False, None)`` zurück"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < self._clock():
+                del self._entries[key]
+                return False, None
+            return True, value
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+
+    def invalidate(self, github_token):
+        """Verwirft alle Einträge eines Tokens"""
+        hashed = token_key(github_token)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == hashed]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Von der App gemeinsam genutzte Instanz
+default_token_cache = TokenCache()
+
+
+def invalidate_token(github_token, cache=None):
+    """Verwirft alle gecachten Ergebnisse eines Tokens (z. B. nach HTTP 401)"""
+    if github_token:
+        (default_token_cache if cache is None else cache).invalidate(github_token)
+
+
+def cached_per_token(ttl=DEFAULT_TTL, cache_if=None, cache=None):
+    """
+    Dekorator für Funktionen ``func(token, *args)``. Ergebnisse werden pro
+    Token-Hash und Argumenten für ``ttl`` Sekunden gespeichert; ``cache_if``
+    kann Ergebnisse (z. B. Verbindungsfehler) vom Caching ausschließen.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(github_token, *args):
+            if not github_token:
+                return func(github_token, *args)
+            store = default_token_cache if cache is None else cache
+            key = (token_key(github_token), func.__name__, args)
+            found, value = store.get(key)
+            if found:
+                return value
+            value = func(github_token, *args)
+            if cache_if is None or cache_if(value):
+                store.set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
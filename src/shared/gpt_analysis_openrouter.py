@@ -1,31 +1,21 @@
-import os
-import requests
+from shared.ai_analysis import openrouter_provider
 
 def analyze_project_with_openrouter(prompt: str) -> str:
     """
-    Sendet eine Projektanalyse-Anfrage an OpenRouter (z. B. Mistral).
+    Sendet eine Projektanalyse-Anfrage an OpenRouter (z. B. Mistral).
     Erwartet Umgebungsvariablen OPENROUTER_API_KEY und OPENROUTER_MODEL in .env.
+    Sendet weder max_tokens noch temperature (Standardwerte des Modells).
     """
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    model = os.getenv("OPENROUTER_MODEL", "mistral/mistral-7b-instruct:free")
-
-    if not api_key:
-        raise EnvironmentError("OPENROUTER_API_KEY nicht gesetzt in .env")
-
-    response = requests.post(
-        "https://openrouter.ai/api/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ]
-        },
-        timeout=30
+    provider = openrouter_provider()
+    return provider.complete(
+        [{"role": "user", "content": prompt}], max_tokens=None, temperature=None
     )
 
-    response.raise_for_status()
-    return response.json()["choices"][0]["message"]["content"]
+def stream_project_with_openrouter(prompt: str):
+    """
+    Wie analyze_project_with_openrouter, liefert die Antwort aber stückweise.
+    """
+    provider = openrouter_provider()
+    return provider.stream(
+        [{"role": "user", "content": prompt}], max_tokens=None, temperature=None
+    )
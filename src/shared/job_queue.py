@@ -0,0 +1,179 @@
+"""
+Warteschlange für Hintergrundaufträge mit Status-Registry.
+
+Aufträge laufen in einem begrenzten Thread-Pool; ihr Zustand (wartend,
+laufend, fertig, fehlgeschlagen), Protokollzeilen und Ergebnis bleiben in
+einer Registry abrufbar, bis sie von neueren abgeschlossenen Aufträgen
+verdrängt werden. Ist die Warteschlange voll, wird ein neuer Auftrag
+abgelehnt statt unbegrenzt Arbeit anzunehmen.
+
+Abbrüche sind kooperativ: wartende Aufträge starten nicht mehr, laufende
+werden beim nächsten Aufruf von ``log`` mit ``JobCancelled`` beendet.
+Laufende Unterprozesse (z. B. ``git push``) werden dabei nicht unterbrochen.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "4"))
+# Maximale Anzahl wartender Aufträge
+MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "100"))
+# Abgeschlossene Aufträge, die abrufbar bleiben
+MAX_FINISHED = 1000
+MAX_LOG_LINES = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+class QueueFull(RuntimeError):
+    """Die Warteschlange nimmt keine weiteren Aufträge an"""
+
+
+class JobCancelled(Exception):
+    """Der Auftrag wurde abgebrochen"""
+
+
+class JobQueue:
+    """Thread-Pool mit abrufbarem Auftragsstatus"""
+
+    def __init__(self, max_workers=MAX_WORKERS, max_pending=MAX_PENDING,
+                 max_finished=MAX_FINISHED):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Stellt ``func(log, *args, **kwargs)`` in die Warteschlange und gibt die
+        Auftrags-ID zurück. ``log(text, progress=None)`` hängt eine Zeile an
+        das Protokoll an (``text=None`` meldet nur den Fortschritt 0–1) und
+        löst ``JobCancelled`` aus, sobald ein Abbruch angefordert wurde; der
+        Rückgabewert von ``func`` wird zum Ergebnis des Auftrags.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self._count(QUEUED) >= self.max_pending:
+                raise QueueFull("Zu viele wartende Aufträge")
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": QUEUED,
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "result": None,
+                "error": None,
+                "progress": 0.0,
+                "cancel_requested": False,
+                "log": [],
+            }
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, func, args, kwargs):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != QUEUED:
+                return
+            job.update(status=RUNNING, started=time.time())
+
+        def log(text=None, progress=None):
+            with self._lock:
+                if progress is not None:
+                    job["progress"] = progress
+                if text is not None:
+                    job["log"].append(text)
+                    del job["log"][:-MAX_LOG_LINES]
+                cancelled = job["cancel_requested"]
+            if cancelled:
+                raise JobCancelled("Auftrag abgebrochen")
+
+        try:
+            result = func(log, *args, **kwargs)
+        except JobCancelled:
+            self._update(job_id, status=CANCELLED, finished=time.time())
+        except Exception as e:
+            logger.warning(f"Auftrag {job_id} fehlgeschlagen: {e}")
+            self._update(job_id, status=FAILED, error=str(e), finished=time.time())
+        else:
+            self._update(
+                job_id, status=DONE, result=result, progress=1.0, finished=time.time()
+            )
+        self._prune()
+
+    def _update(self, job_id, **values):
+        with self._lock:
+            self._jobs[job_id].update(values)
+
+    def _count(self, status):
+        return sum(1 for job in self._jobs.values() if job["status"] == status)
+
+    def _prune(self):
+        with self._lock:
+            finished = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job["status"] in FINISHED
+            ]
+            for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Kopie des Auftragszustands oder None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, log=list(job["log"])) if job else None
+
+    def cancel(self, job_id):
+        """
+        Fordert den Abbruch eines Auftrags an. Wartende Aufträge werden sofort
+        abgebrochen, laufende beim nächsten ``log``-Aufruf. Gibt False zurück,
+        wenn der Auftrag unbekannt oder bereits beendet ist.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return False
+            if job["status"] == QUEUED:
+                job.update(status=CANCELLED, finished=time.time())
+            job["cancel_requested"] = True
+            return True
+
+    def counts(self):
+        """Anzahl Aufträge pro Status"""
+        with self._lock:
+            return {
+                status: self._count(status)
+                for status in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def get_job_queue():
+    """Prozessweite Warteschlange, die Streamlit-Reruns und Sitzungen überdauert"""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
@@ -0,0 +1,203 @@
+"""
+Streamender Parser für ``multipart/form-data``.
+
+Dateiteile werden blockweise direkt auf die Festplatte geschrieben und dabei
+gehasht; der Speicherbedarf hängt nur von der Blockgröße ab, nicht von der
+Dateigröße. Das Größenlimit wird während des Lesens geprüft, sodass zu große
+Uploads abbrechen, bevor sie vollständig empfangen wurden.
+"""
+
+import hashlib
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+# Obergrenzen für Kopfzeilen eines Teils und für einfache Formularfelder
+MAX_HEADER_SIZE = 16 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+
+_PARAM_RE = re.compile(r';\s*([\w*-]+)=(?:"((?:[^"\\]|\\.)*)"|([^;\s]*))')
+
+
+class MultipartError(ValueError):
+    """Ungültiger oder unvollständiger Multipart-Body"""
+
+
+class UploadTooLarge(MultipartError):
+    """Ein Dateiteil überschreitet das erlaubte Größenlimit"""
+
+
+def header_params(value):
+    """``'form-data; name="file"'`` → ``("form-data", {"name": "file"})``"""
+    main, _, _ = value.partition(";")
+    params = {}
+    for match in _PARAM_RE.finditer(value):
+        params[match.group(1).lower()] = (
+            match.group(2).replace('\\"', '"') if match.group(2) is not None else match.group(3)
+        )
+    return main.strip().lower(), params
+
+
+def boundary_from_content_type(content_type):
+    kind, params = header_params(content_type or "")
+    if kind != "multipart/form-data" or not params.get("boundary"):
+        raise MultipartError("Content-Type multipart/form-data mit boundary erwartet")
+    return params["boundary"].encode("latin-1")
+
+
+class _Reader:
+    """Liest höchstens ``length`` Bytes blockweise aus einem Stream"""
+
+    def __init__(self, stream, length, chunk_size):
+        self.stream = stream
+        self.remaining = length
+        self.chunk_size = chunk_size
+
+    def read(self):
+        if self.remaining <= 0:
+            return b""
+        data = self.stream.read(min(self.chunk_size, self.remaining))
+        if not data:
+            raise MultipartError("Verbindung vor Ende des Uploads abgebrochen")
+        self.remaining -= len(data)
+        return data
+
+
+class _FileSink:
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self._file = open(path, "wb")
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise UploadTooLarge(
+                f"Datei ist zu groß (max. {self.max_size / 1024 / 1024:.1f} MB)"
+            )
+        self.sha256.update(data)
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+
+class _FieldSink:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+        if len(self.data) > MAX_FIELD_SIZE:
+            raise MultipartError("Formularfeld zu groß")
+
+    def close(self):
+        pass
+
+
+def parse_multipart(stream, content_type, content_length, target_dir,
+                    max_file_size=None, chunk_size=CHUNK_SIZE):
+    """
+    Liest einen Multipart-Body aus ``stream`` und gibt ``(fields, files)``
+    zurück. ``fields`` enthält Textfelder, ``files`` pro Feldname
+    ``{"filename", "path", "size", "sha256"}``; Dateien liegen in ``target_dir``.
+    Bei einem Fehler werden bereits geschriebene Dateien gelöscht.
+    """
+    delimiter = b"\r\n--" + boundary_from_content_type(content_type)
+    reader = _Reader(stream, content_length, chunk_size)
+    # Der erste Trenner steht ohne vorangestelltes CRLF am Anfang
+    buffer = bytearray(b"\r\n")
+    fields, files, written = {}, {}, []
+
+    def fill(minimum):
+        while len(buffer) < minimum:
+            data = reader.read()
+            if not data:
+                return False
+            buffer.extend(data)
+        return True
+
+    try:
+        # Präambel bis zum ersten Trenner überspringen
+        while True:
+            position = buffer.find(delimiter)
+            if position >= 0:
+                del buffer[: position + len(delimiter)]
+                break
+            del buffer[: max(0, len(buffer) - len(delimiter))]
+            if not fill(len(buffer) + 1):
+                raise MultipartError("Kein Multipart-Trenner gefunden")
+
+        while True:
+            if not fill(2):
+                raise MultipartError("Unvollständiger Multipart-Body")
+            if buffer[:2] == b"--":
+                break
+            if buffer[:2] != b"\r\n":
+                raise MultipartError("Ungültiger Multipart-Trenner")
+            del buffer[:2]
+
+            # Kopfzeilen des Teils
+            while True:
+                end = buffer.find(b"\r\n\r\n")
+                if end >= 0:
+                    break
+                if len(buffer) > MAX_HEADER_SIZE or not fill(len(buffer) + 1):
+                    raise MultipartError("Ungültige Kopfzeilen im Multipart-Body")
+            headers = {}
+            for line in bytes(buffer[:end]).decode("utf-8", errors="replace").split("\r\n"):
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            del buffer[: end + 4]
+
+            _, params = header_params(headers.get("content-disposition", ""))
+            name = params.get("name")
+            if not name:
+                raise MultipartError("Teil ohne Feldnamen")
+            if "filename" in params:
+                path = os.path.join(target_dir, f"upload-{len(written)}")
+                written.append(path)
+                sink = _FileSink(path, max_file_size)
+            else:
+                sink = _FieldSink()
+
+            # Inhalt bis zum nächsten Trenner; das Ende des Puffers wird
+            # zurückgehalten, weil dort ein angeschnittener Trenner stehen kann
+            try:
+                while True:
+                    position = buffer.find(delimiter)
+                    if position >= 0:
+                        sink.write(bytes(buffer[:position]))
+                        del buffer[: position + len(delimiter)]
+                        break
+                    keep = len(delimiter) - 1
+                    if len(buffer) > keep:
+                        sink.write(bytes(buffer[:-keep]))
+                        del buffer[:-keep]
+                    if not fill(len(buffer) + 1):
+                        raise MultipartError("Unvollständiger Multipart-Body")
+            finally:
+                sink.close()
+
+            if isinstance(sink, _FileSink):
+                files[name] = {
+                    "filename": os.path.basename(params["filename"].replace("\\", "/")),
+                    "path": sink.path,
+                    "size": sink.size,
+                    "sha256": sink.sha256.hexdigest(),
+                }
+            else:
+                fields[name] = sink.data.decode("utf-8", errors="replace")
+
+        # Epilog nach dem letzten Trenner verwerfen
+        while reader.read():
+            pass
+    except BaseException:
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    return fields, files
@@ -0,0 +1,258 @@
+"""
+Nicht blockierende Zustellung von Benachrichtigungen.
+
+Jeder Kanal (Slack, Discord, ...) erhält eine begrenzte Warteschlange und
+einen eigenen Worker-Thread. ``submit`` legt ein Ereignis nur ab und kehrt
+sofort zurück, unabhängig von der Latenz der Webhooks. Die Worker senden
+mit Timeout, wiederholen fehlgeschlagene Zustellungen mit exponentiellem
+Backoff und fassen Ereignisse, die innerhalb eines kurzen Zeitfensters
+eintreffen (z. B. beim Batch-Upload), zu einer Sammelnachricht zusammen.
+
+Mit einer Outbox (siehe ``notification_outbox``) wird jedes Ereignis vor der
+Zustellung gespeichert und jeder Versuch protokolliert; fällige Einträge
+werden beim Start und danach periodisch erneut eingereiht. Vor dem Senden
+beansprucht der Worker die Einträge in der Outbox, damit mehrere Prozesse
+denselben Eintrag nicht doppelt zustellen.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from shared.notification_outbox import DEFAULT_LEASE
+
+logger = logging.getLogger(__name__)
+
+# Maximale Anzahl wartender Ereignisse pro Kanal
+DEFAULT_QUEUE_SIZE = 1000
+
+# Zeitfenster (Sekunden), in dem Ereignisse zusammengefasst werden
+DEFAULT_COALESCE_WINDOW = 2.0
+
+# Maximale Anzahl Ereignisse pro Sammelnachricht
+DEFAULT_MAX_BATCH = 50
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+# Abstand (Sekunden), in dem fällige Outbox-Einträge erneut eingereiht werden
+DEFAULT_REQUEUE_INTERVAL = 30.0
+
+_STOP = object()
+
+
+class Channel:
+    """
+    Ein Benachrichtigungskanal. ``send_one(event, timeout)`` und
+    ``send_summary(events, timeout)`` geben True bei Erfolg zurück.
+    """
+
+    def __init__(self, name, send_one, send_summary=None, timeout=5.0):
+        self.name = name
+        self.send_one = send_one
+        self.send_summary = send_summary
+        self.timeout = timeout
+
+    def deliver(self, events):
+        if len(events) == 1 or self.send_summary is None:
+            return all(self.send_one(event, self.timeout) for event in events)
+        return self.send_summary(events, self.timeout)
+
+
+class NotificationDispatcher:
+    """Verteilt Ereignisse asynchron an mehrere Kanäle"""
+
+    def __init__(
+        self,
+        channels,
+        queue_size=DEFAULT_QUEUE_SIZE,
+        coalesce_window=DEFAULT_COALESCE_WINDOW,
+        max_batch=DEFAULT_MAX_BATCH,
+        retries=DEFAULT_RETRIES,
+        backoff=DEFAULT_BACKOFF,
+        outbox=None,
+        requeue_interval=DEFAULT_REQUEUE_INTERVAL,
+        lease=DEFAULT_LEASE,
+    ):
+        self.channels = {channel.name: channel for channel in channels}
+        self.outbox = outbox
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = {
+            name: {"queued": 0, "delivered": 0, "failed": 0, "dropped": 0, "messages": 0}
+            for name in self.channels
+        }
+        self._stats_lock = threading.Lock()
+        self._queues = {name: queue.Queue(maxsize=queue_size) for name in self.channels}
+        # Outbox-IDs, die in diesem Prozess bereits in einer Warteschlange liegen
+        self._queued = set()
+        self._queued_lock = threading.Lock()
+        self._stopping = threading.Event()
+        if outbox is not None:
+            self._replay()
+        self._threads = []
+        for name in self.channels:
+            thread = threading.Thread(
+                target=self._worker, args=(name,), name=f"notify-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self._requeue_thread = None
+        if outbox is not None and requeue_interval:
+            self._requeue_thread = threading.Thread(
+                target=self._requeue, args=(requeue_interval,), name="notify-requeue", daemon=True
+            )
+            self._requeue_thread.start()
+
+    def _count(self, name, field, amount=1):
+        with self._stats_lock:
+            self.stats[name][field] += amount
+
+    def _replay(self):
+        """Reiht fällige, nicht beanspruchte Einträge aus der Outbox erneut ein"""
+        replayed = 0
+        for outbox_id, name, event in self.outbox.due():
+            channel_queue = self._queues.get(name)
+            if channel_queue is None:
+                continue
+            with self._queued_lock:
+                if outbox_id in self._queued:
+                    continue
+                try:
+                    channel_queue.put_nowait((outbox_id, event))
+                except queue.Full:
+                    continue
+                self._queued.add(outbox_id)
+            replayed += 1
+        if replayed:
+            logger.info(f"{replayed} offene Benachrichtigungen aus der Outbox eingereiht")
+
+    def _requeue(self, interval):
+        while not self._stopping.wait(interval):
+            try:
+                self._replay()
+            except Exception as e:
+                logger.warning(f"Outbox konnte nicht gelesen werden: {e}")
+
+    def submit(self, event):
+        """
+        Legt ein Ereignis für alle Kanäle ab (O(Kanäle), ohne Netzwerk).
+        Gibt pro Kanal zurück, ob das Ereignis angenommen wurde. Mit Outbox
+        bleiben abgewiesene Ereignisse gespeichert und werden später zugestellt.
+        """
+        if not self._queues:
+            return {}
+        ids = self.outbox.enqueue(list(self._queues), event) if self.outbox else {}
+        accepted = {}
+        for name, channel_queue in self._queues.items():
+            try:
+                with self._queued_lock:
+                    channel_queue.put_nowait((ids.get(name), event))
+                    if name in ids:
+                        self._queued.add(ids[name])
+                self._count(name, "queued")
+                accepted[name] = True
+            except queue.Full:
+                fate = "bleibt in der Outbox" if self.outbox else "verworfen"
+                logger.warning(f"Benachrichtigungs-Warteschlange {name} voll, Ereignis {fate}")
+                self._count(name, "dropped")
+                accepted[name] = False
+        return accepted
+
+    def _collect_batch(self, channel_queue, first):
+        """Sammelt weitere Ereignisse bis Zeitfenster oder Batchgröße erreicht sind"""
+        batch = [first]
+        deadline = time.monotonic() + self.coalesce_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = channel_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                channel_queue.task_done()
+                channel_queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _claim(self, batch):
+        """Ereignisse, die dieser Dispatcher senden darf (ohne Outbox: alle)"""
+        if self.outbox is None:
+            return batch
+        claimed = set(self.outbox.claim([i for i, _ in batch], self.owner, self.lease))
+        return [item for item in batch if item[0] is None or item[0] in claimed]
+
+    def _deliver(self, name, batch):
+        channel = self.channels[name]
+        ids = [outbox_id for outbox_id, _ in batch]
+        events = [event for _, event in batch]
+        for attempt in range(self.retries + 1):
+            started, error = time.time(), None
+            try:
+                delivered = channel.deliver(events)
+                if not delivered:
+                    error = "Zustellung abgelehnt"
+            except Exception as e:
+                delivered, error = False, str(e)
+            if self.outbox is not None:
+                self.outbox.record_attempt(ids, delivered, started, time.time() - started, error)
+            if delivered:
+                return True
+            logger.warning(f"Zustellung an {name} fehlgeschlagen (Versuch {attempt + 1}): {error}")
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        if self.outbox is not None:
+            # Beim nächsten Einreihen (hier oder in einem anderen Prozess) erneut versuchen
+            self.outbox.release(ids, self.owner)
+        return False
+
+    def _worker(self, name):
+        channel_queue = self._queues[name]
+        while True:
+            item = channel_queue.get()
+            if item is _STOP:
+                channel_queue.task_done()
+                return
+            batch = self._collect_batch(channel_queue, item)
+            try:
+                claimed = self._claim(batch)
+                if claimed:
+                    delivered = self._deliver(name, claimed)
+                    self._count(name, "delivered" if delivered else "failed", len(claimed))
+                    self._count(name, "messages")
+            except Exception as e:
+                logger.warning(f"Zustellung an {name} abgebrochen: {e}")
+            finally:
+                with self._queued_lock:
+                    self._queued.difference_update(outbox_id for outbox_id, _ in batch)
+                for _ in batch:
+                    channel_queue.task_done()
+
+    def flush(self, timeout=None):
+        """Wartet, bis alle abgelegten Ereignisse zugestellt oder verworfen sind"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for channel_queue in self._queues.values():
+            while channel_queue.unfinished_tasks:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout=None):
+        """Stellt ausstehende Ereignisse noch zu und beendet die Worker"""
+        self._stopping.set()
+        if self._requeue_thread is not None:
+            self._requeue_thread.join(timeout)
+        for channel_queue in self._queues.values():
+            channel_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
@@ -0,0 +1,224 @@
+"""
+Persistente Outbox für Benachrichtigungen (SQLite).
+
+Jede Benachrichtigung wird vor der Zustellung pro Kanal gespeichert, jeder
+Zustellversuch mit Dauer und Fehler protokolliert. Nicht zugestellte
+Einträge werden nach einem Neustart erneut eingereiht. Vor dem Senden
+beansprucht ein Dispatcher einen Eintrag atomar mit einer befristeten
+Lease, so dass mehrere Prozesse mit derselben Outbox nie doppelt senden.
+Aus den Daten lassen sich Zustellraten und Latenzen pro Kanal ableiten.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOX_PATH = os.getenv("NOTIFICATION_OUTBOX", "notification_outbox.db")
+
+# Nach so vielen erfolglosen Versuchen gilt eine Benachrichtigung als gescheitert
+MAX_ATTEMPTS = 10
+
+# Sekunden, die ein beanspruchter Eintrag für andere Dispatcher gesperrt bleibt;
+# muss länger sein als eine Zustellung inklusive aller Wiederholungen
+DEFAULT_LEASE = 300.0
+
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT,
+    claimed_by TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_status ON notifications (status, channel);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    notification_id INTEGER NOT NULL REFERENCES notifications (id),
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT
+);
+"""
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class Outbox:
+    """Thread-sichere SQLite-Outbox; eine Verbindung, serialisiert über ein Lock"""
+
+    def __init__(self, path=None, max_attempts=MAX_ATTEMPTS):
+        self.path = path or DEFAULT_OUTBOX_PATH
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Outboxen älterer Versionen ohne Lease-Spalten
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notifications)")}
+        for column, kind in (("claimed_by", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE notifications ADD COLUMN {column} {kind}")
+        self._conn.commit()
+
+    def enqueue(self, channels, event):
+        """Speichert ein Ereignis für mehrere Kanäle; gibt {Kanal: ID} zurück"""
+        payload = json.dumps(event)
+        now = time.time()
+        ids = {}
+        with self._lock:
+            for channel in channels:
+                cursor = self._conn.execute(
+                    "INSERT INTO notifications (channel, payload, created_at) VALUES (?, ?, ?)",
+                    (channel, payload, now),
+                )
+                ids[channel] = cursor.lastrowid
+            self._conn.commit()
+        return ids
+
+    def pending(self, channel=None):
+        """Nicht zugestellte Einträge ``[(id, Kanal, Ereignis)]`` in Eingangsreihenfolge"""
+        query = "SELECT id, channel, payload FROM notifications WHERE status = ?"
+        params = [PENDING]
+        if channel is not None:
+            query += " AND channel = ?"
+            params.append(channel)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+    def due(self):
+        """Offene Einträge ohne gültige Lease ``[(id, Kanal, Ereignis)]``"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, channel, payload FROM notifications WHERE status = ? "
+                "AND (claimed_by IS NULL OR lease_until < ?) ORDER BY id",
+                (PENDING, time.time()),
+            ).fetchall()
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+    def claim(self, ids, owner, lease=DEFAULT_LEASE):
+        """
+        Beansprucht offene Einträge für ``owner``; gibt die IDs zurück, die
+        nicht bereits zugestellt oder von einem anderen Dispatcher belegt sind.
+        """
+        now = time.time()
+        claimed = []
+        with self._lock:
+            for i in ids:
+                if i is None:
+                    continue
+                cursor = self._conn.execute(
+                    "UPDATE notifications SET claimed_by = ?, lease_until = ? "
+                    "WHERE id = ? AND status = ? AND (claimed_by IS NULL OR lease_until < ?)",
+                    (owner, now + lease, i, PENDING, now),
+                )
+                if cursor.rowcount:
+                    claimed.append(i)
+            self._conn.commit()
+        return claimed
+
+    def release(self, ids, owner):
+        """Gibt Einträge nach endgültig fehlgeschlagener Zustellung wieder frei"""
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE notifications SET claimed_by = NULL, lease_until = NULL "
+                "WHERE id = ? AND claimed_by = ?",
+                [(i, owner) for i in ids],
+            )
+            self._conn.commit()
+
+    def record_attempt(self, ids, success, started_at, duration, error=None):
+        """Protokolliert einen (ggf. gebündelten) Zustellversuch für alle IDs"""
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return
+        finished = started_at + duration
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO attempts (notification_id, started_at, duration, success, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(i, started_at, duration, int(success), error) for i in ids],
+            )
+            if success:
+                self._conn.executemany(
+                    "UPDATE notifications SET status = ?, attempts = attempts + 1, "
+                    "delivered_at = ?, last_error = NULL, claimed_by = NULL, "
+                    "lease_until = NULL WHERE id = ?",
+                    [(DELIVERED, finished, i) for i in ids],
+                )
+            else:
+                self._conn.executemany(
+                    "UPDATE notifications SET attempts = attempts + 1, last_error = ?, "
+                    "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END WHERE id = ?",
+                    [(error, self.max_attempts, FAILED, i) for i in ids],
+                )
+            self._conn.commit()
+
+    def metrics(self):
+        """Zustellstatistik pro Kanal inklusive Latenz (Eingang bis Zustellung)"""
+        with self._lock:
+            counts = self._conn.execute(
+                "SELECT channel, status, COUNT(*) FROM notifications GROUP BY channel, status"
+            ).fetchall()
+            latencies = self._conn.execute(
+                "SELECT channel, delivered_at - created_at FROM notifications "
+                "WHERE status = ? ORDER BY channel, 2",
+                (DELIVERED,),
+            ).fetchall()
+            attempts = self._conn.execute(
+                "SELECT n.channel, COUNT(*), SUM(a.success), AVG(a.duration) "
+                "FROM attempts a JOIN notifications n ON n.id = a.notification_id "
+                "GROUP BY n.channel"
+            ).fetchall()
+
+        metrics = {}
+        for channel, status, count in counts:
+            entry = metrics.setdefault(
+                channel, {PENDING: 0, DELIVERED: 0, FAILED: 0, "attempts": 0}
+            )
+            entry[status] = count
+
+        by_channel = {}
+        for channel, latency in latencies:
+            by_channel.setdefault(channel, []).append(latency)
+        for channel, entry in metrics.items():
+            values = by_channel.get(channel, [])
+            entry["latency_p50"] = _percentile(values, 0.5)
+            entry["latency_p95"] = _percentile(values, 0.95)
+            finished = entry[DELIVERED] + entry[FAILED]
+            entry["success_rate"] = entry[DELIVERED] / finished if finished else None
+
+        for channel, total, succeeded, avg_duration in attempts:
+            entry = metrics.get(channel)
+            if entry is not None:
+                entry["attempts"] = total
+                entry["attempt_success_rate"] = (succeeded or 0) / total
+                entry["attempt_duration_avg"] = avg_duration
+        return metrics
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,376 @@
+"""
+Projektbeschreibung und README ohne KI-Anbieter.
+
+Nutzt nur lokal vorhandene Signale: Metadaten aus ``pyproject.toml``,
+``setup.cfg`` und ``package.json``, Docstrings der obersten Python-Module,
+Frameworks aus den deklarierten Abhängigkeiten und Statistiken aus dem
+Datei-Index. Gelesen werden nur die Manifeste im Wurzelverzeichnis und die
+ersten Bytes weniger Module, daher bleibt die Zusammenfassung auch bei großen
+Projekten deutlich unter 100 ms und funktioniert ohne Netzwerk.
+"""
+
+import configparser
+import json
+import logging
+import re
+
+from shared.dependency_files import parse_package_json, parse_pyproject, parse_requirements
+from shared.doc_extractor import is_test_file, module_name
+from shared.file_index import build_file_index
+from shared.generate_readme import (
+    DEFAULT_SECTIONS,
+    DESCRIPTION,
+    build_context,
+    collect_facts,
+    compile_template,
+    render_readme,
+    template_sections,
+)
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+logger = logging.getLogger(__name__)
+
+# Anzahl Module, deren Docstring gelesen wird, und gelesene Bytes pro Modul
+MAX_DOCSTRING_FILES = 12
+DOCSTRING_HEAD_BYTES = 4096
+
+# Maximale Anzahl Module und Tags in der Ausgabe
+MAX_MODULES = 10
+MAX_TAGS = 6
+
+# Module, die ein Projekt typischerweise am besten beschreiben
+ENTRY_MODULES = ("__init__.py", "__main__.py", "main.py", "app.py", "cli.py")
+
+# Abhängigkeit (kleingeschrieben) → angezeigtes Framework
+KNOWN_FRAMEWORKS = {
+    "django": "Django",
+    "flask": "Flask",
+    "fastapi": "FastAPI",
+    "streamlit": "Streamlit",
+    "pandas": "pandas",
+    "numpy": "NumPy",
+    "torch": "PyTorch",
+    "tensorflow": "TensorFlow",
+    "scikit-learn": "scikit-learn",
+    "pytest": "pytest",
+    "react": "React",
+    "vue": "Vue.js",
+    "@angular/core": "Angular",
+    "svelte": "Svelte",
+    "next": "Next.js",
+    "express": "Express",
+    "electron": "Electron",
+    "typescript": "TypeScript",
+    "jest": "Jest",
+}
+
+# Dateiendung → Sprache für die Statistik
+LANGUAGE_NAMES = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".jsx": "JavaScript",
+    ".mjs": "JavaScript",
+    ".ts": "TypeScript",
+    ".tsx": "TypeScript",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".scss": "CSS",
+    ".java": "Java",
+    ".kt": "Kotlin",
+    ".go": "Go",
+    ".rs": "Rust",
+    ".php": "PHP",
+    ".rb": "Ruby",
+    ".c": "C",
+    ".h": "C",
+    ".cpp": "C++",
+    ".hpp": "C++",
+    ".cs": "C#",
+    ".sh": "Shell",
+}
+
+_DOCSTRING_RE = re.compile(
+    rb'\A(?:[ \t]*(?:#[^\n]*)?\r?\n)*[ \t]*[rRuU]?("""|\'\'\')(.*?)\1', re.DOTALL
+)
+_TOML_STRING_RE = r'^{key}\s*=\s*["\'](.*?)["\']\s*$'
+
+
+def _offline_sections(base=DEFAULT_SECTIONS):
+    """Abschnitte des README-Generators plus Module und Statistik"""
+    sections = []
+    for section in base:
+        sections.append(section)
+        if section[0] == "frameworks":
+            sections.append(("modules", "\n## Module\n${modules}", ("modules",)))
+        elif section[0] == "structure":
+            sections.append(("statistics", "\n## Statistik\n${statistics}", ()))
+    return sections
+
+
+OFFLINE_TEMPLATE = compile_template(_offline_sections())
+
+# Projekttyp → (registrierte Abschnitte, kompilierte Offline-Vorlage)
+_offline_templates = {}
+
+
+def offline_template(project_type):
+    """
+    Offline-Vorlage auf Basis der mit ``register_template`` registrierten
+    Vorlage des Projekttyps; ``OFFLINE_TEMPLATE`` für alle anderen Typen.
+    """
+    sections = template_sections(project_type)
+    if sections is None:
+        return OFFLINE_TEMPLATE
+    cached = _offline_templates.get(project_type)
+    # Neu kompilieren, wenn die Vorlage seitdem neu registriert wurde
+    if cached is None or cached[0] is not sections:
+        cached = (sections, compile_template(_offline_sections(sections)))
+        _offline_templates[project_type] = cached
+    return cached[1]
+
+
+def _read_text(index, entry):
+    with open(index.abspath(entry), "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _pyproject_metadata(text):
+    if tomllib is None:
+        metadata = {}
+        for key in ("name", "version", "description"):
+            match = re.search(_TOML_STRING_RE.format(key=key), text, re.MULTILINE)
+            if match:
+                metadata[key] = match.group(1)
+        return metadata
+    data = tomllib.loads(text)
+    project = data.get("project") or data.get("tool", {}).get("poetry", {})
+    return {
+        key: project[key]
+        for key in ("name", "version", "description", "keywords")
+        if project.get(key)
+    }
+
+
+def _setup_cfg_metadata(text):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(text)
+    if not parser.has_section("metadata"):
+        return {}
+    section = parser["metadata"]
+    metadata = {key: section[key] for key in ("name", "version", "description") if section.get(key)}
+    if section.get("keywords"):
+        metadata["keywords"] = [k.strip() for k in section["keywords"].split(",") if k.strip()]
+    return metadata
+
+
+def _package_json_metadata(text):
+    data = json.loads(text)
+    metadata = {
+        key: data[key] for key in ("name", "version", "description", "keywords") if data.get(key)
+    }
+    if isinstance(data.get("scripts"), dict):
+        metadata["scripts"] = data["scripts"]
+    return metadata
+
+
+# Manifest → (Metadaten-Parser, Abhängigkeits-Parser), in Vorrangreihenfolge
+MANIFEST_READERS = {
+    "pyproject.toml": (_pyproject_metadata, parse_pyproject),
+    "setup.cfg": (_setup_cfg_metadata, None),
+    "package.json": (_package_json_metadata, parse_package_json),
+    "requirements.txt": (None, parse_requirements),
+}
+
+
+def read_manifests(index):
+    """
+    Metadaten und Abhängigkeitsnamen aus den Manifesten im Wurzelverzeichnis.
+    Bei mehreren Manifesten gewinnt der erste Wert in ``MANIFEST_READERS``.
+    """
+    root = {entry.name: entry for entry in index.files_in("")}
+    metadata, dependencies = {}, []
+    for name, (read_metadata, read_dependencies) in MANIFEST_READERS.items():
+        entry = root.get(name)
+        if entry is None:
+            continue
+        try:
+            text = _read_text(index, entry)
+            if read_metadata:
+                for key, value in read_metadata(text).items():
+                    metadata.setdefault(key, value)
+            if read_dependencies:
+                dependencies.extend(dep["name"] for dep in read_dependencies(text))
+        except (OSError, ValueError, configparser.Error) as e:
+            logger.warning(f"Manifest {name} nicht lesbar: {e}")
+    return metadata, dependencies
+
+
+def read_module_docstring(path, head_bytes=DOCSTRING_HEAD_BYTES):
+    """Modul-Docstring aus den ersten Bytes einer Python-Datei (ohne Parsen)"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(head_bytes)
+    except OSError:
+        return ""
+    match = _DOCSTRING_RE.match(head.lstrip(b"\xef\xbb\xbf"))
+    if not match:
+        return ""
+    return match.group(2).decode("utf-8", errors="replace").strip()
+
+
+def _first_paragraph(text):
+    paragraph = text.strip().split("\n\n", 1)[0]
+    return " ".join(line.strip() for line in paragraph.splitlines())
+
+
+def module_docstrings(index, limit=MAX_DOCSTRING_FILES):
+    """Docstrings der obersten Module; Einstiegsmodule zuerst"""
+    candidates = [
+        entry
+        for entry in index.by_ext.get(".py", [])
+        if entry.depth <= 1 and not is_test_file(entry.name) and entry.name != "setup.py"
+    ]
+    candidates.sort(key=lambda entry: (entry.name not in ENTRY_MODULES, entry.depth, entry.path))
+    modules = []
+    for entry in candidates[:limit]:
+        docstring = read_module_docstring(index.abspath(entry))
+        if docstring:
+            modules.append(
+                {"path": entry.path, "module": module_name(entry.path), "docstring": docstring}
+            )
+    return modules
+
+
+def file_statistics(index):
+    """Dateianzahl, Gesamtgröße, Sprachen nach Dateianzahl und Testdateien"""
+    languages = {}
+    for ext, entries in index.by_ext.items():
+        language = LANGUAGE_NAMES.get(ext)
+        if language:
+            languages[language] = languages.get(language, 0) + len(entries)
+    return {
+        "file_count": len(index),
+        "total_size": index.total_size,
+        "languages": sorted(languages.items(), key=lambda item: (-item[1], item[0])),
+        "test_files": sum(
+            1
+            for ext in (".py", ".js", ".ts")
+            for entry in index.by_ext.get(ext, [])
+            if is_test_file(entry.name) or ".test." in entry.name or ".spec." in entry.name
+        ),
+    }
+
+
+def summarize_project(index):
+    """
+    Sammelt alle lokalen Signale eines Projekts. ``index`` ist ein
+    ``FileIndex`` oder ein Projektverzeichnis.
+    """
+    if isinstance(index, str):
+        index = build_file_index(index)
+
+    context = build_context(collect_facts(index))
+    metadata, dependencies = read_manifests(index)
+    modules = module_docstrings(index)
+    statistics = file_statistics(index)
+
+    frameworks = [f for f in context["frameworks"].split(", ") if f]
+    for dependency in dependencies:
+        framework = KNOWN_FRAMEWORKS.get(dependency.lower())
+        if framework and framework not in frameworks:
+            frameworks.append(framework)
+
+    description = metadata.get("description") or ""
+    if not description and modules:
+        description = _first_paragraph(modules[0]["docstring"])
+
+    keywords = metadata.get("keywords") or []
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+
+    return {
+        "name": metadata.get("name") or "",
+        "version": metadata.get("version") or "",
+        "description": description,
+        "project_type": context["project_type"],
+        "frameworks": frameworks,
+        "keywords": keywords,
+        "modules": modules,
+        "scripts": metadata.get("scripts") or {},
+        "statistics": statistics,
+        "context": context,
+    }
+
+
+def project_tags(summary, limit=MAX_TAGS):
+    """Tags aus Schlüsselwörtern, Sprachen und Frameworks (ohne Duplikate)"""
+    tags = []
+    candidates = list(summary["keywords"])
+    candidates += [language for language, _ in summary["statistics"]["languages"][:3]]
+    candidates += summary["frameworks"]
+    for tag in candidates:
+        tag = str(tag).strip().lower().replace(" ", "-")
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags[:limit]
+
+
+def _short_description(summary):
+    if summary["description"]:
+        return summary["description"]
+    statistics = summary["statistics"]
+    languages = ", ".join(language for language, _ in statistics["languages"][:2])
+    text = f"{summary['project_type']} mit {statistics['file_count']} Dateien"
+    return f"{text} ({languages})." if languages else f"{text}."
+
+
+def offline_description(summary):
+    """Kurzbeschreibung und Tags im Format der KI-Analyse"""
+    lines = [f"1. {_short_description(summary)}"]
+    if summary["frameworks"]:
+        lines[0] += f" Verwendet {', '.join(summary['frameworks'])}."
+    tags = project_tags(summary)
+    lines.append(f"2. Tags: {', '.join(tags) if tags else '–'}")
+    return "\n".join(lines)
+
+
+def generate_offline_readme(index):
+    """README mit Beschreibung, Modulen und Statistik aus lokalen Signalen"""
+    summary = summarize_project(index)
+    statistics = summary["statistics"]
+
+    context = dict(summary["context"])
+    title = summary["name"] or summary["project_type"]
+    if summary["version"]:
+        title += f" ({summary['version']})"
+    context["title"] = title
+    context["description"] = (
+        f"{summary['description']}\n\n{DESCRIPTION}" if summary["description"] else DESCRIPTION
+    )
+    context["frameworks"] = ", ".join(summary["frameworks"])
+    context["modules"] = "\n".join(
+        f"- `{module['module'] or module['path']}`: {_first_paragraph(module['docstring'])}"
+        for module in summary["modules"][:MAX_MODULES]
+    )
+
+    lines = [
+        f"- Dateien: {statistics['file_count']} "
+        f"({statistics['total_size'] / 1024 / 1024:.1f} MB)"
+    ]
+    if statistics["languages"]:
+        lines.append(
+            "- Sprachen: "
+            + ", ".join(f"{language} ({count})" for language, count in statistics["languages"])
+        )
+    if statistics["test_files"]:
+        lines.append(f"- Testdateien: {statistics['test_files']}")
+    context["statistics"] = "\n".join(lines)
+
+    return render_readme(context, offline_template(summary["project_type"]))
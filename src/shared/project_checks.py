@@ -0,0 +1,568 @@
+"""
+Projektprüfungen und Analysen der Upload-Oberfläche.
+
+Reine Funktionen ohne Streamlit-Abhängigkeit: Projekterkennung, Validierung
+und Tests der Teilprojekte, Sicherheits- und Codeanalysen, Dokumentation
+sowie Auswertung von Git-Fehlern. Als Modul importiert bleiben sie über
+Streamlit-Reruns hinweg im Prozess geladen, statt bei jeder Interaktion mit
+dem Seitenskript neu definiert zu werden.
+"""
+
+import json
+import os
+import re
+import subprocess
+
+from shared.advisory_db import get_database as get_advisory_database
+from shared.dependency_files import audit_dependencies, collect_dependencies
+from shared.doc_extractor import build_symbol_table
+from shared.generate_readme import generate_readme
+from shared.project_detection import detect_project_profile, map_workspaces
+from shared.secret_scanner import scan_directory as scan_secrets
+
+
+def detect_security_issues(project_dir, index=None):
+    """
+    Prüft auf hartcodierte Geheimnisse (bekannte Token-Formate und
+    Strings mit hoher Entropie) und meldet Datei, Zeile und Spalte.
+    """
+    return scan_secrets(project_dir, index=index)
+
+
+def analyze_code_quality(project_dir, project_type):
+    """Analysiert die Codequalität aller Teilprojekte (parallel)"""
+    workspaces = project_type.get("workspaces") or [project_type]
+    results = {"issues": [], "metrics": {}}
+
+    for workspace, ws_results in zip(
+        workspaces,
+        map_workspaces(_analyze_workspace_quality, project_dir, workspaces),
+    ):
+        results["issues"].extend(ws_results["issues"])
+        for file, metrics in ws_results["metrics"].items():
+            key = file if workspace["path"] == "." else f"{workspace['path']}/{file}"
+            results["metrics"][key] = metrics
+
+    return results
+
+
+def _analyze_workspace_quality(project_dir, project_type):
+    """Analysiert die Codequalität eines einzelnen Workspaces"""
+    results = {"issues": [], "metrics": {}}
+
+    if project_type["type"] == "python":
+        # Prüfe mit pylint
+        try:
+            cmd = f"cd {project_dir} && pylint --output-format=json *.py"
+            proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            if proc.returncode != 0:
+                results["issues"].extend(json.loads(proc.stdout))
+        except Exception:
+            pass
+
+        # Berechne Metriken
+        try:
+            import radon.complexity as cc
+
+            for file in project_type["files"]:
+                with open(os.path.join(project_dir, file), "r") as f:
+                    code = f.read()
+                    complexity = cc.cc_visit(code)
+                    avg_complexity = (
+                        sum(item.complexity for item in complexity) / len(complexity)
+                        if complexity
+                        else 0
+                    )
+                    results["metrics"][file] = {"complexity": avg_complexity}
+        except Exception:
+            pass
+
+    elif project_type["type"] == "node":
+        # Prüfe mit ESLint
+        try:
+            cmd = f"cd {project_dir} && npx eslint --format json *.js"
+            proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            if proc.returncode != 0:
+                results["issues"].extend(json.loads(proc.stdout))
+        except Exception:
+            pass
+
+    return results
+
+
+def detect_project_type(project_dir, index=None):
+    """
+    Erkennt den Projekttyp und gibt Konfiguration zurück.
+
+    Durchsucht das Projekt rekursiv und bewertet alle Ökosysteme. Das Ergebnis
+    beschreibt den wichtigsten Workspace und enthält zusätzlich die Rangliste
+    aller Sprachen (``languages``) und alle Teilprojekte (``workspaces``).
+    """
+    profile = detect_project_profile(project_dir, index=index)
+    if not profile["workspaces"]:
+        return None
+
+    # Primärer Workspace: Wurzel, falls sie ein Projekt ist, sonst der höchstbewertete
+    workspaces = profile["workspaces"]
+    primary = next(
+        (ws for ws in workspaces if ws["path"] == "."),
+        max(workspaces, key=lambda ws: ws["score"]),
+    )
+
+    project_type = dict(primary)
+    project_type["languages"] = profile["languages"]
+    project_type["workspaces"] = workspaces
+    project_type["truncated"] = profile["truncated"]
+    return project_type
+
+
+def validate_project(project_dir, project_type):
+    """Validiert ein Projekt inklusive aller Teilprojekte und führt Tests aus"""
+    workspaces = project_type.get("workspaces") or [project_type]
+    if len(workspaces) == 1:
+        return _validate_workspace(
+            os.path.join(project_dir, workspaces[0]["path"]), workspaces[0]
+        )
+
+    # Monorepo: Teilprojekte parallel validieren und Ergebnisse zusammenführen
+    results = {"valid": True, "messages": [], "test_results": None}
+    test_outputs = []
+    for workspace, ws_results in zip(
+        workspaces, map_workspaces(_validate_workspace, project_dir, workspaces)
+    ):
+        label = f"[{workspace['path']} · {workspace['type']}]"
+        results["valid"] = results["valid"] and ws_results["valid"]
+        results["messages"].extend(f"{label} {msg}" for msg in ws_results["messages"])
+        if ws_results["test_results"]:
+            test_outputs.append(f"{label}\n{ws_results['test_results']}")
+
+    if test_outputs:
+        results["test_results"] = "\n\n".join(test_outputs)
+    return results
+
+
+def _validate_workspace(project_dir, project_type):
+    """Validiert einen einzelnen Workspace und führt dessen Tests aus"""
+    results = {"valid": True, "messages": [], "test_results": None}
+
+    if project_type["type"] == "python":
+        # Prüfe Python-Abhängigkeiten
+        if project_type["config"] and project_type["config"] != "requirements.txt":
+            results["messages"].append(f"✅ Konfiguration: {project_type['config']}")
+        elif project_type["config"]:
+            try:
+                req_file = os.path.join(project_dir, "requirements.txt")
+                with open(req_file, "r") as f:
+                    requirements = f.read().splitlines()
+                msg = f"✅ {len(requirements)} Python-Abhängigkeiten gefunden"
+                results["messages"].append(msg)
+            except Exception as e:
+                results["messages"].append("⚠️ Fehler: requirements.txt")
+                results["valid"] = False
+
+        # Führe Python-Tests aus
+        if project_type["test_cmd"]:
+            try:
+                cmd = f"cd {project_dir} && {project_type['test_cmd']}"
+                proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                results["test_results"] = proc.stdout + proc.stderr
+
+                if proc.returncode != 0:
+                    results["valid"] = False
+                    results["messages"].append("❌ Tests fehlgeschlagen")
+                else:
+                    results["messages"].append("✅ Tests erfolgreich")
+            except Exception as e:
+                msg = f"⚠️ Test-Fehler: {str(e)}"
+                results["messages"].append(msg)
+                results["valid"] = False
+
+    elif project_type["type"] == "node":
+        # Prüfe Node.js-Abhängigkeiten
+        try:
+            pkg_file = os.path.join(project_dir, "package.json")
+            with open(pkg_file, "r") as f:
+                package = json.load(f)
+                deps = len(package.get("dependencies", {}))
+                dev_deps = len(package.get("devDependencies", {}))
+                total = deps + dev_deps
+                msg = f"✅ {total} Node.js-Abhängigkeiten gefunden"
+                results["messages"].append(msg)
+        except Exception as e:
+            results["messages"].append("⚠️ Fehler: package.json")
+            results["valid"] = False
+
+        # Führe Node.js-Tests aus
+        if project_type["test_cmd"]:
+            try:
+                cmd = f"cd {project_dir} && {project_type['test_cmd']}"
+                proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                results["test_results"] = proc.stdout + proc.stderr
+
+                if (
+                    "npm ERR!" in proc.stderr
+                    or "FAIL" in proc.stderr
+                    or proc.returncode != 0
+                ):
+                    results["valid"] = False
+                    results["messages"].append("❌ Tests fehlgeschlagen")
+                else:
+                    results["messages"].append("✅ Tests erfolgreich")
+            except Exception as e:
+                msg = f"⚠️ Test-Fehler: {str(e)}"
+                results["messages"].append(msg)
+                results["valid"] = False
+
+    return results
+
+
+def write_workspace_readmes(project_dir, workspaces, file_index):
+    """Erstellt README-Dateien für Teilprojekte ohne eigene README (parallel)"""
+    sub_workspaces = [
+        ws
+        for ws in workspaces
+        if ws["path"] != "."
+        and not any(
+            entry.name.lower() == "readme.md" for entry in file_index.files_in(ws["path"])
+        )
+    ]
+
+    def write(ws_dir, workspace):
+        prefix = workspace["path"] + "/"
+        paths = [entry.path[len(prefix):] for entry in file_index.subtree(workspace["path"])]
+        with open(os.path.join(ws_dir, "README.md"), "w") as f:
+            f.write(generate_readme(paths))
+        return workspace["path"]
+
+    return map_workspaces(write, project_dir, sub_workspaces)
+
+
+def analyze_git_error(error_message):
+    """Analysiert Git-Fehlermeldungen und gibt Lösungsvorschläge zurück"""
+    solutions = []
+    error_str = str(error_message)
+
+    if "fatal: remote origin already exists" in error_str:
+        solutions.append(
+            {
+                "problem": "Das Remote-Repository 'origin' existiert bereits",
+                "solution": "Repository zurücksetzen und neu initialisieren",
+                "action": "git_reset",
+            }
+        )
+    elif "Permission denied (publickey)" in error_str:
+        solutions.append(
+            {
+                "problem": "SSH-Authentifizierungsfehler",
+                "solution": "HTTPS-URL verwenden statt SSH",
+                "action": "use_https",
+            }
+        )
+    elif "fatal: Authentication failed" in error_str:
+        solutions.append(
+            {
+                "problem": "GitHub Token Authentifizierungsfehler",
+                "solution": "Token überprüfen (benötigt 'repo' Scope)",
+                "action": "check_token",
+            }
+        )
+    elif (
+        "rejected] main -> main (fetch first)" in error_str
+        or "non-zero exit status 1" in error_str
+    ):
+        solutions.append(
+            {
+                "problem": "Push wurde abgelehnt - Remote-Repository Konflikt",
+                "solution": "Repository mit force-push synchronisieren",
+                "action": "force_push",
+            }
+        )
+    elif "git push" in error_str:
+        solutions.append(
+            {
+                "problem": "Allgemeiner Git-Push Fehler",
+                "solution": "Repository-Zustand zurücksetzen und neu versuchen",
+                "action": "git_reset",
+            }
+        )
+
+    return solutions
+
+
+def sanitize_repo_name(name):
+    """Bereinigt und validiert Repository-Namen"""
+    if not name:
+        return False, "Kein Repository-Name angegeben"
+
+    # Entferne unerlaubte Zeichen
+    sanitized = re.sub(r"[^a-zA-Z0-9._-]", "-", name)
+
+    # Prüfe Länge
+    if len(sanitized) > 100:
+        return False, "Repository-Name zu lang (max. 100 Zeichen)"
+
+    # Prüfe auf gültige Zeichen am Anfang/Ende
+    if not re.match(r"^[a-zA-Z0-9].*[a-zA-Z0-9]$", sanitized):
+        return False, "Repository-Name muss mit Buchstaben/Zahlen beginnen und enden"
+
+    return True, sanitized
+
+
+def analyze_code_patterns(project_dir):
+    """Analysiert Codemuster und gibt Verbesserungsvorschläge"""
+    patterns = {
+        "hardcoded_config": r"(?:API_KEY|PASSWORD|SECRET)\s*=\s*['\"][^'\"]+['\"]",
+        "large_functions": r"def\s+\w+\s*\([^)]*\):\s*(?:[^}]*?(?:\n\s*[^\n}]+){20,})",
+        "complex_conditions": r"if\s+[^:]+(?:and|or)[^:]+(?:and|or)[^:]+:",
+        "duplicate_code": r"(.{100,}?).*\1",
+    }
+
+    results = []
+
+    for root, _, files in os.walk(project_dir):
+        for file in files:
+            if file.endswith((".py", ".js", ".java")):
+                try:
+                    with open(os.path.join(root, file), "r") as f:
+                        content = f.read()
+
+                        for pattern_name, pattern in patterns.items():
+                            matches = re.finditer(pattern, content, re.MULTILINE)
+                            for match in matches:
+                                results.append(
+                                    {
+                                        "file": file,
+                                        "pattern": pattern_name,
+                                        "line": content.count("\n", 0, match.start())
+                                        + 1,
+                                        "suggestion": get_improvement_suggestion(
+                                            pattern_name
+                                        ),
+                                    }
+                                )
+                except Exception:
+                    pass
+
+    return results
+
+
+def get_improvement_suggestion(pattern_name):
+    """Gibt Verbesserungsvorschläge für erkannte Muster"""
+    suggestions = {
+        "hardcoded_config": "Verwende Umgebungsvariablen oder sichere Konfigurationsdateien",
+        "large_functions": "Teile die Funktion in kleinere, wiederverwendbare Funktionen auf",
+        "complex_conditions": "Vereinfache die Bedingungen oder nutze Hilfsfunktionen",
+        "duplicate_code": "Erstelle eine gemeinsame Funktion für den wiederholten Code",
+    }
+    return suggestions.get(
+        pattern_name, "Überprüfe den Code auf mögliche Verbesserungen"
+    )
+
+
+def analyze_dependencies(project_dir, index=None):
+    """
+    Analysiert Projektabhängigkeiten (inkl. Lockfiles und Teilprojekte) gegen
+    die lokale OSV-Schwachstellen-Datenbank und gibt Empfehlungen
+    """
+    results = {
+        "vulnerabilities": [],
+        "outdated": [],
+        "recommendations": [],
+        "dependency_count": 0,
+        "database": None,
+    }
+
+    dependencies = collect_dependencies(project_dir, index=index)
+    results["dependency_count"] = len(dependencies)
+
+    database = get_advisory_database()
+    if database is not None:
+        results["database"] = len(database)
+        results["vulnerabilities"] = audit_dependencies(dependencies, database)
+
+    for dep in dependencies:
+        # Empfehlungen für bessere Alternativen
+        if dep["name"].lower() == "urllib3":
+            results["recommendations"].append(
+                {
+                    "current": dep["name"] + dep["spec"],
+                    "suggestion": "requests",
+                    "reason": "Einfachere API und bessere Sicherheit",
+                }
+            )
+
+        # Nicht fixierte Node.js-Versionen ohne Lockfile
+        if dep["file"].endswith("package.json") and dep["spec"].startswith("^"):
+            results["recommendations"].append(
+                {
+                    "package": dep["name"],
+                    "current": dep["spec"],
+                    "suggestion": "Fixiere Version für bessere Reproduzierbarkeit",
+                }
+            )
+
+    return results
+
+
+def generate_documentation(project_dir, index=None):
+    """Generiert automatisch Dokumentation für das Projekt"""
+    docs = {
+        "overview": "",
+        "setup": "",
+        "api": [],
+        "examples": [],
+        "symbols": {"modules": []},
+    }
+
+    try:
+        # Projektübersicht
+        readme_path = os.path.join(project_dir, "README.md")
+        if os.path.exists(readme_path):
+            with open(readme_path, "r") as f:
+                content = f.read()
+                docs["overview"] = content
+
+        # Setup-Anleitung
+        setup_steps = []
+        if os.path.exists(os.path.join(project_dir, "requirements.txt")):
+            setup_steps.extend(
+                [
+                    "1. Python-Umgebung erstellen: `python -m venv venv`",
+                    "2. Umgebung aktivieren: `source venv/bin/activate`",
+                    "3. Abhängigkeiten installieren: `pip install -r requirements.txt`",
+                ]
+            )
+        elif os.path.exists(os.path.join(project_dir, "package.json")):
+            setup_steps.extend(
+                [
+                    "1. Node.js installieren",
+                    "2. Abhängigkeiten installieren: `npm install`",
+                    "3. Entwicklungsserver starten: `npm run dev`",
+                ]
+            )
+        docs["setup"] = "\n".join(setup_steps)
+
+        # API-Dokumentation und Beispiele aus einer einzigen AST-Analyse
+        docs["symbols"] = build_symbol_table(project_dir, index=index)
+        for module in docs["symbols"]["modules"]:
+            for function in module["functions"]:
+                if function["docstring"]:
+                    docs["api"].append(
+                        {
+                            "function": function["name"],
+                            "signature": function["signature"],
+                            "description": function["docstring"],
+                            "module": module["module"],
+                        }
+                    )
+            for cls in module["classes"]:
+                if cls["docstring"]:
+                    docs["api"].append(
+                        {
+                            "function": cls["name"],
+                            "signature": f"class {cls['name']}",
+                            "description": cls["docstring"],
+                            "module": module["module"],
+                        }
+                    )
+                for method in cls["methods"]:
+                    if method["docstring"]:
+                        docs["api"].append(
+                            {
+                                "function": f"{cls['name']}.{method['name']}",
+                                "signature": method["signature"],
+                                "description": method["docstring"],
+                                "module": module["module"],
+                            }
+                        )
+
+            # Beispiele aus Testdateien
+            docs["examples"].extend(
+                {"name": test["name"], "code": test["code"]} for test in module["tests"]
+            )
+
+    except Exception:
+        pass
+
+    return docs
+
+
+def analyze_project_structure(project_dir):
+    """Analysiert die Projektstruktur und gibt Empfehlungen"""
+    results = {
+        "structure": [],
+        "recommendations": [],
+        "best_practices": [],
+    }
+
+    try:
+        # Analysiere Verzeichnisstruktur
+        for root, dirs, files in os.walk(project_dir):
+            rel_path = os.path.relpath(root, project_dir)
+            if rel_path == ".":
+                # Hauptverzeichnis
+                if not any(d in dirs for d in ["src", "tests", "docs"]):
+                    results["recommendations"].append(
+                        "Erwäge die Standardordner 'src', 'tests' und 'docs' anzulegen"
+                    )
+
+            # Prüfe auf versteckte Dateien
+            hidden_files = [
+                f
+                for f in files
+                if f.startswith(".") and f not in [".gitignore", ".env.example"]
+            ]
+            if hidden_files:
+                results["recommendations"].append(
+                    f"Überprüfe versteckte Dateien in {rel_path}: {', '.join(hidden_files)}"
+                )
+
+        # Prüfe Best Practices
+        common_files = {
+            "README.md": "Projektdokumentation",
+            ".gitignore": "Git-Ignore Datei",
+            "requirements.txt": "Python Abhängigkeiten",
+            "setup.py": "Python Paket-Setup",
+            "package.json": "Node.js Paket-Info",
+            "Dockerfile": "Container-Definition",
+            "LICENSE": "Lizenzinformation",
+        }
+
+        for file, description in common_files.items():
+            if not os.path.exists(os.path.join(project_dir, file)):
+                results["best_practices"].append(
+                    f"Erwäge das Hinzufügen einer {file} Datei für {description}"
+                )
+
+        # Spezielle Projekttyp-Empfehlungen
+        if os.path.exists(os.path.join(project_dir, "requirements.txt")):
+            results["best_practices"].extend(
+                [
+                    "Nutze virtual environments für Python-Projekte",
+                    "Erwäge die Verwendung von pytest für Tests",
+                    "Füge type hints zu Python-Funktionen hinzu",
+                ]
+            )
+
+        elif os.path.exists(os.path.join(project_dir, "package.json")):
+            results["best_practices"].extend(
+                [
+                    "Nutze ESLint für JavaScript/TypeScript",
+                    "Konfiguriere Prettier für Codeformatierung",
+                    "Erwäge Jest für Tests",
+                ]
+            )
+
+    except Exception as e:
+        results["error"] = str(e)
+
+    return results
+
+
+# KI-Analysen: Name → (Panel-Titel, Analysefunktion)
+ANALYSIS_PANELS = {
+    "code_patterns": ("🔍 Code-Muster", analyze_code_patterns),
+    "dependencies": ("📊 Abhängigkeiten", analyze_dependencies),
+    "documentation": ("📝 Dokumentation", generate_documentation),
+    "structure": ("🏗️ Projektstruktur", analyze_project_structure),
+}
@@ -0,0 +1,263 @@
+"""
+Manifest-basierte Projekttyp-Erkennung mit Unterstützung für mehrsprachige
+Projekte und Monorepos.
+
+Alle Ökosysteme werden in einem einzigen Durchlauf über den Datei-Index
+bewertet. Jedes Verzeichnis mit einer Manifest-Datei (``package.json``,
+``pyproject.toml``, ``Cargo.toml`` …) bildet einen eigenen Workspace.
+"""
+
+import os
+import shlex
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.file_index import DEFAULT_MAX_DEPTH, build_file_index
+
+# Gewichtung einer Manifest-Datei gegenüber einer einzelnen Quelldatei
+MANIFEST_WEIGHT = 10
+
+# Maximale Anzahl paralleler Workspace-Verarbeitungen
+MAX_WORKSPACE_WORKERS = 4
+
+# Ökosystem-Definitionen: Dateiendungen und Manifest-Dateien
+ECOSYSTEMS = {
+    "python": {
+        "extensions": (".py",),
+        "manifests": ("requirements.txt", "setup.py", "pyproject.toml", "setup.cfg", "Pipfile"),
+    },
+    "node": {
+        "extensions": (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"),
+        "manifests": ("package.json",),
+    },
+    "java": {
+        "extensions": (".java", ".kt"),
+        "manifests": ("pom.xml", "build.gradle", "build.gradle.kts"),
+    },
+    "go": {
+        "extensions": (".go",),
+        "manifests": ("go.mod",),
+    },
+    "rust": {
+        "extensions": (".rs",),
+        "manifests": ("Cargo.toml",),
+    },
+}
+
+# Reihenfolge bei Punktgleichstand (entspricht der bisherigen Erkennungsreihenfolge)
+ECOSYSTEM_PRIORITY = ["python", "node", "java", "go", "rust"]
+
+_EXTENSION_MAP = {
+    ext: ecosystem
+    for ecosystem, spec in ECOSYSTEMS.items()
+    for ext in spec["extensions"]
+}
+_MANIFEST_MAP = {
+    manifest: ecosystem
+    for ecosystem, spec in ECOSYSTEMS.items()
+    for manifest in spec["manifests"]
+}
+
+
+def _is_test_file(name):
+    return "test" in name.lower()
+
+
+def _found_manifest(ecosystem, names):
+    """Erste vorhandene Manifest-Datei des Ökosystems (Reihenfolge aus ECOSYSTEMS)"""
+    return next((m for m in ECOSYSTEMS[ecosystem]["manifests"] if m in names), None)
+
+
+def _workspace_config(ecosystem, names, files, has_tests):
+    """Erstellt die Workspace-Konfiguration (kompatibel zum bisherigen Format)"""
+    config = _found_manifest(ecosystem, names) if ecosystem in ECOSYSTEMS else None
+    if ecosystem == "python":
+        return {
+            "config": config,
+            "test_cmd": (
+                "python -m pytest"
+                if any(os.path.basename(f).startswith("test_") for f in files)
+                else None
+            ),
+            "build_system": (
+                "setuptools"
+                if "setup.py" in names
+                else ("poetry" if "pyproject.toml" in names else None)
+            ),
+        }
+    if ecosystem == "node":
+        return {
+            "config": config,
+            "test_cmd": "npm test" if has_tests and config else None,
+            "build_system": (
+                "npm"
+                if "package-lock.json" in names
+                else ("yarn" if "yarn.lock" in names else None)
+            ),
+        }
+    if ecosystem == "java":
+        return {
+            "config": config,
+            "test_cmd": "mvn test" if config == "pom.xml" else ("gradle test" if config else None),
+            "build_system": "maven" if config == "pom.xml" else ("gradle" if config else None),
+        }
+    if ecosystem == "go":
+        return {
+            "config": config,
+            "test_cmd": "go test ./...",
+            "build_system": "go",
+        }
+    if ecosystem == "rust":
+        return {
+            "config": config,
+            "test_cmd": "cargo test" if config else None,
+            "build_system": "cargo" if config else None,
+        }
+    return {"config": None, "test_cmd": None, "build_system": None}
+
+
+def _exclude_nested_workspaces(workspaces):
+    """
+    ``python -m pytest`` im übergeordneten Workspace sammelt sonst auch die
+    Tests eingebetteter Workspaces, die dort ein zweites Mal laufen würden.
+    """
+    for workspace in workspaces:
+        if workspace["type"] != "python" or not workspace["test_cmd"]:
+            continue
+        prefix = "" if workspace["path"] == "." else f"{workspace['path']}/"
+        nested = [
+            other["path"][len(prefix):]
+            for other in workspaces
+            if other is not workspace
+            and other["path"] != "."
+            and other["path"].startswith(prefix)
+        ]
+        if nested:
+            workspace["test_cmd"] += "".join(
+                f" --ignore={shlex.quote(path)}" for path in nested
+            )
+
+
+def _rank(scores):
+    """Sortiert Ökosysteme nach Punktzahl, bei Gleichstand nach Priorität"""
+    return sorted(
+        (eco for eco, score in scores.items() if score > 0),
+        key=lambda eco: (-scores[eco], ECOSYSTEM_PRIORITY.index(eco)),
+    )
+
+
+def detect_project_profile(project_dir, index=None, max_depth=DEFAULT_MAX_DEPTH):
+    """
+    Erstellt ein mehrsprachiges Projektprofil.
+
+    Gibt ein Dict mit ``languages`` (absteigend nach Punktzahl), ``primary``,
+    ``workspaces`` (ein Eintrag je Verzeichnis mit Manifest, plus Wurzel),
+    ``file_count`` und ``truncated`` zurück.
+    """
+    if index is None:
+        index = build_file_index(project_dir, max_depth=max_depth)
+
+    # Ein Durchlauf: Quelldateien und Manifeste je Verzeichnis zählen
+    dir_sources = defaultdict(lambda: defaultdict(list))
+    dir_tests = defaultdict(bool)
+    manifest_dirs = defaultdict(set)
+
+    for entry in index:
+        ecosystem = _EXTENSION_MAP.get(entry.ext)
+        if ecosystem:
+            dir_sources[entry.dir][ecosystem].append(entry.path)
+        if entry.name in _MANIFEST_MAP:
+            manifest_dirs[entry.dir].add(entry.name)
+        if _is_test_file(entry.name):
+            dir_tests[entry.dir] = True
+
+    workspace_roots = set(manifest_dirs) | {""}
+    nearest_cache = {}
+
+    def nearest_workspace(directory):
+        if directory in nearest_cache:
+            return nearest_cache[directory]
+        if directory in workspace_roots:
+            result = directory
+        else:
+            result = nearest_workspace(directory.rpartition("/")[0])
+        nearest_cache[directory] = result
+        return result
+
+    # Verzeichnisstatistiken den Workspaces zuordnen
+    ws_sources = defaultdict(lambda: defaultdict(list))
+    ws_tests = defaultdict(bool)
+    for directory in set(dir_sources) | set(dir_tests):
+        ws = nearest_workspace(directory)
+        for ecosystem, paths in dir_sources[directory].items():
+            ws_sources[ws][ecosystem].extend(paths)
+        ws_tests[ws] = ws_tests[ws] or dir_tests[directory]
+
+    total_scores = Counter()
+    workspaces = []
+    for ws in sorted(workspace_roots):
+        scores = Counter()
+        for ecosystem, paths in ws_sources[ws].items():
+            scores[ecosystem] += len(paths)
+        for manifest in manifest_dirs.get(ws, ()):
+            scores[_MANIFEST_MAP[manifest]] += MANIFEST_WEIGHT
+        total_scores.update(scores)
+
+        ranked = _rank(scores)
+        if not ranked:
+            continue
+
+        ecosystem = ranked[0]
+        prefix = f"{ws}/" if ws else ""
+        files = [path[len(prefix):] for path in ws_sources[ws].get(ecosystem, [])]
+        if ecosystem == "node" and "package.json" in manifest_dirs.get(ws, ()):
+            files = ["package.json"] + files
+        names = {entry.name for entry in index.files_in(ws)}
+
+        workspace = {
+            "path": ws or ".",
+            "type": ecosystem,
+            "files": files,
+            "languages": ranked,
+            "score": scores[ecosystem],
+        }
+        workspace.update(_workspace_config(ecosystem, names, files, ws_tests[ws]))
+        workspaces.append(workspace)
+    _exclude_nested_workspaces(workspaces)
+
+    total = sum(total_scores.values())
+    languages = [
+        {
+            "type": ecosystem,
+            "score": total_scores[ecosystem],
+            "share": round(total_scores[ecosystem] / total, 3) if total else 0.0,
+        }
+        for ecosystem in _rank(total_scores)
+    ]
+
+    return {
+        "languages": languages,
+        "primary": languages[0]["type"] if languages else None,
+        "workspaces": workspaces,
+        "file_count": len(index),
+        "truncated": index.truncated,
+    }
+
+
+def map_workspaces(func, project_dir, workspaces, max_workers=MAX_WORKSPACE_WORKERS):
+    """
+    Führt ``func(workspace_dir, workspace)`` parallel für alle Workspaces aus.
+    Die Ergebnisse werden in der Reihenfolge der Workspaces zurückgegeben.
+    """
+    if not workspaces:
+        return []
+
+    def run(workspace):
+        ws_dir = os.path.normpath(os.path.join(project_dir, workspace["path"]))
+        return func(ws_dir, workspace)
+
+    if len(workspaces) == 1:
+        return [run(workspaces[0])]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(workspaces))) as executor:
+        return list(executor.map(run, workspaces))
@@ -0,0 +1,234 @@
+"""
+Hochladen von Release-Assets zu GitHub.
+
+Dateien werden direkt von der Festplatte gestreamt (konstanter Speicherbedarf
+auch bei AppImages mit mehreren hundert MB) und melden dabei gesendete Bytes.
+Schlägt ein Upload fehl, bleibt bei GitHub oft ein unvollständiges Asset
+gleichen Namens zurück; es wird vor dem nächsten Versuch gelöscht. Mehrere
+Assets werden parallel hochgeladen, der Fortschritt wird im aufrufenden Thread
+gemeldet (Streamlit-Elemente sind nicht thread-sicher).
+"""
+
+import logging
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://api.github.com"
+REQUEST_TIMEOUT = 15
+# (Verbindungsaufbau, Warten auf Antwort) für den eigentlichen Upload
+UPLOAD_TIMEOUT = (10, 600)
+
+CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = 3
+MAX_RETRIES = 3
+RETRY_BACKOFF = 2.0
+
+# Abstand (Sekunden) zwischen zwei Fortschrittsmeldungen bei parallelen Uploads
+PROGRESS_INTERVAL = 0.2
+
+CONTENT_TYPES = {
+    ".appimage": "application/x-executable",
+    ".zip": "application/zip",
+    ".gz": "application/gzip",
+    ".whl": "application/zip",
+}
+
+
+def content_type_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+class ProgressFile:
+    """
+    Dateiobjekt für ``requests``: liest blockweise und meldet nach jedem Block
+    die Summe der gelesenen Bytes an ``callback``. ``__len__`` sorgt für einen
+    ``Content-Length``-Header statt Chunked-Encoding.
+    """
+
+    def __init__(self, path, callback=None, chunk_size=CHUNK_SIZE):
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self.callback = callback
+        self.chunk_size = chunk_size
+        self.sent = 0
+
+    def __len__(self):
+        return self._size
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+        data = self._file.read(size)
+        self.sent += len(data)
+        if data and self.callback is not None:
+            self.callback(self.sent)
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReleaseAssetUploader:
+    """Streamt Assets zu einem Release, mit Wiederholung und parallelen Uploads"""
+
+    def __init__(self, github_token, session=None, max_workers=MAX_WORKERS,
+                 max_retries=MAX_RETRIES, chunk_size=CHUNK_SIZE, backoff=RETRY_BACKOFF):
+        self.session = session or requests.Session()
+        self.token = github_token
+        self.headers = {
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github+json",
+        }
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.backoff = backoff
+
+    def create_release(self, owner, repo, tag, name=None, body="", draft=False, prerelease=False):
+        """Erstellt ein Release; existiert der Tag schon, wird dessen Release geliefert"""
+        url = f"{API_BASE}/repos/{owner}/{repo}/releases"
+        response = self.session.post(
+            url,
+            headers=self.headers,
+            json={
+                "tag_name": tag,
+                "name": name or tag,
+                "body": body,
+                "draft": draft,
+                "prerelease": prerelease,
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+        if response.status_code == 422:
+            existing = self.session.get(
+                f"{url}/tags/{tag}", headers=self.headers, timeout=REQUEST_TIMEOUT
+            )
+            if existing.status_code == 200:
+                return existing.json()
+        if response.status_code != 201:
+            raise RuntimeError(f"Release konnte nicht erstellt werden: {_error_message(response)}")
+        return response.json()
+
+    def _delete_existing(self, release, name):
+        """Löscht ein (ggf. unvollständiges) Asset gleichen Namens"""
+        response = self.session.get(
+            release["assets_url"],
+            headers=self.headers,
+            params={"per_page": 100},
+            timeout=REQUEST_TIMEOUT,
+        )
+        if response.status_code != 200:
+            return False
+        for asset in response.json():
+            if asset["name"] == name:
+                logger.info(f"Lösche unvollständiges Asset {name} ({asset.get('state')})")
+                deleted = self.session.delete(
+                    asset["url"], headers=self.headers, timeout=REQUEST_TIMEOUT
+                )
+                return deleted.status_code == 204
+        return False
+
+    def upload(self, release, path, name=None, label=None, content_type=None, progress=None):
+        """
+        Lädt eine Datei als Asset hoch. ``progress`` wird mit den bisher
+        gesendeten Bytes aufgerufen (bei einem neuen Versuch wieder ab 0).
+        Gibt ``{"name", "path", "success", "message", "download_url", "attempts"}`` zurück.
+        """
+        name = name or os.path.basename(path)
+        params = {"name": name}
+        if label:
+            params["label"] = label
+        headers = {
+            "Authorization": f"token {self.token}",
+            "Content-Type": content_type or content_type_for(path),
+        }
+        upload_url = release["upload_url"].split("{", 1)[0]
+        result = {"name": name, "path": path, "success": False, "message": "",
+                  "download_url": None, "attempts": 0}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff * attempt)
+                self._delete_existing(release, name)
+            result["attempts"] = attempt + 1
+            try:
+                with ProgressFile(path, progress, self.chunk_size) as body:
+                    response = self.session.post(
+                        upload_url,
+                        headers=headers,
+                        params=params,
+                        data=body,
+                        timeout=UPLOAD_TIMEOUT,
+                    )
+            except requests.exceptions.RequestException as e:
+                result["message"] = f"Netzwerkfehler: {e}"
+                continue
+            except OSError as e:
+                result["message"] = f"Datei nicht lesbar: {e}"
+                break
+
+            if response.status_code == 201:
+                result.update(
+                    success=True,
+                    message="",
+                    download_url=response.json().get("browser_download_url"),
+                )
+                return result
+            result["message"] = _error_message(response)
+            # 422: Asset existiert bereits (z. B. Rest eines abgebrochenen Uploads)
+            if response.status_code != 422 and response.status_code < 500:
+                break
+        return result
+
+    def upload_many(self, release, paths, progress=None):
+        """
+        Lädt mehrere Dateien parallel hoch. ``progress`` wird im aufrufenden
+        Thread mit ``(gesendete Bytes, Gesamtbytes)`` aufgerufen. Ergebnisse in
+        der Reihenfolge von ``paths``.
+        """
+        if not paths:
+            return []
+        sent = [0] * len(paths)
+        total = sum(os.path.getsize(path) for path in paths)
+        lock = threading.Lock()
+
+        def tracker(i):
+            def update(count):
+                with lock:
+                    sent[i] = count
+            return update
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(paths)))) as executor:
+            futures = [
+                executor.submit(self.upload, release, path, progress=tracker(i))
+                for i, path in enumerate(paths)
+            ]
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                if progress is not None:
+                    with lock:
+                        done = sum(sent)
+                    progress(min(done, total), total)
+        return [future.result() for future in futures]
+
+
+def _error_message(response):
+    try:
+        return response.json().get("message", f"HTTP {response.status_code}")
+    except ValueError:
+        return response.text[:200] or f"HTTP {response.status_code}"
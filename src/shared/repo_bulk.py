@@ -0,0 +1,364 @@
+"""
+Massenoperationen auf GitHub-Repositories.
+
+Repositories werden per Filter ausgewählt (Namensmuster, Alter, Sprache,
+vom Uploader erstellt), daraus ein Plan erzeugt, der sich als Probelauf
+anzeigen lässt, und der Plan anschließend parallel ausgeführt. Schreibende
+Anfragen werden gedrosselt (GitHub begrenzt sie zusätzlich zum stündlichen
+Kontingent); ``X-RateLimit-*``- und ``Retry-After``-Header werden ausgewertet.
+Jede Aktion liefert ein eigenes Ergebnis für den Abschlussbericht.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import requests
+
+from shared.upload_stats import HISTORY_FILE
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://api.github.com"
+REQUEST_TIMEOUT = 15
+
+# Parallele Anfragen und maximale schreibende Anfragen pro Minute
+MAX_WORKERS = 4
+MUTATIONS_PER_MINUTE = 60
+
+# Unter diesem Restkontingent wird bis zum Reset des Limits pausiert
+RATE_LIMIT_RESERVE = 10
+
+# Längste Pause (Sekunden), bevor eine Aktion als fehlgeschlagen gilt
+MAX_WAIT = 300
+MAX_RETRIES = 3
+
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "failed"
+DRY_RUN = "dry-run"
+
+# Operation → (Beschriftung, benötigt einen Wert)
+OPERATIONS = {
+    "make_private": ("🔒 Privat machen", False),
+    "make_public": ("🌍 Öffentlich machen", False),
+    "archive": ("📦 Archivieren", False),
+    "description": ("📝 Beschreibung setzen", True),
+    "topics": ("🏷️ Topics setzen", True),
+    "delete": ("🗑️ Löschen", False),
+}
+
+
+def _parse_time(value):
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+def uploaded_repo_names(history_file=HISTORY_FILE):
+    """Namen aller erfolgreich vom Uploader erstellten Repositories"""
+    if not os.path.exists(history_file):
+        return set()
+    try:
+        with open(history_file, "r") as f:
+            history = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Upload-Historie nicht lesbar: {e}")
+        return set()
+    return {
+        item["repo_name"]
+        for item in history
+        if item.get("status", "success") == "success" and item.get("repo_name")
+    }
+
+
+def select_repositories(
+    repos,
+    name_pattern=None,
+    min_age_days=None,
+    languages=None,
+    uploaded_only=False,
+    include_archived=False,
+    history_file=HISTORY_FILE,
+    now=None,
+):
+    """
+    Filtert Repositories. ``name_pattern`` ist ein Glob-Muster (``test-*``,
+    ohne Groß-/Kleinschreibung), ``min_age_days`` das Mindestalter seit
+    Erstellung, ``languages`` eine Sprachauswahl (``"Unbekannt"`` für keine).
+    """
+    now = now or datetime.now(timezone.utc)
+    pattern = name_pattern.lower() if name_pattern else None
+    languages = set(languages) if languages else None
+    uploaded = uploaded_repo_names(history_file) if uploaded_only else None
+
+    selected = []
+    for repo in repos:
+        if repo.get("archived") and not include_archived:
+            continue
+        if pattern and not fnmatch.fnmatchcase(repo["name"].lower(), pattern):
+            continue
+        if languages is not None and (repo.get("language") or "Unbekannt") not in languages:
+            continue
+        if uploaded is not None and repo["name"] not in uploaded:
+            continue
+        if min_age_days is not None:
+            created = repo.get("created_at")
+            if not created or (now - _parse_time(created)).days < min_age_days:
+                continue
+        selected.append(repo)
+    return selected
+
+
+def _repo_url(repo):
+    return f"{API_BASE}/repos/{repo['full_name']}"
+
+
+def _plan_item(repo, method, url, payload, change, skip=None):
+    return {
+        "repo": repo["full_name"],
+        "id": repo.get("id"),
+        "method": method,
+        "url": url,
+        "json": payload,
+        "change": change,
+        "skip": skip,
+    }
+
+
+def plan_operation(repos, operation, value=None):
+    """
+    Erstellt den Ausführungsplan (eine Anfrage pro Repository). Aktionen ohne
+    Wirkung, etwa ein bereits privates Repository, werden als ``skip`` markiert.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unbekannte Operation: {operation}")
+
+    plan = []
+    for repo in repos:
+        url = _repo_url(repo)
+        visibility = "Privat" if repo.get("private") else "Öffentlich"
+        if operation in ("make_private", "make_public"):
+            private = operation == "make_private"
+            target = "Privat" if private else "Öffentlich"
+            skip = f"bereits {target.lower()}" if bool(repo.get("private")) == private else None
+            plan.append(
+                _plan_item(repo, "PATCH", url, {"private": private}, f"{visibility} → {target}", skip)
+            )
+        elif operation == "archive":
+            skip = "bereits archiviert" if repo.get("archived") else None
+            plan.append(_plan_item(repo, "PATCH", url, {"archived": True}, "→ archiviert", skip))
+        elif operation == "description":
+            old = repo.get("description") or ""
+            skip = "Beschreibung unverändert" if old == value else None
+            plan.append(
+                _plan_item(
+                    repo, "PATCH", url, {"description": value}, f"„{old}“ → „{value}“", skip
+                )
+            )
+        elif operation == "topics":
+            names = sorted({t.strip().lower() for t in value if t.strip()})
+            old = sorted(repo.get("topics") or [])
+            skip = "Topics unverändert" if old == names else None
+            plan.append(
+                _plan_item(
+                    repo,
+                    "PUT",
+                    f"{url}/topics",
+                    {"names": names},
+                    f"{', '.join(old) or '–'} → {', '.join(names) or '–'}",
+                    skip,
+                )
+            )
+        elif operation == "delete":
+            plan.append(_plan_item(repo, "DELETE", url, None, "→ gelöscht"))
+    return plan
+
+
+class RateLimiter:
+    """
+    Drosselt schreibende Anfragen auf ``per_minute`` und pausiert, wenn das
+    GitHub-Kontingent fast aufgebraucht ist oder ``Retry-After`` gesetzt wird.
+    """
+
+    def __init__(self, per_minute=MUTATIONS_PER_MINUTE, reserve=RATE_LIMIT_RESERVE,
+                 clock=time.time, sleep=time.sleep):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.reserve = reserve
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    def wait(self, max_wait=None):
+        """
+        Reserviert den nächsten Sendezeitpunkt und wartet bis dahin. Gibt
+        False zurück (ohne zu warten), wenn die Wartezeit ``max_wait`` übersteigt.
+        """
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot, self._paused_until)
+            if max_wait is not None and slot - now > max_wait:
+                return False
+            self._next_slot = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+        return True
+
+    def pause_until(self, timestamp):
+        with self._lock:
+            self._paused_until = max(self._paused_until, timestamp)
+
+    def update(self, response):
+        """
+        Wertet die Rate-Limit-Header einer Antwort aus. Gibt die empfohlene
+        Wartezeit zurück, wenn die Anfrage wiederholt werden sollte, sonst None.
+        """
+        headers = response.headers
+        now = self.clock()
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None and int(remaining) <= self.reserve:
+            self.pause_until(float(reset))
+
+        if response.status_code in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif remaining == "0" and reset is not None:
+                delay = max(0.0, float(reset) - now)
+            else:
+                return None
+            self.pause_until(now + delay)
+            return delay
+        return None
+
+
+class BulkExecutor:
+    """Führt einen Plan parallel aus und liefert pro Repository ein Ergebnis"""
+
+    def __init__(self, github_token, session=None, max_workers=MAX_WORKERS, limiter=None,
+                 max_retries=MAX_RETRIES, max_wait=MAX_WAIT):
+        self.session = session or requests.Session()
+        self.headers = {
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github+json",
+        }
+        self.max_workers = max_workers
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+
+    def _execute(self, item):
+        result = {"repo": item["repo"], "id": item["id"], "change": item["change"]}
+        if item["skip"]:
+            return dict(result, status=SKIPPED, code=None, message=item["skip"], repo_data=None)
+
+        started = time.monotonic()
+        code, message = None, ""
+        for attempt in range(self.max_retries + 1):
+            if not self.limiter.wait(self.max_wait):
+                message = "Rate-Limit erschöpft, später erneut versuchen"
+                break
+            try:
+                response = self.session.request(
+                    item["method"],
+                    item["url"],
+                    headers=self.headers,
+                    json=item["json"],
+                    timeout=REQUEST_TIMEOUT,
+                )
+            except requests.exceptions.RequestException as e:
+                message = f"Netzwerkfehler: {e}"
+                continue
+
+            delay = self.limiter.update(response)
+            code = response.status_code
+            if 200 <= code < 300:
+                data = response.json() if code != 204 and response.content else None
+                return dict(
+                    result,
+                    status=OK,
+                    code=code,
+                    message="",
+                    duration=time.monotonic() - started,
+                    repo_data=data if item["method"] == "PATCH" else None,
+                )
+            try:
+                message = response.json().get("message", "Unbekannter Fehler")
+            except ValueError:
+                message = response.text[:200]
+            if delay is None or delay > self.max_wait:
+                break
+            logger.info(f"Rate-Limit bei {item['repo']}, neuer Versuch in {delay:.0f}s")
+
+        return dict(
+            result,
+            status=FAILED,
+            code=code,
+            message=message,
+            duration=time.monotonic() - started,
+            repo_data=None,
+        )
+
+    def execute(self, plan, dry_run=False, progress=None):
+        """
+        Führt den Plan aus. Mit ``dry_run`` wird nichts gesendet; ``progress``
+        wird nach jeder Aktion mit ``(erledigt, gesamt)`` aufgerufen.
+        """
+        if dry_run:
+            return [
+                {
+                    "repo": item["repo"],
+                    "id": item["id"],
+                    "change": item["change"],
+                    "status": SKIPPED if item["skip"] else DRY_RUN,
+                    "code": None,
+                    "message": item["skip"] or f"{item['method']} {item['url']}",
+                    "repo_data": None,
+                }
+                for item in plan
+            ]
+        results = [None] * len(plan)
+        if not plan:
+            return results
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(plan)))) as executor:
+            futures = {executor.submit(self._execute, item): i for i, item in enumerate(plan)}
+            # Fortschritt im aufrufenden Thread melden (Streamlit-Elemente sind nicht thread-sicher)
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done, len(plan))
+        return results
+
+
+def inventory_changes(plan, results):
+    """
+    Änderungen für den Inventar-Cache ``{Repository-ID: Felder oder None}``;
+    None steht für ein gelöschtes Repository.
+    """
+    changes = {}
+    for item, result in zip(plan, results):
+        if result["status"] != OK or item["id"] is None:
+            continue
+        if item["method"] == "DELETE":
+            changes[str(item["id"])] = None
+        elif result["repo_data"]:
+            changes[str(item["id"])] = result["repo_data"]
+        elif item["json"] is not None and "names" in item["json"]:
+            changes[str(item["id"])] = {"topics": item["json"]["names"]}
+        else:
+            changes[str(item["id"])] = item["json"]
+    return changes
+
+
+def summarize_results(results):
+    """Anzahl der Ergebnisse pro Status"""
+    summary = {OK: 0, SKIPPED: 0, FAILED: 0, DRY_RUN: 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return summary
@@ -0,0 +1,241 @@
+"""
+Zwischengespeichertes Repository-Inventar eines GitHub-Accounts.
+
+Die Liste aus ``/user/repos`` wird vollständig über die ``Link``-Paginierung
+geladen (Folgeseiten parallel) und lokal pro Token gespeichert. Spätere
+Aktualisierungen sind inkrementell: Die erste Seite wird mit ``If-None-Match``
+angefragt (304 zählt nicht gegen das Rate-Limit); bei Änderungen werden nur
+so viele nach ``updated`` sortierte Seiten geladen, bis bekannte, unveränderte
+Repositories erreicht sind. Gelöschte Repositories erkennt erst eine
+vollständige Aktualisierung, die nach ``FULL_REFRESH_INTERVAL`` automatisch
+erfolgt.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from shared.github_cache import token_key
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.github.com/user/repos"
+PER_PAGE = 100
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 15
+
+# Lokale Cache-Datei (überschreibbar per Umgebungsvariable)
+DEFAULT_CACHE_PATH = os.getenv("REPO_INVENTORY_CACHE", "repo_inventory_cache.json")
+
+# Nach dieser Zeit (Sekunden) wird statt inkrementell vollständig neu geladen
+FULL_REFRESH_INTERVAL = 24 * 3600
+
+# Im Cache gespeicherte Felder eines Repositories
+REPO_FIELDS = (
+    "id",
+    "name",
+    "full_name",
+    "description",
+    "created_at",
+    "updated_at",
+    "pushed_at",
+    "language",
+    "private",
+    "fork",
+    "archived",
+    "html_url",
+    "clone_url",
+    "default_branch",
+    "stargazers_count",
+    "forks_count",
+    "open_issues_count",
+    "topics",
+)
+
+_file_lock = threading.Lock()
+_memory = {}
+
+
+def _slim(repo):
+    slim = {field: repo.get(field) for field in REPO_FIELDS}
+    slim["owner"] = {"login": (repo.get("owner") or {}).get("login")}
+    return slim
+
+
+def _last_page(response):
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+
+
+def _read_cache_file(path):
+    """Liest die Cache-Datei; im Speicher gehalten, solange sie sich nicht ändert"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _memory.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Repository-Cache {path} nicht lesbar: {e}")
+        data = {}
+    _memory[path] = (mtime, data)
+    return data
+
+
+def _write_cache_file(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+    _memory[path] = (os.stat(path).st_mtime_ns, data)
+
+
+class RepoInventory:
+    """Repository-Liste eines Tokens mit lokalem Cache und inkrementeller Aktualisierung"""
+
+    def __init__(self, github_token, cache_path=None, session=None, max_workers=MAX_WORKERS):
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.key = token_key(github_token)
+        self.max_workers = max_workers
+        self.session = session or requests.Session()
+        self.headers = {
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+        self.requests_made = 0
+
+    def _entry(self):
+        return _read_cache_file(self.cache_path).get(self.key)
+
+    def _save(self, entry):
+        with _file_lock:
+            data = dict(_read_cache_file(self.cache_path))
+            data[self.key] = entry
+            _write_cache_file(self.cache_path, data)
+
+    def cached(self):
+        """Repositories aus dem Cache (ohne Netzwerk), neueste zuerst; None wenn leer"""
+        entry = self._entry()
+        if not entry:
+            return None
+        return sorted(entry["repos"].values(), key=lambda r: r["updated_at"] or "", reverse=True)
+
+    @property
+    def fetched_at(self):
+        entry = self._entry()
+        return entry["fetched_at"] if entry else None
+
+    def _get_page(self, page, etag=None):
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        params = {"per_page": PER_PAGE, "sort": "updated", "direction": "desc", "page": page}
+        self.requests_made += 1
+        response = self.session.get(
+            API_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code not in (200, 304):
+            message = "Unbekannter Fehler"
+            try:
+                message = response.json().get("message", message)
+            except ValueError:
+                pass
+            raise RuntimeError(f"GitHub API-Fehler ({response.status_code}): {message}")
+        return response
+
+    def _full_refresh(self):
+        first = self._get_page(1)
+        last_page = _last_page(first)
+        pages = [first.json()]
+        if last_page > 1:
+            workers = min(self.max_workers, last_page - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = executor.map(self._get_page, range(2, last_page + 1))
+                pages.extend(response.json() for response in responses)
+
+        repos = {str(repo["id"]): _slim(repo) for page in pages for repo in page}
+        logger.info(f"Repository-Inventar vollständig geladen: {len(repos)} Repositories")
+        return first.headers.get("ETag"), repos, len(repos)
+
+    def _incremental_refresh(self, entry):
+        first = self._get_page(1, etag=entry.get("etag"))
+        if first.status_code == 304:
+            return entry.get("etag"), entry["repos"], 0
+
+        repos = dict(entry["repos"])
+        watermark = max((r["updated_at"] or "" for r in repos.values()), default="")
+        last_page = _last_page(first)
+        response, page, changed = first, 1, 0
+        while True:
+            items = response.json()
+            for repo in items:
+                repos[str(repo["id"])] = _slim(repo)
+            newer = [repo for repo in items if (repo.get("updated_at") or "") > watermark]
+            changed += len(newer)
+            # Sortiert nach "updated": ab der ersten bekannten Seite ist alles unverändert
+            if len(newer) < len(items) or page >= last_page:
+                break
+            page += 1
+            response = self._get_page(page)
+
+        logger.info(f"Repository-Inventar aktualisiert: {changed} geänderte Repositories")
+        return first.headers.get("ETag"), repos, changed
+
+    def refresh(self, full=False):
+        """
+        Aktualisiert den Cache und gibt ``(repos, changed)`` zurück.
+        ``changed`` ist die Anzahl neuer oder geänderter Repositories.
+        """
+        entry = self._entry()
+        stale = not entry or time.time() - entry.get("full_at", 0) > FULL_REFRESH_INTERVAL
+        if full or stale:
+            etag, repos, changed = self._full_refresh()
+            full_at = time.time()
+        else:
+            etag, repos, changed = self._incremental_refresh(entry)
+            full_at = entry["full_at"]
+
+        self._save({"etag": etag, "repos": repos, "fetched_at": time.time(), "full_at": full_at})
+        return self.cached(), changed
+
+    def apply_changes(self, changes):
+        """
+        Übernimmt eigene Änderungen ``{ID: Felder oder None}`` in den Cache,
+        ohne neu zu laden; None entfernt ein gelöschtes Repository.
+        """
+        entry = self._entry()
+        if not entry or not changes:
+            return
+        repos = dict(entry["repos"])
+        for repo_id, fields in changes.items():
+            if fields is None:
+                repos.pop(repo_id, None)
+            elif repo_id in repos:
+                repos[repo_id] = dict(
+                    repos[repo_id], **{k: v for k, v in fields.items() if k in REPO_FIELDS}
+                )
+        self._save(dict(entry, repos=repos))
+
+
+def load_inventory(github_token, refresh=False, full=False, cache_path=None):
+    """
+    Repositories eines Tokens: aus dem Cache, oder (bei ``refresh`` bzw. leerem
+    Cache) nach Aktualisierung über die GitHub API.
+    """
+    inventory = RepoInventory(github_token, cache_path=cache_path)
+    repos = None if refresh or full else inventory.cached()
+    if repos is None:
+        repos, _ = inventory.refresh(full=full)
+    return repos
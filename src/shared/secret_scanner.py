@@ -0,0 +1,316 @@
+"""
+Regel- und entropiebasierter Scanner für hartcodierte Geheimnisse.
+
+Dateien werden blockweise gestreamt (konstanter Speicherbedarf), Binärdateien
+per kurzem Sniff übersprungen und Anbieter-Regeln nur ausgewertet, wenn ihr
+Präfix im Block vorkommt. Jeder Fund enthält Datei, Zeile und Spalte.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from shared.analysis_cache import default_cache
+from shared.file_index import build_file_index
+
+# Blockgröße beim Lesen und Anzahl Bytes für die Binärerkennung
+CHUNK_SIZE = 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+
+# Zeilen ohne Umbruch werden spätestens ab dieser Länge als Fragment gescannt
+MAX_LINE_BYTES = 4 * CHUNK_SIZE
+
+# Mindest-Entropie (Bit pro Zeichen) für Zufallsstrings
+ENTROPY_THRESHOLD_BASE64 = 4.5
+ENTROPY_THRESHOLD_HEX = 3.0
+
+# Dateiendungen, die nie Text enthalten und ohne Öffnen übersprungen werden
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".ico", ".pdf",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar", ".tar",
+    ".mp3", ".mp4", ".wav", ".ogg", ".flac", ".avi", ".mkv", ".mov",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".so", ".dll", ".exe", ".bin", ".class", ".jar", ".pyc", ".o", ".a",
+    ".appimage",
+}
+
+# Lockfiles enthalten Integritäts-Hashes; dort keine Entropie-Prüfung
+ENTROPY_SKIP_FILES = {
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "Pipfile.lock",
+    "poetry.lock",
+    "Cargo.lock",
+    "go.sum",
+    "composer.lock",
+}
+
+# Regeln für bekannte Token-Formate:
+# (Regel-ID, Schweregrad, Beschreibung, Vorfilter-Literale, Muster)
+PROVIDER_RULES = [
+    ("github_pat", "critical", "GitHub Personal Access Token (fine-grained)",
+     (b"github_pat_",), rb"github_pat_[A-Za-z0-9_]{22,255}"),
+    ("github_token", "critical", "GitHub Token",
+     (b"ghp_", b"gho_", b"ghu_", b"ghs_", b"ghr_"), rb"gh[pousr]_[A-Za-z0-9]{36,255}"),
+    ("aws_access_key", "critical", "AWS Access Key ID",
+     (b"AKIA", b"ASIA"), rb"(?:AKIA|ASIA)[0-9A-Z]{16}"),
+    ("private_key", "critical", "Privater Schlüssel",
+     (b"PRIVATE KEY",),
+     rb"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----"),
+    ("slack_token", "high", "Slack Token",
+     (b"xox",), rb"xox[baprs]-[A-Za-z0-9-]{10,250}"),
+    ("slack_webhook", "high", "Slack Webhook-URL",
+     (b"hooks.slack.com",), rb"https://hooks\.slack\.com/services/[A-Za-z0-9/_-]{20,}"),
+    ("discord_webhook", "high", "Discord Webhook-URL",
+     (b"/api/webhooks/",),
+     rb"https://(?:ptb\.|canary\.)?discord(?:app)?\.com/api/webhooks/[0-9]+/[A-Za-z0-9_-]{20,}"),
+    ("google_api_key", "high", "Google API Key",
+     (b"AIza",), rb"AIza[0-9A-Za-z_-]{35}"),
+    ("stripe_key", "high", "Stripe Secret Key",
+     (b"_live_",), rb"(?:sk|rk)_live_[0-9A-Za-z]{24,}"),
+    ("openai_key", "high", "OpenAI API Key",
+     (b"T3BlbkFJ",), rb"sk-(?:proj-)?[A-Za-z0-9_-]{20,}T3BlbkFJ[A-Za-z0-9_-]{20,}"),
+    ("openrouter_key", "high", "OpenRouter API Key",
+     (b"sk-or-",), rb"sk-or-v1-[0-9a-f]{64}"),
+    ("jwt", "medium", "JSON Web Token",
+     (b"eyJ",), rb"eyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}"),
+]
+
+# Generische Zuweisung (api_key = "..."), ausgewertet auf dem kleingeschriebenen Block
+GENERIC_RULE = ("generic_secret", "medium", "Mögliches hartcodiertes Geheimnis")
+_GENERIC_RE = re.compile(
+    rb"(?:api[_-]?key|apikey|secret|passw(?:or)?d|token|auth)[a-z0-9_-]{0,20}"
+    rb"[ \t]*[:=][ \t]*[\"']([^\"'\s]{6,200})[\"']"
+)
+
+# Zufallsstrings in Anführungszeichen (Kandidaten für die Entropie-Prüfung)
+ENTROPY_RULE = ("high_entropy", "medium", "String mit hoher Entropie")
+_ENTROPY_RE = re.compile(rb"[\"']([A-Za-z0-9+/=_-]{20,200})[\"']")
+
+_RULE_INFO = {
+    rule_id: (severity, description)
+    for rule_id, severity, description, *_ in PROVIDER_RULES + [GENERIC_RULE, ENTROPY_RULE]
+}
+_PROVIDER_RES = [
+    (rule_id, hints, re.compile(pattern)) for rule_id, _, _, hints, pattern in PROVIDER_RULES
+]
+_HEX_RE = re.compile(rb"[0-9a-fA-F]+")
+
+# Name der Analyse im gemeinsamen Cache
+CACHE_NAME = "secrets"
+
+# Ab dieser Gesamtgröße verteilt scan_directory die Arbeit auf Prozesse
+PROCESS_POOL_THRESHOLD = 64 * 1024 * 1024
+
+
+def shannon_entropy(data):
+    """Shannon-Entropie einer Byte-Folge in Bit pro Zeichen"""
+    if not data:
+        return 0.0
+    length = len(data)
+    return -sum(
+        count / length * math.log2(count / length) for count in Counter(data).values()
+    )
+
+
+def _redact(secret):
+    """Kürzt ein Geheimnis für die Anzeige"""
+    text = secret.decode("utf-8", errors="replace")
+    if len(text) <= 8:
+        return "*" * len(text)
+    return f"{text[:4]}…{text[-4:]}"
+
+
+def _find_candidates(block, check_entropy):
+    """
+    Liefert (Start, Regel-ID, Geheimnis) für alle Treffer eines Blocks.
+
+    Anbieter-Regeln laufen nur, wenn eines ihrer Literale im Block vorkommt.
+    Generische und Entropie-Treffer, die ein bekanntes Token enthalten,
+    werden nicht doppelt gemeldet.
+    """
+    candidates = []
+    provider_spans = []
+
+    for rule_id, hints, pattern in _PROVIDER_RES:
+        if not any(hint in block for hint in hints):
+            continue
+        for match in pattern.finditer(block):
+            candidates.append((match.start(), rule_id, match.group(0)))
+            provider_spans.append((match.start(), match.end()))
+
+    def overlaps_provider(start, end):
+        return any(p_start < end and start < p_end for p_start, p_end in provider_spans)
+
+    for match in _GENERIC_RE.finditer(block.lower()):
+        start, end = match.span(1)
+        if not overlaps_provider(start, end):
+            candidates.append((start, GENERIC_RULE[0], block[start:end]))
+
+    if check_entropy:
+        for match in _ENTROPY_RE.finditer(block):
+            start, end = match.span(1)
+            secret = match.group(1)
+            threshold = (
+                ENTROPY_THRESHOLD_HEX
+                if _HEX_RE.fullmatch(secret)
+                else ENTROPY_THRESHOLD_BASE64
+            )
+            if shannon_entropy(secret) < threshold or overlaps_provider(start, end):
+                continue
+            candidates.append((start, ENTROPY_RULE[0], secret))
+
+    # Zuweisungen mit hoher Entropie nur einmal (als generischen Treffer) melden
+    candidates.sort(key=lambda c: (c[0], c[1] == ENTROPY_RULE[0]))
+    unique = []
+    for candidate in candidates:
+        if unique and unique[-1][0] == candidate[0]:
+            continue
+        unique.append(candidate)
+    return unique
+
+
+def _scan_block(block, rel_path, first_line, col_offset, check_entropy):
+    """Scannt einen Block vollständiger Zeilen"""
+    findings = []
+    line = first_line
+    pos = 0
+    line_start = 0
+
+    for start, rule_id, secret in _find_candidates(block, check_entropy):
+        newlines = block.count(b"\n", pos, start)
+        if newlines:
+            line += newlines
+            line_start = block.rfind(b"\n", pos, start) + 1
+        pos = start
+        column = start - line_start + 1 + (col_offset if line == first_line else 0)
+        severity, description = _RULE_INFO[rule_id]
+        findings.append(
+            {
+                "type": "security",
+                "rule": rule_id,
+                "severity": severity,
+                "file": rel_path,
+                "line": line,
+                "column": column,
+                "secret": _redact(secret),
+                "message": description,
+            }
+        )
+
+    return findings
+
+
+def scan_file(file_path, rel_path=None, chunk_size=CHUNK_SIZE):
+    """
+    Scannt eine einzelne Datei blockweise nach Geheimnissen.
+    Binärdateien werden anhand der ersten Bytes erkannt und übersprungen.
+    """
+    rel_path = rel_path or os.path.basename(file_path)
+    name = os.path.basename(file_path)
+    if os.path.splitext(name)[1].lower() in BINARY_EXTENSIONS:
+        return []
+    check_entropy = name not in ENTROPY_SKIP_FILES
+
+    findings = []
+    line = 1
+    col_offset = 0
+    carry = b""
+
+    try:
+        with open(file_path, "rb") as f:
+            chunk = f.read(chunk_size)
+            if b"\0" in chunk[:BINARY_SNIFF_BYTES]:
+                return []
+
+            while True:
+                final = not chunk
+                data = carry + chunk
+                if final:
+                    block, carry = data, b""
+                else:
+                    cut = data.rfind(b"\n") + 1
+                    if cut == 0 and len(data) < MAX_LINE_BYTES:
+                        carry = data
+                        chunk = f.read(chunk_size)
+                        continue
+                    cut = cut or len(data)
+                    block, carry = data[:cut], data[cut:]
+
+                if block:
+                    findings.extend(_scan_block(block, rel_path, line, col_offset, check_entropy))
+                    newlines = block.count(b"\n")
+                    if newlines:
+                        line += newlines
+                        col_offset = len(block) - block.rfind(b"\n") - 1
+                    else:
+                        col_offset += len(block)
+
+                if final:
+                    break
+                chunk = f.read(chunk_size)
+    except OSError:
+        return []
+
+    return findings
+
+
+def _scan_entry(args):
+    file_path, rel_path = args
+    return scan_file(file_path, rel_path)
+
+
+def scan_directory(
+    project_dir, index=None, max_workers=None, use_processes=None, cache=default_cache
+):
+    """
+    Scannt alle Dateien eines Projekts parallel nach Geheimnissen.
+
+    Da die Regex-Auswertung den GIL hält, werden große Projekte
+    (ab ``PROCESS_POOL_THRESHOLD``) auf mehrere Prozesse verteilt, kleine
+    in einem Thread-Pool gescannt. ``use_processes`` erzwingt eine Variante.
+    Unveränderte Dateien werden aus dem gemeinsamen Analyse-Cache bedient.
+    """
+    if index is None:
+        index = build_file_index(project_dir)
+
+    findings = []
+    jobs = []
+    job_keys = []
+    pending_size = 0
+    for entry in index:
+        if entry.ext in BINARY_EXTENSIONS or entry.size == 0:
+            continue
+        file_path = index.abspath(entry)
+        key = cache.file_key(CACHE_NAME, file_path)
+        found, cached = cache.get(key)
+        if found:
+            findings.extend(cached)
+            continue
+        jobs.append((file_path, entry.path))
+        job_keys.append(key)
+        pending_size += entry.size
+
+    if jobs:
+        if use_processes is None:
+            use_processes = (os.cpu_count() or 1) > 1 and pending_size >= PROCESS_POOL_THRESHOLD
+
+        if use_processes:
+            executor_cls = ProcessPoolExecutor
+            max_workers = max_workers or os.cpu_count() or 1
+        else:
+            executor_cls = ThreadPoolExecutor
+            max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+        with executor_cls(max_workers=max_workers) as executor:
+            for key, file_findings in zip(
+                job_keys, executor.map(_scan_entry, jobs, chunksize=16)
+            ):
+                cache.set(key, file_findings)
+                findings.extend(file_findings)
+
+    findings.sort(key=lambda f: (f["file"], f["line"], f["column"]))
+    return findings
@@ -0,0 +1,153 @@
+"""
+SMTP-Versand mit wiederverwendeten Verbindungen.
+
+Verbindungen werden in einem kleinen Pool gehalten, damit viele
+Benachrichtigungen (z. B. beim Batch-Upload) nicht jedes Mal Verbindungsaufbau,
+TLS-Handshake und Login bezahlen. Länger ungenutzte Verbindungen werden vor
+der Wiederverwendung mit NOOP geprüft.
+"""
+
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_TIMEOUT = 10
+
+# Nach so vielen Sekunden Leerlauf wird eine Verbindung vor Nutzung geprüft
+IDLE_CHECK_AFTER = 30
+
+
+class SMTPSender:
+    """Versendet E-Mails über einen Pool wiederverwendbarer SMTP-Verbindungen"""
+
+    def __init__(
+        self,
+        host,
+        port=587,
+        username=None,
+        password=None,
+        sender=None,
+        starttls=True,
+        use_ssl=False,
+        timeout=DEFAULT_TIMEOUT,
+        pool_size=DEFAULT_POOL_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username or f"zip-uploader@{host}"
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    @classmethod
+    def from_env(cls):
+        """Erstellt einen Sender aus SMTP_* Umgebungsvariablen; None ohne SMTP_HOST"""
+        host = os.getenv("SMTP_HOST")
+        if not host:
+            return None
+        use_ssl = os.getenv("SMTP_SSL", "false").lower() == "true"
+        return cls(
+            host,
+            port=int(os.getenv("SMTP_PORT", "465" if use_ssl else "587")),
+            username=os.getenv("SMTP_USER"),
+            password=os.getenv("SMTP_PASSWORD"),
+            sender=os.getenv("SMTP_FROM"),
+            starttls=os.getenv("SMTP_STARTTLS", "true").lower() == "true",
+            use_ssl=use_ssl,
+        )
+
+    def _connect(self, timeout):
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=timeout)
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=timeout)
+            if self.starttls and connection.has_extn("starttls"):
+                connection.starttls()
+                connection.ehlo()
+        if self.username and self.password:
+            connection.login(self.username, self.password)
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def _acquire(self, timeout):
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(timeout)
+            # Timeout des aktuellen Aufrufs gilt auch für wiederverwendete Verbindungen
+            connection.sock.settimeout(timeout)
+            if time.monotonic() - last_used < IDLE_CHECK_AFTER:
+                return connection
+            try:
+                if connection.noop()[0] == 250:
+                    return connection
+            except smtplib.SMTPException:
+                pass
+            self._discard(connection)
+
+    def _release(self, connection):
+        try:
+            self._idle.put_nowait((connection, time.monotonic()))
+        except queue.Full:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def send(self, recipients, subject, body, timeout=None):
+        """
+        Sendet eine Text-E-Mail; bei getrennter Verbindung einmal mit neuer
+        Verbindung. ``timeout`` (Sekunden) ersetzt für diesen Aufruf ``self.timeout``.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if isinstance(recipients, str):
+            recipients = [r.strip() for r in recipients.split(",") if r.strip()]
+
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(recipients)
+        message["Subject"] = subject
+        message.set_content(body)
+
+        for attempt in range(2):
+            connection = self._acquire(timeout)
+            try:
+                connection.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                connection.close()
+                if attempt == 1:
+                    raise
+                continue
+            except Exception:
+                self._discard(connection)
+                raise
+            self._release(connection)
+            return True
+
+    def close(self):
+        """Schließt alle Verbindungen im Pool"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
@@ -0,0 +1,193 @@
+"""
+Vorberechnete Upload-Statistiken für die Dashboards.
+
+Statt bei jedem Streamlit-Rerun die gesamte Upload-Historie zu parsen und zu
+gruppieren, werden Zähler pro Tag, Woche und Monat fortlaufend beim Abschluss
+eines Uploads aktualisiert. Dashboard-Abfragen kosten damit O(Buckets) statt
+O(Historie). Passt die Statistik nicht zur Historie (z. B. ältere Version
+oder manuell bearbeitete Datei), wird sie einmalig aus der Historie neu
+aufgebaut.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE = "upload_history.json"
+STATS_FILE = "upload_stats.json"
+
+STATS_VERSION = 1
+PERIODS = ("day", "week", "month")
+
+_lock = threading.Lock()
+_memory = {}
+_UNKNOWN = object()
+
+
+def bucket_keys(day):
+    """Bucket-Schlüssel eines Datums für alle Zeiträume"""
+    year, week, _ = day.isocalendar()
+    return {
+        "day": day.isoformat(),
+        "week": f"{year}-W{week:02d}",
+        "month": f"{day.year}-{day.month:02d}",
+    }
+
+
+def _empty_stats():
+    return {
+        "version": STATS_VERSION,
+        "history": None,
+        "total": 0,
+        "success": 0,
+        "failure": 0,
+        "buckets": {period: {} for period in PERIODS},
+    }
+
+
+def file_signature(path):
+    """Größe und Änderungszeit einer Datei (None, wenn sie fehlt)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _add(stats, status, timestamp):
+    outcome = "success" if status == "success" else "failure"
+    stats["total"] += 1
+    stats[outcome] += 1
+    index = 0 if outcome == "success" else 1
+    for period, key in bucket_keys(timestamp.date()).items():
+        counts = stats["buckets"][period].setdefault(key, [0, 0])
+        counts[index] += 1
+
+
+def rebuild_stats(history):
+    """Baut die Statistik einmalig aus einer vollständigen Historie auf"""
+    stats = _empty_stats()
+    for item in history:
+        try:
+            timestamp = datetime.fromisoformat(item["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        _add(stats, item.get("status", "success"), timestamp)
+    return stats
+
+
+def _write(stats_file, stats):
+    tmp_path = f"{stats_file}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(stats, f)
+    os.replace(tmp_path, stats_file)
+    _memory[stats_file] = (file_signature(stats_file), stats)
+
+
+def _read(stats_file):
+    signature = file_signature(stats_file)
+    cached = _memory.get(stats_file)
+    if cached and signature and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(stats_file, "r") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _memory[stats_file] = (signature, stats)
+    return stats
+
+
+def load_stats(history_file=HISTORY_FILE, stats_file=STATS_FILE):
+    """
+    Gibt die aktuelle Statistik zurück. Solange Historie und Statistik
+    zusammenpassen, wird die Historie nicht gelesen.
+    """
+    with _lock:
+        history_signature = file_signature(history_file)
+        stats = _read(stats_file)
+        if (
+            stats is not None
+            and stats.get("version") == STATS_VERSION
+            and stats.get("history") == history_signature
+        ):
+            return stats
+
+        history = []
+        if history_signature is not None:
+            try:
+                with open(history_file, "r") as f:
+                    history = json.load(f)
+            except ValueError:
+                logger.warning("Upload-Historie nicht lesbar, Statistik wird leer aufgebaut")
+
+        logger.info(f"Baue Upload-Statistik aus {len(history)} Historien-Einträgen neu auf")
+        stats = rebuild_stats(history)
+        stats["history"] = history_signature
+        _write(stats_file, stats)
+        return stats
+
+
+def record_upload(status, timestamp=None, history_file=HISTORY_FILE, stats_file=STATS_FILE,
+                  previous=_UNKNOWN):
+    """
+    Zählt einen abgeschlossenen Upload. Wird nach dem Schreiben der Historie
+    aufgerufen, damit Statistik und Historie als konsistent erkannt werden.
+    ``previous`` ist die Signatur der Historie vor diesem Eintrag; passt die
+    Statistik nicht dazu (z. B. Historie von Hand bearbeitet), wird sie aus
+    der Historie neu aufgebaut statt fortgeschrieben.
+    """
+    timestamp = timestamp or datetime.now()
+    with _lock:
+        stats = _read(stats_file)
+        history_signature = file_signature(history_file)
+        if (
+            stats is None
+            or stats.get("version") != STATS_VERSION
+            or (previous is not _UNKNOWN and stats.get("history") != previous)
+        ):
+            stats = None
+        else:
+            stats = json.loads(json.dumps(stats))
+            _add(stats, status, timestamp)
+            stats["history"] = history_signature
+            _write(stats_file, stats)
+    if stats is None:
+        # Noch keine Statistik: einmalig aus der Historie aufbauen
+        stats = load_stats(history_file, stats_file)
+    return stats
+
+
+def rollup(stats, period="day", start=None, end=None):
+    """
+    Zeitreihe ``[(bucket, erfolgreich, fehlgeschlagen), ...]`` eines Zeitraums,
+    aufsteigend sortiert und optional auf [start, end] (Datum) begrenzt.
+    """
+    buckets = stats["buckets"][period]
+    low = bucket_keys(start)[period] if start else None
+    high = bucket_keys(end)[period] if end else None
+    return [
+        (key, counts[0], counts[1])
+        for key, counts in sorted(buckets.items())
+        if (low is None or key >= low) and (high is None or key <= high)
+    ]
+
+
+def count_since(stats, days, today=None):
+    """Anzahl Uploads der letzten ``days`` Tage (inklusive heute)"""
+    today = today or date.today()
+    daily = stats["buckets"]["day"]
+    total = 0
+    for offset in range(days):
+        counts = daily.get((today - timedelta(days=offset)).isoformat())
+        if counts:
+            total += counts[0] + counts[1]
+    return total
+
+
+def success_rate(stats):
+    return stats["success"] / stats["total"] if stats["total"] else 0.0
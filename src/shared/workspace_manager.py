@@ -0,0 +1,325 @@
+"""
+Arbeitsbereiche für Uploads mit Speicherplatzreservierung.
+
+Bevor ein Archiv entpackt wird, reserviert der Aufrufer den Platzbedarf aus
+dem Zentralverzeichnis des ZIP bzw. den Metadaten anderer Archivformate
+(``archive_workspace_size``). Reservierungen
+zählen gegen eine Quote und gegen den freien Platz des jeweiligen Volumes
+abzüglich einer Reserve; passt ein Auftrag gerade nicht, wartet er, bis
+andere Arbeitsbereiche freigegeben werden, statt mitten im Entpacken an
+ENOSPC zu scheitern.
+
+Kleine Aufträge landen auf einem schnellen Volume (standardmäßig
+``/dev/shm``), große auf der Festplatte. Freigegebene Verzeichnisse werden
+geleert und wiederverwendet. Neben jedem Arbeitsbereich liegt eine
+``.pid``-Datei; Arbeitsbereiche beendeter Prozesse (z. B. nach einem
+Absturz) werden beim Start des nächsten Managers entfernt.
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+
+from shared.archive_reader import archive_format, unpacked_size
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+DEFAULT_ROOT = os.getenv("WORKSPACE_DIR") or os.path.join(
+    tempfile.gettempdir(), "zip2gh-workspaces"
+)
+DEFAULT_FAST_ROOT = os.getenv("WORKSPACE_FAST_DIR") or (
+    "/dev/shm/zip2gh-workspaces" if os.path.isdir("/dev/shm") else None
+)
+# Aufträge bis zu dieser Größe laufen auf dem schnellen Volume
+FAST_MAX_SIZE = int(os.getenv("WORKSPACE_FAST_MAX_MB", "64")) * MB
+# Summe aller Reservierungen dieses Prozesses
+QUOTA = int(os.getenv("WORKSPACE_QUOTA_MB", "4096")) * MB
+# Freier Platz, der auf jedem Volume übrig bleiben muss
+MIN_FREE = int(os.getenv("WORKSPACE_MIN_FREE_MB", "256")) * MB
+# Geleerte Verzeichnisse, die zur Wiederverwendung bereitgehalten werden
+POOL_SIZE = int(os.getenv("WORKSPACE_POOL_SIZE", "8"))
+# Maximale Wartezeit auf freien Platz (Sekunden)
+WAIT_TIMEOUT = float(os.getenv("WORKSPACE_WAIT", "300"))
+
+# Rundung pro Datei auf Dateisystemblöcke
+BLOCK_SIZE = 4096
+PREFIX = "zip2gh-ws-"
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+class InsufficientSpace(RuntimeError):
+    """Für den Arbeitsbereich ist (innerhalb der Wartezeit) kein Platz frei"""
+
+
+def archive_workspace_size(archive, include_archive=True):
+    """
+    Platzbedarf eines Archivs: entpackte Dateien (bei ZIP laut
+    Zentralverzeichnis, auf Blockgröße gerundet; sonst laut ``unpacked_size``)
+    plus Git-Objekte in etwa der komprimierten Größe, bei ``include_archive``
+    zusätzlich das Archiv selbst. ``archive`` ist ein Pfad oder ein
+    Datei-Objekt. Ungültige Archive zählen nur mit ihrer Dateigröße; die
+    Validierung meldet den Fehler später.
+    """
+    if isinstance(archive, (str, os.PathLike)):
+        archive_size = os.path.getsize(archive)
+    else:
+        position = archive.tell()
+        archive_size = archive.seek(0, os.SEEK_END)
+        archive.seek(position)
+
+    fmt = archive_format(archive)
+    if fmt is None:
+        return archive_size
+    if fmt != "zip":
+        # Ohne Inhaltsverzeichnis: keine Rundung pro Datei möglich
+        return unpacked_size(archive, fmt) + archive_size * (2 if include_archive else 1)
+
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            infos = zf.infolist()
+    except (zipfile.BadZipFile, OSError):
+        return archive_size
+    finally:
+        if not isinstance(archive, (str, os.PathLike)):
+            archive.seek(position)
+
+    extracted = sum(-(-info.file_size // BLOCK_SIZE) * BLOCK_SIZE for info in infos)
+    compressed = sum(info.compress_size for info in infos)
+    return extracted + compressed + (archive_size if include_archive else 0)
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # os.kill(pid, 0) würde unter Windows den Prozess beenden
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Workspace:
+    """Reserviertes Arbeitsverzeichnis; als Kontextmanager mit automatischer Freigabe"""
+
+    def __init__(self, manager, path, volume, size):
+        self.manager = manager
+        self.path = path
+        self.volume = volume
+        self.size = size
+        self.released = False
+
+    def grow(self, additional, timeout=None):
+        """Erweitert die Reservierung, z. B. sobald die entpackte Größe bekannt ist"""
+        self.manager._reserve(self.volume, additional, timeout, held=self.size)
+        self.size += additional
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.manager._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class WorkspaceManager:
+    """
+    Vergibt Arbeitsverzeichnisse gegen eine Platzquote. ``root`` liegt auf
+    der Festplatte, ``fast_root`` (optional) auf einem schnellen Volume wie
+    tmpfs für Aufträge bis ``fast_max_size``.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, fast_root=DEFAULT_FAST_ROOT,
+                 fast_max_size=FAST_MAX_SIZE, quota=QUOTA, min_free=MIN_FREE,
+                 pool_size=POOL_SIZE, wait_timeout=WAIT_TIMEOUT):
+        self.quota = quota
+        self.min_free = min_free
+        self.pool_size = pool_size
+        self.wait_timeout = wait_timeout
+        self.fast_max_size = fast_max_size
+        self.roots = {"disk": root}
+        if fast_root and fast_max_size > 0:
+            self.roots["fast"] = fast_root
+        self._reserved = {volume: 0 for volume in self.roots}
+        self._pool = {volume: [] for volume in self.roots}
+        self._active = 0
+        self._condition = threading.Condition()
+
+        for volume, path in list(self.roots.items()):
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError as e:
+                if volume == "disk":
+                    raise
+                logger.warning(f"Schnelles Volume {path} nicht nutzbar: {e}")
+                del self.roots[volume]
+                continue
+            self.cleanup_stale(path)
+        atexit.register(self.close)
+
+    def acquire(self, size, fast=None, timeout=None):
+        """
+        Reserviert ``size`` Bytes und gibt einen ``Workspace`` zurück. Ohne
+        ``fast`` entscheidet die Größe über das Volume; ``fast=False``
+        erzwingt die Festplatte (z. B. wenn die endgültige Größe noch
+        unbekannt ist). Wirft ``InsufficientSpace``, wenn die Reservierung
+        nicht innerhalb von ``timeout`` Sekunden möglich ist.
+        """
+        volume = "disk"
+        if "fast" in self.roots and fast is not False and size <= self.fast_max_size:
+            with self._condition:
+                if self._fits("fast", size):
+                    volume = "fast"
+        self._reserve(volume, size, timeout)
+        try:
+            path = self._take_directory(volume)
+        except Exception:
+            with self._condition:
+                self._reserved[volume] -= size
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._active += 1
+        return Workspace(self, path, volume, size)
+
+    def usage(self):
+        """Reservierte Bytes pro Volume, Quote und Anzahl der Arbeitsbereiche"""
+        with self._condition:
+            return {
+                "reserved": dict(self._reserved),
+                "quota": self.quota,
+                "active": self._active,
+                "pooled": sum(len(paths) for paths in self._pool.values()),
+            }
+
+    def _available(self, volume):
+        """
+        Freier Platz des Volumes abzüglich Reserve und aller Reservierungen.
+        Bereits geschriebene Daten zählen dabei doppelt (konservativ).
+        """
+        free = shutil.disk_usage(self.roots[volume]).free
+        return free - self.min_free - self._reserved[volume]
+
+    def _fits(self, volume, size):
+        return (
+            sum(self._reserved.values()) + size <= self.quota
+            and size <= self._available(volume)
+        )
+
+    def _reserve(self, volume, size, timeout, held=0):
+        if size > self.quota:
+            raise InsufficientSpace(
+                f"Arbeitsbereich benötigt {size / MB:.0f} MB, Quote ist {self.quota / MB:.0f} MB"
+            )
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._fits(volume, size):
+                remaining = deadline - time.monotonic()
+                # Ohne fremde Reservierungen wird auch durch Warten nichts frei
+                if remaining <= 0 or sum(self._reserved.values()) <= held:
+                    raise InsufficientSpace(
+                        f"Nicht genug Speicherplatz für {size / MB:.0f} MB in "
+                        f"{self.roots[volume]} (frei: {max(0, self._available(volume)) / MB:.0f} MB)"
+                    )
+                self._condition.wait(min(remaining, 1.0))
+            self._reserved[volume] += size
+
+    def _take_directory(self, volume):
+        with self._condition:
+            if self._pool[volume]:
+                return self._pool[volume].pop()
+        path = os.path.join(self.roots[volume], f"{PREFIX}{uuid.uuid4().hex}")
+        # .pid-Datei zuerst, damit kein Verzeichnis ohne Besitzer entsteht
+        with open(f"{path}.pid", "w") as f:
+            f.write(str(os.getpid()))
+        os.mkdir(path)
+        return path
+
+    def _release(self, workspace):
+        # Inhalt außerhalb der Sperre löschen; erst danach Platz freigeben
+        reusable = True
+        for entry in os.listdir(workspace.path) if os.path.isdir(workspace.path) else []:
+            path = os.path.join(workspace.path, entry)
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                logger.warning(f"Arbeitsbereich {workspace.path} nicht geleert: {e}")
+                reusable = False
+
+        with self._condition:
+            pool = self._pool[workspace.volume]
+            keep = reusable and os.path.isdir(workspace.path) and len(pool) < self.pool_size
+            if keep:
+                pool.append(workspace.path)
+        if not keep:
+            self._remove(workspace.path)
+
+        with self._condition:
+            self._reserved[workspace.volume] -= workspace.size
+            self._active -= 1
+            self._condition.notify_all()
+
+    @staticmethod
+    def _remove(path):
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.remove(f"{path}.pid")
+        except OSError:
+            pass
+
+    def cleanup_stale(self, root):
+        """Entfernt Arbeitsbereiche beendeter Prozesse; gibt deren Anzahl zurück"""
+        removed = 0
+        for name in os.listdir(root):
+            if not (name.startswith(PREFIX) and name.endswith(".pid")):
+                continue
+            path = os.path.join(root, name[: -len(".pid")])
+            try:
+                with open(f"{path}.pid") as f:
+                    pid = int(f.read().strip())
+            except (OSError, ValueError):
+                continue
+            if pid != os.getpid() and not _pid_alive(pid):
+                self._remove(path)
+                removed += 1
+        if removed:
+            logger.info(f"{removed} verwaiste Arbeitsbereiche in {root} entfernt")
+        return removed
+
+    def close(self):
+        """Löscht die bereitgehaltenen Verzeichnisse"""
+        with self._condition:
+            pooled = [path for paths in self._pool.values() for path in paths]
+            for paths in self._pool.values():
+                paths.clear()
+        for path in pooled:
+            self._remove(path)
+
+
+def get_workspace_manager():
+    """Prozessweiter Manager (Konfiguration über ``WORKSPACE_*``)"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = WorkspaceManager()
+        return _default_manager
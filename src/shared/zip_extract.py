@@ -0,0 +1,214 @@
+"""
+Paralleles, begrenztes Entpacken von ZIP-Archiven.
+
+Einträge werden auf mehrere Threads verteilt; jeder Thread öffnet ein
+eigenes ``ZipFile``-Handle, damit Dekomprimierung und Schreiben parallel
+laufen (zlib und Dateisystem geben den GIL frei). Jeder Eintrag wird
+blockweise mit fester Puffergröße geschrieben; die tatsächlich entpackten
+Bytes werden dabei gegen die Limits pro Datei und insgesamt gezählt, so
+dass auch manipulierte Größenangaben im Zentralverzeichnis die Limits nie
+überschreiten. Zielpfade werden vor dem Schreiben aufgelöst; Einträge
+außerhalb des Zielverzeichnisses (``../``, absolute Pfade, Symlinks im
+Pfad) führen zum Abbruch.
+"""
+
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+BUFFER_SIZE = 1024 * 1024
+# Kleine Archive lohnen den Thread-Pool nicht
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+class ExtractionError(ValueError):
+    """Unsicherer Pfad, überschrittenes Limit oder defekter Eintrag beim Entpacken"""
+
+
+def member_error(name, error):
+    """``ExtractionError`` für einen Eintrag, der nicht gelesen oder geschrieben werden kann"""
+    return ExtractionError(f"Eintrag {name} kann nicht entpackt werden: {error}")
+
+
+def resolve_member_path(target, name):
+    """
+    Absoluter Zielpfad eines Eintrags. Wirft ``ExtractionError`` für absolute
+    Pfade, Laufwerksangaben und Pfade, die (auch über vorhandene Symlinks)
+    aus ``target`` herausführen.
+    """
+    if not name or name.startswith(("/", "\\")) or os.path.isabs(name) or ":" in name.split("/")[0]:
+        raise ExtractionError(f"Unsicherer Pfad im Archiv: {name}")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if ".." in parts:
+        raise ExtractionError(f"Unsicherer Pfad im Archiv: {name}")
+
+    root = os.path.realpath(target)
+    path = os.path.realpath(os.path.join(root, *parts)) if parts else root
+    if path != root and os.path.commonpath([root, path]) != root:
+        raise ExtractionError(f"Pfad außerhalb des Zielverzeichnisses: {name}")
+    return path
+
+
+def _preallocate(fd, size):
+    """Reserviert den Platz einer Datei vorab (weniger Fragmentierung, frühes ENOSPC)"""
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        # Nicht unterstützt (z. B. manche Netzlaufwerke): ohne Vorabreservierung weiter
+        if e.errno == 28:
+            raise
+
+
+class ByteBudget:
+    """Gemeinsamer Zähler der tatsächlich entpackten Bytes"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.failed = threading.Event()
+        self._lock = threading.Lock()
+
+    def take(self, size):
+        with self._lock:
+            self.used += size
+            if self.limit is not None and self.used > self.limit:
+                raise ExtractionError(
+                    f"Entpackte Größe überschreitet Limit ({self.limit / 1024 / 1024:.1f} MB)"
+                )
+
+
+def write_member(source, path, name, size, budget, max_file_size=None, buffer_size=BUFFER_SIZE):
+    """
+    Schreibt einen Eintrag blockweise aus ``source`` nach ``path``. ``size``
+    ist die angegebene Größe (nur für die Vorabreservierung, höchstens
+    ``max_file_size``); gezählt werden die gelesenen Bytes. Lese- und
+    Schreibfehler (z. B. CRC-Fehler) werden als ``ExtractionError`` geworfen.
+    """
+    if max_file_size is not None:
+        size = min(size, max_file_size)
+    written = 0
+    try:
+        with open(path, "wb") as out:
+            _preallocate(out.fileno(), size)
+            while True:
+                if budget.failed.is_set():
+                    return written
+                chunk = source.read(buffer_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_file_size is not None and written > max_file_size:
+                    raise ExtractionError(
+                        f"Einzelne Datei zu groß: {name} "
+                        f"(max. {max_file_size / 1024 / 1024:.1f} MB)"
+                    )
+                budget.take(len(chunk))
+                out.write(chunk)
+            # Vorab reservierter Platz über die tatsächliche Länge hinaus
+            out.truncate(written)
+    except (OSError, EOFError, zipfile.BadZipFile) as e:
+        raise member_error(name, e) from e
+    return written
+
+
+def _extract_member(zf, info, path, budget, max_file_size, buffer_size):
+    try:
+        source = zf.open(info)
+    except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+        # Defekter lokaler Header, Verschlüsselung, unbekannte Kompression
+        raise member_error(info.filename, e) from e
+    with source:
+        return write_member(
+            source, path, info.filename, info.file_size, budget, max_file_size, buffer_size
+        )
+
+
+def extract_zip(zip_path, target, max_total_size=None, max_file_size=None,
+                max_files=None, workers=EXTRACT_WORKERS, buffer_size=BUFFER_SIZE):
+    """
+    Entpackt ``zip_path`` nach ``target`` und gibt ``{"files", "directories",
+    "bytes"}`` zurück. Alle Zielpfade werden vor dem ersten Schreiben geprüft;
+    Limits gelten für die tatsächlich entpackten Bytes. Bei einem Fehler
+    bleiben bereits geschriebene Dateien liegen (der Aufrufer verwirft das
+    Zielverzeichnis).
+    """
+    os.makedirs(target, exist_ok=True)
+    with zipfile.ZipFile(zip_path) as zf:
+        infos = zf.infolist()
+
+    if max_files is not None and len(infos) > max_files:
+        raise ExtractionError(f"ZIP enthält zu viele Dateien (max. {max_files})")
+
+    # Pfade prüfen und Verzeichnisse anlegen, bevor Daten geschrieben werden
+    directories, members = set(), []
+    for info in infos:
+        path = resolve_member_path(target, info.filename)
+        if info.is_dir():
+            directories.add(path)
+        else:
+            directories.add(os.path.dirname(path))
+            members.append((info, path))
+    # Datei "a" neben "a/b" oder doppelte Einträge: parallel nicht eindeutig schreibbar
+    seen = set()
+    for info, path in members:
+        if path in directories or path in seen:
+            raise ExtractionError(f"Doppelter oder widersprüchlicher Eintrag: {info.filename}")
+        seen.add(path)
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+    # Symlinks werden nicht entpackt; vorhandene Symlinks im Ziel dürfen
+    # auch nach dem Anlegen der Verzeichnisse nicht umleiten
+    for info, path in members:
+        if os.path.realpath(path) != path:
+            raise ExtractionError(f"Pfad außerhalb des Zielverzeichnisses: {info.filename}")
+
+    declared = sum(info.file_size for info, _ in members)
+    if max_total_size is not None and declared > max_total_size:
+        raise ExtractionError(
+            f"Entpackte Größe überschreitet Limit ({declared / 1024 / 1024:.1f} MB > "
+            f"{max_total_size / 1024 / 1024:.1f} MB)"
+        )
+
+    budget = ByteBudget(max_total_size)
+    workers = max(1, min(workers, len(members)))
+    if workers == 1 or declared < PARALLEL_MIN_BYTES:
+        with zipfile.ZipFile(zip_path) as zf:
+            for info, path in members:
+                _extract_member(zf, info, path, budget, max_file_size, buffer_size)
+        return {"files": len(members), "directories": len(directories), "bytes": budget.used}
+
+    # Ein ZipFile-Handle pro Worker-Thread; große Einträge zuerst für gleichmäßige Auslastung
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def run(info, path):
+        if budget.failed.is_set():
+            return 0
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path)
+            with handles_lock:
+                handles.append(zf)
+        try:
+            return _extract_member(zf, info, path, budget, max_file_size, buffer_size)
+        except Exception:
+            budget.failed.set()
+            raise
+
+    members.sort(key=lambda member: member[0].file_size, reverse=True)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="unzip") as executor:
+            futures = [executor.submit(run, info, path) for info, path in members]
+        # Ersten aufgetretenen Fehler weiterreichen
+        for future in futures:
+            future.result()
+    finally:
+        for zf in handles:
+            zf.close()
+    return {"files": len(members), "directories": len(directories), "bytes": budget.used}
+
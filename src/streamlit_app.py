@@ -1,6 +1,4 @@
 import streamlit as st
-import zipfile
-import tempfile
 import os
 import sys
 import requests
@@ -14,9 +12,22 @@ import altair as alt
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from uploader_utils import create_repo_and_push
+from upload_jobs import extract_uploaded_archive
 from dotenv import load_dotenv
+from shared.archive_reader import FILE, UPLOAD_TYPES, list_members, strip_archive_suffix
+from shared.workspace_manager import archive_workspace_size, get_workspace_manager
 from shared.generate_readme import generate_readme
+from shared.file_index import build_file_index
 from shared.gpt_analysis_github_copilot import analyze_project_with_github_copilot
+from shared.repo_inventory import RepoInventory
+from shared.repo_bulk import (
+    OPERATIONS,
+    BulkExecutor,
+    inventory_changes,
+    plan_operation,
+    select_repositories,
+    summarize_results,
+)
 
 # .env laden
 load_dotenv()
@@ -81,7 +92,9 @@ if page == "Einzelupload":
             "🚫 .gitignore Template", ["Keine", "Python", "Node", "Java"]
         )
 
-    uploaded_zip = st.file_uploader("Wähle eine ZIP-Datei", type="zip")
+    uploaded_zip = st.file_uploader(
+        "Wähle eine ZIP-Datei (auch tar.gz, tar.zst, 7z)", type=UPLOAD_TYPES
+    )
     run_ai = False
 
     if default_copilot_key:
@@ -93,24 +106,20 @@ if page == "Einzelupload":
     if uploaded_zip and github_token and repo_name and github_user:
         # ZIP-Vorschau
         with st.expander("🔍 ZIP-Inhalt Vorschau"):
-            with tempfile.TemporaryDirectory() as tmpdir:
-                zip_path = os.path.join(tmpdir, "upload.zip")
-                with open(zip_path, "wb") as f:
-                    f.write(uploaded_zip.read())
-
-                # ZIP zurücksetzen für späteren Gebrauch
-                uploaded_zip.seek(0)
+            # Liest nur das Inhaltsverzeichnis (tar: ein Durchgang), ohne zu entpacken
+            file_list = [
+                member.name for member in list_members(uploaded_zip) if member.kind == FILE
+            ]
+            # Archiv zurücksetzen für späteren Gebrauch
+            uploaded_zip.seek(0)
 
-                with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                    file_list = zip_ref.namelist()
+            # Zeige die ersten 20 Dateien
+            st.write(f"Archiv enthält {len(file_list)} Dateien:")
+            for file in file_list[:20]:
+                st.write(f"- {file}")
 
-                    # Zeige die ersten 20 Dateien
-                    st.write(f"ZIP enthält {len(file_list)} Dateien:")
-                    for file in file_list[:20]:
-                        st.write(f"- {file}")
-
-                    if len(file_list) > 20:
-                        st.write(f"... und {len(file_list) - 20} weitere Dateien")
+            if len(file_list) > 20:
+                st.write(f"... und {len(file_list) - 20} weitere Dateien")
 
         if st.button("🚀 Projekt hochladen und GitHub-Repo erstellen"):
             with st.spinner("Wird verarbeitet..."):
@@ -119,28 +128,16 @@ if page == "Einzelupload":
                     progress_bar = st.progress(0)
                     status_text = st.empty()
 
-                    # Schritt 1: ZIP entpacken
-                    status_text.text("📦 Entpacke ZIP-Datei...")
+                    # Schritt 1: Archiv entpacken
+                    status_text.text("📦 Entpacke Archiv...")
                     progress_bar.progress(0.1)
                     time.sleep(0.5)
 
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        # ZIP speichern und entpacken
-                        zip_path = os.path.join(tmpdir, "upload.zip")
-                        with open(zip_path, "wb") as f:
-                            f.write(uploaded_zip.read())
-                        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                            zip_ref.extractall(tmpdir)
-
-                        # Projektverzeichnis ermitteln
-                        entries = os.listdir(tmpdir)
-                        dirs = [
-                            d
-                            for d in entries
-                            if os.path.isdir(os.path.join(tmpdir, d))
-                            and d != "__MACOSX"
-                        ]
-                        project_dir = os.path.join(tmpdir, dirs[0]) if dirs else tmpdir
+                    # Platz für Archiv und entpackten Inhalt vorab reservieren
+                    size = archive_workspace_size(uploaded_zip)
+                    with get_workspace_manager().acquire(size) as workspace:
+                        # Archiv speichern und mit Pfad- und Größenprüfung entpacken
+                        project_dir = extract_uploaded_archive(uploaded_zip, workspace.path)
 
                         # Schritt 2: README-Generierung
                         status_text.text("📝 Generiere README...")
@@ -160,7 +157,7 @@ if page == "Einzelupload":
                         else:
                             readme_option = "Überschreiben"
 
-                        generated = generate_readme(os.listdir(project_dir))
+                        generated = generate_readme(build_file_index(project_dir))
                         if readme_option == "Überschreiben":
                             with open(os.path.join(project_dir, "README.md"), "w") as f:
                                 f.write(generated)
@@ -278,7 +275,9 @@ elif page == "Batch-Upload":
 
     # Batch-Upload
     uploaded_files = st.file_uploader(
-        "Mehrere ZIP-Dateien auswählen", type="zip", accept_multiple_files=True
+        "Mehrere ZIP-Dateien auswählen (auch tar.gz, tar.zst, 7z)",
+        type=UPLOAD_TYPES,
+        accept_multiple_files=True,
     )
 
     if uploaded_files and github_token and github_user:
@@ -287,7 +286,7 @@ elif page == "Batch-Upload":
 
         preview_data = []
         for i, file in enumerate(uploaded_files):
-            repo_name = file.name.replace(".zip", "").replace(" ", "-")
+            repo_name = strip_archive_suffix(file.name).replace(" ", "-")
             preview_data.append(
                 {
                     "Nr.": i + 1,
@@ -306,34 +305,21 @@ elif page == "Batch-Upload":
             results = []
 
             for i, file in enumerate(uploaded_files):
-                repo_name = file.name.replace(".zip", "").replace(" ", "-")
+                repo_name = strip_archive_suffix(file.name).replace(" ", "-")
                 status_text.text(
                     f"Verarbeite {file.name} ({i+1}/{len(uploaded_files)})..."
                 )
 
                 try:
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        # ZIP speichern und entpacken
-                        zip_path = os.path.join(tmpdir, file.name)
-                        with open(zip_path, "wb") as f:
-                            f.write(file.read())
-
-                        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                            zip_ref.extractall(tmpdir)
-
-                        # Projektverzeichnis ermitteln
-                        entries = os.listdir(tmpdir)
-                        dirs = [
-                            d
-                            for d in entries
-                            if os.path.isdir(os.path.join(tmpdir, d))
-                            and d != "__MACOSX"
-                        ]
-                        project_dir = os.path.join(tmpdir, dirs[0]) if dirs else tmpdir
+                    # Platz für Archiv und entpackten Inhalt vorab reservieren
+                    size = archive_workspace_size(file)
+                    with get_workspace_manager().acquire(size) as workspace:
+                        # Archiv speichern und mit Pfad- und Größenprüfung entpacken
+                        project_dir = extract_uploaded_archive(file, workspace.path)
 
                         # README generieren
                         if auto_init:
-                            generated = generate_readme(os.listdir(project_dir))
+                            generated = generate_readme(build_file_index(project_dir))
                             with open(os.path.join(project_dir, "README.md"), "w") as f:
                                 f.write(generated)
 
@@ -476,91 +462,86 @@ elif page == "Dashboard":
 
     with tab2:
         st.header("🔍 Repository-Liste")
-        
+
         # Token-Validierung
         if not github_token or not github_user:
             st.warning("⚠️ Bitte gib GitHub-Token und Benutzername ein.")
-        else:
-            if st.button("🔄 Repositories laden"):
-                with st.spinner("Lade Repositories..."):
-                    headers = {"Authorization": f"token {github_token}"}
-                    
-                    # Teste zuerst die Token-Gültigkeit
-                    auth_test = requests.get("https://api.github.com/user", headers=headers)
-                    if auth_test.status_code != 200:
-                        st.error(f"❌ Token ungültig! Status: {auth_test.status_code}")
-                    else:
-                        auth_user = auth_test.json()
-                        st.success(f"✅ Token gültig für Benutzer: {auth_user['login']}")
-                        
-                        # Verwende die authentifizierte API um auch private Repos zu sehen
-                        response = requests.get(
-                            "https://api.github.com/user/repos?per_page=100&sort=updated",
-                            headers=headers,
-                        )
-                        
-                        st.write(f"**Debug Info:** Status Code: {response.status_code}")
-                        
-                        if response.status_code == 200:
-                            repos = response.json()
-                            st.success(f"✅ {len(repos)} Repositories gefunden")
-                            
-                            # Filter nur die Repos des gewünschten Users (falls Token Zugriff auf andere Orgs hat)
-                            user_repos = [repo for repo in repos if repo["owner"]["login"] == github_user]
-                            st.info(f"📊 Davon {len(user_repos)} Repositories von {github_user}")
-
-                    # Daten für Tabelle vorbereiten (verwende gefilterte user_repos)
-                    repo_data = []
-                    for repo in user_repos:
-                        repo_data.append(
-                            {
-                                "Name": repo["name"],
-                                "Beschreibung": repo["description"] or "",
-                                "Erstellt am": repo["created_at"],
-                                "Sprache": repo["language"] or "Unbekannt",
-                                "Sichtbarkeit": (
-                                    "Privat" if repo["private"] else "Öffentlich"
-                                ),
-                                "URL": repo["html_url"],
-                            }
-                        )
+        elif st.button("🔄 Repositories laden"):
+            response = None
+            with st.spinner("Lade Repositories..."):
+                headers = {"Authorization": f"token {github_token}"}
+
+                # Teste zuerst die Token-Gültigkeit
+                auth_test = requests.get("https://api.github.com/user", headers=headers)
+                if auth_test.status_code != 200:
+                    st.error(f"❌ Token ungültig! Status: {auth_test.status_code}")
+                else:
+                    auth_user = auth_test.json()
+                    st.success(f"✅ Token gültig für Benutzer: {auth_user['login']}")
 
-                    # Tabelle anzeigen
-                    if repo_data:
-                        df = pd.DataFrame(repo_data)
-                        st.dataframe(df)
+                    # Verwende die authentifizierte API um auch private Repos zu sehen
+                    response = requests.get(
+                        "https://api.github.com/user/repos?per_page=100&sort=updated",
+                        headers=headers,
+                    )
 
-                        # Sprachverteilung nur anzeigen wenn Daten vorhanden
-                        st.subheader("Sprachverteilung")
-                        try:
-                            if "Sprache" in df.columns and len(df) > 0:
-                                lang_counts = df["Sprache"].value_counts()
-                                if len(lang_counts) > 0:
-                                    st.bar_chart(lang_counts)
-                                else:
-                                    st.info("Keine Sprachdaten verfügbar.")
-                            else:
-                                st.info("Keine Sprachdaten verfügbar.")
-                        except Exception as e:
-                            st.warning(f"Fehler bei der Sprachverteilung: {e}")
-                            st.info("Sprachverteilung konnte nicht angezeigt werden.")
-                    else:
-                        st.info("Keine Repository-Daten gefunden.")
+            if response is not None and response.status_code == 200:
+                repos = response.json()
+                st.success(f"✅ {len(repos)} Repositories gefunden")
 
-                else:
-                    st.error(f"❌ Fehler beim Laden der Repositories: {response.status_code}")
-                    
-                    # Zeige detaillierte Fehlerinformationen
+                # Filter nur die Repos des gewünschten Users (falls Token Zugriff auf andere Orgs hat)
+                user_repos = [repo for repo in repos if repo["owner"]["login"] == github_user]
+                st.info(f"📊 Davon {len(user_repos)} Repositories von {github_user}")
+
+                # Daten für Tabelle vorbereiten (verwende gefilterte user_repos)
+                repo_data = []
+                for repo in user_repos:
+                    repo_data.append(
+                        {
+                            "Name": repo["name"],
+                            "Beschreibung": repo["description"] or "",
+                            "Erstellt am": repo["created_at"],
+                            "Sprache": repo["language"] or "Unbekannt",
+                            "Sichtbarkeit": (
+                                "Privat" if repo["private"] else "Öffentlich"
+                            ),
+                            "URL": repo["html_url"],
+                        }
+                    )
+
+                # Tabelle anzeigen
+                if repo_data:
+                    df = pd.DataFrame(repo_data)
+                    st.dataframe(df)
+
+                    # Sprachverteilung nur anzeigen wenn Daten vorhanden
+                    st.subheader("Sprachverteilung")
                     try:
-                        error_data = response.json()
-                        st.write(f"**Fehlerdetails:** {error_data.get('message', 'Unbekannter Fehler')}")
-                    except:
-                        st.write(f"**Antworttext:** {response.text[:200]}...")
-                    
-                    st.info("💡 Mögliche Lösungen:")
-                    st.write("- Prüfe ob das GitHub-Token gültig ist")
-                    st.write("- Stelle sicher, dass das Token 'repo' Berechtigung hat")
-                    st.write("- Prüfe ob der Benutzername korrekt ist")
+                        lang_counts = df["Sprache"].value_counts()
+                        if len(lang_counts) > 0:
+                            st.bar_chart(lang_counts)
+                        else:
+                            st.info("Keine Sprachdaten verfügbar.")
+                    except Exception as e:
+                        st.warning(f"Fehler bei der Sprachverteilung: {e}")
+                        st.info("Sprachverteilung konnte nicht angezeigt werden.")
+                else:
+                    st.info("Keine Repository-Daten gefunden.")
+
+            elif response is not None:
+                st.error(f"❌ Fehler beim Laden der Repositories: {response.status_code}")
+
+                # Zeige detaillierte Fehlerinformationen
+                try:
+                    error_data = response.json()
+                    st.write(f"**Fehlerdetails:** {error_data.get('message', 'Unbekannter Fehler')}")
+                except ValueError:
+                    st.write(f"**Antworttext:** {response.text[:200]}...")
+
+                st.info("💡 Mögliche Lösungen:")
+                st.write("- Prüfe ob das GitHub-Token gültig ist")
+                st.write("- Stelle sicher, dass das Token 'repo' Berechtigung hat")
+                st.write("- Prüfe ob der Benutzername korrekt ist")
 
     with tab3:
         st.header("📜 Upload-Historie")
@@ -676,3 +657,120 @@ elif page == "Dashboard":
                                 )
             else:
                 st.error(f"Repository nicht gefunden: {response.status_code}")
+
+        # Massenoperationen über mehrere Repositories
+        st.markdown("---")
+        st.subheader("🧰 Massenoperationen")
+
+        if not github_token or not github_user:
+            st.warning("⚠️ Bitte gib GitHub-Token und Benutzername ein.")
+        else:
+            inventory = RepoInventory(github_token)
+            refresh_inventory = st.button("🔄 Inventar aktualisieren", key="bulk_refresh")
+            all_repos = None if refresh_inventory else inventory.cached()
+            if all_repos is None:
+                try:
+                    with st.spinner("Lade Repositories..."):
+                        all_repos, _ = inventory.refresh()
+                except (RuntimeError, requests.exceptions.RequestException) as e:
+                    st.error(f"❌ Fehler beim Laden: {e}")
+                    all_repos = []
+            user_repos = [repo for repo in all_repos if repo["owner"]["login"] == github_user]
+
+            col1, col2 = st.columns(2)
+            with col1:
+                name_pattern = st.text_input("Namensmuster", placeholder="z. B. test-*")
+                min_age_days = st.number_input(
+                    "Mindestalter (Tage, 0 = egal)", min_value=0, value=0, step=1
+                )
+            with col2:
+                bulk_languages = st.multiselect(
+                    "Sprachen",
+                    sorted({repo["language"] or "Unbekannt" for repo in user_repos}),
+                )
+                uploaded_only = st.checkbox("Nur vom Uploader erstellte Repositories")
+                include_archived = st.checkbox("Archivierte einbeziehen")
+
+            selected = select_repositories(
+                user_repos,
+                name_pattern=name_pattern or None,
+                min_age_days=min_age_days or None,
+                languages=bulk_languages,
+                uploaded_only=uploaded_only,
+                include_archived=include_archived,
+            )
+            st.write(f"**{len(selected)}** von {len(user_repos)} Repositories ausgewählt")
+
+            operation = st.selectbox(
+                "Aktion", list(OPERATIONS), format_func=lambda op: OPERATIONS[op][0]
+            )
+            value = None
+            if operation == "description":
+                value = st.text_input("Neue Beschreibung")
+            elif operation == "topics":
+                value = [t for t in st.text_input("Topics (kommagetrennt)").split(",") if t.strip()]
+
+            plan = plan_operation(selected, operation, value)
+            dry_run = st.checkbox("🧪 Probelauf (nichts ändern)", value=True)
+            confirm = ""
+            if operation == "delete" and not dry_run:
+                st.warning("⚠️ Löschen kann nicht rückgängig gemacht werden!")
+                confirm = st.text_input('Zum Bestätigen "LÖSCHEN" eingeben')
+
+            with st.expander(f"📋 Vorschau ({len(plan)} Aktionen)", expanded=dry_run):
+                if plan:
+                    st.dataframe(
+                        pd.DataFrame(
+                            [
+                                {
+                                    "Repository": item["repo"],
+                                    "Änderung": item["change"],
+                                    "Hinweis": item["skip"] or "",
+                                }
+                                for item in plan
+                            ]
+                        )
+                    )
+                else:
+                    st.info("Keine Repositories ausgewählt.")
+
+            if plan and st.button("▶️ Ausführen", key="bulk_execute"):
+                if operation == "delete" and not dry_run and confirm != "LÖSCHEN":
+                    st.error('❌ Bitte "LÖSCHEN" zur Bestätigung eingeben.')
+                else:
+                    progress_bar = st.progress(0)
+                    results = BulkExecutor(github_token).execute(
+                        plan,
+                        dry_run=dry_run,
+                        progress=lambda done, total: progress_bar.progress(done / total),
+                    )
+                    progress_bar.progress(1.0)
+                    if not dry_run:
+                        inventory.apply_changes(inventory_changes(plan, results))
+
+                    summary = summarize_results(results)
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("✅ Erfolgreich", summary["ok"])
+                    col2.metric("🧪 Probelauf", summary["dry-run"])
+                    col3.metric("⏭️ Übersprungen", summary["skipped"])
+                    col4.metric("❌ Fehlgeschlagen", summary["failed"])
+
+                    report = pd.DataFrame(
+                        [
+                            {
+                                "Repository": result["repo"],
+                                "Änderung": result["change"],
+                                "Status": result["status"],
+                                "HTTP": result["code"] or "",
+                                "Meldung": result["message"],
+                            }
+                            for result in results
+                        ]
+                    )
+                    st.dataframe(report)
+                    st.download_button(
+                        label="📥 Bericht als CSV herunterladen",
+                        data=report.to_csv(index=False),
+                        file_name=f"bulk_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv",
+                    )
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+HTTP-API für den ZIP-to-GitHub Uploader.
+
+Uploads werden als ``multipart/form-data`` blockweise auf die Festplatte
+gestreamt (mit SHA-256 und Größenlimit während des Empfangs) und als
+Auftrag in eine Warteschlange gestellt. Die Antwort kommt sofort mit
+``202 Accepted`` und einer Auftrags-ID; Validierung, README und Push laufen
+im Worker-Pool.
+
+Endpunkte:
+    POST /uploads     Felder: file (ZIP, tar.gz, tar.zst, 7z …), repo_name, private, readme
+    GET  /jobs/<id>   Status, Protokoll und Ergebnis eines Auftrags
+    GET  /health      Anzahl Aufträge pro Status
+
+Start: ``python src/upload_api.py`` (Konfiguration über ``UPLOAD_API_*``
+und ``GITHUB_TOKEN``/``GITHUB_USERNAME`` in der ``.env``).
+"""
+
+import hmac
+import json
+import logging
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Füge das aktuelle Verzeichnis zum Python-Pfad hinzu
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from security_validation import UPLOAD_LIMITS
+from shared.job_queue import JobQueue, QueueFull
+from shared.multipart_stream import MultipartError, UploadTooLarge, parse_multipart
+from shared.workspace_manager import DEFAULT_ROOT, InsufficientSpace, WorkspaceManager
+from upload_pipeline import parse_flag, repo_name_from_archive, upload_archive
+from uploader_utils import create_repo_and_push
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_TYPE = "api_upload"
+# Spielraum für Multipart-Kopfzeilen und Formularfelder über der ZIP-Größe
+MULTIPART_OVERHEAD = 1024 * 1024
+RETRY_AFTER = 30
+
+
+def load_settings():
+    """Konfiguration aus Umgebungsvariablen"""
+    return {
+        "host": os.getenv("UPLOAD_API_HOST", "127.0.0.1"),
+        "port": int(os.getenv("UPLOAD_API_PORT", "8600")),
+        "api_key": os.getenv("UPLOAD_API_KEY"),
+        "workers": int(os.getenv("UPLOAD_API_WORKERS", "4")),
+        "max_pending": int(os.getenv("UPLOAD_API_MAX_PENDING", "100")),
+        "work_dir": os.getenv("UPLOAD_API_DIR") or DEFAULT_ROOT,
+        "github_token": os.getenv("GITHUB_TOKEN"),
+        "github_user": os.getenv("GITHUB_USERNAME"),
+    }
+
+
+def process_upload(log, upload, options, push=create_repo_and_push):
+    """
+    Auftrag für einen empfangenen Upload (siehe ``upload_archive``). Die
+    Reservierung wächst vor dem Entpacken um die entpackte Größe; der
+    Arbeitsbereich mit dem empfangenen ZIP wird in jedem Fall freigegeben.
+    """
+    workspace = upload["workspace"]
+    try:
+        result = upload_archive(
+            log, upload["path"], workspace.path, options, push, reserve=workspace.grow
+        )
+    finally:
+        workspace.release()
+    return dict(result, sha256=upload["sha256"], size=upload["size"])
+
+
+class UploadAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, address, settings, jobs=None, pipeline=process_upload, workspaces=None):
+        super().__init__(address, UploadAPIHandler)
+        self.settings = settings
+        self.jobs = jobs or JobQueue(settings["workers"], settings["max_pending"])
+        self.pipeline = pipeline
+        # Empfangene Uploads liegen immer auf der Festplatte (Endgröße unbekannt)
+        self.workspaces = workspaces or WorkspaceManager(root=settings["work_dir"], fast_root=None)
+
+
+class UploadAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ZipToGitHubAPI/1.0"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reject(self, status, message, headers=None):
+        """Fehlerantwort; ein ungelesener Body macht die Verbindung unbrauchbar"""
+        self.close_connection = True
+        self.send_json(status, {"error": message}, dict(headers or {}, Connection="close"))
+
+    def authorized(self):
+        api_key = self.server.settings["api_key"]
+        if not api_key:
+            return True
+        given = self.headers.get("X-API-Key", "")
+        if not given and self.headers.get("Authorization", "").startswith("Bearer "):
+            given = self.headers["Authorization"][7:]
+        return hmac.compare_digest(given.encode(), api_key.encode())
+
+    def do_GET(self):
+        if not self.authorized():
+            return self.reject(401, "Ungültiger API-Schlüssel")
+        if self.path == "/health":
+            return self.send_json(200, {"status": "ok", "jobs": self.server.jobs.counts()})
+        if self.path.startswith("/jobs/"):
+            job = self.server.jobs.get(self.path[len("/jobs/"):])
+            if job is None:
+                return self.send_json(404, {"error": "Auftrag nicht gefunden"})
+            return self.send_json(200, job)
+        self.send_json(404, {"error": "Unbekannter Endpunkt"})
+
+    def do_POST(self):
+        if self.path != "/uploads":
+            return self.reject(404, "Unbekannter Endpunkt")
+        if not self.authorized():
+            return self.reject(401, "Ungültiger API-Schlüssel")
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            return self.reject(411, "Content-Length erforderlich")
+
+        settings = self.server.settings
+        max_zip_size = UPLOAD_LIMITS[UPLOAD_TYPE]["max_zip_size"]
+        if length > max_zip_size + MULTIPART_OVERHEAD:
+            return self.reject(
+                413, f"Upload ist zu groß (max. {max_zip_size / 1024 / 1024:.1f} MB)"
+            )
+
+        try:
+            # Ohne Wartezeit: bei vollem Datenträger lieber später erneut senden lassen
+            workspace = self.server.workspaces.acquire(length, fast=False, timeout=0)
+        except InsufficientSpace as e:
+            return self.reject(503, str(e), {"Retry-After": str(RETRY_AFTER)})
+        try:
+            fields, files = parse_multipart(
+                self.rfile,
+                self.headers.get("Content-Type"),
+                length,
+                workspace.path,
+                max_file_size=max_zip_size,
+            )
+            upload = files.get("file")
+            if upload is None:
+                raise MultipartError("Feld 'file' fehlt")
+
+            repo_name = fields.get("repo_name") or repo_name_from_archive(upload["filename"])
+            options = {
+                "repo_name": repo_name.strip().replace(" ", "-"),
+                "private": parse_flag(fields.get("private"), True),
+                "readme": parse_flag(fields.get("readme"), True),
+                "upload_type": UPLOAD_TYPE,
+                "user_id": self.client_address[0],
+                "github_token": settings["github_token"],
+                "github_user": settings["github_user"],
+            }
+            upload["workspace"] = workspace
+            job_id = self.server.jobs.submit(self.server.pipeline, upload, options)
+        except UploadTooLarge as e:
+            workspace.release()
+            return self.reject(413, str(e))
+        except MultipartError as e:
+            workspace.release()
+            return self.reject(400, str(e))
+        except QueueFull as e:
+            workspace.release()
+            return self.reject(503, str(e), {"Retry-After": str(RETRY_AFTER)})
+        except Exception:
+            workspace.release()
+            raise
+
+        self.send_json(
+            202,
+            {
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": f"/jobs/{job_id}",
+                "sha256": upload["sha256"],
+                "size": upload["size"],
+            },
+            {"Location": f"/jobs/{job_id}"},
+        )
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    settings = load_settings()
+    server = UploadAPIServer((settings["host"], settings["port"]), settings)
+    logger.info(f"Upload-API läuft auf http://{settings['host']}:{settings['port']}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.jobs.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,262 @@
+"""
+Hintergrundaufträge der Upload-Oberfläche.
+
+Der Einzelupload läuft als Auftrag in der prozessweiten ``JobQueue`` statt
+direkt im Streamlit-Skript. Widget-Interaktionen lösen zwar weiterhin Reruns
+aus, brechen den Upload aber nicht mehr ab; die Seite fragt nur Status,
+Fortschritt und Protokoll ab. Aufträge greifen nicht auf ``st.session_state``
+zu: Funde, Validierung, Beschreibung und Analysen kommen als Ergebnis zurück
+und werden von der Seite übernommen.
+"""
+
+import io
+import os
+from contextlib import closing
+
+from shared.ai_analysis import copilot_provider, stream_project_analysis
+from shared.analysis_scheduler import AnalysisScheduler
+from shared.archive_reader import extract_archive
+from shared.file_index import build_file_index
+from shared.github_cache import invalidate_token
+from shared.job_queue import JobCancelled
+from shared.offline_summary import generate_offline_readme, offline_description, summarize_project
+from shared.project_checks import (
+    ANALYSIS_PANELS,
+    detect_project_type,
+    detect_security_issues,
+    validate_project,
+    write_workspace_readmes,
+)
+from shared.workspace_manager import MB, archive_workspace_size, get_workspace_manager
+from uploader_utils import create_repo_and_push, save_upload_history
+from webhook_integration import notify_all
+
+UPLOAD_OPTIONS = {
+    "repo_name": None,
+    "github_token": None,
+    "github_user": None,
+    "private": True,
+    "auto_init": True,
+    "license_template": None,
+    "gitignore_template": None,
+    # Analysen, die parallel zum Upload laufen (Schlüssel aus ANALYSIS_PANELS)
+    "analyses": [],
+    "describe": False,
+    "copilot_key": None,
+    # Upload trotz fehlgeschlagener Validierung fortsetzen
+    "ignore_validation": False,
+    "appimage": False,
+    "release_tag": "v1.0.0",
+}
+
+# Grenzen beim Entpacken in der Oberfläche (wie "admin_upload" in security_validation);
+# geprüft werden die tatsächlich geschriebenen Bytes
+EXTRACT_LIMITS = {
+    "max_total_size": 2048 * MB,
+    "max_file_size": 500 * MB,
+}
+
+
+def extract_uploaded_archive(uploaded_file, tmpdir, limits=EXTRACT_LIMITS):
+    """
+    Speichert und entpackt ein hochgeladenes Archiv (ZIP, tar.gz, tar.zst,
+    7z usw.), gibt das Projektverzeichnis zurück. Unsichere Pfade,
+    überschrittene ``limits`` und nicht unterstützte Formate führen zu
+    ``ExtractionError``.
+    """
+    archive_path = os.path.join(tmpdir, "upload")
+    uploaded_file.seek(0)
+    with open(archive_path, "wb") as f:
+        f.write(uploaded_file.read())
+    uploaded_file.seek(0)
+
+    # Eigenes Zielverzeichnis, damit Einträge das Archiv nicht überschreiben
+    root = os.path.join(tmpdir, "projekt")
+    extract_archive(archive_path, root, **limits)
+    os.remove(archive_path)
+
+    # Projektverzeichnis ermitteln
+    entries = os.listdir(root)
+    dirs = [
+        d for d in entries if os.path.isdir(os.path.join(root, d)) and d != "__MACOSX"
+    ]
+    return os.path.join(root, dirs[0]) if dirs else root
+
+
+def describe_project(log, file_index, copilot_key):
+    """Projektbeschreibung per Copilot (gestreamt, abbrechbar) oder offline"""
+    if not copilot_key:
+        return offline_description(summarize_project(file_index))
+
+    chunks = stream_project_analysis(
+        file_index.paths,
+        provider=copilot_provider(copilot_key),
+        sizes={entry.path: entry.size for entry in file_index},
+    )
+    text = ""
+    with closing(chunks):
+        for chunk in chunks:
+            text += chunk
+            # Abbruchpunkt; schließt beim Abbruch auch die Verbindung
+            log()
+    return text
+
+
+def build_and_release_appimage(log, project_dir, options):
+    """Baut ein AppImage und lädt es als Release-Asset hoch"""
+    from shared.appimage_builder import build_appimage
+    from shared.release_assets import ReleaseAssetUploader
+
+    repo_name = options["repo_name"]
+    log("🎁 Erstelle AppImage...")
+    build_result = build_appimage(project_dir, repo_name.lower().replace(" ", "-"))
+    if not build_result["success"]:
+        return {"success": False, "message": build_result["message"]}
+    log(build_result["message"])
+
+    uploader = ReleaseAssetUploader(options["github_token"])
+    release_info = uploader.create_release(
+        options["github_user"],
+        repo_name,
+        options["release_tag"],
+        name=f"{repo_name} {options['release_tag']}",
+        body="Erste AppImage Version",
+    )
+
+    def show_upload_progress(sent, total):
+        log(progress=0.9 + 0.1 * (sent / total if total else 1.0))
+
+    upload_result = uploader.upload_many(
+        release_info, [build_result["appimage_path"]], progress=show_upload_progress
+    )[0]
+    if not upload_result["success"]:
+        return {
+            "success": False,
+            "message": f"Fehler beim Hochladen des AppImage ({upload_result['attempts']} "
+            f"Versuche): {upload_result['message']}",
+        }
+    log("✅ AppImage hochgeladen")
+    return {"success": True, "message": build_result["message"],
+            "download_url": upload_result["download_url"]}
+
+
+def run_upload(log, zip_bytes, zip_hash, options, push=create_repo_and_push, workspaces=None):
+    """
+    Einzelupload als Hintergrundauftrag: entpacken, README, Beschreibung,
+    Sicherheitsprüfung, Validierung, Push und optional AppImage. Gibt ein
+    Ergebnis-Dict zurück; ``uploaded`` ist False, wenn die Validierung den
+    Upload gestoppt hat. Fehler beim Erstellen oder Pushen werden geworfen.
+    Der Arbeitsbereich wird vorab in voller Größe reserviert (``workspaces``,
+    Standard: prozessweiter ``WorkspaceManager``).
+    """
+    options = dict(UPLOAD_OPTIONS, **options)
+    repo_name = options["repo_name"]
+    result = {
+        "repo_name": repo_name,
+        "repo_url": None,
+        "uploaded": False,
+        "project_type": None,
+        "description": None,
+        "security_issues": [],
+        "validation": None,
+        "analyses": {},
+        "appimage": None,
+    }
+
+    try:
+        log("💾 Reserviere Speicherplatz...", progress=0.05)
+        workspaces = workspaces or get_workspace_manager()
+        size = archive_workspace_size(io.BytesIO(zip_bytes))
+        with workspaces.acquire(size) as workspace:
+            log("📦 Entpacke Archiv...", progress=0.1)
+            project_dir = extract_uploaded_archive(io.BytesIO(zip_bytes), workspace.path)
+
+            # Gewählte Analysen laufen parallel zum restlichen Upload, gestartet
+            # erst nach dem Schreiben der READMEs (sie sehen den hochgeladenen Stand)
+            scheduler = AnalysisScheduler(
+                {name: func for name, (_, func) in ANALYSIS_PANELS.items()}, {}
+            )
+
+            def start_analyses():
+                scheduler.schedule(zip_hash, options["analyses"], project_dir)
+
+            try:
+                _upload_project(log, project_dir, options, result, push, start_analyses)
+            finally:
+                # Analysen abschließen, solange das Verzeichnis existiert
+                result["analyses"] = scheduler.collect(zip_hash)
+    except JobCancelled:
+        raise
+    except Exception as e:
+        save_upload_history(repo_name, None, status="failure")
+        notify_all(repo_name, None, success=False)
+        if "(401)" in str(e):
+            invalidate_token(options["github_token"])
+        raise
+
+    log("✅ Fertig!", progress=1.0)
+    return result
+
+
+def _upload_project(log, project_dir, options, result, push, start_analyses=None):
+    # Projekt einmal rekursiv indizieren
+    file_index = build_file_index(project_dir)
+    project_type = detect_project_type(project_dir, index=file_index)
+    result["project_type"] = project_type
+
+    if options["auto_init"]:
+        log("📝 Generiere README...", progress=0.2)
+        with open(os.path.join(project_dir, "README.md"), "w") as f:
+            f.write(generate_offline_readme(file_index))
+        # Teilprojekte ohne eigene README erhalten eine eigene
+        if project_type:
+            write_workspace_readmes(project_dir, project_type["workspaces"], file_index)
+
+    if start_analyses is not None:
+        start_analyses()
+
+    if options["describe"]:
+        log("🧠 Beschreibe Projekt...", progress=0.3)
+        try:
+            result["description"] = describe_project(log, file_index, options["copilot_key"])
+        except JobCancelled:
+            raise
+        except Exception as e:
+            result["description"] = {"error": str(e)}
+
+    log("🔍 Analysiere Projekt...", progress=0.4)
+    result["security_issues"] = detect_security_issues(project_dir, index=file_index)
+
+    if project_type:
+        log(f"✨ {project_type['type'].upper()}-Projekt erkannt – führe Tests aus...", progress=0.5)
+        result["validation"] = validate_project(project_dir, project_type)
+        if not result["validation"]["valid"]:
+            if not options["ignore_validation"]:
+                log("❌ Validierung fehlgeschlagen – Upload gestoppt")
+                return
+            log("⚠️ Upload trotz Validierungsfehlern")
+    else:
+        log("ℹ️ Typ nicht erkannt - Skip Validierung")
+
+    log("🔗 Erstelle GitHub-Repository...", progress=0.7)
+    result["repo_url"] = push(
+        options["github_token"],
+        options["github_user"],
+        options["repo_name"],
+        project_dir,
+        private=options["private"],
+        license_template=options["license_template"],
+        gitignore_template=options["gitignore_template"],
+        auto_init=options["auto_init"],
+    )
+    result["uploaded"] = True
+    log(f"Hochgeladen: {result['repo_url']}", progress=0.85)
+    notify_all(options["repo_name"], result["repo_url"], success=True)
+
+    if options["appimage"] and project_type and project_type["type"] == "python":
+        try:
+            result["appimage"] = build_and_release_appimage(log, project_dir, options)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            result["appimage"] = {"success": False, "message": f"Fehler beim Upload: {e}"}
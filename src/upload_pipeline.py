@@ -0,0 +1,125 @@
+"""
+Gemeinsamer Upload-Ablauf für HTTP-API und Kommandozeile.
+
+Ein Archiv (ZIP, tar.gz, tar.zst, 7z usw., siehe ``archive_reader``) wird
+geprüft, in einen Arbeitsbereich entpackt, Datei für Datei validiert, bei
+Bedarf um eine README ergänzt und als Repository hochgeladen. Fortschritt
+wird zeilenweise über ``log`` gemeldet.
+"""
+
+import os
+
+from security_validation import (
+    UPLOAD_LIMITS,
+    is_safe_filename,
+    validate_archive_file,
+    validate_upload_directory,
+)
+from shared.archive_reader import extract_archive, strip_archive_suffix
+from shared.offline_summary import generate_offline_readme
+from shared.workspace_manager import archive_workspace_size
+from uploader_utils import create_repo_and_push
+
+DEFAULT_OPTIONS = {
+    "repo_name": None,
+    "private": True,
+    "readme": True,
+    "license_template": None,
+    "gitignore_template": None,
+    "upload_type": "api_upload",
+    "user_id": None,
+    "github_token": None,
+    "github_user": None,
+    "dry_run": False,
+}
+
+
+def parse_flag(value, default):
+    """Wahrheitswert aus Formular- oder CSV-Feldern"""
+    if value is None or str(value).strip() == "":
+        return default
+    return str(value).strip().lower() in ("1", "true", "yes", "ja", "on")
+
+
+def repo_name_from_archive(filename):
+    """Repository-Name aus dem Archivnamen (wie auf der Batch-Seite)"""
+    name = strip_archive_suffix(os.path.basename(filename))
+    return name.strip().replace(" ", "-") or "upload"
+
+
+def find_project_dir(root):
+    """Projektverzeichnis nach dem Entpacken (ein gemeinsames Wurzelverzeichnis)"""
+    entries = [e for e in os.listdir(root) if e != "__MACOSX"]
+    if len(entries) == 1 and os.path.isdir(os.path.join(root, entries[0])):
+        return os.path.join(root, entries[0])
+    return root
+
+
+def upload_archive(
+    log, archive_path, workspace, options, push=create_repo_and_push, reserve=None
+):
+    """
+    Führt den Upload eines Archivs aus und gibt ``{"repo_name", "repo_url",
+    "files"}`` zurück; ``repo_url`` ist bei ``dry_run`` None. Fehler werden als
+    ``ValueError`` (Validierung und Entpacken, siehe ``ExtractionError``) oder
+    ``RuntimeError`` (GitHub/Git) gemeldet.
+    ``reserve(bytes)`` wird vor dem Entpacken mit dem Platzbedarf aus den
+    Archiv-Metadaten aufgerufen (z. B. ``Workspace.grow``).
+    """
+    options = dict(DEFAULT_OPTIONS, **options)
+    repo_name = options["repo_name"] or repo_name_from_archive(archive_path)
+    upload_type = options["upload_type"]
+
+    is_valid, message = validate_archive_file(archive_path, upload_type, options["user_id"])
+    log(message)
+    if not is_valid:
+        raise ValueError(message)
+
+    if reserve is not None:
+        reserve(archive_workspace_size(archive_path, include_archive=False))
+
+    # Limits erneut beim Schreiben prüfen: die Angaben im Zentralverzeichnis
+    # können gefälscht sein, tar-Archive haben gar keins
+    limits = UPLOAD_LIMITS.get(upload_type, UPLOAD_LIMITS["web_upload"])
+    root = os.path.join(workspace, "project")
+    extract_archive(
+        archive_path,
+        root,
+        max_total_size=limits["max_extracted_size"],
+        max_file_size=limits["max_file_size"],
+        max_files=limits["max_files_in_zip"],
+        check=lambda name: is_safe_filename(name, upload_type),
+    )
+    project_dir = find_project_dir(root)
+
+    is_valid, message = validate_upload_directory(project_dir, upload_type)
+    log(message)
+    if not is_valid:
+        raise ValueError(message)
+
+    readme_path = os.path.join(project_dir, "README.md")
+    if options["readme"] and not os.path.exists(readme_path):
+        with open(readme_path, "w", encoding="utf-8") as f:
+            f.write(generate_offline_readme(project_dir))
+        log("README.md erstellt")
+
+    files = sum(len(names) for _, _, names in os.walk(project_dir))
+    if options["dry_run"]:
+        log(f"Probelauf: {repo_name} würde mit {files} Dateien erstellt")
+        return {"repo_name": repo_name, "repo_url": None, "files": files}
+
+    if not options["github_token"] or not options["github_user"]:
+        raise RuntimeError("GITHUB_TOKEN und GITHUB_USERNAME sind nicht konfiguriert")
+    log(f"Erstelle Repository {repo_name}")
+    repo_url = push(
+        options["github_token"],
+        options["github_user"],
+        repo_name,
+        project_dir,
+        private=options["private"],
+        license_template=options["license_template"],
+        gitignore_template=options["gitignore_template"],
+        auto_init=False,
+    )
+    log(f"Hochgeladen: {repo_url}")
+    return {"repo_name": repo_name, "repo_url": repo_url, "files": files}
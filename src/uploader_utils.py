@@ -3,14 +3,25 @@ import subprocess
 import requests
 import logging
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+from shared.upload_stats import HISTORY_FILE, file_signature, record_upload
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur Thread-Lock
+    fcntl = None
+
 # Logging konfigurieren
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+_history_lock = threading.Lock()
+
 
 def create_repo_and_push(
     github_token: str,
@@ -171,31 +182,49 @@ def create_repo_and_push(
     return clone_url
 
 
-def save_upload_history(repo_name, repo_url):
-    """Speichert Upload-Historie in einer JSON-Datei"""
-    history_file = "upload_history.json"
-    history = []
+@contextmanager
+def _locked_history(history_file):
+    """Serialisiert Änderungen an der Historie zwischen Threads und Prozessen"""
+    with _history_lock, open(f"{history_file}.lock", "a") as lock_file:
+        if fcntl is not None:
+            # Wird mit dem Schließen der Datei freigegeben
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
 
-    if os.path.exists(history_file):
-        try:
-            with open(history_file, "r") as f:
-                history = json.load(f)
-        except json.JSONDecodeError:
-            logger.warning(
-                f"Fehler beim Lesen der Upload-Historie, erstelle neue Datei"
-            )
 
-    history.append(
-        {
-            "repo_name": repo_name,
-            "repo_url": repo_url,
-            "timestamp": datetime.now().isoformat(),
-            "status": "success",
-        }
-    )
+def save_upload_history(repo_name, repo_url, status="success", history_file=HISTORY_FILE):
+    """Speichert Upload-Historie in einer JSON-Datei und aktualisiert die Statistik"""
+    timestamp = datetime.now()
+    with _locked_history(history_file):
+        history = []
+        previous = file_signature(history_file)
+        if os.path.exists(history_file):
+            try:
+                with open(history_file, "r") as f:
+                    history = json.load(f)
+            except json.JSONDecodeError:
+                # Unlesbare Historie nicht überschreiben, sondern beiseitelegen
+                backup = f"{history_file}.{timestamp:%Y%m%d_%H%M%S}.defekt"
+                os.replace(history_file, backup)
+                logger.warning(
+                    f"Fehler beim Lesen der Upload-Historie, gesichert als {backup}"
+                )
+
+        history.append(
+            {
+                "repo_name": repo_name,
+                "repo_url": repo_url,
+                "timestamp": timestamp.isoformat(),
+                "status": status,
+            }
+        )
+
+        tmp_path = f"{history_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp_path, history_file)
 
-    with open(history_file, "w") as f:
-        json.dump(history, f, indent=2)
+        record_upload(status, timestamp, history_file=history_file, previous=previous)
 
     logger.info(f"Upload-Historie aktualisiert: {repo_name}")
 
@@ -1,16 +1,32 @@
 import requests
 import os
 import json
+import threading
 from dotenv import load_dotenv
 
+from shared.notification_dispatcher import Channel, NotificationDispatcher
+from shared.notification_outbox import Outbox
+from shared.smtp_sender import SMTPSender
+
 load_dotenv()
 
-def send_slack_notification(repo_name, repo_url, success=True):
+# Timeout (Sekunden) pro Webhook-Aufruf
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "5"))
+
+# Maximale Anzahl Repositories, die in einer Sammelnachricht aufgelistet werden
+SUMMARY_MAX_ITEMS = 20
+
+_dispatcher = None
+_smtp_sender = None
+_dispatcher_lock = threading.Lock()
+_smtp_lock = threading.Lock()
+
+def send_slack_notification(repo_name, repo_url, success=True, webhook_url=None, timeout=WEBHOOK_TIMEOUT):
     """
     Sendet eine Benachrichtigung an Slack über einen neuen Repository-Upload.
     Erfordert SLACK_WEBHOOK_URL in .env
     """
-    webhook_url = os.getenv("SLACK_WEBHOOK_URL")
+    webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
     if not webhook_url:
         return False
     
@@ -43,17 +59,61 @@ def send_slack_notification(repo_name, repo_url, success=True):
     }
     
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = requests.post(webhook_url, json=payload, timeout=timeout)
         return response.status_code == 200
     except Exception:
         return False
 
-def send_discord_notification(repo_name, repo_url, success=True):
+def _summary_lines(events, link):
+    """Listet die Repositories einer Sammelnachricht auf (gekürzt)"""
+    lines = []
+    for event in events[:SUMMARY_MAX_ITEMS]:
+        icon = "✅" if event["success"] else "❌"
+        lines.append(f"{icon} {link(event['repo_name'], event['repo_url'])}")
+    if len(events) > SUMMARY_MAX_ITEMS:
+        lines.append(f"... und {len(events) - SUMMARY_MAX_ITEMS} weitere")
+    return "\n".join(lines)
+
+def send_slack_summary(events, webhook_url, timeout=WEBHOOK_TIMEOUT):
+    """
+    Sendet eine Sammelnachricht für mehrere Uploads an Slack.
+    """
+    succeeded = sum(1 for event in events if event["success"])
+    failed = len(events) - succeeded
+    
+    payload = {
+        "attachments": [
+            {
+                "fallback": f"{len(events)} Repository-Uploads: {succeeded} erfolgreich, {failed} fehlgeschlagen",
+                "color": "#36a64f" if not failed else "#ff0000",
+                "title": f"{len(events)} Repository-Uploads",
+                "text": _summary_lines(events, lambda name, url: f"<{url}|{name}>" if url else name),
+                "fields": [
+                    {
+                        "title": "Erfolgreich",
+                        "value": str(succeeded),
+                        "short": True
+                    },
+                    {
+                        "title": "Fehlgeschlagen",
+                        "value": str(failed),
+                        "short": True
+                    }
+                ],
+                "footer": "ZIP to GitHub Uploader"
+            }
+        ]
+    }
+    
+    response = requests.post(webhook_url, json=payload, timeout=timeout)
+    return response.status_code == 200
+
+def send_discord_notification(repo_name, repo_url, success=True, webhook_url=None, timeout=WEBHOOK_TIMEOUT):
     """
     Sendet eine Benachrichtigung an Discord über einen neuen Repository-Upload.
     Erfordert DISCORD_WEBHOOK_URL in .env
     """
-    webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
+    webhook_url = webhook_url or os.getenv("DISCORD_WEBHOOK_URL")
     if not webhook_url:
         return False
     
@@ -74,38 +134,158 @@ def send_discord_notification(repo_name, repo_url, success=True):
     }
     
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = requests.post(webhook_url, json=payload, timeout=timeout)
         return response.status_code == 204
     except Exception:
         return False
 
-def send_email_notification(repo_name, repo_url, recipient_email, success=True):
+def send_discord_summary(events, webhook_url, timeout=WEBHOOK_TIMEOUT):
+    """
+    Sendet eine Sammelnachricht für mehrere Uploads an Discord.
+    """
+    succeeded = sum(1 for event in events if event["success"])
+    failed = len(events) - succeeded
+    
+    payload = {
+        "embeds": [
+            {
+                "title": f"{len(events)} Repository-Uploads: {succeeded} erfolgreich, {failed} fehlgeschlagen",
+                "description": _summary_lines(events, lambda name, url: f"[{name}]({url})" if url else name),
+                "color": 3066993 if not failed else 15158332,
+                "footer": {
+                    "text": "ZIP to GitHub Uploader"
+                }
+            }
+        ]
+    }
+    
+    response = requests.post(webhook_url, json=payload, timeout=timeout)
+    return response.status_code == 204
+
+def get_smtp_sender():
+    """
+    Gemeinsamer SMTP-Sender mit Verbindungspool; None ohne SMTP_HOST in .env
+    """
+    global _smtp_sender
+    with _smtp_lock:
+        if _smtp_sender is None:
+            _smtp_sender = SMTPSender.from_env()
+        return _smtp_sender
+
+def send_email_notification(repo_name, repo_url, recipient_email, success=True, sender=None,
+                            timeout=None):
     """
     Sendet eine E-Mail-Benachrichtigung über einen neuen Repository-Upload.
-    Erfordert SMTP-Konfiguration in .env
+    Erfordert SMTP-Konfiguration in .env (SMTP_HOST, SMTP_PORT, SMTP_USER, ...)
     """
-    # Diese Funktion würde SMTP verwenden, um E-Mails zu senden
-    # Für die Implementierung wäre ein E-Mail-Service wie SendGrid oder SMTP-Bibliothek nötig
-    pass
+    sender = sender or get_smtp_sender()
+    if not sender or not recipient_email:
+        return False
+    
+    status = "erfolgreich" if success else "fehlgeschlagen"
+    body = (
+        f"Repository-Upload {status}\n\n"
+        f"Repository: {repo_name}\n"
+        f"URL: {repo_url or '-'}\n\n"
+        "ZIP to GitHub Uploader"
+    )
+    return sender.send(
+        recipient_email, f"Repository-Upload {status}: {repo_name}", body, timeout=timeout
+    )
 
-def notify_all(repo_name, repo_url, success=True):
+def send_email_summary(events, recipient_email, sender=None, timeout=None):
     """
-    Sendet Benachrichtigungen an alle konfigurierten Kanäle.
+    Sendet eine Sammel-E-Mail für mehrere Uploads.
     """
-    results = {}
+    sender = sender or get_smtp_sender()
+    if not sender or not recipient_email:
+        return False
     
-    # Slack
-    slack_result = send_slack_notification(repo_name, repo_url, success)
-    results["slack"] = slack_result
+    succeeded = sum(1 for event in events if event["success"])
+    failed = len(events) - succeeded
+    lines = [
+        f"{'OK    ' if event['success'] else 'FEHLER'} {event['repo_name']} {event['repo_url'] or ''}"
+        for event in events
+    ]
+    body = (
+        f"{len(events)} Repository-Uploads: {succeeded} erfolgreich, {failed} fehlgeschlagen\n\n"
+        + "\n".join(lines)
+        + "\n\nZIP to GitHub Uploader"
+    )
+    return sender.send(
+        recipient_email, f"{len(events)} Repository-Uploads abgeschlossen", body, timeout=timeout
+    )
+
+def build_channels():
+    """
+    Erstellt die Kanäle für alle konfigurierten Webhooks (Umgebung wird einmal gelesen).
+    """
+    channels = []
     
-    # Discord
-    discord_result = send_discord_notification(repo_name, repo_url, success)
-    results["discord"] = discord_result
+    slack_url = os.getenv("SLACK_WEBHOOK_URL")
+    if slack_url:
+        channels.append(Channel(
+            "slack",
+            lambda event, timeout: send_slack_notification(
+                event["repo_name"], event["repo_url"], event["success"], slack_url, timeout
+            ),
+            lambda events, timeout: send_slack_summary(events, slack_url, timeout),
+            timeout=WEBHOOK_TIMEOUT
+        ))
+    
+    discord_url = os.getenv("DISCORD_WEBHOOK_URL")
+    if discord_url:
+        channels.append(Channel(
+            "discord",
+            lambda event, timeout: send_discord_notification(
+                event["repo_name"], event["repo_url"], event["success"], discord_url, timeout
+            ),
+            lambda events, timeout: send_discord_summary(events, discord_url, timeout),
+            timeout=WEBHOOK_TIMEOUT
+        ))
     
-    # E-Mail (falls konfiguriert)
     email = os.getenv("NOTIFICATION_EMAIL")
-    if email:
-        email_result = send_email_notification(repo_name, repo_url, email, success)
-        results["email"] = email_result
+    if email and os.getenv("SMTP_HOST"):
+        channels.append(Channel(
+            "email",
+            lambda event, timeout: send_email_notification(
+                event["repo_name"], event["repo_url"], email, event["success"], timeout=timeout
+            ),
+            lambda events, timeout: send_email_summary(events, email, timeout=timeout),
+            timeout=WEBHOOK_TIMEOUT
+        ))
     
-    return results
\ No newline at end of file
+    return channels
+
+def get_dispatcher():
+    """
+    Gemeinsamer Dispatcher mit Hintergrund-Workern (wird beim ersten Aufruf erstellt).
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            channels = build_channels()
+            # Outbox nur anlegen, wenn überhaupt ein Kanal konfiguriert ist
+            outbox = Outbox() if channels else None
+            _dispatcher = NotificationDispatcher(channels, outbox=outbox)
+        return _dispatcher
+
+def delivery_metrics():
+    """
+    Zustellstatistik pro Kanal aus der Outbox (leer, wenn keine Kanäle konfiguriert sind).
+    """
+    dispatcher = get_dispatcher()
+    return dispatcher.outbox.metrics() if dispatcher.outbox else {}
+
+def notify_all(repo_name, repo_url, success=True):
+    """
+    Sendet Benachrichtigungen an alle konfigurierten Kanäle.
+    Die Zustellung läuft im Hintergrund; zurückgegeben wird pro Kanal,
+    ob die Benachrichtigung angenommen wurde.
+    """
+    event = {
+        "repo_name": repo_name,
+        "repo_url": repo_url,
+        "success": success,
+    }
+    return get_dispatcher().submit(event)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+zip2gh – Massenimport von Archiven nach GitHub ohne Browser.
+
+Eingaben sind Archive (ZIP, tar, tar.gz, tar.bz2, tar.xz, tar.zst, 7z),
+Glob-Muster, Verzeichnisse mit Archiven oder eine Manifest-CSV (Spalten
+``name`` und ``zip``, optional ``private``).
+Jedes Archiv durchläuft Validierung, README-Erstellung und Push parallel;
+Fortschritt wird als JSON-Lines auf stdout ausgegeben, der Abschlussbericht
+als CSV im Format der Batch-Seite.
+
+Exit-Codes: 0 alles erfolgreich, 1 mindestens ein Archiv fehlgeschlagen,
+2 ungültige Aufruf- oder Konfigurationsfehler.
+
+Beispiel::
+
+    python src/zip2gh.py archive/*.zip --jobs 4 --report bericht.csv
+    python src/zip2gh.py --manifest migration.csv --public --dry-run
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+# Füge das aktuelle Verzeichnis zum Python-Pfad hinzu
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from shared.archive_reader import ARCHIVE_SUFFIXES
+from shared.workspace_manager import WorkspaceManager, archive_workspace_size, get_workspace_manager
+from upload_pipeline import parse_flag, repo_name_from_archive, upload_archive
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+REPORT_FIELDS = [
+    "Nr.",
+    "ZIP-Datei",
+    "Repository-Name",
+    "Repository-URL",
+    "Status",
+    "Zeitstempel",
+]
+
+_output_lock = threading.Lock()
+
+
+def emit(stream, event, **data):
+    """Schreibt ein Ereignis als JSON-Zeile"""
+    line = json.dumps(dict(event=event, time=round(time.time(), 3), **data), ensure_ascii=False)
+    with _output_lock:
+        stream.write(line + "\n")
+        stream.flush()
+
+
+def read_manifest(path):
+    """Aufträge aus einer CSV mit den Spalten ``name``, ``zip`` und optional ``private``"""
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            row = {key.strip().lower(): (value or "").strip() for key, value in row.items() if key}
+            zip_path = row.get("zip") or row.get("zip_path")
+            if not zip_path:
+                raise ValueError(f"Manifest-Zeile ohne ZIP-Datei: {row}")
+            if not os.path.isabs(zip_path):
+                zip_path = os.path.join(base, zip_path)
+            item = {"zip": zip_path, "name": row.get("name") or row.get("repo_name") or None}
+            if row.get("private"):
+                item["private"] = parse_flag(row["private"], True)
+            items.append(item)
+    return items
+
+
+def collect_inputs(patterns):
+    """Archive aus Pfaden, Glob-Mustern und Verzeichnissen (sortiert, ohne Duplikate)"""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if name.lower().endswith(ARCHIVE_SUFFIXES)
+                and not name.startswith(".")
+                and os.path.isfile(os.path.join(pattern, name))
+            ]
+        else:
+            matches = glob.glob(pattern, recursive=True) or [pattern]
+        found.extend(os.path.abspath(m) for m in sorted(matches))
+    return [{"zip": path, "name": None} for path in dict.fromkeys(found)]
+
+
+def process_item(index, item, options, workspaces, stream):
+    """Verarbeitet ein Archiv und gibt die Berichtszeile zurück"""
+    zip_path = item["zip"]
+    repo_name = item["name"] or repo_name_from_archive(zip_path)
+    item_options = dict(options, repo_name=repo_name)
+    if "private" in item:
+        item_options["private"] = item["private"]
+
+    def log(message):
+        emit(stream, "log", nr=index, zip=zip_path, message=message)
+
+    emit(stream, "start", nr=index, zip=zip_path, repo=repo_name)
+    started = time.monotonic()
+    workspace = None
+    try:
+        if not os.path.isfile(zip_path):
+            raise ValueError("Datei nicht gefunden")
+        # Wartet, bis der entpackte Inhalt sicher Platz hat
+        workspace = workspaces.acquire(archive_workspace_size(zip_path, include_archive=False))
+        result = upload_archive(log, zip_path, workspace.path, item_options)
+        status = "Probelauf" if options["dry_run"] else "Erfolgreich"
+        repo_url = result["repo_url"] or ""
+        emit(
+            stream,
+            "done",
+            nr=index,
+            zip=zip_path,
+            repo=repo_name,
+            url=repo_url,
+            duration=round(time.monotonic() - started, 3),
+        )
+    except Exception as e:
+        status, repo_url = f"Fehler: {e}", ""
+        emit(
+            stream,
+            "failed",
+            nr=index,
+            zip=zip_path,
+            repo=repo_name,
+            error=str(e),
+            duration=round(time.monotonic() - started, 3),
+        )
+    finally:
+        if workspace is not None:
+            workspace.release()
+
+    return {
+        "Nr.": index,
+        "ZIP-Datei": os.path.basename(zip_path),
+        "Repository-Name": repo_name,
+        "Repository-URL": repo_url,
+        "Status": status,
+        "Zeitstempel": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def run(items, options, jobs=4, work_dir=None, stream=sys.stdout):
+    """
+    Verarbeitet alle Aufträge parallel; Berichtszeilen in Eingabereihenfolge.
+    Arbeitsbereiche liegen in ``work_dir`` bzw. im Standard-Arbeitsbereich
+    (``WORKSPACE_*``) und zählen gegen dessen Speicherplatzquote.
+    """
+    workspaces = (
+        WorkspaceManager(root=work_dir, fast_root=None) if work_dir else get_workspace_manager()
+    )
+    rows = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(items) or 1))) as executor:
+        futures = {
+            executor.submit(process_item, i + 1, item, options, workspaces, stream): i
+            for i, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            rows[futures[future]] = future.result()
+    return rows
+
+
+def write_report(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="zip2gh", description="Archive als GitHub-Repositories hochladen"
+    )
+    parser.add_argument("inputs", nargs="*", help="Archive, Glob-Muster oder Verzeichnisse")
+    parser.add_argument("--manifest", help="CSV mit den Spalten name, zip (optional private)")
+    parser.add_argument("--user", default=os.getenv("GITHUB_USERNAME"), help="GitHub-Benutzer")
+    parser.add_argument(
+        "--token", default=os.getenv("GITHUB_TOKEN"), help="GitHub-Token (Standard: GITHUB_TOKEN)"
+    )
+    visibility = parser.add_mutually_exclusive_group()
+    visibility.add_argument("--private", dest="private", action="store_true", default=True)
+    visibility.add_argument("--public", dest="private", action="store_false")
+    parser.add_argument("--license", dest="license_template", help="Lizenz-Vorlage, z. B. MIT")
+    parser.add_argument("--gitignore", dest="gitignore_template", help=".gitignore-Vorlage")
+    parser.add_argument("--no-readme", dest="readme", action="store_false", help="keine README erzeugen")
+    parser.add_argument(
+        "--upload-type",
+        default="api_upload",
+        choices=["web_upload", "api_upload", "admin_upload"],
+        help="Limits aus security_validation",
+    )
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="parallele Archive")
+    parser.add_argument(
+        "--work-dir", help="Verzeichnis für Arbeitsbereiche (Standard: WORKSPACE_DIR)"
+    )
+    parser.add_argument("--report", help="Abschlussbericht als CSV")
+    parser.add_argument("--dry-run", action="store_true", help="nur prüfen, nichts hochladen")
+    return parser
+
+
+def main(argv=None, stream=sys.stdout):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        items = read_manifest(args.manifest) if args.manifest else []
+    except (OSError, ValueError, csv.Error) as e:
+        emit(stream, "error", message=f"Manifest nicht lesbar: {e}")
+        return EXIT_USAGE
+    items += collect_inputs(args.inputs)
+    if not items:
+        emit(stream, "error", message="Keine Archive angegeben")
+        return EXIT_USAGE
+    if not args.dry_run and not (args.token and args.user):
+        emit(stream, "error", message="GITHUB_TOKEN und GITHUB_USERNAME bzw. --token/--user fehlen")
+        return EXIT_USAGE
+
+    options = {
+        "private": args.private,
+        "readme": args.readme,
+        "license_template": args.license_template,
+        "gitignore_template": args.gitignore_template,
+        "upload_type": args.upload_type,
+        "github_token": args.token,
+        "github_user": args.user,
+        "dry_run": args.dry_run,
+    }
+    emit(stream, "begin", total=len(items), jobs=args.jobs, dry_run=args.dry_run)
+    rows = run(items, options, jobs=args.jobs, work_dir=args.work_dir, stream=stream)
+
+    if args.report:
+        write_report(rows, args.report)
+    failed = sum(1 for row in rows if row["Status"].startswith("Fehler"))
+    emit(stream, "summary", total=len(rows), succeeded=len(rows) - failed, failed=failed,
+         report=args.report)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cli():
+    """Einstiegspunkt für ``python src/zip2gh.py`` (lädt die ``.env``)"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    sys.exit(main())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests für Prompt-Budget, Antwort-Cache, Parallelität und Streaming der KI-Analyse
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from shared import gpt_analysis_openrouter
+from shared.ai_analysis import (
+    ChatCompletionProvider,
+    ResponseCache,
+    analyze_project,
+    analyze_projects,
+    estimate_tokens,
+    stream_project_analysis,
+    summarize_file_list,
+)
+
+
+class CompletionStubHandler(BaseHTTPRequestHandler):
+    """OpenAI-kompatibler Stub, der Anfragen und Parallelität zählt"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.prompts.append(payload["messages"][-1]["content"])
+        server.payloads.append(payload)
+        if payload.get("stream") and server.stream_chunks is not None:
+            self.send_stream()
+            with server.lock:
+                server.active -= 1
+            return
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        body = json.dumps(
+            {"choices": [{"message": {"content": f"Antwort {server.requests}"}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self):
+        """Antwort als Server-Sent Events in einzelnen HTTP-Chunks"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [
+            {"choices": [{"delta": {"content": chunk}}]} for chunk in self.server.stream_chunks
+        ]
+        try:
+            for event in events:
+                self.write_chunk(f"data: {json.dumps(event)}\n\n")
+                time.sleep(self.server.chunk_delay)
+            self.write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.stream_aborted.set()
+        self.close_connection = True
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_stub(delay=0.0, stream_chunks=None, chunk_delay=0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionStubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = server.active = server.max_active = 0
+    server.prompts = []
+    server.payloads = []
+    server.delay = delay
+    server.stream_chunks = stream_chunks
+    server.chunk_delay = chunk_delay
+    server.stream_aborted = threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stub_provider(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/chat/completions"
+    return ChatCompletionProvider("Stub", url, "test-key", "stub-model")
+
+
+def test_file_list_trimmed_to_budget_keeps_manifests():
+    paths = [f"src/module_{i:04d}/implementation_{i}.py" for i in range(5000)]
+    paths += ["requirements.txt", "pyproject.toml", "frontend/package.json"]
+
+    summary = summarize_file_list(paths, budget_tokens=300)
+
+    assert estimate_tokens(summary) <= 330
+    lines = summary.splitlines()
+    for manifest in ["requirements.txt", "pyproject.toml", "frontend/package.json"]:
+        assert manifest in lines
+    assert any(line.startswith("src/ (5000 Dateien") for line in lines)
+    assert lines[-1].startswith("... und ")
+    # Deterministisch unabhängig von der Eingabereihenfolge
+    assert summarize_file_list(list(reversed(paths)), budget_tokens=300) == summary
+
+
+def test_small_file_list_is_sent_unchanged():
+    paths = ["main.py", "README.md", "src/app.py"]
+    assert summarize_file_list(paths).splitlines() == ["README.md", "main.py", "src/app.py"]
+
+
+def test_identical_projects_hit_cache():
+    server = start_stub()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = os.path.join(tmpdir, "cache.json")
+        provider = stub_provider(server)
+        paths = ["app.py", "requirements.txt", "templates/index.html"]
+        try:
+            first = analyze_project(paths, provider=provider, cache=ResponseCache(cache_path))
+            # Neuer Cache aus derselben Datei: Antwort überlebt einen Neustart
+            second = analyze_project(
+                list(reversed(paths)), provider=provider, cache=ResponseCache(cache_path)
+            )
+            assert first == second == "Antwort 1"
+            assert server.requests == 1
+
+            analyze_project(paths + ["Dockerfile"], provider=provider, cache=ResponseCache(cache_path))
+            assert server.requests == 2
+        finally:
+            server.shutdown()
+
+
+def test_batch_analysis_respects_concurrency_cap():
+    server = start_stub(delay=0.05)
+    provider = stub_provider(server)
+    projects = {f"projekt-{i}": [f"projekt_{i}.py", "requirements.txt"] for i in range(8)}
+    try:
+        results = analyze_projects(
+            projects, provider=provider, cache=ResponseCache(path=None), max_concurrency=2
+        )
+    finally:
+        server.shutdown()
+
+    assert set(results) == set(projects)
+    assert all(isinstance(answer, str) for answer in results.values())
+    assert server.requests == 8
+    assert server.max_active <= 2
+
+
+def test_batch_analysis_reports_errors_per_project():
+    provider = ChatCompletionProvider(
+        "Stub", "http://127.0.0.1:9/chat/completions", "key", "model", timeout=1
+    )
+    results = analyze_projects(
+        {"kaputt": ["main.py"]}, provider=provider, cache=ResponseCache(path=None)
+    )
+    assert "error" in results["kaputt"]
+
+
+def test_stream_yields_chunks_before_completion_and_caches_result():
+    chunks = ["Ein ", "Flask-", "Projekt ", "mit Tests. ", "Tags: python, flask"]
+    server = start_stub(stream_chunks=chunks, chunk_delay=0.1)
+    cache = ResponseCache(path=None)
+    paths = ["app.py", "requirements.txt"]
+    try:
+        started = time.monotonic()
+        stream = stream_project_analysis(paths, provider=stub_provider(server), cache=cache)
+        first = next(stream)
+        first_latency = time.monotonic() - started
+        received = [first] + list(stream)
+        total = time.monotonic() - started
+
+        assert received == chunks
+        assert first_latency < total / 2
+        # Vollständige Antwort landet im Cache und wird ohne Anfrage geliefert
+        cached = list(stream_project_analysis(paths, provider=stub_provider(server), cache=cache))
+        assert cached == ["".join(chunks)]
+        assert server.requests == 1
+    finally:
+        server.shutdown()
+
+
+def test_closing_stream_closes_connection_without_caching():
+    server = start_stub(stream_chunks=[f"Teil {i} " for i in range(200)], chunk_delay=0.01)
+    cache = ResponseCache(path=None)
+    try:
+        stream = stream_project_analysis(["main.py"], provider=stub_provider(server), cache=cache)
+        assert next(stream) == "Teil 0 "
+        stream.close()
+
+        assert server.stream_aborted.wait(timeout=5)
+        assert cache._entries == {}
+    finally:
+        server.shutdown()
+
+
+def test_stream_falls_back_to_complete_json():
+    server = start_stub()
+    try:
+        provider = stub_provider(server)
+        chunks = list(provider.stream([{"role": "user", "content": "Hallo"}]))
+    finally:
+        server.shutdown()
+    assert chunks == ["Antwort 1"]
+
+
+def test_openrouter_sends_no_generation_limits(monkeypatch):
+    server = start_stub()
+    monkeypatch.setattr(
+        gpt_analysis_openrouter, "openrouter_provider", lambda: stub_provider(server)
+    )
+
+    assert gpt_analysis_openrouter.analyze_project_with_openrouter("Projekt") == "Antwort 1"
+    stub_provider(server).complete([{"role": "user", "content": "x"}])
+
+    assert "max_tokens" not in server.payloads[0] and "temperature" not in server.payloads[0]
+    assert server.payloads[1]["max_tokens"] == 500
+    server.shutdown()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests für die bedarfsgesteuerte Analyse-Ausführung
+"""
+
+import io
+
+from shared.analysis_scheduler import AnalysisScheduler, hash_file_obj
+
+
+def make_scheduler(calls, store=None):
+    def count(project_dir):
+        calls.append(project_dir)
+        return len(calls)
+
+    def broken(project_dir):
+        raise ValueError("kaputt")
+
+    return AnalysisScheduler({"count": count, "broken": broken}, {} if store is None else store)
+
+
+def test_results_are_memoized_per_hash():
+    """Eine Analyse läuft pro ZIP-Hash nur einmal"""
+    calls = []
+    store = {}
+    scheduler = make_scheduler(calls, store)
+
+    scheduler.schedule("abc", ["count"], "/tmp/projekt")
+    assert scheduler.collect("abc") == {"count": 1}
+
+    # Neuer Scheduler (z. B. nach einem Rerun) mit demselben Store
+    scheduler = make_scheduler(calls, store)
+    scheduler.schedule("abc", ["count"], "/tmp/projekt")
+    assert scheduler.run("abc", "count", "/tmp/projekt") == 1
+    assert calls == ["/tmp/projekt"]
+
+    assert scheduler.run("other", "count", "/tmp/anderes") == 2
+
+
+def test_errors_are_stored():
+    scheduler = make_scheduler([])
+    scheduler.schedule("abc", ["broken"], "/tmp/projekt")
+    assert scheduler.collect("abc")["broken"] == {"error": "kaputt"}
+
+
+def test_run_with_override():
+    scheduler = make_scheduler([])
+    assert scheduler.run("abc", "validation", "/tmp/p", func=lambda d: d + "!") == "/tmp/p!"
+    assert scheduler.has_result("abc", "validation")
+
+
+def test_hash_file_obj_keeps_position():
+    data = io.BytesIO(b"x" * 100)
+    data.seek(10)
+    assert hash_file_obj(data, chunk_size=7) == hash_file_obj(io.BytesIO(b"x" * 100))
+    assert data.tell() == 10
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests für den inkrementellen AppImage-Build mit lokal bereitgestelltem Werkzeug
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from shared.appimage_builder import build_appimage
+
+# Ersetzt appimagetool: listet das AppDir in die Ausgabedatei und zählt Aufrufe
+FAKE_TOOL = """#!{python}
+import os, sys
+app_dir, output = sys.argv[-2], sys.argv[-1]
+with open(os.path.join(os.path.dirname(__file__), "calls"), "a") as f:
+    f.write(" ".join(sys.argv[1:-2]) + "\\n")
+listing = []
+for root, dirs, files in os.walk(app_dir):
+    for name in files:
+        path = os.path.join(root, name)
+        listing.append("%s %d" % (os.path.relpath(path, app_dir), os.stat(path).st_nlink))
+with open(output, "w") as f:
+    f.write("\\n".join(sorted(listing)))
+"""
+
+
+def make_tool(directory, delay=0):
+    tool = os.path.join(directory, "appimagetool")
+    with open(tool, "w") as f:
+        f.write(FAKE_TOOL.format(python=sys.executable))
+        if delay:
+            f.write(f"import time\ntime.sleep({delay})\n")
+    os.chmod(tool, 0o755)
+    return tool
+
+
+def make_project(directory):
+    files = {
+        "main.py": "print('hallo')\n",
+        "pkg/modul.py": "X = 1\n",
+        ".git/HEAD": "ref: refs/heads/main\n",
+        "AppDir/usr/bin/main.py": "alt\n",
+        "alt-x86_64.AppImage": "alt\n",
+    }
+    for path, content in files.items():
+        full_path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
+
+
+def calls(tool):
+    with open(os.path.join(os.path.dirname(tool), "calls")) as f:
+        return f.read().splitlines()
+
+
+def test_unchanged_project_reuses_build():
+    base = tempfile.mkdtemp()
+    project, cache = os.path.join(base, "projekt"), os.path.join(base, "cache")
+    make_project(project)
+    tool = make_tool(base)
+
+    first = build_appimage(project, "demo", cache_dir=cache, allow_download=False, tool=tool)
+    assert first["success"] and not first["cached"]
+    with open(first["appimage_path"]) as f:
+        listing = dict(line.rsplit(" ", 1) for line in f.read().splitlines())
+    assert set(listing) == {
+        "AppRun",
+        "demo.desktop",
+        "demo.svg",
+        "usr/bin/main.py",
+        "usr/bin/pkg/modul.py",
+        "usr/share/applications/demo.desktop",
+        "usr/share/icons/hicolor/scalable/apps/demo.svg",
+    }
+    # Projektdateien werden verlinkt statt kopiert
+    assert listing["usr/bin/main.py"] == "2"
+
+    # Neu entpackt (neue Änderungszeiten), aber gleicher Inhalt
+    os.utime(os.path.join(project, "main.py"), (0, 0))
+    second = build_appimage(project, "demo", cache_dir=cache, allow_download=False, tool=tool)
+    assert second["cached"] and second["appimage_path"] == first["appimage_path"]
+    assert len(calls(tool)) == 1
+
+
+def test_changed_content_rebuilds_and_drops_old_build():
+    base = tempfile.mkdtemp()
+    project, cache = os.path.join(base, "projekt"), os.path.join(base, "cache")
+    make_project(project)
+    tool = make_tool(base)
+    runtime = os.path.join(base, "runtime")
+    with open(runtime, "wb") as f:
+        f.write(b"\x7fELF")
+
+    first = build_appimage(
+        project, "demo", cache_dir=cache, allow_download=False, tool=tool, runtime=runtime
+    )
+    with open(os.path.join(project, "pkg", "modul.py"), "w") as f:
+        f.write("X = 2\n")
+    second = build_appimage(
+        project, "demo", cache_dir=cache, allow_download=False, tool=tool, runtime=runtime
+    )
+
+    assert second["success"] and not second["cached"]
+    assert second["appimage_path"] != first["appimage_path"]
+    assert not os.path.exists(first["appimage_path"])
+    assert calls(tool) == [f"--no-appstream --runtime-file {runtime}"] * 2
+
+
+def test_different_apps_build_in_parallel():
+    base = tempfile.mkdtemp()
+    project, cache = os.path.join(base, "projekt"), os.path.join(base, "cache")
+    make_project(project)
+    tool = make_tool(base, delay=1)
+    results = {}
+
+    def build(name):
+        results[name] = build_appimage(
+            project, name, cache_dir=cache, allow_download=False, tool=tool
+        )
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=build, args=(name,)) for name in ("eins", "zwei")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # appimagetool läuft für beide Anwendungen gleichzeitig
+    assert time.monotonic() - started < 1.9
+    assert all(result["success"] for result in results.values())
+    with open(os.path.join(cache, "manifest.json")) as f:
+        assert set(json.load(f)) == {"eins", "zwei"}
+
+
+def test_missing_tool_without_network():
+    base = tempfile.mkdtemp()
+    make_project(base)
+    os.environ.pop("APPIMAGETOOL", None)
+    os.environ["PATH"], old_path = base, os.environ["PATH"]
+    try:
+        result = build_appimage(base, "demo", cache_dir=os.path.join(base, "cache"), allow_download=False)
+    finally:
+        os.environ["PATH"] = old_path
+    assert not result["success"]
+    assert "appimagetool nicht gefunden" in result["message"]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests für tar-, tar.zst- und 7z-Archive über den gemeinsamen Archivleser
+"""
+
+import dataclasses
+import io
+import json
+import os
+import tarfile
+import tempfile
+import zipfile
+
+import pytest
+
+from shared.archive_reader import (
+    DIRECTORY,
+    FILE,
+    archive_format,
+    extract_archive,
+    list_members,
+    strip_archive_suffix,
+    unpacked_size,
+)
+from shared.workspace_manager import archive_workspace_size
+from shared.zip_extract import ExtractionError
+from zip2gh import EXIT_OK, main
+
+FILES = {
+    "./projekt/main.py": b"print(1)\n",
+    "./projekt/docs/README.md": b"# Projekt\n" * 200,
+}
+
+
+def make_tar(files, mode="w:gz", links=()):
+    """tar-Archiv mit Verzeichniseinträgen und optionalen Symlinks als Bytes"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as tf:
+        for directory in sorted({os.path.dirname(name) for name in files}):
+            info = tarfile.TarInfo(directory)
+            info.type = tarfile.DIRTYPE
+            tf.addfile(info)
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tf.addfile(info, io.BytesIO(content))
+        for name, target in links:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tf.addfile(info)
+    return buffer.getvalue()
+
+
+def write(data, name="upload"):
+    path = os.path.join(tempfile.mkdtemp(), name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def test_format_detection_by_signature():
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as zf:
+        zf.writestr("a.txt", "1")
+    assert archive_format(zip_buffer) == "zip"
+    for mode, fmt in (("w", "tar"), ("w:gz", "gz"), ("w:bz2", "bz2"), ("w:xz", "xz")):
+        assert archive_format(io.BytesIO(make_tar(FILES, mode))) == fmt
+        assert archive_format(write(make_tar(FILES, mode))) == fmt
+    assert archive_format(io.BytesIO(b"kein archiv")) is None
+
+    assert strip_archive_suffix("Mein Projekt.tar.gz") == "Mein Projekt"
+    assert strip_archive_suffix("app.TZST") == "app"
+    assert strip_archive_suffix("notizen.txt") == "notizen.txt"
+
+
+def test_tar_gz_is_extracted_in_one_pass():
+    archive = write(make_tar(FILES, links=[("./projekt/link", "/etc/passwd")]))
+    target = tempfile.mkdtemp()
+
+    stats = extract_archive(archive, target)
+
+    assert stats == dict(stats, format="gz", files=2, skipped=1)
+    assert stats["bytes"] == sum(len(content) for content in FILES.values())
+    with open(os.path.join(target, "projekt", "docs", "README.md"), "rb") as f:
+        assert f.read() == FILES["./projekt/docs/README.md"]
+    assert not os.path.lexists(os.path.join(target, "projekt", "link"))
+
+    members = list_members(archive)
+    assert ("projekt/main.py", len(FILES["./projekt/main.py"]), FILE) in members
+    assert any(member.kind == DIRECTORY for member in members)
+    # gzip-Trailer liefert die Größe des tar-Stroms
+    assert unpacked_size(archive) == len(make_tar(FILES, mode="w"))
+    assert archive_workspace_size(archive) > os.path.getsize(archive)
+
+
+def test_tar_checks_apply_while_streaming():
+    with pytest.raises(ExtractionError, match="Unsicherer Pfad"):
+        extract_archive(write(make_tar({"../boese.py": b"x"})), tempfile.mkdtemp())
+    archive = write(make_tar(FILES, mode="w:xz"))
+    with pytest.raises(ExtractionError, match="zu viele"):
+        extract_archive(archive, tempfile.mkdtemp(), max_files=2)
+    with pytest.raises(ExtractionError, match="Limit"):
+        extract_archive(archive, tempfile.mkdtemp(), max_total_size=100)
+    with pytest.raises(ExtractionError, match="Unsichere Datei"):
+        extract_archive(
+            archive,
+            tempfile.mkdtemp(),
+            check=lambda name: (not name.endswith(".md"), "Dateityp nicht erlaubt"),
+        )
+    with pytest.raises(ExtractionError, match="Kein unterstütztes"):
+        extract_archive(write(b"kein archiv"), tempfile.mkdtemp())
+    # Datei "a" neben Verzeichnis "a/"
+    with pytest.raises(ExtractionError, match="kann nicht entpackt"):
+        extract_archive(write(make_tar({"./p/a": b"1", "./p/a/b": b"2"})), tempfile.mkdtemp())
+
+
+def test_zip2gh_accepts_tar_gz():
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(directory, "web app.tar.gz"), "wb") as f:
+        f.write(make_tar(FILES))
+    stream = io.StringIO()
+
+    assert main([directory, "--dry-run"], stream=stream) == EXIT_OK
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["repo"] for e in events if e["event"] == "done"] == ["web-app"]
+
+
+def test_tar_zst():
+    zstandard = pytest.importorskip("zstandard")
+    tar_bytes = make_tar(FILES, mode="w")
+    archive = write(zstandard.ZstdCompressor().compress(tar_bytes))
+
+    assert archive_format(archive) == "zst"
+    assert unpacked_size(archive) == len(tar_bytes)
+    stats = extract_archive(archive, tempfile.mkdtemp())
+    assert stats["files"] == 2
+
+
+def test_corrupt_tar_zst_raises_extraction_error():
+    zstandard = pytest.importorskip("zstandard")
+    data = b"".join(b"zeile %d\n" % i for i in range(50000))
+    compressed = zstandard.ZstdCompressor().compress(make_tar({"./p/daten.bin": data}, mode="w"))
+    middle = len(compressed) // 2
+    archive = write(compressed[:middle] + b"\x00" * 64 + compressed[middle + 64:])
+
+    with pytest.raises(ExtractionError, match="daten.bin"):
+        extract_archive(archive, tempfile.mkdtemp())
+
+
+def test_7z():
+    py7zr = pytest.importorskip("py7zr")
+    source = tempfile.mkdtemp()
+    os.makedirs(os.path.join(source, "projekt"))
+    with open(os.path.join(source, "projekt", "main.py"), "wb") as f:
+        f.write(FILES["./projekt/main.py"])
+    archive = os.path.join(tempfile.mkdtemp(), "projekt.7z")
+    with py7zr.SevenZipFile(archive, "w") as sz:
+        sz.writeall(os.path.join(source, "projekt"), "projekt")
+
+    assert archive_format(archive) == "7z"
+    target = tempfile.mkdtemp()
+    assert extract_archive(archive, target)["files"] == 1
+    assert os.path.isfile(os.path.join(target, "projekt", "main.py"))
+    with pytest.raises(ExtractionError, match="Limit"):
+        extract_archive(archive, tempfile.mkdtemp(), max_total_size=1)
+
+
+def test_7z_limits_apply_to_written_bytes(monkeypatch):
+    """Zu kleine Größenangaben im Inhaltsverzeichnis umgehen die Limits nicht"""
+    py7zr = pytest.importorskip("py7zr")
+    archive = os.path.join(tempfile.mkdtemp(), "gross.7z")
+    with py7zr.SevenZipFile(archive, "w") as sz:
+        sz.writestr(b"x" * 4096, "projekt/gross.bin")
+        sz.writestr(b"", "projekt/leer.txt")
+
+    real_list = py7zr.SevenZipFile.list
+
+    def lying_list(self):
+        # FileInfo ist je nach py7zr-Version namedtuple oder dataclass
+        return [
+            info._replace(uncompressed=0)
+            if hasattr(info, "_replace")
+            else dataclasses.replace(info, uncompressed=0)
+            for info in real_list(self)
+        ]
+
+    monkeypatch.setattr(py7zr.SevenZipFile, "list", lying_list)
+    with pytest.raises(ExtractionError, match="zu groß"):
+        extract_archive(archive, tempfile.mkdtemp(), max_file_size=1024)
+    with pytest.raises(ExtractionError, match="Limit"):
+        extract_archive(archive, tempfile.mkdtemp(), max_total_size=1024)
+
+    target = tempfile.mkdtemp()
+    stats = extract_archive(archive, target)
+    assert (stats["files"], stats["bytes"]) == (2, 4096)
+    assert os.path.getsize(os.path.join(target, "projekt", "leer.txt")) == 0
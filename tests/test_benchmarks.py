@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests für Archiv-Generatoren und Baseline-Vergleich der Benchmarks
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from archive_generators import GENERATORS, generate_all
+from run_benchmarks import compare, run_suite
+
+
+def digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_generators_are_reproducible():
+    first = generate_all(tempfile.mkdtemp(), scale=0.02)
+    second = generate_all(tempfile.mkdtemp(), scale=0.02)
+    assert set(first) == set(GENERATORS)
+    assert {name: digest(path) for name, path in first.items()} == {
+        name: digest(path) for name, path in second.items()
+    }
+    other_seed = generate_all(tempfile.mkdtemp(), scale=0.02, seed=7, names=["many_small"])
+    assert digest(other_seed["many_small"]) != digest(first["many_small"])
+
+
+def test_suite_reports_metrics_and_regressions():
+    archives = generate_all(tempfile.mkdtemp(), scale=0.02, names=["many_small"])
+    results = run_suite(archives, ["validate_zip", "readme"], repeat=3, isolated=False)
+
+    summary = results["readme/many_small"]
+    assert summary["runs"] == 3
+    assert 0 < summary["p50_s"] <= summary["p95_s"]
+    assert summary["files"] > 0 and summary["throughput_mb_s"] > 0
+
+    # Gleiche Werte sind keine Regression, eine deutlich langsamere Messung schon
+    assert compare(results, results) == []
+    slower = dict(results, **{"readme/many_small": dict(summary, p50_s=summary["p50_s"] + 0.1)})
+    regressions = compare(slower, results)
+    assert [(r["case"], r["metric"]) for r in regressions] == [("readme/many_small", "p50_s")]
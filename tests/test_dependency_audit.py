@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests für die Offline-Schwachstellenprüfung von Abhängigkeiten
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from shared.advisory_db import NPM, PYPI, AdvisoryDatabase, load_database, version_key
+from shared.dependency_files import (
+    audit_dependencies,
+    collect_dependencies,
+    parse_package_json,
+    parse_package_lock,
+    parse_requirements,
+    parse_yarn_lock,
+    spec_range,
+)
+
+ADVISORIES = [
+    {
+        "id": "GHSA-django",
+        "summary": "SQL-Injection",
+        "database_specific": {"severity": "HIGH"},
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "Django"},
+                "ranges": [
+                    {
+                        "type": "ECOSYSTEM",
+                        "events": [
+                            {"introduced": "0"},
+                            {"fixed": "2.0"},
+                            {"introduced": "2.1"},
+                            {"last_affected": "2.1.4"},
+                        ],
+                    }
+                ],
+            }
+        ],
+    },
+    {
+        "id": "GHSA-lodash",
+        "summary": "Prototype Pollution",
+        "database_specific": {"severity": "MODERATE"},
+        "affected": [
+            {
+                "package": {"ecosystem": "npm", "name": "lodash"},
+                "ranges": [
+                    {"type": "SEMVER", "events": [{"introduced": "4.0.0"}, {"fixed": "4.17.21"}]}
+                ],
+                "versions": ["3.10.1"],
+            }
+        ],
+    },
+]
+
+
+def make_database():
+    database = AdvisoryDatabase()
+    for advisory in ADVISORIES:
+        database.add(advisory)
+    return database
+
+
+def test_version_ordering():
+    ordered = ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1", "1.0.1", "2.0.0-beta.1"]
+    keys = [version_key(v) for v in ordered]
+    assert keys == sorted(keys)
+    assert version_key("1.0") == version_key("1.0.0")
+    assert version_key("0.9") < version_key("1.0.0-next.5") < version_key("1.0.0")
+    assert version_key("2.0.0-beta.2") < version_key("2.0.0-beta.10")
+    # Phasen nur als ganzer Bezeichner; numerische Vorabversionen unter allen anderen
+    assert version_key("1.0.0-canary.1") < version_key("1.0.0-canary.2") < version_key("1.0.0")
+    assert version_key("1.0.0-build.3") != version_key("1.0.0-beta.3")
+    assert version_key("1.0.0-0.3.7") < version_key("1.0.0-alpha") < version_key("1.0.0")
+
+
+def test_lookup_ranges_and_exact_versions():
+    database = make_database()
+
+    assert [a["id"] for a in database.lookup(PYPI, "django", "1.11.29")] == ["GHSA-django"]
+    assert database.lookup(PYPI, "django", "2.0.5") == []
+    assert database.lookup(PYPI, "django", "2.1.4")[0]["severity"] == "high"
+    assert database.lookup(PYPI, "django", "2.1.5") == []
+    assert database.lookup(NPM, "lodash", "4.17.20")[0]["severity"] == "medium"
+    assert database.lookup(NPM, "lodash", "4.17.21") == []
+    # Vorabversion des Fix-Release ist noch betroffen
+    assert database.lookup(NPM, "lodash", "4.17.21-0.3.7")
+    assert database.lookup(NPM, "lodash", "3.10.1")
+    assert database.lookup(NPM, "unbekannt", "1.0.0") == []
+
+
+def test_spec_ranges():
+    database = make_database()
+
+    assert database.lookup_range(PYPI, "django", *spec_range(PYPI, "<2.0"))
+    assert not database.lookup_range(PYPI, "django", *spec_range(PYPI, ">=2.0,<2.1"))
+    assert database.lookup_range(NPM, "lodash", *spec_range(NPM, "^4.17.0"))
+    assert not database.lookup_range(NPM, "lodash", *spec_range(NPM, "^4.17.21"))
+    assert spec_range(NPM, "4.x") == (version_key("4"), version_key("5"))
+    assert spec_range(NPM, "1.2.x") == (version_key("1.2"), version_key("1.3"))
+    for spec in ("file:../lib", "git+https://example.com/a.git", "github:a/b", "next"):
+        assert spec_range(NPM, spec) is None
+    assert database.lookup_range(NPM, "lodash", *spec_range(NPM, "4.0.0 - 4.17.20"))
+    assert not database.lookup_range(NPM, "lodash", *spec_range(NPM, "4.17.21 - 4.18"))
+    packages = parse_package_json(json.dumps({"dependencies": {"a": "4.x", "b": "1.2.*"}}))
+    assert [d["version"] for d in packages] == [None, None]
+
+
+def test_lockfile_parsers():
+    requirements = parse_requirements("Django[argon2]==1.11 ; python_version > '3'\n-e .\n# x\nflask>=2\n")
+    assert [(d["name"], d["version"]) for d in requirements] == [("Django", "1.11"), ("flask", None)]
+
+    lock = json.dumps(
+        {
+            "lockfileVersion": 3,
+            "packages": {
+                "": {"name": "app"},
+                "node_modules/lodash": {"version": "4.17.20"},
+                "node_modules/a/node_modules/@scope/b": {"version": "1.0.0"},
+            },
+        }
+    )
+    assert [(d["name"], d["version"]) for d in parse_package_lock(lock)] == [
+        ("lodash", "4.17.20"),
+        ("@scope/b", "1.0.0"),
+    ]
+
+    yarn = (
+        '"@babel/core@^7.0.0", "@babel/core@^7.1.0":\n'
+        '  version "7.2.0"\n'
+        '  dependencies:\n'
+        '    lodash "^4.0.0"\n'
+        '\n'
+        '"lodash@npm:^4.17.0":\n'
+        '  version: 4.17.20\n'
+    )
+    assert [(d["name"], d["version"]) for d in parse_yarn_lock(yarn)] == [
+        ("@babel/core", "7.2.0"),
+        ("lodash", "4.17.20"),
+    ]
+
+
+def test_project_audit_prefers_lockfiles():
+    """package-lock.json ersetzt package.json; Teilprojekte werden mitgeprüft"""
+    root = tempfile.mkdtemp(prefix="deps_test_")
+    os.makedirs(os.path.join(root, "web"))
+    with open(os.path.join(root, "requirements.txt"), "w") as f:
+        f.write("django==1.11.29\nrequests==2.31.0\n")
+    with open(os.path.join(root, "web", "package.json"), "w") as f:
+        json.dump({"dependencies": {"lodash": "^4.0.0"}}, f)
+    with open(os.path.join(root, "web", "package-lock.json"), "w") as f:
+        json.dump({"lockfileVersion": 1, "dependencies": {"lodash": {"version": "4.17.21"}}}, f)
+    with open(os.path.join(root, "advisories.json"), "w") as f:
+        json.dump(ADVISORIES, f)
+
+    dependencies = collect_dependencies(root)
+    assert {d["file"] for d in dependencies} == {"requirements.txt", "web/package-lock.json"}
+
+    findings = audit_dependencies(dependencies, load_database(os.path.join(root, "advisories.json")))
+    assert [(f["package"], f["id"]) for f in findings] == [("django==1.11.29", "GHSA-django")]
+
+
+def test_large_lockfile_is_fast():
+    """2000 Abhängigkeiten gegen 2000 Advisories in deutlich unter einer Sekunde"""
+    database = AdvisoryDatabase()
+    for i in range(2000):
+        database.add(
+            {
+                "id": f"OSV-{i}",
+                "affected": [
+                    {
+                        "package": {"ecosystem": "npm", "name": f"pkg-{i % 500}"},
+                        "ranges": [
+                            {"type": "SEMVER", "events": [{"introduced": f"{i % 7}.0.0"}, {"fixed": f"{i % 7}.5.0"}]}
+                        ],
+                    }
+                ],
+            }
+        )
+    database.build()
+    dependencies = [
+        {"ecosystem": NPM, "name": f"pkg-{i}", "version": f"{i % 9}.2.0", "spec": "", "file": "x"}
+        for i in range(2000)
+    ]
+
+    started = time.perf_counter()
+    findings = audit_dependencies(dependencies, database)
+    assert time.perf_counter() - started < 0.5
+    assert findings
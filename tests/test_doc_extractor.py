@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests für die AST-basierte Dokumentations-Extraktion
+"""
+
+import os
+import tempfile
+
+from shared.analysis_cache import AnalysisCache
+from shared.doc_extractor import build_symbol_table, parse_symbols
+
+SOURCE = '''"""Modul-Docstring"""
+
+
+def add(
+    a: int,
+    b: int = 2,
+    *values,
+    scale: float = 1.0,
+    **options
+) -> int:
+    \'\'\'Addiert zwei Zahlen.\'\'\'
+    return a + b
+
+
+async def fetch(url):
+    """Lädt eine URL."""
+
+
+def undocumented():
+    pass
+
+
+class Client(Base):
+    """HTTP-Client."""
+
+    def get(self, path: str) -> dict:
+        """Führt einen GET-Request aus."""
+'''.encode("utf-8")
+
+TEST_SOURCE = b'''
+def test_adds_numbers():
+    result = add(1, 2)
+
+    assert result == 3
+
+
+class TestClient:
+    def test_get(self):
+        assert Client().get("/")
+'''
+
+
+def test_parse_symbols_signatures_and_docstrings():
+    """Mehrzeilige Signaturen, Klassen und einfache Anführungszeichen"""
+    symbols = parse_symbols(SOURCE)
+
+    assert symbols["docstring"] == "Modul-Docstring"
+    functions = {f["name"]: f for f in symbols["functions"]}
+    assert functions["add"]["signature"] == (
+        "add(a: int, b: int = 2, *values, scale: float = 1.0, **options) -> int"
+    )
+    assert functions["add"]["docstring"] == "Addiert zwei Zahlen."
+    assert functions["fetch"]["async"]
+    assert functions["undocumented"]["docstring"] == ""
+
+    client = symbols["classes"][0]
+    assert client["bases"] == ["Base"]
+    assert client["docstring"] == "HTTP-Client."
+    assert client["methods"][0]["signature"] == "get(self, path: str) -> dict"
+
+
+def test_test_examples_are_complete():
+    """Testbeispiele enthalten den vollständigen Funktionskörper"""
+    symbols = parse_symbols(TEST_SOURCE, collect_tests=True)
+
+    examples = {t["name"]: t["code"] for t in symbols["tests"]}
+    assert examples["adds numbers"] == (
+        "def test_adds_numbers():\n    result = add(1, 2)\n\n    assert result == 3"
+    )
+    assert examples["get"].startswith("def test_get(self):")
+
+    helper = parse_symbols(b"def testing_helpers():\n    pass\n", collect_tests=True)
+    assert helper["tests"][0]["name"] == "testing helpers"
+
+
+def test_syntax_error_is_reported():
+    symbols = parse_symbols(b"def broken(:\n")
+    assert "error" in symbols
+    assert symbols["functions"] == []
+
+
+def test_build_symbol_table_uses_cache():
+    """Unveränderte Dateien werden beim zweiten Durchlauf nicht neu geparst"""
+    root = tempfile.mkdtemp(prefix="doc_test_")
+    os.makedirs(os.path.join(root, "pkg"))
+    with open(os.path.join(root, "pkg", "__init__.py"), "wb") as f:
+        f.write(SOURCE)
+    with open(os.path.join(root, "test_pkg.py"), "wb") as f:
+        f.write(TEST_SOURCE)
+
+    cache = AnalysisCache()
+    table = build_symbol_table(root, cache=cache)
+
+    assert [m["module"] for m in table["modules"]] == ["pkg", "test_pkg"]
+    assert len(table["modules"][1]["tests"]) == 2
+    assert cache.misses == 2
+
+    build_symbol_table(root, cache=cache)
+    assert cache.hits == 2
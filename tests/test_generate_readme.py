@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests für den vorlagenbasierten README-Generator
+"""
+
+import heapq
+import time
+
+from shared.file_index import FileEntry, FileIndex
+from shared.generate_readme import generate_readme, register_template
+
+
+def make_index(paths):
+    """Baut einen Index aus relativen Pfaden (ohne Dateisystem)"""
+    entries = []
+    for path in paths:
+        directory, _, name = path.rpartition("/")
+        dot = name.rfind(".")
+        entries.append(
+            FileEntry(
+                path=path,
+                dir=directory,
+                name=name,
+                ext=name[dot:].lower() if dot > 0 else "",
+                size=0,
+                depth=path.count("/"),
+            )
+        )
+    return FileIndex("/projekt", entries)
+
+
+def test_flask_project_from_recursive_index():
+    paths = ["app.py", "requirements.txt", "flask_ext/views.py", "static/css/style.css"]
+    readme = generate_readme(make_index(paths))
+
+    assert readme.startswith("# Flask-Anwendung\n")
+    assert "Dieses Projekt verwendet: Python-Paket, Flask" in readme
+    assert "pip install -r requirements.txt" in readme
+    assert "python app.py" in readme
+    # Index und Pfadliste ergeben dieselbe README
+    assert generate_readme(paths) == readme
+
+
+def test_nested_manifests_do_not_count_as_root():
+    readme = generate_readme(make_index(["frontend/package.json", "frontend/src/App.jsx"]))
+    assert readme.startswith("# JavaScript-Projekt")
+    assert "npm install" not in readme
+
+
+def test_project_type_template_override():
+    readme = generate_readme(["Dockerfile", "docker-compose.yml", "main.py"])
+    assert readme.startswith("# Docker-Projekt")
+    assert "docker compose up" in readme
+    assert "python main.py" not in readme
+
+    register_template("Webseite", run=("\n## Ausführung\n`index.html` öffnen", ()))
+    try:
+        readme = generate_readme(["index.html", "style.css"])
+    finally:
+        register_template("Webseite")
+    assert readme.endswith("## Ausführung\n`index.html` öffnen")
+
+
+def test_large_index_preview_and_speed():
+    paths = [f"pkg{i % 7}/sub{i % 997}/modul_{i}.py" for i in range(100000)]
+    paths += [f"pkg{i % 7}/Komponente_{i}.js" for i in range(0, 100000, 11)]
+    paths.append("main.py")
+    index = make_index(paths)
+
+    started = time.perf_counter()
+    readme = generate_readme(index)
+    elapsed = time.perf_counter() - started
+
+    structure = readme.split("```")[1].strip().splitlines()
+    assert structure[:-1] == [f"- {path}" for path in heapq.nsmallest(20, paths)]
+    assert structure[-1] == f"... und {len(paths) - 20} weitere Dateien"
+    assert elapsed < 0.25
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests für den token-bezogenen TTL-Cache
+"""
+
+from shared.github_cache import TokenCache, cached_per_token, invalidate_token
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_results_are_cached_per_token_until_ttl():
+    clock = FakeClock()
+    cache = TokenCache(clock=clock)
+    calls = []
+
+    @cached_per_token(ttl=60, cache=cache)
+    def check(token):
+        calls.append(token)
+        return True, f"ok {len(calls)}"
+
+    assert check("token-a") == (True, "ok 1")
+    assert check("token-a") == (True, "ok 1")
+    assert check("token-b") == (True, "ok 2")
+
+    clock.now = 61
+    assert check("token-a") == (True, "ok 3")
+    assert calls == ["token-a", "token-b", "token-a"]
+    assert all("token" not in key[0] for key in cache._entries)
+
+
+def test_invalidate_and_cache_if():
+    cache = TokenCache()
+    results = iter([(True, "gültig"), (False, "401"), (False, "Verbindungsfehler")])
+
+    @cached_per_token(cache=cache, cache_if=lambda result: result[1] != "Verbindungsfehler")
+    def check(token):
+        return next(results)
+
+    assert check("token") == (True, "gültig")
+    invalidate_token("token", cache=cache)
+    assert check("token") == (False, "401")
+    assert check("token") == (False, "401")
+
+    cache.clear()
+    assert check("token") == (False, "Verbindungsfehler")
+    assert len(cache) == 0
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests für die asynchrone Zustellung von Benachrichtigungen
+"""
+
+import threading
+import time
+
+from shared.notification_dispatcher import Channel, NotificationDispatcher
+
+
+def event(i, success=True):
+    return {"repo_name": f"repo-{i}", "repo_url": f"https://example.com/{i}", "success": success}
+
+
+def test_submit_does_not_wait_for_slow_webhooks():
+    release = threading.Event()
+    sent = []
+
+    def slow_send(item, timeout):
+        release.wait(5)
+        sent.append(item)
+        return True
+
+    dispatcher = NotificationDispatcher([Channel("slow", slow_send)], coalesce_window=0)
+
+    started = time.perf_counter()
+    for i in range(20):
+        assert dispatcher.submit(event(i)) == {"slow": True}
+    assert time.perf_counter() - started < 0.5
+
+    release.set()
+    assert dispatcher.flush(timeout=5)
+    assert len(sent) == 20
+    dispatcher.shutdown()
+
+
+def test_batch_events_are_coalesced():
+    summaries = []
+    channel = Channel(
+        "chat",
+        send_one=lambda item, timeout: True,
+        send_summary=lambda items, timeout: summaries.append(len(items)) or True,
+    )
+    dispatcher = NotificationDispatcher([channel], coalesce_window=0.3, max_batch=10)
+
+    for i in range(25):
+        dispatcher.submit(event(i, success=i % 5 != 0))
+
+    assert dispatcher.flush(timeout=5)
+    assert summaries == [10, 10, 5]
+    assert dispatcher.stats["chat"]["messages"] == 3
+    assert dispatcher.stats["chat"]["delivered"] == 25
+    dispatcher.shutdown()
+
+
+def test_retry_with_backoff_and_bounded_queue():
+    attempts = []
+
+    def flaky(item, timeout):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise OSError("Timeout")
+        return True
+
+    dispatcher = NotificationDispatcher(
+        [Channel("flaky", flaky)], coalesce_window=0, retries=3, backoff=0.01
+    )
+    dispatcher.submit(event(1))
+    assert dispatcher.flush(timeout=5)
+    assert len(attempts) == 3
+    assert dispatcher.stats["flaky"]["delivered"] == 1
+    dispatcher.shutdown()
+
+    blocked = threading.Event()
+    full = NotificationDispatcher(
+        [Channel("full", lambda item, timeout: blocked.wait(5))], queue_size=2, coalesce_window=0
+    )
+    results = [full.submit(event(i))["full"] for i in range(5)]
+    assert results.count(False) >= 2
+    assert full.stats["full"]["dropped"] == results.count(False)
+    blocked.set()
+    full.shutdown()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests für Outbox, Wiederaufnahme nach Neustart und SMTP-Versand
+"""
+
+import os
+import socketserver
+import tempfile
+import threading
+import time
+
+from shared.notification_dispatcher import Channel, NotificationDispatcher
+from shared.notification_outbox import Outbox
+from shared.smtp_sender import SMTPSender
+import webhook_integration
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Minimaler SMTP-Server, der empfangene Nachrichten sammelt"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line.split(" ", 1)[0].upper()
+            if not line or command == "QUIT":
+                self.reply("221 Bye")
+                return
+            if command == "EHLO":
+                self.reply("250 stub")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline().decode()
+                    if data.rstrip("\r\n") == ".":
+                        break
+                    lines.append(data)
+                self.server.messages.append("".join(lines))
+                self.reply("250 OK")
+            else:
+                self.reply("250 OK")
+
+
+def start_smtp_stub():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPStubHandler)
+    server.daemon_threads = True
+    server.messages = []
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_smtp_sender_reuses_connections():
+    server = start_smtp_stub()
+    sender = SMTPSender("127.0.0.1", server.server_address[1], starttls=False)
+    try:
+        for i in range(5):
+            assert sender.send("dev@example.com", f"Upload {i}", "Inhalt")
+    finally:
+        sender.close()
+        server.shutdown()
+
+    assert len(server.messages) == 5
+    assert "Subject: Upload 4" in server.messages[-1]
+    assert sender.connections_opened == 1
+    assert server.connections == 1
+
+
+def test_email_channel_passes_timeout_to_smtp(monkeypatch):
+    server = start_smtp_stub()
+    sender = SMTPSender("127.0.0.1", server.server_address[1], starttls=False)
+    monkeypatch.setattr(webhook_integration, "get_smtp_sender", lambda: sender)
+    monkeypatch.setenv("NOTIFICATION_EMAIL", "dev@example.com")
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.delenv("SLACK_WEBHOOK_URL", raising=False)
+    monkeypatch.delenv("DISCORD_WEBHOOK_URL", raising=False)
+    [channel] = webhook_integration.build_channels()
+    event = {"repo_name": "demo", "repo_url": None, "success": True}
+    try:
+        assert channel.send_one(event, 2.5)
+        connection, _ = sender._idle.get_nowait()
+        assert connection.sock.gettimeout() == 2.5
+        sender._release(connection)
+        # Wiederverwendete Verbindung übernimmt das Timeout des neuen Aufrufs
+        assert channel.send_summary([event, event], 1.5)
+        connection, _ = sender._idle.get_nowait()
+        assert connection.sock.gettimeout() == 1.5
+        sender._release(connection)
+    finally:
+        sender.close()
+        server.shutdown()
+    assert sender.connections_opened == 1
+
+
+def test_outbox_replays_undelivered_after_restart():
+    path = os.path.join(tempfile.mkdtemp(), "outbox.db")
+    event = {"repo_name": "demo", "repo_url": None, "success": True}
+
+    # Erster Lauf: Kanal nicht erreichbar
+    failing = NotificationDispatcher(
+        [Channel("chat", lambda item, timeout: False)],
+        coalesce_window=0,
+        retries=1,
+        backoff=0,
+        outbox=Outbox(path),
+    )
+    failing.submit(event)
+    assert failing.flush(timeout=5)
+    failing.shutdown()
+    failing.outbox.close()
+
+    outbox = Outbox(path)
+    assert [(channel, item) for _, channel, item in outbox.pending()] == [("chat", event)]
+    assert outbox.metrics()["chat"]["attempts"] == 2
+
+    # Neustart: offene Einträge werden zugestellt
+    delivered = []
+    dispatcher = NotificationDispatcher(
+        [Channel("chat", lambda item, timeout: delivered.append(item) or True)],
+        coalesce_window=0,
+        outbox=outbox,
+    )
+    assert dispatcher.flush(timeout=5)
+    dispatcher.shutdown()
+
+    assert delivered == [event]
+    assert outbox.pending() == []
+    metrics = outbox.metrics()["chat"]
+    assert metrics["delivered"] == 1
+    assert metrics["success_rate"] == 1.0
+    assert metrics["attempt_success_rate"] == 1 / 3
+    assert metrics["latency_p50"] >= 0
+    outbox.close()
+
+
+def test_due_rows_are_requeued_and_claimed_once():
+    path = os.path.join(tempfile.mkdtemp(), "outbox.db")
+    delivered = []
+    lock = threading.Lock()
+
+    def send(item, timeout):
+        with lock:
+            delivered.append(item["repo_name"])
+        return True
+
+    # Zwei Dispatcher mit eigener Verbindung wie zwei Prozesse
+    dispatchers = [
+        NotificationDispatcher(
+            [Channel("chat", send)], coalesce_window=0, outbox=Outbox(path), requeue_interval=0.02
+        )
+        for _ in range(2)
+    ]
+    # Einträge eines dritten Prozesses werden periodisch eingereiht
+    writer = Outbox(path)
+    for i in range(20):
+        writer.enqueue(["chat"], {"repo_name": f"repo-{i}", "repo_url": None, "success": True})
+
+    deadline = time.monotonic() + 5
+    while writer.pending() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    for dispatcher in dispatchers:
+        dispatcher.shutdown()
+        dispatcher.outbox.close()
+
+    assert writer.pending() == []
+    assert sorted(delivered) == sorted(f"repo-{i}" for i in range(20))
+
+    # Eine gültige Lease sperrt den Eintrag für andere Dispatcher
+    ids = writer.enqueue(["chat"], {"repo_name": "x"})
+    assert writer.claim(ids.values(), "a") == [ids["chat"]]
+    assert writer.claim(ids.values(), "b") == []
+    assert writer.due() == []
+    writer.release(ids.values(), "a")
+    assert [i for i, _, _ in writer.due()] == [ids["chat"]]
+    writer.close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests für die Projektbeschreibung ohne KI-Anbieter
+"""
+
+import os
+import tempfile
+import time
+
+from shared.file_index import build_file_index
+from shared.offline_summary import (
+    generate_offline_readme,
+    offline_description,
+    read_module_docstring,
+    summarize_project,
+)
+
+
+def create_tree(files):
+    """Legt eine Verzeichnisstruktur mit den angegebenen Dateien an"""
+    root = tempfile.mkdtemp(prefix="offline_test_")
+    for rel_path, content in files.items():
+        path = os.path.join(root, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    return root
+
+
+PYPROJECT = """
+[project]
+name = "bildarchiv"
+version = "1.2.0"
+description = "Verwaltet und verschlagwortet Fotosammlungen."
+keywords = ["fotos", "archiv"]
+dependencies = ["flask>=2.0", "pillow"]
+"""
+
+
+def test_summary_uses_manifest_docstrings_and_dependencies():
+    root = create_tree(
+        {
+            "pyproject.toml": PYPROJECT,
+            "app.py": '#!/usr/bin/env python3\n"""Web-Oberfläche des Bildarchivs."""\n',
+            "bildarchiv/__init__.py": '"""\nKernlogik: Import, Suche und Tags.\n\nDetails folgen.\n"""\n',
+            "bildarchiv/suche.py": "def suche():\n    pass\n",
+            "tests/test_suche.py": '"""Tests"""\n',
+        }
+    )
+    summary = summarize_project(build_file_index(root))
+
+    assert summary["name"] == "bildarchiv"
+    assert summary["description"] == "Verwaltet und verschlagwortet Fotosammlungen."
+    assert "Flask" in summary["frameworks"]
+    assert [m["module"] for m in summary["modules"]] == ["app", "bildarchiv"]
+    assert summary["statistics"]["test_files"] == 1
+
+    description = offline_description(summary)
+    assert description.startswith("1. Verwaltet und verschlagwortet Fotosammlungen.")
+    assert "2. Tags: fotos, archiv, python, flask" in description
+
+    readme = generate_offline_readme(root)
+    assert readme.startswith("# bildarchiv (1.2.0)\n")
+    assert "- `bildarchiv`: Kernlogik: Import, Suche und Tags." in readme
+    assert "## Statistik" in readme
+
+
+def test_offline_readme_uses_project_type_template():
+    root = create_tree({"Dockerfile": "FROM python:3.11\n", "main.py": '"""Einstieg."""\n'})
+
+    readme = generate_offline_readme(root)
+
+    # Vorlage des Docker-Projekts plus Module und Statistik
+    assert "docker build -t projekt ." in readme
+    assert "python main.py" not in readme
+    assert "- `main`: Einstieg." in readme
+    assert "## Statistik" in readme
+
+
+def test_package_json_and_docstring_fallback():
+    root = create_tree(
+        {
+            "package.json": '{"name": "dashboard", "dependencies": {"react": "^18.2.0"}}',
+            "src/App.jsx": "",
+            "server/main.py": "",
+        }
+    )
+    summary = summarize_project(root)
+    assert summary["project_type"] == "Python, JavaScript-Projekt"
+    assert summary["frameworks"] == ["Node.js", "React"]
+    assert offline_description(summary).startswith("1. Python, JavaScript-Projekt mit 3 Dateien")
+
+
+def test_docstring_read_from_file_head_only():
+    root = create_tree(
+        {
+            "gross.py": "# -*- coding: utf-8 -*-\n'''Großes Modul.'''\n" + "x = 1\n" * 200000,
+            "ohne.py": "import os\n'''Kein Docstring'''\n",
+        }
+    )
+    assert read_module_docstring(os.path.join(root, "gross.py")) == "Großes Modul."
+    assert read_module_docstring(os.path.join(root, "ohne.py")) == ""
+
+
+def test_large_project_summary_is_fast():
+    files = {"pyproject.toml": PYPROJECT, "app.py": '"""Einstieg."""\n'}
+    for i in range(3000):
+        files[f"paket/modul_{i % 40}/datei_{i}.py"] = ""
+    index = build_file_index(create_tree(files))
+
+    started = time.perf_counter()
+    generate_offline_readme(index)
+    assert time.perf_counter() - started < 0.1
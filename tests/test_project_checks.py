@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests für die aus der Streamlit-App ausgelagerten Projektprüfungen
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from shared.project_checks import (
+    analyze_git_error,
+    analyze_project_structure,
+    detect_project_type,
+    sanitize_repo_name,
+)
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def test_sanitize_repo_name():
+    assert sanitize_repo_name("Mein Projekt 1") == (True, "Mein-Projekt-1")
+    assert sanitize_repo_name("")[0] is False
+    assert sanitize_repo_name("-projekt-")[0] is False
+    assert sanitize_repo_name("a" * 101)[0] is False
+
+
+def test_git_errors_and_structure():
+    assert [s["action"] for s in analyze_git_error("fatal: Authentication failed")] == [
+        "check_token"
+    ]
+    assert analyze_git_error("unbekannt") == []
+
+    project = tempfile.mkdtemp()
+    with open(os.path.join(project, "requirements.txt"), "w") as f:
+        f.write("requests\n")
+    with open(os.path.join(project, "main.py"), "w") as f:
+        f.write("print(1)\n")
+
+    structure = analyze_project_structure(project)
+    assert any("README.md" in practice for practice in structure["best_practices"])
+    assert detect_project_type(project)["type"] == "python"
+
+
+def test_modules_load_without_ui_and_chart_libraries():
+    code = (
+        "import sys\n"
+        "import shared.project_checks, shared.github_auth\n"
+        "heavy = {'streamlit', 'pandas', 'altair', 'matplotlib'} & set(sys.modules)\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env=dict(os.environ, PYTHONPATH=SRC_DIR),
+    )
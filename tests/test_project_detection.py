@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests für die rekursive, manifest-basierte Projekttyp-Erkennung
+"""
+
+import os
+import tempfile
+
+from shared.file_index import build_file_index
+from shared.project_detection import detect_project_profile, map_workspaces
+
+
+def create_tree(files):
+    """Legt eine Verzeichnisstruktur mit den angegebenen Dateien an"""
+    root = tempfile.mkdtemp(prefix="detect_test_")
+    for rel_path, content in files.items():
+        path = os.path.join(root, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+    return root
+
+
+def test_fullstack_monorepo():
+    """Node im Wurzelverzeichnis und Python im Unterordner werden beide erkannt"""
+    root = create_tree(
+        {
+            "package.json": "{}",
+            "yarn.lock": "",
+            "src/index.js": "",
+            "src/app.js": "",
+            "src/app.test.js": "",
+            "backend/requirements.txt": "flask\n",
+            "backend/app.py": "",
+            "backend/tests/test_app.py": "",
+            "node_modules/lib/index.js": "",
+        }
+    )
+
+    profile = detect_project_profile(root)
+
+    assert [lang["type"] for lang in profile["languages"]] == ["node", "python"]
+    workspaces = {ws["path"]: ws for ws in profile["workspaces"]}
+    assert set(workspaces) == {".", "backend"}
+
+    assert workspaces["."]["type"] == "node"
+    assert workspaces["."]["build_system"] == "yarn"
+    assert workspaces["."]["test_cmd"] == "npm test"
+    assert "src/index.js" in workspaces["."]["files"]
+
+    assert workspaces["backend"]["type"] == "python"
+    assert workspaces["backend"]["config"] == "requirements.txt"
+    assert workspaces["backend"]["test_cmd"] == "python -m pytest"
+    assert sorted(workspaces["backend"]["files"]) == ["app.py", "tests/test_app.py"]
+
+
+def test_depth_cap():
+    """Dateien unterhalb der Tiefenbegrenzung werden nicht indiziert"""
+    root = create_tree({"a/b/c/deep.py": "", "top.go": ""})
+
+    index = build_file_index(root, max_depth=1)
+    profile = detect_project_profile(root, index=index)
+
+    assert index.truncated
+    assert index.paths == ["top.go"]
+    assert profile["primary"] == "go"
+
+
+def test_unknown_project():
+    """Ohne Quelldateien und Manifeste gibt es keine Workspaces"""
+    root = create_tree({"notes.txt": "", "docs/readme.md": ""})
+
+    profile = detect_project_profile(root)
+
+    assert profile["primary"] is None
+    assert profile["workspaces"] == []
+
+
+def test_map_workspaces_keeps_order():
+    """Ergebnisse werden in Workspace-Reihenfolge zurückgegeben"""
+    root = create_tree(
+        {
+            "a/go.mod": "",
+            "b/Cargo.toml": "",
+            "c/package.json": "{}",
+        }
+    )
+    workspaces = detect_project_profile(root)["workspaces"]
+
+    results = map_workspaces(lambda ws_dir, ws: os.path.basename(ws_dir), root, workspaces)
+
+    assert results == ["a", "b", "c"]
+
+
+def test_config_reports_found_manifest_and_nested_tests_are_ignored():
+    """Gemeldet wird das tatsächlich gefundene Manifest; eingebettete Tests laufen nur einmal"""
+    root = create_tree(
+        {
+            "pyproject.toml": "",
+            "tests/test_core.py": "",
+            "tools/rs/main.rs": "",
+            "plugins/extra/setup.py": "",
+            "plugins/extra/test_extra.py": "",
+        }
+    )
+
+    workspaces = {ws["path"]: ws for ws in detect_project_profile(root)["workspaces"]}
+
+    assert workspaces["."]["config"] == "pyproject.toml"
+    assert workspaces["."]["test_cmd"] == "python -m pytest --ignore=plugins/extra"
+    assert workspaces["plugins/extra"]["config"] == "setup.py"
+    assert workspaces["plugins/extra"]["test_cmd"] == "python -m pytest"
+
+    rust = detect_project_profile(create_tree({"main.rs": ""}))["workspaces"][0]
+    assert rust["config"] is None and rust["test_cmd"] is None
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests für gestreamte Release-Uploads mit Wiederholung und Fortschritt
+"""
+
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from shared.release_assets import ReleaseAssetUploader
+
+
+class ReleaseStubHandler(BaseHTTPRequestHandler):
+    """Upload-Endpunkt mit Asset-Liste; ausgewählte Uploads scheitern einmal"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, data=None):
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        name = parse_qs(urlparse(self.path).query)["name"][0]
+        length = int(self.headers["Content-Length"])
+        data = self.rfile.read(length)
+        with server.lock:
+            server.content_types.append(self.headers["Content-Type"])
+            if name in server.assets:
+                return self.reply(422, {"message": "Validation Failed"})
+            if name in server.fail_once:
+                server.fail_once.discard(name)
+                server.assets[name] = ("starter", b"")
+                return self.reply(502, {"message": "Bad Gateway"})
+            server.assets[name] = ("uploaded", data)
+        self.reply(201, {"name": name, "browser_download_url": f"https://download/{name}"})
+
+    def do_GET(self):
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        with self.server.lock:
+            assets = [
+                {"name": name, "state": state, "url": f"{base}/assets/{name}"}
+                for name, (state, _) in self.server.assets.items()
+            ]
+        self.reply(200, assets)
+
+    def do_DELETE(self):
+        with self.server.lock:
+            self.server.deleted.append(self.path.rsplit("/", 1)[-1])
+            self.server.assets.pop(self.path.rsplit("/", 1)[-1], None)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def start_server(fail_once=()):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReleaseStubHandler)
+    server.lock = threading.Lock()
+    server.assets = {}
+    server.deleted = []
+    server.content_types = []
+    server.fail_once = set(fail_once)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    release = {
+        "upload_url": f"{base}/uploads/assets{{?name,label}}",
+        "assets_url": f"{base}/assets",
+    }
+    return server, release
+
+
+def make_file(directory, name, size):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def test_streamed_upload_reports_bytes():
+    server, release = start_server()
+    path = make_file(tempfile.mkdtemp(), "demo-x86_64.AppImage", 3 * 1024 * 1024 + 17)
+    seen = []
+    try:
+        uploader = ReleaseAssetUploader("token", chunk_size=64 * 1024)
+        result = uploader.upload(release, path, progress=seen.append)
+    finally:
+        server.shutdown()
+
+    assert result["success"] and result["attempts"] == 1
+    assert result["download_url"] == "https://download/demo-x86_64.AppImage"
+    with open(path, "rb") as f:
+        assert server.assets["demo-x86_64.AppImage"][1] == f.read()
+    assert server.content_types == ["application/x-executable"]
+    # Blockweise gelesen, nie mehr als ein Block auf einmal
+    assert len(seen) >= 3 * 1024 * 1024 // (64 * 1024)
+    assert max(b - a for a, b in zip([0] + seen, seen)) <= 64 * 1024
+    assert seen[-1] == os.path.getsize(path)
+
+
+def test_parallel_uploads_retry_after_partial_asset():
+    server, release = start_server(fail_once={"b.zip"})
+    directory = tempfile.mkdtemp()
+    paths = [make_file(directory, name, 200000) for name in ("a.AppImage", "b.zip", "c.tar.gz")]
+    progress = []
+    try:
+        uploader = ReleaseAssetUploader("token", backoff=0)
+        results = uploader.upload_many(release, paths, progress=lambda s, t: progress.append((s, t)))
+    finally:
+        server.shutdown()
+
+    assert [r["name"] for r in results] == ["a.AppImage", "b.zip", "c.tar.gz"]
+    assert all(r["success"] for r in results)
+    assert results[1]["attempts"] == 2
+    assert server.deleted == ["b.zip"]
+    assert progress[-1] == (600000, 600000)
+    assert all(state == "uploaded" for state, _ in server.assets.values())
+
+
+def test_existing_asset_is_replaced():
+    server, release = start_server()
+    path = make_file(tempfile.mkdtemp(), "x.bin", 10)
+    server.assets["x.bin"] = ("uploaded", b"")
+    try:
+        result = ReleaseAssetUploader("token", backoff=0, max_retries=1).upload(release, path)
+    finally:
+        server.shutdown()
+    assert result["success"] and result["attempts"] == 2 and server.deleted == ["x.bin"]
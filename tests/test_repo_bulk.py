@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests für Auswahl, Probelauf, Drosselung und Ausführung von Massenoperationen
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from shared.repo_bulk import (
+    DRY_RUN,
+    FAILED,
+    OK,
+    SKIPPED,
+    BulkExecutor,
+    RateLimiter,
+    inventory_changes,
+    plan_operation,
+    select_repositories,
+    summarize_results,
+)
+from shared.repo_inventory import RepoInventory
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def make_repo(i, name, created_at="2025-01-01T00:00:00Z", language="Python", private=False):
+    return {
+        "id": i,
+        "name": name,
+        "full_name": f"alice/{name}",
+        "created_at": created_at,
+        "updated_at": created_at,
+        "language": language,
+        "private": private,
+        "archived": False,
+        "description": "",
+        "topics": [],
+        "owner": {"login": "alice"},
+    }
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+        self.content = b"" if data is None else json.dumps(data).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        if self._data is None:
+            raise ValueError("kein JSON")
+        return self._data
+
+
+class FakeGitHub:
+    """Nimmt PATCH/PUT/DELETE an; optional mit einmaligem sekundärem Rate-Limit"""
+
+    def __init__(self, limited=(), failing=(), delay=0.0):
+        self.limited = set(limited)
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        self.active = self.max_active = 0
+
+    def request(self, method, url, headers, json, timeout):
+        name = url.split("/")[5]
+        with self.lock:
+            self.calls.append((method, name))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            if name in self.limited:
+                self.limited.discard(name)
+                return FakeResponse(403, {"message": "secondary rate limit"}, {"Retry-After": "0"})
+        if name in self.failing:
+            return FakeResponse(404, {"message": "Not Found"})
+        if method == "DELETE":
+            return FakeResponse(204)
+        if method == "PUT":
+            return FakeResponse(200, {"names": json["names"]})
+        return FakeResponse(200, dict(make_repo(0, name), **json))
+
+
+def test_select_by_pattern_age_language_and_history():
+    repos = [
+        make_repo(1, "test-alt", created_at="2024-01-01T00:00:00Z"),
+        make_repo(2, "test-neu", created_at="2025-05-30T00:00:00Z"),
+        make_repo(3, "Test-JS", created_at="2024-01-01T00:00:00Z", language="JavaScript"),
+        make_repo(4, "produktiv", created_at="2024-01-01T00:00:00Z"),
+    ]
+    assert [r["name"] for r in select_repositories(repos, name_pattern="test-*", now=NOW)] == [
+        "test-alt",
+        "test-neu",
+        "Test-JS",
+    ]
+    selected = select_repositories(
+        repos, name_pattern="test-*", min_age_days=30, languages=["Python"], now=NOW
+    )
+    assert [r["name"] for r in selected] == ["test-alt"]
+
+    history_file = os.path.join(tempfile.mkdtemp(), "history.json")
+    with open(history_file, "w") as f:
+        json.dump([{"repo_name": "produktiv", "status": "success"}], f)
+    selected = select_repositories(repos, uploaded_only=True, history_file=history_file)
+    assert [r["name"] for r in selected] == ["produktiv"]
+
+
+def test_dry_run_sends_nothing_and_marks_noops():
+    repos = [make_repo(1, "a"), make_repo(2, "b", private=True)]
+    plan = plan_operation(repos, "make_private")
+    github = FakeGitHub()
+
+    results = BulkExecutor("token", session=github).execute(plan, dry_run=True)
+
+    assert github.calls == []
+    assert [r["status"] for r in results] == [DRY_RUN, SKIPPED]
+    assert results[0]["change"] == "Öffentlich → Privat"
+
+
+def test_execute_concurrently_with_per_item_report():
+    repos = [make_repo(i, f"repo-{i}") for i in range(12)]
+    plan = plan_operation(repos, "archive")
+    github = FakeGitHub(limited={"repo-3"}, failing={"repo-5"}, delay=0.02)
+    executor = BulkExecutor(
+        "token", session=github, max_workers=4, limiter=RateLimiter(per_minute=None)
+    )
+
+    progress = []
+    results = executor.execute(plan, progress=lambda done, total: progress.append(done))
+
+    assert [r["repo"] for r in results] == [f"alice/repo-{i}" for i in range(12)]
+    assert results[3]["status"] == OK
+    assert results[5]["status"] == FAILED and results[5]["message"] == "Not Found"
+    assert summarize_results(results)[OK] == 11
+    assert github.calls.count(("PATCH", "repo-3")) == 2
+    assert 1 < github.max_active <= 4
+    assert progress == list(range(1, 13))
+
+
+def test_rate_limiter_spaces_requests_and_pauses_on_low_quota():
+    now = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(per_minute=30, reserve=5, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.wait()
+    assert sleeps == [2.0, 2.0]
+
+    limiter.update(FakeResponse(200, {}, {"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "1100"}))
+    assert limiter.wait(max_wait=10) is False
+    assert limiter.wait() is True
+    assert now[0] == 1100.0
+
+
+def test_inventory_cache_reflects_changes():
+    repos = [make_repo(1, "weg"), make_repo(2, "tags")]
+    cache_path = os.path.join(tempfile.mkdtemp(), "inventory.json")
+    inventory = RepoInventory("token", cache_path=cache_path)
+    inventory._save({"etag": None, "repos": {str(r["id"]): r for r in repos}, "fetched_at": 0, "full_at": 0})
+
+    github = FakeGitHub()
+    executor = BulkExecutor("token", session=github, limiter=RateLimiter(per_minute=None))
+    delete_plan = plan_operation(repos[:1], "delete")
+    topics_plan = plan_operation(repos[1:], "topics", ["Archiv", " test "])
+    changes = inventory_changes(delete_plan, executor.execute(delete_plan))
+    changes.update(inventory_changes(topics_plan, executor.execute(topics_plan)))
+
+    inventory.apply_changes(changes)
+    cached = inventory.cached()
+    assert [r["name"] for r in cached] == ["tags"]
+    assert cached[0]["topics"] == ["archiv", "test"]
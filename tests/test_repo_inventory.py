@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests für das zwischengespeicherte Repository-Inventar
+"""
+
+import os
+import tempfile
+import threading
+
+from shared.repo_inventory import PER_PAGE, RepoInventory
+
+
+class FakeResponse:
+    def __init__(self, status_code, items=None, etag=None, last_page=None):
+        self.status_code = status_code
+        self._items = items or []
+        self.headers = {"ETag": etag} if etag else {}
+        self.links = (
+            {"last": {"url": f"https://api.github.com/user/repos?page={last_page}"}}
+            if last_page
+            else {}
+        )
+
+    def json(self):
+        return self._items
+
+
+class FakeGitHub:
+    """Simuliert /user/repos mit Paginierung, Sortierung und ETags"""
+
+    def __init__(self, count):
+        self.repos = [self.make_repo(i, f"2024-01-01T00:00:{i % 60:02d}Z") for i in range(count)]
+        self.calls = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_repo(i, updated_at):
+        return {
+            "id": i,
+            "name": f"repo-{i}",
+            "updated_at": updated_at,
+            "owner": {"login": "alice"},
+            "private": False,
+            "extra": "wird nicht gespeichert",
+        }
+
+    def etag(self):
+        return '"%s"' % hash(tuple((r["id"], r["updated_at"]) for r in self.ordered()[:PER_PAGE]))
+
+    def ordered(self):
+        return sorted(self.repos, key=lambda r: (r["updated_at"], r["id"]), reverse=True)
+
+    def get(self, url, headers, params, timeout):
+        page = params["page"]
+        with self.lock:
+            self.calls.append(page)
+        if page == 1 and headers.get("If-None-Match") == self.etag():
+            return FakeResponse(304)
+        items = self.ordered()[(page - 1) * PER_PAGE : page * PER_PAGE]
+        last_page = max(1, -(-len(self.repos) // PER_PAGE))
+        return FakeResponse(200, items, etag=self.etag(), last_page=last_page)
+
+
+def test_full_refresh_follows_pagination():
+    """Alle Seiten werden geladen, nicht nur die ersten 100 Repositories"""
+    github = FakeGitHub(450)
+    cache_path = os.path.join(tempfile.mkdtemp(), "inventory.json")
+    inventory = RepoInventory("token", cache_path=cache_path, session=github)
+
+    repos, changed = inventory.refresh()
+
+    assert len(repos) == 450 and changed == 450
+    assert sorted(github.calls) == [1, 2, 3, 4, 5]
+    assert "extra" not in repos[0]
+    assert "token" not in open(cache_path).read()
+
+
+def test_incremental_refresh_uses_etag():
+    github = FakeGitHub(450)
+    cache_path = os.path.join(tempfile.mkdtemp(), "inventory.json")
+    RepoInventory("token", cache_path=cache_path, session=github).refresh()
+
+    # Unverändert: eine Anfrage, Antwort 304
+    github.calls = []
+    inventory = RepoInventory("token", cache_path=cache_path, session=github)
+    repos, changed = inventory.refresh()
+    assert github.calls == [1] and changed == 0 and len(repos) == 450
+
+    # Neues und geändertes Repository: nur die erste Seite wird geladen
+    github.calls = []
+    github.repos.append(github.make_repo(999, "2024-02-01T00:00:00Z"))
+    github.repos[5]["updated_at"] = "2024-02-02T00:00:00Z"
+    repos, changed = inventory.refresh()
+    assert github.calls == [1] and changed == 2
+    assert len(repos) == 451
+    assert [r["id"] for r in repos[:2]] == [5, 999]
+
+
+def test_cache_is_scoped_per_token():
+    github = FakeGitHub(3)
+    cache_path = os.path.join(tempfile.mkdtemp(), "inventory.json")
+    RepoInventory("token-a", cache_path=cache_path, session=github).refresh()
+
+    assert RepoInventory("token-a", cache_path=cache_path).cached()
+    assert RepoInventory("token-b", cache_path=cache_path).cached() is None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests für den regel- und entropiebasierten Secret-Scanner
+"""
+
+import os
+import tempfile
+
+from shared.secret_scanner import scan_directory, scan_file, shannon_entropy
+
+GITHUB_TOKEN = "ghp_" + "A1b2C3d4E5f6G7h8I9j0K1l2M3n4O5p6Q7r8"
+FINE_GRAINED_PAT = "github_pat_" + "11ABCDEFG0123456789_abcdefghijklmnopqrstuvwxyz"
+
+
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "wb" if isinstance(content, bytes) else "w"
+    with open(path, mode) as f:
+        f.write(content)
+    return path
+
+
+def test_github_tokens_with_position():
+    """GitHub-Tokens werden mit Zeile und Spalte gemeldet"""
+    directory = tempfile.mkdtemp(prefix="secret_test_")
+    path = write_file(
+        directory,
+        "config.py",
+        f"import os\n\nTOKEN = '{GITHUB_TOKEN}'\nother = \"{FINE_GRAINED_PAT}\"\n",
+    )
+
+    findings = scan_file(path, "config.py")
+
+    assert [(f["rule"], f["line"], f["column"]) for f in findings] == [
+        ("github_token", 3, 10),
+        ("github_pat", 4, 10),
+    ]
+    assert GITHUB_TOKEN not in findings[0]["secret"]
+
+
+def test_generic_assignment_and_entropy():
+    """Generische Zuweisungen und zufällige Strings werden erkannt"""
+    directory = tempfile.mkdtemp(prefix="secret_test_")
+    path = write_file(
+        directory,
+        "settings.js",
+        'const password = "hunter2hunter2";\n'
+        'const blob = "Zx8kQ2pL9vN3mR7tW1yB5cF0hJ4gD6sA";\n'
+        'const label = "aaaaaaaaaaaaaaaaaaaaaaaaaaaa";\n',
+    )
+
+    rules = [(f["rule"], f["line"]) for f in scan_file(path)]
+
+    assert ("generic_secret", 1) in rules
+    assert ("high_entropy", 2) in rules
+    assert all(line != 3 for _, line in rules)
+
+
+def test_chunk_boundaries_keep_line_numbers():
+    """Kleine Blöcke verändern weder Funde noch Zeilennummern"""
+    directory = tempfile.mkdtemp(prefix="secret_test_")
+    lines = ["x = 1"] * 500 + [f"key = '{GITHUB_TOKEN}'"] + ["y = 2"] * 10
+    path = write_file(directory, "big.py", "\n".join(lines))
+
+    findings = scan_file(path, chunk_size=64)
+
+    assert [(f["rule"], f["line"], f["column"]) for f in findings] == [
+        ("github_token", 501, 8)
+    ]
+
+
+def test_binary_files_are_skipped():
+    """Dateien mit NUL-Bytes werden nicht gescannt"""
+    directory = tempfile.mkdtemp(prefix="secret_test_")
+    write_file(directory, "data.dat", b"\x00\x01" + GITHUB_TOKEN.encode())
+    write_file(directory, "src/app.py", f"t = '{GITHUB_TOKEN}'\n")
+
+    findings = scan_directory(directory)
+
+    assert [f["file"] for f in findings] == ["src/app.py"]
+
+
+def test_shannon_entropy():
+    assert shannon_entropy(b"") == 0.0
+    assert shannon_entropy(b"aaaa") == 0.0
+    assert abs(shannon_entropy(b"abcd") - 2.0) < 1e-9
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests für den streamenden Multipart-Parser und die Upload-API
+"""
+
+import functools
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+import pytest
+import requests
+
+from shared.multipart_stream import UploadTooLarge, parse_multipart
+from upload_api import UploadAPIServer, process_upload
+
+BOUNDARY = "----grenze42"
+
+
+def multipart_body(fields, files):
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            + value.encode()
+            + b"\r\n"
+        )
+    for name, (filename, data) in files.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; '
+            f'filename="{filename}"\r\nContent-Type: application/zip\r\n\r\n'.encode()
+            + data
+            + b"\r\n"
+        )
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_parser_streams_files_to_disk(chunk_size):
+    # Enthält Teile des Trenners, die nicht als Trenner gelten dürfen
+    data = os.urandom(20000) + b"\r\n------grenze4" + os.urandom(100)
+    body = multipart_body({"repo_name": "mein projekt"}, {"file": ("C:\\tmp\\p.zip", data)})
+    target = tempfile.mkdtemp()
+
+    fields, files = parse_multipart(
+        io.BytesIO(body), f"multipart/form-data; boundary={BOUNDARY}", len(body), target,
+        chunk_size=chunk_size,
+    )
+
+    assert fields == {"repo_name": "mein projekt"}
+    upload = files["file"]
+    assert upload["filename"] == "p.zip"
+    assert upload["size"] == len(data)
+    assert upload["sha256"] == hashlib.sha256(data).hexdigest()
+    with open(upload["path"], "rb") as f:
+        assert f.read() == data
+
+
+def test_parser_stops_at_size_limit():
+    body = multipart_body({}, {"file": ("gross.zip", b"x" * 500000)})
+    stream = io.BytesIO(body)
+    target = tempfile.mkdtemp()
+    with pytest.raises(UploadTooLarge):
+        parse_multipart(
+            stream, f"multipart/form-data; boundary={BOUNDARY}", len(body), target,
+            max_file_size=100000, chunk_size=4096,
+        )
+    # Abbruch während des Empfangs, angefangene Datei entfernt
+    assert stream.tell() < 200000
+    assert os.listdir(target) == []
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def api():
+    pushed = []
+
+    def fake_push(token, user, repo_name, local_path, **kwargs):
+        pushed.append((repo_name, sorted(os.listdir(local_path)), kwargs["private"]))
+        return f"https://github.com/{user}/{repo_name}.git"
+
+    settings = {
+        "api_key": "geheim",
+        "work_dir": tempfile.mkdtemp(),
+        "workers": 2,
+        "max_pending": 10,
+        "github_token": "token",
+        "github_user": "alice",
+    }
+    server = UploadAPIServer(
+        ("127.0.0.1", 0), settings, pipeline=functools.partial(process_upload, push=fake_push)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield base, pushed, settings
+    server.shutdown()
+    server.jobs.shutdown()
+
+
+def wait_for_job(base, job_id):
+    for _ in range(100):
+        job = requests.get(f"{base}/jobs/{job_id}", headers={"X-API-Key": "geheim"}).json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("Auftrag nicht abgeschlossen")
+
+
+def test_upload_accepted_and_processed(api):
+    base, pushed, settings = api
+    archive = make_zip({"demo/main.py": "print('hallo')\n", "demo/requirements.txt": "flask\n"})
+
+    response = requests.post(
+        f"{base}/uploads",
+        headers={"X-API-Key": "geheim"},
+        data={"private": "false"},
+        files={"file": ("demo projekt.zip", archive)},
+    )
+    assert response.status_code == 202
+    accepted = response.json()
+    assert response.headers["Location"] == accepted["status_url"]
+    assert accepted["sha256"] == hashlib.sha256(archive).hexdigest()
+
+    job = wait_for_job(base, accepted["job_id"])
+    assert job["status"] == "done", job
+    assert job["result"]["repo_url"] == "https://github.com/alice/demo-projekt.git"
+    assert pushed == [("demo-projekt", ["README.md", "main.py", "requirements.txt"], False)]
+    # Arbeitsbereich geleert (leere Verzeichnisse bleiben zur Wiederverwendung)
+    work_dir = settings["work_dir"]
+    for name in os.listdir(work_dir):
+        path = os.path.join(work_dir, name)
+        assert name.endswith(".pid") or os.listdir(path) == []
+
+
+def test_rejections(api):
+    base, pushed, _ = api
+    assert requests.get(f"{base}/health").status_code == 401
+
+    response = requests.post(
+        f"{base}/uploads",
+        headers={"X-API-Key": "geheim"},
+        files={"file": ("kaputt.zip", b"kein zip")},
+    )
+    job = wait_for_job(base, response.json()["job_id"])
+    assert job["status"] == "failed" and "ZIP" in job["error"]
+
+    response = requests.post(
+        f"{base}/uploads",
+        headers={"X-API-Key": "geheim", "Content-Length": str(10 ** 10)},
+        data=b"",
+    )
+    assert response.status_code == 413
+    assert pushed == []
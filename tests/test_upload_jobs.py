@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests für Upload-Aufträge im Hintergrund (Abbruch, Validierungsstopp)
+"""
+
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+import upload_jobs
+from shared.job_queue import CANCELLED, DONE, QUEUED, JobQueue
+from shared.workspace_manager import WorkspaceManager
+from upload_jobs import run_upload
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+def wait_finished(jobs, job_id, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job["finished"]:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Auftrag nicht beendet: {jobs.get(job_id)}")
+
+
+def test_upload_job_runs_in_background(monkeypatch):
+    pushed = []
+    monkeypatch.setitem(
+        upload_jobs.ANALYSIS_PANELS, "structure", ("Struktur", lambda d: sorted(os.listdir(d)))
+    )
+
+    def fake_push(token, user, repo_name, project_dir, **kwargs):
+        pushed.append((repo_name, sorted(os.listdir(project_dir)), kwargs["auto_init"]))
+        return f"https://github.com/{user}/{repo_name}"
+
+    jobs = JobQueue(max_workers=1)
+    zip_bytes = make_zip({"projekt/main.py": "def main():\n    return 1\n"})
+    options = {
+        "repo_name": "projekt",
+        "github_token": "t",
+        "github_user": "nutzer",
+        "analyses": ["structure"],
+    }
+    workspaces = WorkspaceManager(root=tempfile.mkdtemp(), fast_root=None, min_free=0)
+    job = wait_finished(
+        jobs,
+        jobs.submit(run_upload, zip_bytes, "hash", options, push=fake_push, workspaces=workspaces),
+    )
+    assert workspaces.usage()["reserved"]["disk"] == 0
+
+    assert job["status"] == DONE and job["progress"] == 1.0
+    assert job["result"]["repo_url"] == "https://github.com/nutzer/projekt"
+    # Analysen starten erst nach dem Schreiben der README
+    assert job["result"]["analyses"]["structure"] == ["README.md", "main.py"]
+    assert pushed == [("projekt", ["README.md", "main.py"], True)]
+    assert any("Erstelle GitHub-Repository" in line for line in job["log"])
+
+
+def test_failed_validation_stops_before_push():
+    pushed = []
+    zip_bytes = make_zip(
+        {"projekt/package.json": "kein json", "projekt/index.js": "console.log(1)\n"}
+    )
+    options = {"repo_name": "projekt", "github_token": "t", "github_user": "nutzer"}
+
+    workspaces = WorkspaceManager(root=tempfile.mkdtemp(), fast_root=None, min_free=0)
+    result = run_upload(
+        lambda *a, **k: None, zip_bytes, "hash", options, push=pushed.append, workspaces=workspaces
+    )
+    assert result["uploaded"] is False and not result["validation"]["valid"]
+    assert pushed == []
+
+
+def test_cancel_queued_and_running_jobs():
+    jobs = JobQueue(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(log):
+        started.set()
+        release.wait(5)
+        log("weiter")
+        return "nie erreicht"
+
+    running = jobs.submit(slow)
+    queued = jobs.submit(slow)
+    assert started.wait(5)
+    assert jobs.get(queued)["status"] == QUEUED
+
+    assert jobs.cancel(queued) and jobs.cancel(running)
+    release.set()
+    assert wait_finished(jobs, running)["status"] == CANCELLED
+    assert jobs.get(queued)["status"] == CANCELLED
+    assert jobs.get(running)["result"] is None
+    assert not jobs.cancel(running)
+    assert jobs.counts()[CANCELLED] == 2
+    jobs.shutdown()
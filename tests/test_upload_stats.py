@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests für die vorberechneten Upload-Statistiken
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+
+from shared import upload_stats
+from shared.upload_stats import count_since, load_stats, record_upload, rollup, success_rate
+from uploader_utils import save_upload_history
+
+
+def make_files(history):
+    directory = tempfile.mkdtemp(prefix="stats_test_")
+    history_file = os.path.join(directory, "upload_history.json")
+    stats_file = os.path.join(directory, "upload_stats.json")
+    with open(history_file, "w") as f:
+        json.dump(history, f)
+    return history_file, stats_file
+
+
+def test_rebuild_from_existing_history():
+    history_file, stats_file = make_files(
+        [
+            {"repo_name": "a", "timestamp": "2025-07-14T10:00:00", "status": "success"},
+            {"repo_name": "b", "timestamp": "2025-07-14T11:00:00", "status": "success"},
+            {"repo_name": "c", "timestamp": "2025-07-20T09:00:00", "status": "failure"},
+            {"repo_name": "d", "timestamp": "2025-08-01T09:00:00", "status": "success"},
+        ]
+    )
+
+    stats = load_stats(history_file, stats_file)
+
+    assert (stats["total"], stats["success"], stats["failure"]) == (4, 3, 1)
+    assert success_rate(stats) == 0.75
+    assert rollup(stats, "day")[0] == ("2025-07-14", 2, 0)
+    assert rollup(stats, "week") == [("2025-W29", 2, 1), ("2025-W31", 1, 0)]
+    assert rollup(stats, "month") == [("2025-07", 2, 1), ("2025-08", 1, 0)]
+    assert rollup(stats, "day", start=date(2025, 7, 15)) == [
+        ("2025-07-20", 0, 1),
+        ("2025-08-01", 1, 0),
+    ]
+    assert count_since(stats, 7, today=date(2025, 7, 20)) == 3
+
+
+def test_record_upload_does_not_reread_history(monkeypatch):
+    """Nach dem ersten Aufbau wird die Historie nicht mehr gelesen"""
+    history_file, stats_file = make_files([])
+    load_stats(history_file, stats_file)
+
+    history = []
+    for i in range(3):
+        history.append({"timestamp": datetime(2025, 7, 14, i).isoformat(), "status": "success"})
+        with open(history_file, "w") as f:
+            json.dump(history, f)
+        record_upload("success", datetime(2025, 7, 14, i), history_file, stats_file)
+
+    monkeypatch.setattr(upload_stats, "rebuild_stats", None)
+    stats = load_stats(history_file, stats_file)
+    assert stats["total"] == 3
+    assert rollup(stats, "day") == [("2025-07-14", 3, 0)]
+
+
+def test_concurrent_history_updates_are_not_lost(monkeypatch):
+    history_file, _ = make_files([])
+    monkeypatch.chdir(os.path.dirname(history_file))
+
+    def upload(worker):
+        for i in range(25):
+            save_upload_history(f"repo-{worker}-{i}", None, history_file=history_file)
+
+    threads = [threading.Thread(target=upload, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(history_file) as f:
+        assert len(json.load(f)) == 100
+    assert load_stats(history_file)["total"] == 100
+
+    # Unlesbare Historie wird beiseitegelegt statt überschrieben
+    with open(history_file, "w") as f:
+        f.write("{kaputt")
+    save_upload_history("neu", None, history_file=history_file)
+    backups = [name for name in os.listdir(".") if name.endswith(".defekt")]
+    with open(backups[0]) as f:
+        assert f.read() == "{kaputt"
+    with open(history_file) as f:
+        assert [item["repo_name"] for item in json.load(f)] == ["neu"]
+
+
+def test_externally_edited_history_triggers_rebuild(monkeypatch):
+    history_file, _ = make_files([])
+    monkeypatch.chdir(os.path.dirname(history_file))
+    for i in range(4):
+        save_upload_history(f"repo-{i}", None, history_file=history_file)
+
+    # Historie von Hand gekürzt: Statistik darf nicht weiterzählen
+    with open(history_file) as f:
+        history = json.load(f)
+    with open(history_file, "w") as f:
+        json.dump(history[:1], f)
+    save_upload_history("neu", None, history_file=history_file)
+
+    assert load_stats(history_file)["total"] == 2
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests für Arbeitsbereiche mit Speicherplatzreservierung
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+import pytest
+
+from shared.workspace_manager import (
+    MB,
+    InsufficientSpace,
+    WorkspaceManager,
+    archive_workspace_size,
+)
+
+
+def manager(**kwargs):
+    kwargs.setdefault("fast_root", None)
+    kwargs.setdefault("min_free", 0)
+    return WorkspaceManager(root=tempfile.mkdtemp(), **kwargs)
+
+
+def test_archive_size_from_central_directory():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("a.txt", "x" * 10000)
+        zf.writestr("b.txt", "y")
+    archive_size = len(buffer.getvalue())
+
+    extracted_only = archive_workspace_size(buffer, include_archive=False)
+    assert extracted_only >= 12 * 1024 + 2
+    assert archive_workspace_size(buffer) == extracted_only + archive_size
+    assert buffer.tell() == archive_size
+
+    assert archive_workspace_size(io.BytesIO(b"kein zip")) == 8
+
+
+def test_quota_waits_for_release_and_recycles_directories():
+    workspaces = manager(quota=10 * MB, wait_timeout=5)
+    first = workspaces.acquire(6 * MB)
+    with open(os.path.join(first.path, "daten"), "wb") as f:
+        f.write(b"1")
+
+    with pytest.raises(InsufficientSpace):
+        workspaces.acquire(6 * MB, timeout=0)
+    with pytest.raises(InsufficientSpace):
+        workspaces.acquire(11 * MB)
+
+    threading.Timer(0.2, first.release).start()
+    started = time.monotonic()
+    with workspaces.acquire(6 * MB) as second:
+        assert time.monotonic() - started >= 0.1
+        # Geleertes Verzeichnis wird wiederverwendet
+        assert second.path == first.path and os.listdir(second.path) == []
+        with pytest.raises(InsufficientSpace):
+            second.grow(5 * MB, timeout=0)
+        second.grow(4 * MB)
+        assert workspaces.usage()["reserved"]["disk"] == 10 * MB
+    assert workspaces.usage() == dict(workspaces.usage(), active=0, pooled=1)
+
+
+def test_small_jobs_use_fast_volume():
+    workspaces = manager(fast_root=tempfile.mkdtemp(), fast_max_size=MB)
+    with workspaces.acquire(MB // 2) as small, workspaces.acquire(2 * MB) as large:
+        assert small.volume == "fast" and large.volume == "disk"
+        with workspaces.acquire(MB // 2, fast=False) as forced:
+            assert forced.volume == "disk"
+
+
+def test_workspaces_of_dead_processes_are_removed():
+    root = tempfile.mkdtemp()
+    script = (
+        "import sys; from shared.workspace_manager import WorkspaceManager\n"
+        f"ws = WorkspaceManager(root={root!r}, fast_root=None, min_free=0).acquire(1024)\n"
+        "open(ws.path + '/halb', 'w').write('x')\n"
+        "import os; os._exit(1)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", script], env=env)
+    assert len(os.listdir(root)) == 2
+
+    WorkspaceManager(root=root, fast_root=None, min_free=0)
+    assert os.listdir(root) == []
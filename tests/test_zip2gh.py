@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests für den Kommandozeilen-Import (Probelauf ohne GitHub)
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+from zip2gh import EXIT_FAILED, EXIT_OK, EXIT_USAGE, main
+
+
+def make_zip(path, files):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+
+
+def run(argv):
+    stream = io.StringIO()
+    code = main(argv, stream=stream)
+    return code, [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_directory_dry_run_with_report():
+    directory = tempfile.mkdtemp()
+    for i in range(3):
+        make_zip(os.path.join(directory, f"projekt {i}.zip"), {f"p{i}/main.py": "print(1)\n"})
+    with open(os.path.join(directory, "kaputt.zip"), "w") as f:
+        f.write("kein zip")
+    report = os.path.join(directory, "bericht.csv")
+
+    code, events = run([directory, "--dry-run", "--jobs", "2", "--report", report])
+
+    assert code == EXIT_FAILED
+    assert events[0] == dict(events[0], event="begin", total=4)
+    assert events[-1] == dict(events[-1], event="summary", succeeded=3, failed=1)
+    assert {e["repo"] for e in events if e["event"] == "done"} == {
+        "projekt-0",
+        "projekt-1",
+        "projekt-2",
+    }
+    with open(report, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["ZIP-Datei"] for row in rows] == [
+        "kaputt.zip",
+        "projekt 0.zip",
+        "projekt 1.zip",
+        "projekt 2.zip",
+    ]
+    assert rows[0]["Status"].startswith("Fehler: Keine gültige ZIP-Datei")
+    assert rows[1]["Status"] == "Probelauf"
+
+
+def test_manifest_names_and_usage_errors():
+    directory = tempfile.mkdtemp()
+    make_zip(os.path.join(directory, "alt.zip"), {"main.py": "print(1)\n"})
+    manifest = os.path.join(directory, "migration.csv")
+    with open(manifest, "w") as f:
+        f.write("name,zip\nneuer-name,alt.zip\n")
+
+    code, events = run(["--manifest", manifest, "--dry-run"])
+    assert code == EXIT_OK
+    assert [e["repo"] for e in events if e["event"] == "done"] == ["neuer-name"]
+
+    assert run([])[0] == EXIT_USAGE
+    assert run([manifest.replace(".csv", ".zip"), "--token", "", "--user", ""])[0] == EXIT_USAGE
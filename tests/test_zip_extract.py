@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests für das parallele, begrenzte Entpacken
+"""
+
+import os
+import random
+import tempfile
+import zipfile
+
+import pytest
+
+from shared import zip_extract
+from shared.zip_extract import ExtractionError, extract_zip, resolve_member_path
+
+
+def make_zip(files, compression=zipfile.ZIP_DEFLATED):
+    path = os.path.join(tempfile.mkdtemp(), "archiv.zip")
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return path
+
+
+def test_parallel_extraction_matches_contents():
+    rng = random.Random(7)
+    # Groß genug für den Thread-Pool (PARALLEL_MIN_BYTES)
+    files = {
+        f"projekt/paket{i % 4}/datei{i}.bin": os.urandom(rng.randint(200_000, 400_000))
+        for i in range(24)
+    }
+    files["projekt/leer/"] = b""
+    target = tempfile.mkdtemp()
+
+    stats = extract_zip(make_zip(files), target, workers=4, buffer_size=4096)
+
+    assert stats["files"] == 24
+    assert stats["bytes"] == sum(len(content) for content in files.values())
+    assert os.path.isdir(os.path.join(target, "projekt", "leer"))
+    for name, content in files.items():
+        if not name.endswith("/"):
+            with open(os.path.join(target, name), "rb") as f:
+                assert f.read() == content
+
+
+@pytest.mark.parametrize("name", ["../boese.txt", "a/../../boese.txt", "/etc/boese", "C:/boese"])
+def test_paths_outside_target_are_rejected(name):
+    target = tempfile.mkdtemp()
+    with pytest.raises(ExtractionError):
+        resolve_member_path(target, name)
+
+    archive = make_zip({"ok.txt": b"1", name: b"boese"})
+    with pytest.raises(ExtractionError):
+        extract_zip(archive, target)
+    # Geprüft wird vor dem ersten Schreiben
+    assert os.listdir(target) == []
+
+
+def test_symlink_in_target_is_rejected():
+    target, outside = tempfile.mkdtemp(), tempfile.mkdtemp()
+    os.symlink(outside, os.path.join(target, "link"))
+    with pytest.raises(ExtractionError):
+        extract_zip(make_zip({"link/datei.txt": b"boese"}), target)
+    assert os.listdir(outside) == []
+
+
+def test_limits_are_enforced_while_writing():
+    archive = make_zip({"a.txt": b"x" * 5000, "b.txt": b"y" * 5000})
+    with pytest.raises(ExtractionError, match="zu viele"):
+        extract_zip(archive, tempfile.mkdtemp(), max_files=1)
+    with pytest.raises(ExtractionError, match="Limit"):
+        extract_zip(archive, tempfile.mkdtemp(), max_total_size=9000)
+    with pytest.raises(ExtractionError, match="zu groß"):
+        extract_zip(archive, tempfile.mkdtemp(), max_file_size=4000)
+
+
+
+def test_broken_members_raise_extraction_error(monkeypatch):
+    # Datei "a" neben "a/b"
+    with pytest.raises(ExtractionError, match="widersprüchlicher"):
+        extract_zip(make_zip({"a": b"1", "a/b": b"2"}), tempfile.mkdtemp())
+
+    # Manipulierter Inhalt: CRC-Fehler beim Lesen
+    archive = make_zip({"a.txt": b"hallo welt"}, zipfile.ZIP_STORED)
+    with open(archive, "rb") as f:
+        data = f.read()
+    with open(archive, "wb") as f:
+        f.write(data.replace(b"hallo welt", b"hallo WELT"))
+    with pytest.raises(ExtractionError, match="a.txt"):
+        extract_zip(archive, tempfile.mkdtemp())
+
+    # Vorabreservierung höchstens bis zum Limit pro Datei
+    sizes = []
+    monkeypatch.setattr(zip_extract, "_preallocate", lambda fd, size: sizes.append(size))
+    with pytest.raises(ExtractionError, match="zu groß"):
+        extract_zip(make_zip({"a.txt": b"x" * 5000}), tempfile.mkdtemp(), max_file_size=4000)
+    assert sizes == [4000]